@@ -3,6 +3,12 @@ import os
 import random
 from pathlib import Path
 
+if os.environ.get("ENABLE_STARTUP_PROFILING", "False").lower() == "true":
+    # Installed before anything else is imported to profile the whole startup
+    from open_webui.utils.profiling import start_import_profiling
+
+    start_import_profiling()
+
 import typer
 import uvicorn
 from typing import Optional
@@ -30,12 +36,7 @@ def main(
     pass
 
 
-@app.command()
-def serve(
-    host: str = "0.0.0.0",
-    port: int = 8080,
-):
-    os.environ["FROM_INIT_PY"] = "true"
+def load_secret_key():
     if os.getenv("WEBUI_SECRET_KEY") is None:
         typer.echo(
             "Loading WEBUI_SECRET_KEY from file, not provided as an environment variable."
@@ -46,6 +47,15 @@ def serve(
         typer.echo(f"Loading WEBUI_SECRET_KEY from {KEY_FILE}")
         os.environ["WEBUI_SECRET_KEY"] = KEY_FILE.read_text()
 
+
+@app.command()
+def serve(
+    host: str = "0.0.0.0",
+    port: int = 8080,
+):
+    os.environ["FROM_INIT_PY"] = "true"
+    load_secret_key()
+
     if os.getenv("USE_CUDA_DOCKER", "false") == "true":
         typer.echo(
             "CUDA is enabled, appending LD_LIBRARY_PATH to include torch/cudnn & cublas libraries."
@@ -99,5 +109,30 @@ def dev(
     )
 
 
+@app.command()
+def worker(
+    concurrency: Annotated[
+        Optional[int], typer.Option(help="Jobs processed in parallel")
+    ] = None,
+):
+    """
+    Process queued file ingestion jobs (requires ENABLE_INGESTION_QUEUE).
+    """
+    import signal
+
+    os.environ["FROM_INIT_PY"] = "true"
+    load_secret_key()
+
+    from open_webui.env import INGESTION_WORKER_CONCURRENCY
+    from open_webui.main import app as webui_app
+    from open_webui.utils.ingestion import IngestionWorker
+
+    ingestion_worker = IngestionWorker(
+        webui_app, concurrency=concurrency or INGESTION_WORKER_CONCURRENCY
+    )
+    signal.signal(signal.SIGTERM, lambda *_: ingestion_worker.stop())
+    ingestion_worker.run()
+
+
 if __name__ == "__main__":
     app()
@@ -174,12 +174,12 @@ class PersistentConfig(Generic[T]):
                 self.config_path.startswith("oauth.")
                 and not ENABLE_OAUTH_PERSISTENT_CONFIG
             ):
-                log.info(
+                log.debug(
                     f"Skipping loading of '{env_name}' as OAuth persistent config is disabled"
                 )
                 self.value = env_value
             else:
-                log.info(f"'{env_name}' loaded from the latest database entry")
+                log.debug(f"'{env_name}' loaded from the latest database entry")
                 self.value = self.config_value
         else:
             self.value = env_value
@@ -943,6 +943,42 @@ AZURE_STORAGE_ENDPOINT = os.environ.get("AZURE_STORAGE_ENDPOINT", None)
 AZURE_STORAGE_CONTAINER_NAME = os.environ.get("AZURE_STORAGE_CONTAINER_NAME", None)
 AZURE_STORAGE_KEY = os.environ.get("AZURE_STORAGE_KEY", None)
 
+# Local copies of remote (s3, gcs, azure) objects are kept in UPLOAD_DIR and
+# revalidated against the object's ETag/generation; the least recently used
+# copies are removed once they exceed this many bytes (0 disables the cache)
+STORAGE_LOCAL_CACHE_MAX_SIZE = os.environ.get(
+    "STORAGE_LOCAL_CACHE_MAX_SIZE", str(5 * 1024 * 1024 * 1024)
+)
+
+try:
+    STORAGE_LOCAL_CACHE_MAX_SIZE = int(STORAGE_LOCAL_CACHE_MAX_SIZE)
+except Exception:
+    STORAGE_LOCAL_CACHE_MAX_SIZE = 5 * 1024 * 1024 * 1024
+
+# Evicted copies handed out to a reader less than this many seconds ago are
+# deleted only once that much time has passed, so readers can still open them
+STORAGE_LOCAL_CACHE_EVICT_DELAY = os.environ.get(
+    "STORAGE_LOCAL_CACHE_EVICT_DELAY", "300"
+)
+
+try:
+    STORAGE_LOCAL_CACHE_EVICT_DELAY = max(int(STORAGE_LOCAL_CACHE_EVICT_DELAY), 0)
+except Exception:
+    STORAGE_LOCAL_CACHE_EVICT_DELAY = 300
+
+# Redirect file downloads to a short-lived presigned URL of the remote object
+# instead of proxying them through the app
+STORAGE_PRESIGNED_URL_REDIRECT = (
+    os.environ.get("STORAGE_PRESIGNED_URL_REDIRECT", "false").lower() == "true"
+)
+
+STORAGE_PRESIGNED_URL_EXPIRY = os.environ.get("STORAGE_PRESIGNED_URL_EXPIRY", "300")
+
+try:
+    STORAGE_PRESIGNED_URL_EXPIRY = int(STORAGE_PRESIGNED_URL_EXPIRY)
+except Exception:
+    STORAGE_PRESIGNED_URL_EXPIRY = 300
+
 ####################################
 # File Upload DIR
 ####################################
@@ -2340,6 +2376,20 @@ else:
     except Exception:
         PGVECTOR_IVFFLAT_LISTS = 100
 
+# Build the vector index over a half-precision cast of the (full precision)
+# vector column, halving index memory without migrating stored vectors
+PGVECTOR_INDEX_HALFVEC = os.getenv("PGVECTOR_INDEX_HALFVEC", "false").lower() == "true"
+
+PGVECTOR_INSERT_BATCH_SIZE = os.environ.get("PGVECTOR_INSERT_BATCH_SIZE", 1000)
+
+if PGVECTOR_INSERT_BATCH_SIZE == "":
+    PGVECTOR_INSERT_BATCH_SIZE = 1000
+else:
+    try:
+        PGVECTOR_INSERT_BATCH_SIZE = int(PGVECTOR_INSERT_BATCH_SIZE)
+    except Exception:
+        PGVECTOR_INSERT_BATCH_SIZE = 1000
+
 # Pinecone
 PINECONE_API_KEY = os.environ.get("PINECONE_API_KEY", None)
 PINECONE_ENVIRONMENT = os.environ.get("PINECONE_ENVIRONMENT", None)
@@ -2379,6 +2429,33 @@ log.info(f"VECTOR_DB: {VECTOR_DB}")
 S3_VECTOR_BUCKET_NAME = os.environ.get("S3_VECTOR_BUCKET_NAME", None)
 S3_VECTOR_REGION = os.environ.get("S3_VECTOR_REGION", None)
 
+# Embedded (memory-mapped, single node)
+EMBEDDED_VECTOR_DATA_PATH = os.environ.get(
+    "EMBEDDED_VECTOR_DATA_PATH", f"{DATA_DIR}/embedded_vector_db"
+)
+EMBEDDED_VECTOR_DTYPE = os.environ.get("EMBEDDED_VECTOR_DTYPE", "float16").lower()
+if EMBEDDED_VECTOR_DTYPE not in ("float16", "float32"):
+    EMBEDDED_VECTOR_DTYPE = "float16"
+
+# Collections with at least this many live rows are searched through an HNSW
+# graph (requires hnswlib); smaller ones use exact search
+EMBEDDED_VECTOR_HNSW_THRESHOLD = os.environ.get("EMBEDDED_VECTOR_HNSW_THRESHOLD", 50000)
+
+try:
+    EMBEDDED_VECTOR_HNSW_THRESHOLD = int(EMBEDDED_VECTOR_HNSW_THRESHOLD)
+except Exception:
+    EMBEDDED_VECTOR_HNSW_THRESHOLD = 50000
+
+# Fraction of deleted rows that triggers a background compaction
+EMBEDDED_VECTOR_COMPACTION_RATIO = os.environ.get(
+    "EMBEDDED_VECTOR_COMPACTION_RATIO", 0.3
+)
+
+try:
+    EMBEDDED_VECTOR_COMPACTION_RATIO = float(EMBEDDED_VECTOR_COMPACTION_RATIO)
+except Exception:
+    EMBEDDED_VECTOR_COMPACTION_RATIO = 0.3
+
 ####################################
 # Information Retrieval (RAG)
 ####################################
@@ -2762,6 +2839,22 @@ RAG_EMBEDDING_QUERY_PREFIX = os.environ.get("RAG_EMBEDDING_QUERY_PREFIX", None)
 
 RAG_EMBEDDING_CONTENT_PREFIX = os.environ.get("RAG_EMBEDDING_CONTENT_PREFIX", None)
 
+# Keep the chunk embeddings of uploaded files on disk, grouped by file content,
+# so duplicate uploads and re-processing don't call the embedding model again
+ENABLE_FILE_EMBEDDING_CACHE = (
+    os.environ.get("ENABLE_FILE_EMBEDDING_CACHE", "True").lower() == "true"
+)
+
+# Bytes of cached file embeddings kept on disk, least recently used go first
+FILE_EMBEDDING_CACHE_MAX_SIZE = os.environ.get(
+    "FILE_EMBEDDING_CACHE_MAX_SIZE", str(1024 * 1024 * 1024)
+)
+
+try:
+    FILE_EMBEDDING_CACHE_MAX_SIZE = max(int(FILE_EMBEDDING_CACHE_MAX_SIZE), 0)
+except Exception:
+    FILE_EMBEDDING_CACHE_MAX_SIZE = 1024 * 1024 * 1024
+
 RAG_EMBEDDING_PREFIX_FIELD_NAME = os.environ.get(
     "RAG_EMBEDDING_PREFIX_FIELD_NAME", None
 )
@@ -2965,6 +3058,22 @@ BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL = PersistentConfig(
 )
 
 
+# "collection" stores web search results in a vector DB collection per
+# search, "memory" embeds and ranks them in-process without storing them
+WEB_SEARCH_RETRIEVAL_MODE = PersistentConfig(
+    "WEB_SEARCH_RETRIEVAL_MODE",
+    "rag.web.search.retrieval_mode",
+    os.getenv("WEB_SEARCH_RETRIEVAL_MODE", "collection"),
+)
+
+# Seconds before stored web search collections are deleted, 0 keeps them
+WEB_SEARCH_COLLECTION_TTL = PersistentConfig(
+    "WEB_SEARCH_COLLECTION_TTL",
+    "rag.web.search.collection_ttl",
+    int(os.getenv("WEB_SEARCH_COLLECTION_TTL", "0")),
+)
+
+
 BYPASS_WEB_SEARCH_WEB_LOADER = PersistentConfig(
     "BYPASS_WEB_SEARCH_WEB_LOADER",
     "rag.web.search.bypass_web_loader",
@@ -3017,6 +3126,14 @@ WEB_LOADER_TIMEOUT = PersistentConfig(
     os.getenv("WEB_LOADER_TIMEOUT", ""),
 )
 
+# Seconds web search waits for pages to load, then continues with the pages
+# loaded so far. 0 waits for all of them
+WEB_LOADER_DEADLINE = PersistentConfig(
+    "WEB_LOADER_DEADLINE",
+    "rag.web.loader.deadline",
+    float(os.getenv("WEB_LOADER_DEADLINE", "0")),
+)
+
 
 ENABLE_WEB_LOADER_SSL_VERIFICATION = PersistentConfig(
     "ENABLE_WEB_LOADER_SSL_VERIFICATION",
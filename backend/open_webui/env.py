@@ -6,13 +6,12 @@ import pkgutil
 import sys
 import shutil
 from uuid import uuid4
+from functools import lru_cache
 from pathlib import Path
 from cryptography.hazmat.primitives import serialization
 import re
 
 
-import markdown
-from bs4 import BeautifulSoup
 from open_webui.constants import ERROR_MESSAGES
 
 ####################################
@@ -60,13 +59,15 @@ if USE_CUDA.lower() == "true":
 else:
     DEVICE_TYPE = "cpu"
 
-try:
-    import torch
+if sys.platform == "darwin":
+    # Importing torch is slow, only probe for Apple silicon where it exists
+    try:
+        import torch
 
-    if torch.backends.mps.is_available() and torch.backends.mps.is_built():
-        DEVICE_TYPE = "mps"
-except Exception:
-    pass
+        if torch.backends.mps.is_available() and torch.backends.mps.is_built():
+            DEVICE_TYPE = "mps"
+    except Exception:
+        pass
 
 ####################################
 # LOGGING
@@ -135,45 +136,55 @@ def parse_section(section):
     return items
 
 
-try:
-    changelog_path = BASE_DIR / "CHANGELOG.md"
-    with open(str(changelog_path.absolute()), "r", encoding="utf8") as file:
-        changelog_content = file.read()
+@lru_cache
+def get_changelog() -> dict:
+    """The changelog by version, parsed on first use as it takes a while."""
+    import markdown
+    from bs4 import BeautifulSoup
 
-except Exception:
-    changelog_content = (pkgutil.get_data("open_webui", "CHANGELOG.md") or b"").decode()
+    try:
+        changelog_path = BASE_DIR / "CHANGELOG.md"
+        with open(str(changelog_path.absolute()), "r", encoding="utf8") as file:
+            changelog_content = file.read()
+
+    except Exception:
+        changelog_content = (
+            pkgutil.get_data("open_webui", "CHANGELOG.md") or b""
+        ).decode()
 
-# Convert markdown content to HTML
-html_content = markdown.markdown(changelog_content)
+    # Convert markdown content to HTML
+    html_content = markdown.markdown(changelog_content)
 
-# Parse the HTML content
-soup = BeautifulSoup(html_content, "html.parser")
+    # Parse the HTML content
+    soup = BeautifulSoup(html_content, "html.parser")
 
-# Initialize JSON structure
-changelog_json = {}
+    # Initialize JSON structure
+    changelog_json = {}
 
-# Iterate over each version
-for version in soup.find_all("h2"):
-    version_number = version.get_text().strip().split(" - ")[0][1:-1]  # Remove brackets
-    date = version.get_text().strip().split(" - ")[1]
+    # Iterate over each version
+    for version in soup.find_all("h2"):
+        # Remove brackets
+        version_number = version.get_text().strip().split(" - ")[0][1:-1]
+        date = version.get_text().strip().split(" - ")[1]
 
-    version_data = {"date": date}
+        version_data = {"date": date}
 
-    # Find the next sibling that is a h3 tag (section title)
-    current = version.find_next_sibling()
+        # Find the next sibling that is a h3 tag (section title)
+        current = version.find_next_sibling()
 
-    while current and current.name != "h2":
-        if current.name == "h3":
-            section_title = current.get_text().lower()  # e.g., "added", "fixed"
-            section_items = parse_section(current.find_next_sibling("ul"))
-            version_data[section_title] = section_items
+        while current and current.name != "h2":
+            if current.name == "h3":
+                section_title = current.get_text().lower()  # e.g., "added", "fixed"
+                section_items = parse_section(current.find_next_sibling("ul"))
+                version_data[section_title] = section_items
 
-        # Move to the next element
-        current = current.find_next_sibling()
+            # Move to the next element
+            current = current.find_next_sibling()
 
-    changelog_json[version_number] = version_data
+        changelog_json[version_number] = version_data
+
+    return changelog_json
 
-CHANGELOG = changelog_json
 
 ####################################
 # SAFE_MODE
@@ -496,6 +507,23 @@ OAUTH_SESSION_TOKEN_ENCRYPTION_KEY = os.environ.get(
     "OAUTH_SESSION_TOKEN_ENCRYPTION_KEY", WEBUI_SECRET_KEY
 )
 
+# Seconds a decrypted OAuth session is reused before it is read again
+OAUTH_SESSION_CACHE_TTL = os.environ.get("OAUTH_SESSION_CACHE_TTL", "60")
+
+try:
+    OAUTH_SESSION_CACHE_TTL = max(int(OAUTH_SESSION_CACHE_TTL), 0)
+except Exception:
+    OAUTH_SESSION_CACHE_TTL = 60
+
+# Seconds between background refreshes of the OAuth tokens in use that are
+# about to expire, 0 to only refresh them when used
+OAUTH_TOKEN_REFRESH_INTERVAL = os.environ.get("OAUTH_TOKEN_REFRESH_INTERVAL", "60")
+
+try:
+    OAUTH_TOKEN_REFRESH_INTERVAL = max(int(OAUTH_TOKEN_REFRESH_INTERVAL), 0)
+except Exception:
+    OAUTH_TOKEN_REFRESH_INTERVAL = 60
+
 ####################################
 # SCIM Configuration
 ####################################
@@ -603,6 +631,248 @@ else:
         CHAT_STREAM_RESPONSE_CHUNK_MAX_BUFFER_SIZE = None
 
 
+# Images referenced by URL or file id are inlined as base64 before every request;
+# the inlined data URLs are kept in a per-process LRU bounded by bytes.
+CHAT_IMAGE_CACHE_MAX_SIZE = os.environ.get(
+    "CHAT_IMAGE_CACHE_MAX_SIZE", str(256 * 1024 * 1024)
+)
+
+try:
+    CHAT_IMAGE_CACHE_MAX_SIZE = int(CHAT_IMAGE_CACHE_MAX_SIZE)
+except Exception:
+    CHAT_IMAGE_CACHE_MAX_SIZE = 256 * 1024 * 1024
+
+CHAT_IMAGE_FETCH_CONCURRENCY = os.environ.get("CHAT_IMAGE_FETCH_CONCURRENCY", "8")
+
+try:
+    CHAT_IMAGE_FETCH_CONCURRENCY = max(int(CHAT_IMAGE_FETCH_CONCURRENCY), 1)
+except Exception:
+    CHAT_IMAGE_FETCH_CONCURRENCY = 8
+
+# Downscale inlined images whose longest side exceeds this many pixels (disabled if empty)
+CHAT_IMAGE_MAX_DIMENSION = os.environ.get("CHAT_IMAGE_MAX_DIMENSION", "")
+
+if CHAT_IMAGE_MAX_DIMENSION == "":
+    CHAT_IMAGE_MAX_DIMENSION = None
+else:
+    try:
+        CHAT_IMAGE_MAX_DIMENSION = int(CHAT_IMAGE_MAX_DIMENSION)
+    except Exception:
+        CHAT_IMAGE_MAX_DIMENSION = None
+
+CHAT_IMAGE_REENCODE_QUALITY = os.environ.get("CHAT_IMAGE_REENCODE_QUALITY", "85")
+
+try:
+    CHAT_IMAGE_REENCODE_QUALITY = int(CHAT_IMAGE_REENCODE_QUALITY)
+except Exception:
+    CHAT_IMAGE_REENCODE_QUALITY = 85
+
+
+####################################
+# CHAT IMPORT
+####################################
+
+# Limits of NDJSON chat imports, in (decompressed) bytes; larger bodies or
+# lines are rejected with 413
+CHAT_IMPORT_MAX_SIZE = os.environ.get("CHAT_IMPORT_MAX_SIZE", str(1024 * 1024 * 1024))
+
+try:
+    CHAT_IMPORT_MAX_SIZE = max(int(CHAT_IMPORT_MAX_SIZE), 0)
+except Exception:
+    CHAT_IMPORT_MAX_SIZE = 1024 * 1024 * 1024
+
+CHAT_IMPORT_MAX_LINE_SIZE = os.environ.get(
+    "CHAT_IMPORT_MAX_LINE_SIZE", str(64 * 1024 * 1024)
+)
+
+try:
+    CHAT_IMPORT_MAX_LINE_SIZE = max(int(CHAT_IMPORT_MAX_LINE_SIZE), 0)
+except Exception:
+    CHAT_IMPORT_MAX_LINE_SIZE = 64 * 1024 * 1024
+
+
+####################################
+# CONTENT EXTRACTION
+####################################
+
+# Extracted documents are cached on disk keyed by (file hash, engine, engine
+# config), so re-processing an identical file skips parsing entirely
+ENABLE_CONTENT_EXTRACTION_CACHE = (
+    os.environ.get("ENABLE_CONTENT_EXTRACTION_CACHE", "True").lower() == "true"
+)
+
+CONTENT_EXTRACTION_CACHE_DIR = os.environ.get(
+    "CONTENT_EXTRACTION_CACHE_DIR", str(DATA_DIR / "cache" / "extraction")
+)
+
+# Bytes of cached extractions kept on disk, least recently used go first
+CONTENT_EXTRACTION_CACHE_MAX_SIZE = os.environ.get(
+    "CONTENT_EXTRACTION_CACHE_MAX_SIZE", str(1024 * 1024 * 1024)
+)
+
+try:
+    CONTENT_EXTRACTION_CACHE_MAX_SIZE = max(int(CONTENT_EXTRACTION_CACHE_MAX_SIZE), 0)
+except Exception:
+    CONTENT_EXTRACTION_CACHE_MAX_SIZE = 1024 * 1024 * 1024
+
+# Worker processes for CPU-bound local loaders (PDF, Office, Unstructured).
+# 0 keeps parsing in the calling thread.
+CONTENT_EXTRACTION_PROCESS_POOL_SIZE = os.environ.get(
+    "CONTENT_EXTRACTION_PROCESS_POOL_SIZE", "0"
+)
+
+try:
+    CONTENT_EXTRACTION_PROCESS_POOL_SIZE = max(
+        int(CONTENT_EXTRACTION_PROCESS_POOL_SIZE), 0
+    )
+except Exception:
+    CONTENT_EXTRACTION_PROCESS_POOL_SIZE = 0
+
+# PDFs are split into page ranges of at least this many pages, one per worker
+CONTENT_EXTRACTION_PDF_PAGES_PER_TASK = os.environ.get(
+    "CONTENT_EXTRACTION_PDF_PAGES_PER_TASK", "8"
+)
+
+try:
+    CONTENT_EXTRACTION_PDF_PAGES_PER_TASK = max(
+        int(CONTENT_EXTRACTION_PDF_PAGES_PER_TASK), 1
+    )
+except Exception:
+    CONTENT_EXTRACTION_PDF_PAGES_PER_TASK = 8
+
+
+####################################
+# INGESTION QUEUE
+####################################
+
+# When enabled, uploads and knowledge batches are queued in the database and
+# processed by `open-webui worker` processes instead of the serving worker
+ENABLE_INGESTION_QUEUE = (
+    os.environ.get("ENABLE_INGESTION_QUEUE", "False").lower() == "true"
+)
+
+INGESTION_QUEUE_MAX_ATTEMPTS = os.environ.get("INGESTION_QUEUE_MAX_ATTEMPTS", "3")
+
+try:
+    INGESTION_QUEUE_MAX_ATTEMPTS = max(int(INGESTION_QUEUE_MAX_ATTEMPTS), 1)
+except Exception:
+    INGESTION_QUEUE_MAX_ATTEMPTS = 3
+
+# Seconds before the first retry, doubled on every further attempt
+INGESTION_QUEUE_RETRY_BACKOFF = os.environ.get("INGESTION_QUEUE_RETRY_BACKOFF", "30")
+
+try:
+    INGESTION_QUEUE_RETRY_BACKOFF = max(int(INGESTION_QUEUE_RETRY_BACKOFF), 0)
+except Exception:
+    INGESTION_QUEUE_RETRY_BACKOFF = 30
+
+# Running jobs without a worker heartbeat for this many seconds are requeued
+INGESTION_QUEUE_LOCK_TIMEOUT = os.environ.get("INGESTION_QUEUE_LOCK_TIMEOUT", "300")
+
+try:
+    INGESTION_QUEUE_LOCK_TIMEOUT = max(int(INGESTION_QUEUE_LOCK_TIMEOUT), 30)
+except Exception:
+    INGESTION_QUEUE_LOCK_TIMEOUT = 300
+
+# Seconds a job is pushed back per doubling of its size above 1 MiB, so small
+# files go first while large ones still run once they have waited long enough
+INGESTION_QUEUE_SIZE_PENALTY = os.environ.get("INGESTION_QUEUE_SIZE_PENALTY", "60")
+
+try:
+    INGESTION_QUEUE_SIZE_PENALTY = max(int(INGESTION_QUEUE_SIZE_PENALTY), 0)
+except Exception:
+    INGESTION_QUEUE_SIZE_PENALTY = 60
+
+INGESTION_WORKER_CONCURRENCY = os.environ.get("INGESTION_WORKER_CONCURRENCY", "2")
+
+try:
+    INGESTION_WORKER_CONCURRENCY = max(int(INGESTION_WORKER_CONCURRENCY), 1)
+except Exception:
+    INGESTION_WORKER_CONCURRENCY = 2
+
+# Files embedded in parallel while reindexing knowledge bases
+KNOWLEDGE_REINDEX_CONCURRENCY = os.environ.get("KNOWLEDGE_REINDEX_CONCURRENCY", "4")
+
+try:
+    KNOWLEDGE_REINDEX_CONCURRENCY = max(int(KNOWLEDGE_REINDEX_CONCURRENCY), 1)
+except Exception:
+    KNOWLEDGE_REINDEX_CONCURRENCY = 4
+
+####################################
+# MEMORIES
+####################################
+
+# Users whose memory index is kept in memory, least recently used first out
+MEMORY_INDEX_CACHE_SIZE = os.environ.get("MEMORY_INDEX_CACHE_SIZE", "1000")
+
+try:
+    MEMORY_INDEX_CACHE_SIZE = max(int(MEMORY_INDEX_CACHE_SIZE), 1)
+except Exception:
+    MEMORY_INDEX_CACHE_SIZE = 1000
+
+# Also write memories to the vector DB, e.g. for external tools reading the
+# `user-memory-{id}` collections. Memory queries never use it.
+ENABLE_MEMORY_VECTOR_DB = (
+    os.environ.get("ENABLE_MEMORY_VECTOR_DB", "False").lower() == "true"
+)
+
+####################################
+# WEB SEARCH
+####################################
+
+# Seconds between deletions of web search collections older than
+# WEB_SEARCH_COLLECTION_TTL
+WEB_SEARCH_COLLECTION_CLEANUP_INTERVAL = os.environ.get(
+    "WEB_SEARCH_COLLECTION_CLEANUP_INTERVAL", "300"
+)
+
+try:
+    WEB_SEARCH_COLLECTION_CLEANUP_INTERVAL = max(
+        int(WEB_SEARCH_COLLECTION_CLEANUP_INTERVAL), 1
+    )
+except Exception:
+    WEB_SEARCH_COLLECTION_CLEANUP_INTERVAL = 300
+
+# Bytes read from each fetched web page, the rest is dropped. 0 for no limit
+WEB_LOADER_MAX_PAGE_SIZE = os.environ.get(
+    "WEB_LOADER_MAX_PAGE_SIZE", str(10 * 1024 * 1024)
+)
+
+try:
+    WEB_LOADER_MAX_PAGE_SIZE = max(int(WEB_LOADER_MAX_PAGE_SIZE), 0)
+except Exception:
+    WEB_LOADER_MAX_PAGE_SIZE = 10 * 1024 * 1024
+
+# Seconds search engine results are reused for the same query, 0 to disable
+WEB_SEARCH_CACHE_TTL = os.environ.get("WEB_SEARCH_CACHE_TTL", "3600")
+
+try:
+    WEB_SEARCH_CACHE_TTL = max(int(WEB_SEARCH_CACHE_TTL), 0)
+except Exception:
+    WEB_SEARCH_CACHE_TTL = 3600
+
+# Seconds fetched pages are reused when the response has no caching headers,
+# 0 to disable the page cache
+WEB_PAGE_CACHE_TTL = os.environ.get("WEB_PAGE_CACHE_TTL", "3600")
+
+try:
+    WEB_PAGE_CACHE_TTL = max(int(WEB_PAGE_CACHE_TTL), 0)
+except Exception:
+    WEB_PAGE_CACHE_TTL = 3600
+
+# "local" (per process) or "redis", defaults to Redis when it is configured
+WEB_SEARCH_CACHE_BACKEND = os.environ.get("WEB_SEARCH_CACHE_BACKEND", "").lower()
+
+# Bytes of search results and pages kept by the local backend
+WEB_SEARCH_CACHE_MAX_SIZE = os.environ.get(
+    "WEB_SEARCH_CACHE_MAX_SIZE", str(64 * 1024 * 1024)
+)
+
+try:
+    WEB_SEARCH_CACHE_MAX_SIZE = max(int(WEB_SEARCH_CACHE_MAX_SIZE), 0)
+except Exception:
+    WEB_SEARCH_CACHE_MAX_SIZE = 64 * 1024 * 1024
+
 ####################################
 # WEBSOCKET SUPPORT
 ####################################
@@ -713,6 +983,25 @@ AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL = (
     os.environ.get("AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL", "True").lower() == "true"
 )
 
+# Seconds between background refreshes of the OpenAPI tool server specs, 0 to
+# only refresh them when the connections change or an admin asks
+TOOL_SERVER_REFRESH_INTERVAL = os.environ.get("TOOL_SERVER_REFRESH_INTERVAL", "300")
+
+try:
+    TOOL_SERVER_REFRESH_INTERVAL = max(int(TOOL_SERVER_REFRESH_INTERVAL), 0)
+except Exception:
+    TOOL_SERVER_REFRESH_INTERVAL = 300
+
+# Connections kept open per tool server for tool calls
+TOOL_SERVER_CONNECTION_POOL_SIZE = os.environ.get(
+    "TOOL_SERVER_CONNECTION_POOL_SIZE", "32"
+)
+
+try:
+    TOOL_SERVER_CONNECTION_POOL_SIZE = max(int(TOOL_SERVER_CONNECTION_POOL_SIZE), 0)
+except Exception:
+    TOOL_SERVER_CONNECTION_POOL_SIZE = 32
+
 
 # Webhook SSL verification (for n8n and external workflow integrations)
 # Set to False if your webhook server uses a self-signed certificate
@@ -765,6 +1054,21 @@ else:
     except Exception:
         SENTENCE_TRANSFORMERS_CROSS_ENCODER_MODEL_KWARGS = None
 
+####################################
+# STARTUP
+####################################
+
+# Load local models, the vector DB client and document loaders in the
+# background once the app has started, instead of on first use
+ENABLE_BACKGROUND_WARMUP = (
+    os.environ.get("ENABLE_BACKGROUND_WARMUP", "True").lower() == "true"
+)
+
+# Log the import time and memory of each package once the app has started
+ENABLE_STARTUP_PROFILING = (
+    os.environ.get("ENABLE_STARTUP_PROFILING", "False").lower() == "true"
+)
+
 ####################################
 # OFFLINE_MODE
 ####################################
@@ -885,6 +1189,23 @@ OTEL_LOGS_OTLP_SPAN_EXPORTER = os.environ.get(
 PIP_OPTIONS = os.getenv("PIP_OPTIONS", "").split()
 PIP_PACKAGE_INDEX_OPTIONS = os.getenv("PIP_PACKAGE_INDEX_OPTIONS", "").split()
 
+# Wheels of function and tool requirements are built once into this directory
+# and installed from it, put it on a shared volume to share it across pods
+PIP_WHEEL_CACHE_DIR = os.environ.get(
+    "PIP_WHEEL_CACHE_DIR", str(DATA_DIR / "cache" / "wheels")
+)
+
+# Seconds a loaded function or tool module is used without checking it
+# against the DB. Changes made through the app are applied immediately in all
+# workers sharing Redis; this bounds how long other workers or edits made
+# directly in the DB can go unnoticed.
+PLUGIN_MODULE_CACHE_TTL = os.environ.get("PLUGIN_MODULE_CACHE_TTL", "10")
+
+try:
+    PLUGIN_MODULE_CACHE_TTL = max(float(PLUGIN_MODULE_CACHE_TTL), 0)
+except Exception:
+    PLUGIN_MODULE_CACHE_TTL = 10.0
+
 
 ####################################
 # PROGRESSIVE WEB APP OPTIONS
@@ -31,6 +31,7 @@ from open_webui.models.functions import Functions
 from open_webui.models.models import Models
 
 from open_webui.utils.plugin import (
+    RequirementsNotReadyError,
     load_function_module_by_id,
     get_function_module_from_cache,
 )
@@ -148,6 +149,9 @@ async def get_function_models(request):
                         "has_user_valves": has_user_valves,
                     }
                 )
+        except RequirementsNotReadyError as e:
+            log.warning(f"Skipping pipe {pipe.id}: {e}")
+            continue
         except Exception as e:
             log.exception(e)
             continue
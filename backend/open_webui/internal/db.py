@@ -16,7 +16,7 @@ from open_webui.env import (
     DATABASE_ENABLE_SQLITE_WAL,
 )
 from peewee_migrate import Router
-from sqlalchemy import Dialect, create_engine, MetaData, event, types
+from sqlalchemy import Dialect, create_engine, MetaData, event, select, types
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.pool import QueuePool, NullPool
@@ -158,3 +158,33 @@ def get_session():
 
 
 get_db = contextmanager(get_session)
+
+
+def iter_by_keyset(model, *criteria, batch_size: int = 500):
+    """
+    Iterate over the rows of `model` matching `criteria` in primary key order,
+    loading one page of `batch_size` rows at a time.
+
+    Each page is read in its own short-lived session with a query continuing
+    after the last key seen, and its rows are yielded once that session is
+    closed, so memory use does not grow with the table and a slow consumer
+    never keeps a connection or transaction open.
+    """
+    key = model.__mapper__.primary_key[0]
+
+    last_key = None
+    while True:
+        with get_db() as db:
+            query = select(model).where(*criteria)
+            if last_key is not None:
+                query = query.where(key > last_key)
+
+            rows = db.execute(query.order_by(key).limit(batch_size)).scalars().all()
+            db.expunge_all()
+
+        for row in rows:
+            yield row
+
+        if len(rows) < batch_size:
+            return
+        last_key = getattr(rows[-1], key.key)
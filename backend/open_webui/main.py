@@ -13,6 +13,7 @@ from uuid import uuid4
 
 
 from contextlib import asynccontextmanager
+from functools import partial
 from urllib.parse import urlencode, parse_qs, urlparse
 from pydantic import BaseModel
 from sqlalchemy import text
@@ -59,7 +60,9 @@ from starsessions.stores.redis import RedisStore
 
 from open_webui.utils import logger
 from open_webui.utils.audit import AuditLevel, AuditLoggingMiddleware
+from open_webui.utils.lazy import LazyObject, warm_up
 from open_webui.utils.logger import start_logger
+from open_webui.utils.profiling import stop_import_profiling
 from open_webui.socket.main import (
     MODELS,
     app as socket_app,
@@ -210,6 +213,7 @@ from open_webui.config import (
     WEB_LOADER_ENGINE,
     WEB_LOADER_CONCURRENT_REQUESTS,
     WEB_LOADER_TIMEOUT,
+    WEB_LOADER_DEADLINE,
     WHISPER_MODEL,
     WHISPER_VAD_FILTER,
     WHISPER_LANGUAGE,
@@ -290,6 +294,8 @@ from open_webui.config import (
     WEB_SEARCH_ENGINE,
     BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL,
     BYPASS_WEB_SEARCH_WEB_LOADER,
+    WEB_SEARCH_RETRIEVAL_MODE,
+    WEB_SEARCH_COLLECTION_TTL,
     WEB_SEARCH_RESULT_COUNT,
     WEB_SEARCH_CONCURRENT_REQUESTS,
     WEB_SEARCH_TRUST_ENV,
@@ -444,7 +450,7 @@ from open_webui.env import (
     LICENSE_KEY,
     AUDIT_EXCLUDED_PATHS,
     AUDIT_LOG_LEVEL,
-    CHANGELOG,
+    get_changelog,
     REDIS_URL,
     REDIS_CLUSTER,
     REDIS_KEY_PREFIX,
@@ -477,6 +483,8 @@ from open_webui.env import (
     AIOHTTP_CLIENT_SESSION_SSL,
     ENABLE_STAR_SESSIONS_MIDDLEWARE,
     ENABLE_PUBLIC_ACTIVE_USERS_COUNT,
+    ENABLE_BACKGROUND_WARMUP,
+    ENABLE_STARTUP_PROFILING,
 )
 
 
@@ -502,7 +510,11 @@ from open_webui.utils.auth import (
     get_admin_user,
     get_verified_user,
 )
-from open_webui.utils.plugin import install_tool_and_function_dependencies
+from open_webui.utils.plugin import (
+    install_tool_and_function_dependencies,
+    plugin_invalidation_listener,
+)
+from open_webui.retrieval.memory_index import memory_invalidation_listener
 from open_webui.utils.oauth import (
     get_oauth_client_info_with_dynamic_client_registration,
     encrypt_data,
@@ -510,8 +522,12 @@ from open_webui.utils.oauth import (
     OAuthManager,
     OAuthClientManager,
     OAuthClientInformationFull,
+    oauth_token_refresh_loop,
 )
 from open_webui.utils.security_headers import SecurityHeadersMiddleware
+from open_webui.utils.tools import TOOL_SERVER_SESSIONS, tool_server_refresh_loop
+from open_webui.utils.images.comfyui import COMFYUI_SCHEDULER
+from open_webui.retrieval.web.collections import web_search_collection_cleanup_loop
 from open_webui.utils.redis import get_redis_connection
 
 from open_webui.tasks import (
@@ -579,8 +595,8 @@ async def lifespan(app: FastAPI):
     if LICENSE_KEY:
         get_license_data(app, LICENSE_KEY)
 
-    # This should be blocking (sync) so functions are not deactivated on first /get_models calls
-    # when the first user lands on the / route.
+    # Installed in the background; until then, modules missing requirements
+    # fail to load without being deactivated
     log.info("Installing external dependencies of functions and tools...")
     install_tool_and_function_dependencies()
 
@@ -597,6 +613,22 @@ async def lifespan(app: FastAPI):
         app.state.redis_task_command_listener = asyncio.create_task(
             redis_task_command_listener(app)
         )
+        app.state.plugin_invalidation_listener = asyncio.create_task(
+            plugin_invalidation_listener(app)
+        )
+        app.state.memory_invalidation_listener = asyncio.create_task(
+            memory_invalidation_listener(app)
+        )
+
+    app.state.tool_server_refresh_task = asyncio.create_task(
+        tool_server_refresh_loop(app)
+    )
+    app.state.oauth_token_refresh_task = asyncio.create_task(
+        oauth_token_refresh_loop(app)
+    )
+    app.state.web_search_collection_cleanup_task = asyncio.create_task(
+        web_search_collection_cleanup_loop(app)
+    )
 
     if THREAD_POOL_SIZE and THREAD_POOL_SIZE > 0:
         limiter = anyio.to_thread.current_default_thread_limiter()
@@ -604,6 +636,14 @@ async def lifespan(app: FastAPI):
 
     asyncio.create_task(periodic_usage_pool_cleanup())
 
+    if ENABLE_STARTUP_PROFILING:
+        report = stop_import_profiling()
+        if report:
+            log.info(f"Startup profile:\n{report}")
+
+    if ENABLE_BACKGROUND_WARMUP:
+        warm_up()
+
     if app.state.config.ENABLE_BASE_MODELS_CACHE:
         await get_all_models(
             Request(
@@ -630,6 +670,29 @@ async def lifespan(app: FastAPI):
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
+    if hasattr(app.state, "plugin_invalidation_listener"):
+        app.state.plugin_invalidation_listener.cancel()
+
+    if hasattr(app.state, "memory_invalidation_listener"):
+        app.state.memory_invalidation_listener.cancel()
+
+    if hasattr(app.state, "tool_server_refresh_task"):
+        app.state.tool_server_refresh_task.cancel()
+
+    if hasattr(app.state, "oauth_token_refresh_task"):
+        app.state.oauth_token_refresh_task.cancel()
+
+    if hasattr(app.state, "web_search_collection_cleanup_task"):
+        app.state.web_search_collection_cleanup_task.cancel()
+
+    await TOOL_SERVER_SESSIONS.close()
+    await COMFYUI_SCHEDULER.close()
+
+    if "open_webui.retrieval.loaders.main" in sys.modules:
+        from open_webui.retrieval.loaders.main import reset_process_pool
+
+        reset_process_pool()
+
 
 app = FastAPI(
     title="Open WebUI",
@@ -822,10 +885,10 @@ app.state.EXTERNAL_PWA_MANIFEST_URL = EXTERNAL_PWA_MANIFEST_URL
 app.state.USER_COUNT = None
 
 app.state.TOOLS = {}
-app.state.TOOL_CONTENTS = {}
+app.state.TOOL_VERSIONS = {}
 
 app.state.FUNCTIONS = {}
-app.state.FUNCTION_CONTENTS = {}
+app.state.FUNCTION_VERSIONS = {}
 
 ########################################
 #
@@ -930,12 +993,15 @@ app.state.config.WEB_SEARCH_CONCURRENT_REQUESTS = WEB_SEARCH_CONCURRENT_REQUESTS
 app.state.config.WEB_LOADER_ENGINE = WEB_LOADER_ENGINE
 app.state.config.WEB_LOADER_CONCURRENT_REQUESTS = WEB_LOADER_CONCURRENT_REQUESTS
 app.state.config.WEB_LOADER_TIMEOUT = WEB_LOADER_TIMEOUT
+app.state.config.WEB_LOADER_DEADLINE = WEB_LOADER_DEADLINE
 
 app.state.config.WEB_SEARCH_TRUST_ENV = WEB_SEARCH_TRUST_ENV
 app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL = (
     BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL
 )
 app.state.config.BYPASS_WEB_SEARCH_WEB_LOADER = BYPASS_WEB_SEARCH_WEB_LOADER
+app.state.config.WEB_SEARCH_RETRIEVAL_MODE = WEB_SEARCH_RETRIEVAL_MODE
+app.state.config.WEB_SEARCH_COLLECTION_TTL = WEB_SEARCH_COLLECTION_TTL
 
 app.state.config.ENABLE_GOOGLE_DRIVE_INTEGRATION = ENABLE_GOOGLE_DRIVE_INTEGRATION
 app.state.config.ENABLE_ONEDRIVE_INTEGRATION = ENABLE_ONEDRIVE_INTEGRATION
@@ -991,26 +1057,33 @@ app.state.rf = None
 app.state.YOUTUBE_LOADER_TRANSLATION = None
 
 
-try:
-    app.state.ef = get_ef(
-        app.state.config.RAG_EMBEDDING_ENGINE, app.state.config.RAG_EMBEDDING_MODEL
+# Local models are loaded on first use, or in the background at startup
+if app.state.config.RAG_EMBEDDING_ENGINE == "" and app.state.config.RAG_EMBEDDING_MODEL:
+    app.state.ef = LazyObject(
+        "embedding model",
+        partial(
+            get_ef,
+            app.state.config.RAG_EMBEDDING_ENGINE,
+            app.state.config.RAG_EMBEDDING_MODEL,
+        ),
     )
-    if (
-        app.state.config.ENABLE_RAG_HYBRID_SEARCH
-        and not app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
-    ):
-        app.state.rf = get_rf(
+
+if (
+    app.state.config.ENABLE_RAG_HYBRID_SEARCH
+    and not app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
+    and app.state.config.RAG_RERANKING_MODEL
+):
+    app.state.rf = LazyObject(
+        "reranking model",
+        partial(
+            get_rf,
             app.state.config.RAG_RERANKING_ENGINE,
             app.state.config.RAG_RERANKING_MODEL,
             app.state.config.RAG_EXTERNAL_RERANKER_URL,
             app.state.config.RAG_EXTERNAL_RERANKER_API_KEY,
             app.state.config.RAG_EXTERNAL_RERANKER_TIMEOUT,
-        )
-    else:
-        app.state.rf = None
-except Exception as e:
-    log.error(f"Error updating models: {e}")
-    pass
+        ),
+    )
 
 
 app.state.EMBEDDING_FUNCTION = get_embedding_function(
@@ -1724,6 +1797,7 @@ async def chat_completion(
                             {
                                 "parentId": metadata.get("parent_message_id", None),
                                 "error": {"content": str(e)},
+                                "done": True,
                             },
                         )
 
@@ -2066,7 +2140,8 @@ async def get_app_latest_release_version(user=Depends(get_verified_user)):
 
 @app.get("/api/changelog")
 async def get_app_changelog():
-    return {key: CHANGELOG[key] for idx, key in enumerate(CHANGELOG) if idx < 5}
+    changelog = get_changelog()
+    return {key: changelog[key] for idx, key in enumerate(changelog) if idx < 5}
 
 
 @app.get("/api/usage")
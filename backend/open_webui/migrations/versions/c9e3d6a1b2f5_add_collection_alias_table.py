@@ -0,0 +1,32 @@
+"""Add collection_alias table
+
+Revision ID: c9e3d6a1b2f5
+Revises: b7d2c5e8f1a4
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c9e3d6a1b2f5"
+down_revision: Union[str, None] = "b7d2c5e8f1a4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "collection_alias",
+        sa.Column("name", sa.String(), primary_key=True),
+        sa.Column("target", sa.String(), nullable=False),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("collection_alias")
@@ -0,0 +1,67 @@
+"""Add chat_stat and chat_usage_daily tables
+
+Revision ID: d4a7f2c8e6b1
+Revises: c9e3d6a1b2f5
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4a7f2c8e6b1"
+down_revision: Union[str, None] = "c9e3d6a1b2f5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = (
+    "user_message_count",
+    "assistant_message_count",
+    "user_content_length",
+    "assistant_content_length",
+    "response_time_sum",
+    "response_time_count",
+)
+
+
+def upgrade() -> None:
+    # Existing chats are counted on their next write or stats read
+    op.create_table(
+        "chat_stat",
+        sa.Column("chat_id", sa.String(), primary_key=True),
+        sa.Column("user_id", sa.String(), nullable=True),
+        sa.Column("message_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("models", sa.JSON(), nullable=True),
+        sa.Column("last_message_at", sa.BigInteger(), nullable=True),
+        sa.Column(
+            "history_message_count", sa.BigInteger(), nullable=False, server_default="0"
+        ),
+        sa.Column("history_models", sa.JSON(), nullable=True),
+        *[
+            sa.Column(name, sa.BigInteger(), nullable=False, server_default="0")
+            for name in COUNTERS
+        ],
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+    )
+    op.create_index("ix_chat_stat_user_id", "chat_stat", ["user_id"])
+
+    op.create_table(
+        "chat_usage_daily",
+        sa.Column("date", sa.String(), primary_key=True),
+        sa.Column("user_id", sa.String(), primary_key=True),
+        sa.Column("model", sa.String(), primary_key=True),
+        *[
+            sa.Column(name, sa.BigInteger(), nullable=False, server_default="0")
+            for name in COUNTERS
+        ],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("chat_usage_daily")
+    op.drop_index("ix_chat_stat_user_id", table_name="chat_stat")
+    op.drop_table("chat_stat")
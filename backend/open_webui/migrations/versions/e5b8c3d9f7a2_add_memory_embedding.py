@@ -0,0 +1,31 @@
+"""Add embedding columns to memory table
+
+Revision ID: e5b8c3d9f7a2
+Revises: d4a7f2c8e6b1
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5b8c3d9f7a2"
+down_revision: Union[str, None] = "d4a7f2c8e6b1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # float32 vector of the content, embedded lazily by the memory index
+    op.add_column("memory", sa.Column("embedding", sa.LargeBinary(), nullable=True))
+    op.add_column("memory", sa.Column("embedding_model", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("memory") as batch_op:
+        batch_op.drop_column("embedding_model")
+        batch_op.drop_column("embedding")
@@ -0,0 +1,44 @@
+"""Add SCIM external ids and indexes for SCIM lookups
+
+Revision ID: f3c7d1a8b2e5
+Revises: e5b8c3d9f7a2
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f3c7d1a8b2e5"
+down_revision: Union[str, None] = "e5b8c3d9f7a2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("user", sa.Column("scim_external_id", sa.Text(), nullable=True))
+    op.add_column("group", sa.Column("scim_external_id", sa.Text(), nullable=True))
+    op.create_index("ix_user_scim_external_id", "user", ["scim_external_id"])
+    op.create_index("ix_group_scim_external_id", "group", ["scim_external_id"])
+
+    # userName filters compare emails case-insensitively
+    op.create_index("ix_user_email_lower", "user", [sa.text("lower(email)")])
+
+    # Groups of a user, the unique (group_id, user_id) only covers group_id
+    op.create_index("ix_group_member_user_id", "group_member", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_group_member_user_id", table_name="group_member")
+    op.drop_index("ix_user_email_lower", table_name="user")
+    op.drop_index("ix_group_scim_external_id", table_name="group")
+    op.drop_index("ix_user_scim_external_id", table_name="user")
+
+    with op.batch_alter_table("group") as batch_op:
+        batch_op.drop_column("scim_external_id")
+    with op.batch_alter_table("user") as batch_op:
+        batch_op.drop_column("scim_external_id")
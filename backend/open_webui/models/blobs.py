@@ -0,0 +1,141 @@
+import logging
+import time
+from typing import Optional
+
+from open_webui.internal.db import Base, get_db
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import BigInteger, Column, String, Text
+from sqlalchemy.exc import IntegrityError
+
+log = logging.getLogger(__name__)
+
+####################
+# File Blob DB Schema
+####################
+
+
+class FileBlob(Base):
+    """
+    Stored file content shared by every `file` row with the same SHA-256.
+    `ref_count` is the number of `file` rows pointing at `path`.
+    """
+
+    __tablename__ = "file_blob"
+
+    hash = Column(String, primary_key=True)
+    path = Column(Text, nullable=False)
+    size = Column(BigInteger, nullable=True)
+    ref_count = Column(BigInteger, nullable=False, default=0)
+
+    created_at = Column(BigInteger)
+    updated_at = Column(BigInteger)
+
+
+class FileBlobModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    hash: str
+    path: str
+    size: Optional[int] = None
+    ref_count: int
+
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+
+
+class FileBlobsTable:
+    def get_blob_by_hash(self, hash: str) -> Optional[FileBlobModel]:
+        with get_db() as db:
+            blob = db.get(FileBlob, hash)
+            return FileBlobModel.model_validate(blob) if blob else None
+
+    def acquire_blob(
+        self, hash: str, path: str, size: Optional[int] = None
+    ) -> tuple[FileBlobModel, bool]:
+        """
+        Add a reference to the blob with `hash`, registering `path` as its
+        content if there is none yet. Returns the blob and whether `path` was
+        registered; if not, the caller's copy is redundant.
+        """
+        for _ in range(3):
+            with get_db() as db:
+                # Atomic increment, safe against concurrent acquire/release
+                updated = (
+                    db.query(FileBlob)
+                    .filter_by(hash=hash)
+                    .update(
+                        {
+                            FileBlob.ref_count: FileBlob.ref_count + 1,
+                            FileBlob.updated_at: int(time.time()),
+                        },
+                        synchronize_session=False,
+                    )
+                )
+                db.commit()
+
+                if updated:
+                    return FileBlobModel.model_validate(db.get(FileBlob, hash)), False
+
+                try:
+                    blob = FileBlob(
+                        hash=hash,
+                        path=path,
+                        size=size,
+                        ref_count=1,
+                        created_at=int(time.time()),
+                        updated_at=int(time.time()),
+                    )
+                    db.add(blob)
+                    db.commit()
+                    db.refresh(blob)
+                    return FileBlobModel.model_validate(blob), True
+                except IntegrityError:
+                    # Registered concurrently, take a reference to that one
+                    db.rollback()
+
+        raise RuntimeError(f"Unable to acquire file blob {hash}")
+
+    def release_blob(self, hash: str) -> Optional[FileBlobModel]:
+        """
+        Drop a reference to the blob with `hash`. Returns the blob once it is
+        no longer referenced (its row is removed and its content may be
+        deleted), otherwise None.
+        """
+        with get_db() as db:
+            db.query(FileBlob).filter_by(hash=hash).update(
+                {
+                    FileBlob.ref_count: FileBlob.ref_count - 1,
+                    FileBlob.updated_at: int(time.time()),
+                },
+                synchronize_session=False,
+            )
+            db.commit()
+
+            blob = db.get(FileBlob, hash)
+            if blob is None or blob.ref_count > 0:
+                return None
+
+            blob = FileBlobModel.model_validate(blob)
+
+            # Only the release that removes the row collects the content; a
+            # concurrent acquire in between keeps the row alive
+            deleted = (
+                db.query(FileBlob)
+                .filter(FileBlob.hash == hash, FileBlob.ref_count <= 0)
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+
+            return blob if deleted else None
+
+    def delete_all_blobs(self) -> bool:
+        with get_db() as db:
+            try:
+                db.query(FileBlob).delete()
+                db.commit()
+                return True
+            except Exception:
+                return False
+
+
+FileBlobs = FileBlobsTable()
@@ -0,0 +1,413 @@
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Optional
+
+from open_webui.internal.db import Base, get_db
+from open_webui.utils.misc import get_message_list
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import BigInteger, Column, String, JSON, func
+from sqlalchemy.exc import IntegrityError
+
+log = logging.getLogger(__name__)
+
+# Counters kept per chat and per day, user and model
+COUNTERS = (
+    "user_message_count",
+    "assistant_message_count",
+    "user_content_length",
+    "assistant_content_length",
+    "response_time_sum",
+    "response_time_count",
+)
+
+####################
+# Chat Stats DB Schema
+####################
+
+
+class ChatStat(Base):
+    """
+    Usage statistics of a chat, updated with every write of its messages.
+
+    The history counters sum over all messages of the chat, while
+    `message_count`, `models` and `last_message_at` describe the branch
+    ending at the current message.
+    """
+
+    __tablename__ = "chat_stat"
+
+    chat_id = Column(String, primary_key=True)
+    user_id = Column(String, index=True)
+
+    message_count = Column(BigInteger, nullable=False, default=0)
+    models = Column(JSON, nullable=True)
+    last_message_at = Column(BigInteger, nullable=True)
+
+    history_message_count = Column(BigInteger, nullable=False, default=0)
+    history_models = Column(JSON, nullable=True)
+    user_message_count = Column(BigInteger, nullable=False, default=0)
+    assistant_message_count = Column(BigInteger, nullable=False, default=0)
+    user_content_length = Column(BigInteger, nullable=False, default=0)
+    assistant_content_length = Column(BigInteger, nullable=False, default=0)
+    response_time_sum = Column(BigInteger, nullable=False, default=0)
+    response_time_count = Column(BigInteger, nullable=False, default=0)
+
+    updated_at = Column(BigInteger)
+
+
+class ChatUsageDaily(Base):
+    """
+    Message usage per day (UTC, by message timestamp), user and model. User
+    messages are counted under the empty model.
+    """
+
+    __tablename__ = "chat_usage_daily"
+
+    date = Column(String, primary_key=True)  # YYYY-MM-DD
+    user_id = Column(String, primary_key=True)
+    model = Column(String, primary_key=True)
+
+    user_message_count = Column(BigInteger, nullable=False, default=0)
+    assistant_message_count = Column(BigInteger, nullable=False, default=0)
+    user_content_length = Column(BigInteger, nullable=False, default=0)
+    assistant_content_length = Column(BigInteger, nullable=False, default=0)
+    response_time_sum = Column(BigInteger, nullable=False, default=0)
+    response_time_count = Column(BigInteger, nullable=False, default=0)
+
+
+class ChatStatModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    chat_id: str
+    user_id: str
+
+    message_count: int = 0
+    models: Optional[dict] = None
+    last_message_at: Optional[int] = None
+
+    history_message_count: int = 0
+    history_models: Optional[dict] = None
+    user_message_count: int = 0
+    assistant_message_count: int = 0
+    user_content_length: int = 0
+    assistant_content_length: int = 0
+    response_time_sum: int = 0
+    response_time_count: int = 0
+
+    updated_at: Optional[int] = None
+
+
+class ChatUsageDailyResponse(BaseModel):
+    date: Optional[str] = None
+    user_id: Optional[str] = None
+    model: Optional[str] = None
+
+    user_message_count: int = 0
+    assistant_message_count: int = 0
+    user_content_length: int = 0
+    assistant_content_length: int = 0
+    response_time_sum: int = 0
+    response_time_count: int = 0
+
+
+####################
+# Message contributions
+####################
+
+
+def get_date(timestamp) -> str:
+    try:
+        timestamp = float(timestamp or 0)
+        if timestamp > 1e11:
+            # Milliseconds
+            timestamp /= 1000
+        return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%d")
+    except Exception:
+        return "1970-01-01"
+
+
+def get_message_counters(
+    message: Optional[dict], messages_map: dict
+) -> tuple[Optional[tuple[str, str]], dict[str, int]]:
+    """
+    The (date, model) a message is counted under and what it adds to the
+    counters, mirroring how usage stats were computed from chat histories.
+    Assistant messages are only counted once done, so streaming them changes
+    nothing until they finish.
+    """
+    if not message:
+        return None, {}
+
+    content = message.get("content", "")
+    content_length = len(content) if isinstance(content, str) else 0
+
+    role = message.get("role", "")
+    if role == "user":
+        return (get_date(message.get("timestamp")), ""), {
+            "user_message_count": 1,
+            "user_content_length": content_length,
+        }
+    elif role == "assistant":
+        if not message.get("done"):
+            return None, {}
+
+        counters = {
+            "assistant_message_count": 1,
+            "assistant_content_length": content_length,
+        }
+
+        parent_id = message.get("parentId", None)
+        if parent_id and parent_id in messages_map:
+            try:
+                counters["response_time_sum"] = int(
+                    message.get("timestamp", 0)
+                    - messages_map[parent_id].get("timestamp", 0)
+                )
+                counters["response_time_count"] = 1
+            except Exception:
+                pass
+
+        return (
+            get_date(message.get("timestamp")),
+            message.get("model", None) or "",
+        ), counters
+
+    return None, {}
+
+
+def get_chat_deltas(
+    old_chat: Optional[dict], new_chat: dict, message_ids: Optional[list] = None
+) -> dict[tuple[str, str], dict[str, int]]:
+    """
+    Counter changes per (date, model) between two versions of a chat. Only
+    `message_ids` are compared when given, e.g. a single upserted message.
+    """
+    old_messages = ((old_chat or {}).get("history", {}) or {}).get("messages") or {}
+    new_messages = ((new_chat or {}).get("history", {}) or {}).get("messages") or {}
+
+    if message_ids is None:
+        message_ids = set(old_messages) | set(new_messages)
+
+    deltas = defaultdict(lambda: defaultdict(int))
+    for message_id in message_ids:
+        old_message = old_messages.get(message_id)
+        new_message = new_messages.get(message_id)
+        if old_message == new_message:
+            continue
+
+        for sign, message, messages_map in (
+            (-1, old_message, old_messages),
+            (1, new_message, new_messages),
+        ):
+            key, counters = get_message_counters(message, messages_map)
+            for name, value in counters.items():
+                deltas[key][name] += sign * value
+
+    return {
+        key: {name: value for name, value in counters.items() if value}
+        for key, counters in deltas.items()
+        if any(counters.values())
+    }
+
+
+def get_branch_stats(chat: dict) -> dict:
+    history = (chat or {}).get("history", {}) or {}
+    messages_map = history.get("messages") or {}
+    message_list = get_message_list(messages_map, history.get("currentId"))
+
+    models = defaultdict(int)
+    for message in message_list:
+        if message.get("role") == "assistant" and message.get("model"):
+            models[message["model"]] += 1
+
+    last_message_at = message_list[-1].get("timestamp", None) if message_list else None
+    return {
+        "history_message_count": len(messages_map),
+        "message_count": len(message_list),
+        "models": dict(models),
+        "last_message_at": (
+            int(last_message_at) if isinstance(last_message_at, (int, float)) else None
+        ),
+    }
+
+
+####################
+# Tables
+####################
+
+
+class ChatStatsTable:
+    def get_chat_stat_by_chat_id(self, chat_id: str) -> Optional[ChatStatModel]:
+        with get_db() as db:
+            stat = db.get(ChatStat, chat_id)
+            return ChatStatModel.model_validate(stat) if stat else None
+
+    def update_chat_stats(
+        self,
+        chat_id: str,
+        user_id: str,
+        old_chat: Optional[dict],
+        new_chat: dict,
+        message_ids: Optional[list] = None,
+    ) -> Optional[ChatStatModel]:
+        """
+        Apply the change from `old_chat` to `new_chat` to the chat's stats and
+        the daily usage. A chat without stats yet is counted in full, so each
+        message is counted exactly once whenever its chat is first seen.
+
+        Writes that change nothing counted, like the content of a message
+        being streamed, don't touch the database and return None.
+        """
+        if (
+            old_chat is not None
+            and not get_chat_deltas(old_chat, new_chat, message_ids)
+            and get_branch_stats(old_chat) == get_branch_stats(new_chat)
+        ):
+            return None
+
+        with get_db() as db:
+            stat = (
+                db.query(ChatStat).filter_by(chat_id=chat_id).with_for_update().first()
+            )
+            if stat is None:
+                old_chat, message_ids = None, None
+                stat = ChatStat(
+                    chat_id=chat_id,
+                    user_id=user_id,
+                    history_message_count=0,
+                    history_models={},
+                    **{name: 0 for name in COUNTERS},
+                )
+                db.add(stat)
+
+            deltas = get_chat_deltas(old_chat, new_chat, message_ids)
+
+            history_models = dict(stat.history_models or {})
+            for (_, model), counters in deltas.items():
+                for name, value in counters.items():
+                    setattr(stat, name, (getattr(stat, name) or 0) + value)
+
+                count = counters.get("assistant_message_count", 0)
+                if model and count:
+                    history_models[model] = history_models.get(model, 0) + count
+                    if history_models[model] <= 0:
+                        del history_models[model]
+            stat.history_models = history_models
+
+            for name, value in get_branch_stats(new_chat).items():
+                setattr(stat, name, value)
+            stat.updated_at = int(time.time())
+
+            try:
+                db.commit()
+            except IntegrityError:
+                # Counted concurrently by the first write of this chat
+                db.rollback()
+                return None
+
+            db.refresh(stat)
+            stat = ChatStatModel.model_validate(stat)
+
+        for (date, model), counters in deltas.items():
+            self._add_daily_usage(date, user_id, model, counters)
+
+        return stat
+
+    def _add_daily_usage(
+        self, date: str, user_id: str, model: str, counters: dict[str, int]
+    ):
+        for _ in range(3):
+            with get_db() as db:
+                updated = (
+                    db.query(ChatUsageDaily)
+                    .filter_by(date=date, user_id=user_id, model=model)
+                    .update(
+                        {
+                            getattr(ChatUsageDaily, name): getattr(ChatUsageDaily, name)
+                            + value
+                            for name, value in counters.items()
+                        },
+                        synchronize_session=False,
+                    )
+                )
+                db.commit()
+                if updated:
+                    return
+
+                try:
+                    db.add(
+                        ChatUsageDaily(
+                            date=date,
+                            user_id=user_id,
+                            model=model,
+                            **{name: counters.get(name, 0) for name in COUNTERS},
+                        )
+                    )
+                    db.commit()
+                    return
+                except IntegrityError:
+                    # Inserted concurrently, increment that row instead
+                    db.rollback()
+
+        log.error(f"Failed to update daily usage of {user_id} on {date}")
+
+    def get_daily_usage(
+        self,
+        group_by: list[str],
+        user_id: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> list[ChatUsageDailyResponse]:
+        """
+        Sum the daily usage grouped by any of `date`, `user_id` and `model`,
+        with dates given as YYYY-MM-DD (inclusive).
+        """
+        columns = [getattr(ChatUsageDaily, name) for name in group_by]
+
+        with get_db() as db:
+            query = db.query(
+                *columns,
+                *[
+                    func.sum(getattr(ChatUsageDaily, name)).label(name)
+                    for name in COUNTERS
+                ],
+            )
+
+            if user_id:
+                query = query.filter(ChatUsageDaily.user_id == user_id)
+            if start_date:
+                query = query.filter(ChatUsageDaily.date >= start_date)
+            if end_date:
+                query = query.filter(ChatUsageDaily.date <= end_date)
+
+            if columns:
+                query = query.group_by(*columns).order_by(*columns)
+
+            return [
+                ChatUsageDailyResponse(
+                    **{
+                        name: value if value is not None or name in group_by else 0
+                        for name, value in row._mapping.items()
+                    }
+                )
+                for row in query.all()
+            ]
+
+    def delete_chat_stats_by_chat_ids(self, chat_ids: list[str]) -> bool:
+        with get_db() as db:
+            db.query(ChatStat).filter(ChatStat.chat_id.in_(chat_ids)).delete(
+                synchronize_session=False
+            )
+            db.commit()
+            return True
+
+    def delete_chat_stats_by_user_id(self, user_id: str) -> bool:
+        with get_db() as db:
+            db.query(ChatStat).filter_by(user_id=user_id).delete()
+            db.commit()
+            return True
+
+
+ChatStats = ChatStatsTable()
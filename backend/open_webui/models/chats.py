@@ -2,9 +2,10 @@ import logging
 import json
 import time
 import uuid
-from typing import Optional
+from typing import Iterator, Optional
 
-from open_webui.internal.db import Base, get_db
+from open_webui.internal.db import Base, get_db, iter_by_keyset
+from open_webui.models.chat_stats import ChatStat, ChatStatModel, ChatStats
 from open_webui.models.tags import TagModel, Tag, Tags
 from open_webui.models.folders import Folders
 from open_webui.utils.misc import sanitize_data_for_db, sanitize_text_for_db
@@ -261,6 +262,8 @@ class ChatTable:
             db.add(chat_item)
             db.commit()
             db.refresh(chat_item)
+
+            self._update_chat_stats(chat_item.id, user_id, None, chat_item.chat)
             return ChatModel.model_validate(chat_item) if chat_item else None
 
     def _chat_import_form_to_chat_model(
@@ -300,12 +303,35 @@ class ChatTable:
 
             db.add_all(chats)
             db.commit()
+
+            for chat in chats:
+                self._update_chat_stats(chat.id, user_id, None, chat.chat)
             return [ChatModel.model_validate(chat) for chat in chats]
 
-    def update_chat_by_id(self, id: str, chat: dict) -> Optional[ChatModel]:
+    def _update_chat_stats(
+        self,
+        id: str,
+        user_id: str,
+        old_chat: Optional[dict],
+        new_chat: dict,
+        message_ids: Optional[list] = None,
+    ):
+        try:
+            ChatStats.update_chat_stats(id, user_id, old_chat, new_chat, message_ids)
+        except Exception as e:
+            # Stats must never fail a chat write
+            log.exception(f"Failed to update stats of chat {id}: {e}")
+
+    def update_chat_by_id(
+        self, id: str, chat: dict, message_ids: Optional[list] = None
+    ) -> Optional[ChatModel]:
+        """
+        `message_ids` narrows the stats update to the messages that changed.
+        """
         try:
             with get_db() as db:
                 chat_item = db.get(Chat, id)
+                old_chat = chat_item.chat
                 chat_item.chat = self._clean_null_bytes(chat)
                 chat_item.title = (
                     self._clean_null_bytes(chat["title"])
@@ -318,6 +344,10 @@ class ChatTable:
                 db.commit()
                 db.refresh(chat_item)
 
+                if not chat_item.user_id.startswith("shared-"):
+                    self._update_chat_stats(
+                        id, chat_item.user_id, old_chat, chat_item.chat, message_ids
+                    )
                 return ChatModel.model_validate(chat_item)
         except Exception:
             return None
@@ -400,7 +430,7 @@ class ChatTable:
         history["currentId"] = message_id
 
         chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+        return self.update_chat_by_id(id, chat, message_ids=[message_id])
 
     def add_message_status_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, status: dict
@@ -418,7 +448,7 @@ class ChatTable:
             history["messages"][message_id]["statusHistory"] = status_history
 
         chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+        return self.update_chat_by_id(id, chat, message_ids=[message_id])
 
     def add_message_files_by_id_and_message_id(
         self, id: str, message_id: str, files: list[dict]
@@ -438,7 +468,7 @@ class ChatTable:
             history["messages"][message_id]["files"] = message_files
 
         chat["history"] = history
-        self.update_chat_by_id(id, chat)
+        self.update_chat_by_id(id, chat, message_ids=[message_id])
         return message_files
 
     def insert_shared_chat_by_chat_id(self, chat_id: str) -> Optional[ChatModel]:
@@ -749,6 +779,15 @@ class ChatTable:
             )
             return [ChatModel.model_validate(chat) for chat in all_chats]
 
+    def iter_chats(self, user_id: Optional[str] = None) -> Iterator[ChatModel]:
+        """
+        All chats, or those of `user_id`, in id order, loaded page by page
+        for exports of any size.
+        """
+        criteria = [Chat.user_id == user_id] if user_id else []
+        for chat in iter_by_keyset(Chat, *criteria):
+            yield ChatModel.model_validate(chat)
+
     def get_chats_by_user_id(
         self, user_id: str, skip: Optional[int] = None, limit: Optional[int] = None
     ) -> ChatListResponse:
@@ -775,6 +814,72 @@ class ChatTable:
                 }
             )
 
+    def get_chat_usage_stats_by_user_id(
+        self, user_id: str, skip: int = 0, limit: int = 50
+    ) -> ChatUsageStatsListResponse:
+        """
+        Usage stats of a page of the user's chats, read from their stats
+        records. Chats written before stats existed are counted on first read.
+        """
+        with get_db() as db:
+            query = (
+                db.query(Chat.id, Chat.meta, Chat.created_at, Chat.updated_at, ChatStat)
+                .outerjoin(ChatStat, ChatStat.chat_id == Chat.id)
+                .filter(Chat.user_id == user_id)
+                .order_by(Chat.updated_at.desc())
+            )
+
+            total = query.count()
+            rows = query.offset(skip).limit(limit).all()
+
+        items = []
+        for id, meta, created_at, updated_at, stat in rows:
+            if stat is None:
+                chat = self.get_chat_by_id(id)
+                stat = (
+                    ChatStats.update_chat_stats(id, user_id, None, chat.chat)
+                    if chat
+                    else None
+                )
+            else:
+                stat = ChatStatModel.model_validate(stat)
+
+            if not stat or not stat.message_count or stat.last_message_at is None:
+                continue
+
+            items.append(
+                ChatUsageStatsResponse(
+                    id=id,
+                    models=stat.models or {},
+                    message_count=stat.message_count,
+                    history_models=stat.history_models or {},
+                    history_message_count=stat.history_message_count,
+                    history_user_message_count=stat.user_message_count,
+                    history_assistant_message_count=stat.assistant_message_count,
+                    average_response_time=(
+                        stat.response_time_sum / stat.response_time_count
+                        if stat.response_time_count
+                        else 0
+                    ),
+                    average_user_message_content_length=(
+                        stat.user_content_length / stat.user_message_count
+                        if stat.user_message_count
+                        else 0
+                    ),
+                    average_assistant_message_content_length=(
+                        stat.assistant_content_length / stat.assistant_message_count
+                        if stat.assistant_message_count
+                        else 0
+                    ),
+                    tags=(meta or {}).get("tags", []),
+                    last_message_at=stat.last_message_at,
+                    updated_at=updated_at,
+                    created_at=created_at,
+                )
+            )
+
+        return ChatUsageStatsListResponse(items=items, total=total)
+
     def get_pinned_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
             all_chats = (
@@ -1196,6 +1301,7 @@ class ChatTable:
                 db.query(Chat).filter_by(id=id).delete()
                 db.commit()
 
+                ChatStats.delete_chat_stats_by_chat_ids([id])
                 return True and self.delete_shared_chat_by_chat_id(id)
         except Exception:
             return False
@@ -1203,9 +1309,11 @@ class ChatTable:
     def delete_chat_by_id_and_user_id(self, id: str, user_id: str) -> bool:
         try:
             with get_db() as db:
-                db.query(Chat).filter_by(id=id, user_id=user_id).delete()
+                deleted = db.query(Chat).filter_by(id=id, user_id=user_id).delete()
                 db.commit()
 
+                if deleted:
+                    ChatStats.delete_chat_stats_by_chat_ids([id])
                 return True and self.delete_shared_chat_by_chat_id(id)
         except Exception:
             return False
@@ -1218,6 +1326,7 @@ class ChatTable:
                 db.query(Chat).filter_by(user_id=user_id).delete()
                 db.commit()
 
+                ChatStats.delete_chat_stats_by_user_id(user_id)
                 return True
         except Exception:
             return False
@@ -1227,9 +1336,14 @@ class ChatTable:
     ) -> bool:
         try:
             with get_db() as db:
-                db.query(Chat).filter_by(user_id=user_id, folder_id=folder_id).delete()
+                query = db.query(Chat).filter_by(user_id=user_id, folder_id=folder_id)
+                chat_ids = [chat_id for (chat_id,) in query.with_entities(Chat.id)]
+
+                query.delete()
                 db.commit()
 
+                ChatStats.delete_chat_stats_by_chat_ids(chat_ids)
+
                 return True
         except Exception:
             return False
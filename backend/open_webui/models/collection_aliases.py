@@ -0,0 +1,78 @@
+import logging
+import time
+from typing import Optional
+
+from open_webui.internal.db import Base, get_db
+from sqlalchemy import BigInteger, Column, String
+
+log = logging.getLogger(__name__)
+
+####################
+# Collection Alias DB Schema
+####################
+
+
+class CollectionAlias(Base):
+    """
+    Vector DB collection that serves the logical collection `name`, e.g. the
+    rebuilt collection of a reindexed knowledge base.
+    """
+
+    __tablename__ = "collection_alias"
+
+    name = Column(String, primary_key=True)
+    target = Column(String, nullable=False)
+
+    updated_at = Column(BigInteger)
+
+
+class CollectionAliasesTable:
+    def get_aliases(self) -> dict[str, str]:
+        with get_db() as db:
+            return dict(db.query(CollectionAlias.name, CollectionAlias.target).all())
+
+    def get_alias(self, name: str) -> Optional[str]:
+        with get_db() as db:
+            alias = db.get(CollectionAlias, name)
+            return alias.target if alias else None
+
+    def set_alias(self, name: str, target: str) -> Optional[str]:
+        """Point `name` at `target`, returning the previous target if any."""
+        with get_db() as db:
+            alias = db.get(CollectionAlias, name)
+            previous = alias.target if alias else None
+
+            if alias:
+                alias.target = target
+                alias.updated_at = int(time.time())
+            else:
+                db.add(
+                    CollectionAlias(
+                        name=name, target=target, updated_at=int(time.time())
+                    )
+                )
+            db.commit()
+            return previous
+
+    def delete_alias(self, name: str) -> Optional[str]:
+        with get_db() as db:
+            alias = db.get(CollectionAlias, name)
+            if not alias:
+                return None
+
+            target = alias.target
+            db.delete(alias)
+            db.commit()
+            return target
+
+    def delete_all_aliases(self) -> bool:
+        with get_db() as db:
+            try:
+                db.query(CollectionAlias).delete()
+                db.commit()
+                return True
+            except Exception:
+                return False
+
+
+CollectionAliases = CollectionAliasesTable()
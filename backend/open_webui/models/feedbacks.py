@@ -1,9 +1,9 @@
 import logging
 import time
 import uuid
-from typing import Optional
+from typing import Iterator, Optional
 
-from open_webui.internal.db import Base, get_db
+from open_webui.internal.db import Base, get_db, iter_by_keyset
 from open_webui.models.users import User
 
 from pydantic import BaseModel, ConfigDict
@@ -243,6 +243,10 @@ class FeedbackTable:
                 .all()
             ]
 
+    def iter_feedbacks(self) -> Iterator[FeedbackModel]:
+        for feedback in iter_by_keyset(Feedback):
+            yield FeedbackModel.model_validate(feedback)
+
     def get_feedbacks_by_type(self, type: str) -> list[FeedbackModel]:
         with get_db() as db:
             return [
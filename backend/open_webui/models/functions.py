@@ -5,7 +5,7 @@ from typing import Optional
 from open_webui.internal.db import Base, JSONField, get_db
 from open_webui.models.users import Users, UserModel
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, Index
+from sqlalchemy import BigInteger, Boolean, Column, String, Text, Index, func
 
 log = logging.getLogger(__name__)
 
@@ -185,6 +185,10 @@ class FunctionsTable:
         except Exception:
             return None
 
+    def get_function_updated_at_by_id(self, id: str) -> Optional[int]:
+        with get_db() as db:
+            return db.query(Function.updated_at).filter_by(id=id).scalar()
+
     def get_functions(
         self, active_only=False, include_valves=False
     ) -> list[FunctionModel | FunctionWithValvesModel]:
@@ -228,21 +232,28 @@ class FunctionsTable:
             ]
 
     def get_functions_by_type(
-        self, type: str, active_only=False
-    ) -> list[FunctionModel]:
+        self, type: str, active_only=False, include_valves=False
+    ) -> list[FunctionModel | FunctionWithValvesModel]:
         with get_db() as db:
+            query = db.query(Function).filter_by(type=type)
             if active_only:
-                return [
-                    FunctionModel.model_validate(function)
-                    for function in db.query(Function)
-                    .filter_by(type=type, is_active=True)
-                    .all()
-                ]
-            else:
-                return [
-                    FunctionModel.model_validate(function)
-                    for function in db.query(Function).filter_by(type=type).all()
-                ]
+                query = query.filter_by(is_active=True)
+
+            model = FunctionWithValvesModel if include_valves else FunctionModel
+            return [model.model_validate(function) for function in query.all()]
+
+    def get_functions_stamp_by_type(self, type: str) -> tuple[int, int]:
+        """
+        Number of functions of a type and their latest `updated_at`, which
+        changes with any insert, update or delete of such a function.
+        """
+        with get_db() as db:
+            count, updated_at = (
+                db.query(func.count(Function.id), func.max(Function.updated_at))
+                .filter_by(type=type)
+                .one()
+            )
+            return count or 0, updated_at or 0
 
     def get_global_filter_functions(self) -> list[FunctionModel]:
         with get_db() as db:
@@ -1,12 +1,14 @@
 import json
 import logging
 import time
+from functools import partial
 from typing import Optional
 import uuid
 
 from open_webui.internal.db import Base, get_db
 
 from open_webui.models.files import FileMetadataResponse
+from open_webui.utils.scim import SCIMFilterError, compare_column, compile_filter
 
 
 from pydantic import BaseModel, ConfigDict
@@ -21,6 +23,8 @@ from sqlalchemy import (
     ForeignKey,
     cast,
     or_,
+    exists,
+    select,
 )
 
 
@@ -45,6 +49,9 @@ class Group(Base):
 
     permissions = Column(JSON, nullable=True)
 
+    # Identifier of the group in the SCIM provisioning client
+    scim_external_id = Column(Text, nullable=True)
+
     created_at = Column(BigInteger)
     updated_at = Column(BigInteger)
 
@@ -61,6 +68,8 @@ class GroupModel(BaseModel):
 
     permissions: Optional[dict] = None
 
+    scim_external_id: Optional[str] = None
+
     created_at: int  # timestamp in epoch
     updated_at: int  # timestamp in epoch
 
@@ -89,6 +98,27 @@ class GroupMemberModel(BaseModel):
     updated_at: Optional[int] = None  # timestamp in epoch
 
 
+def compare_members(operator: str, value):
+    members = select(GroupMember.id).where(GroupMember.group_id == Group.id)
+    if operator == "pr":
+        return exists(members)
+    if operator == "eq":
+        return exists(members.where(GroupMember.user_id == value))
+    if operator == "ne":
+        return ~exists(members.where(GroupMember.user_id == value))
+    raise SCIMFilterError(f"Operator '{operator}' is not supported on members")
+
+
+# SCIM group attributes that filters can compare
+SCIM_GROUP_ATTRIBUTES = {
+    "id": partial(compare_column, Group.id, case_exact=True),
+    "displayname": partial(compare_column, Group.name),
+    "externalid": partial(compare_column, Group.scim_external_id, case_exact=True),
+    "members": compare_members,
+    "members.value": compare_members,
+}
+
+
 ####################
 # Forms
 ####################
@@ -238,6 +268,59 @@ class GroupTable:
                 .all()
             ]
 
+    def get_scim_groups(
+        self, filter: Optional[tuple] = None, skip: int = 0, limit: Optional[int] = None
+    ) -> dict:
+        """
+        Groups matching a parsed SCIM filter, in a stable order for paging.
+        Raises SCIMFilterError for unsupported filters.
+        """
+        with get_db() as db:
+            query = db.query(Group)
+            if filter is not None:
+                query = query.filter(compile_filter(filter, SCIM_GROUP_ATTRIBUTES))
+
+            total = query.count()
+            query = query.order_by(Group.created_at.asc(), Group.id.asc()).offset(skip)
+            if limit is not None:
+                query = query.limit(limit)
+
+            return {
+                "groups": [GroupModel.model_validate(group) for group in query.all()],
+                "total": total,
+            }
+
+    def get_groups_by_member_ids(
+        self, user_ids: list[str]
+    ) -> dict[str, list[GroupModel]]:
+        with get_db() as db:
+            user_groups: dict[str, list[GroupModel]] = {
+                user_id: [] for user_id in user_ids
+            }
+            if not user_ids:
+                return user_groups
+
+            for user_id, group in (
+                db.query(GroupMember.user_id, Group)
+                .join(Group, GroupMember.group_id == Group.id)
+                .filter(GroupMember.user_id.in_(user_ids))
+                .order_by(Group.updated_at.desc())
+                .all()
+            ):
+                user_groups[user_id].append(GroupModel.model_validate(group))
+
+            return user_groups
+
+    def update_group_scim_external_id_by_id(
+        self, id: str, scim_external_id: Optional[str]
+    ) -> Optional[GroupModel]:
+        with get_db() as db:
+            db.query(Group).filter_by(id=id).update(
+                {"scim_external_id": scim_external_id, "updated_at": int(time.time())}
+            )
+            db.commit()
+            return self.get_group_by_id(id)
+
     def get_group_by_id(self, id: str) -> Optional[GroupModel]:
         try:
             with get_db() as db:
@@ -510,11 +593,10 @@ class GroupTable:
                 if not user_ids:
                     return GroupModel.model_validate(group)
 
-                # Remove each user from group_member
-                for user_id in user_ids:
-                    db.query(GroupMember).filter(
-                        GroupMember.group_id == id, GroupMember.user_id == user_id
-                    ).delete()
+                # Remove the users from group_member
+                db.query(GroupMember).filter(
+                    GroupMember.group_id == id, GroupMember.user_id.in_(user_ids)
+                ).delete(synchronize_session=False)
 
                 # Update group timestamp
                 group.updated_at = int(time.time())
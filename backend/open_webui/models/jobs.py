@@ -0,0 +1,326 @@
+import logging
+import time
+import uuid
+from typing import Optional
+
+from open_webui.internal.db import Base, get_db
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import BigInteger, Column, Index, Integer, String, Text, JSON, func
+
+log = logging.getLogger(__name__)
+
+####################
+# Job DB Schema
+####################
+
+
+class Job(Base):
+    """
+    Durable background job, claimed by worker processes.
+
+    Pending jobs are claimed in `rank` order once `available_at` has passed.
+    A running job whose `heartbeat_at` is older than the lock timeout belongs
+    to a dead worker and is handed out again.
+    """
+
+    __tablename__ = "job"
+
+    id = Column(String, primary_key=True)
+    type = Column(String, nullable=False)
+    user_id = Column(String, nullable=True)
+
+    payload = Column(JSON, nullable=True)
+    progress = Column(JSON, nullable=True)
+
+    # pending, running, completed, failed
+    status = Column(String, nullable=False)
+    rank = Column(BigInteger, nullable=False)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=1)
+    error = Column(Text, nullable=True)
+
+    available_at = Column(BigInteger, nullable=False)
+    locked_by = Column(String, nullable=True)
+    heartbeat_at = Column(BigInteger, nullable=True)
+
+    created_at = Column(BigInteger)
+    updated_at = Column(BigInteger)
+
+    __table_args__ = (Index("job_status_rank_idx", "status", "rank"),)
+
+
+class JobModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    type: str
+    user_id: Optional[str] = None
+
+    payload: Optional[dict] = None
+    progress: Optional[dict] = None
+
+    status: str
+    rank: int
+
+    attempts: int
+    max_attempts: int
+    error: Optional[str] = None
+
+    available_at: int
+    locked_by: Optional[str] = None
+    heartbeat_at: Optional[int] = None
+
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+
+
+class JobsTable:
+    def insert_new_job(
+        self,
+        type: str,
+        user_id: Optional[str],
+        payload: dict,
+        max_attempts: int = 1,
+        delay: int = 0,
+    ) -> Optional[JobModel]:
+        """
+        Queue a job. `delay` postpones it in the claim order (not in time), so
+        lower priority jobs still run once they have waited long enough.
+        """
+        now = int(time.time())
+        with get_db() as db:
+            job = Job(
+                id=str(uuid.uuid4()),
+                type=type,
+                user_id=user_id,
+                payload=payload,
+                status="pending",
+                rank=now + delay,
+                attempts=0,
+                max_attempts=max(max_attempts, 1),
+                available_at=now,
+                created_at=now,
+                updated_at=now,
+            )
+            try:
+                db.add(job)
+                db.commit()
+                db.refresh(job)
+                return JobModel.model_validate(job)
+            except Exception as e:
+                log.exception(f"Error queueing job: {e}")
+                return None
+
+    def get_job_by_id(self, id: str) -> Optional[JobModel]:
+        with get_db() as db:
+            job = db.get(Job, id)
+            return JobModel.model_validate(job) if job else None
+
+    def get_latest_job_by_type(self, type: str) -> Optional[JobModel]:
+        with get_db() as db:
+            job = (
+                db.query(Job)
+                .filter_by(type=type)
+                .order_by(Job.created_at.desc())
+                .first()
+            )
+            return JobModel.model_validate(job) if job else None
+
+    def claim_job(
+        self, worker_id: str, types: Optional[list[str]] = None, candidates: int = 32
+    ) -> Optional[JobModel]:
+        """
+        Lock the next pending job for `worker_id`.
+
+        Among the first `candidates` jobs in rank order, the job of the user
+        with the fewest running jobs wins, so one user's bulk upload does not
+        starve everyone else. The lock is a conditional update, which lets any
+        number of workers race for the same row safely.
+        """
+        with get_db() as db:
+            for _ in range(3):
+                now = int(time.time())
+
+                query = db.query(Job.id, Job.user_id).filter(
+                    Job.status == "pending", Job.available_at <= now
+                )
+                if types:
+                    query = query.filter(Job.type.in_(types))
+                pending = query.order_by(Job.rank, Job.created_at).limit(candidates)
+                pending = pending.all()
+                if not pending:
+                    return None
+
+                running = dict(
+                    db.query(Job.user_id, func.count(Job.id))
+                    .filter(Job.status == "running")
+                    .group_by(Job.user_id)
+                    .all()
+                )
+                # min() keeps the first, i.e. best ranked, job among ties
+                job_id, _ = min(pending, key=lambda job: running.get(job.user_id, 0))
+
+                claimed = (
+                    db.query(Job)
+                    .filter(Job.id == job_id, Job.status == "pending")
+                    .update(
+                        {
+                            Job.status: "running",
+                            Job.attempts: Job.attempts + 1,
+                            Job.locked_by: worker_id,
+                            Job.heartbeat_at: now,
+                            Job.updated_at: now,
+                        },
+                        synchronize_session=False,
+                    )
+                )
+                db.commit()
+
+                if claimed:
+                    return JobModel.model_validate(db.get(Job, job_id))
+
+            # Lost every race, let the caller poll again
+            return None
+
+    def heartbeat_jobs(self, worker_id: str, ids: list[str]) -> int:
+        if not ids:
+            return 0
+
+        with get_db() as db:
+            updated = (
+                db.query(Job)
+                .filter(
+                    Job.id.in_(ids),
+                    Job.status == "running",
+                    Job.locked_by == worker_id,
+                )
+                .update({Job.heartbeat_at: int(time.time())}, synchronize_session=False)
+            )
+            db.commit()
+            return updated
+
+    def update_job_progress(
+        self, id: str, progress: dict, payload: Optional[dict] = None
+    ) -> bool:
+        """
+        Record progress; a new `payload` narrows what a retry has left to do.
+        """
+        values = {Job.progress: progress, Job.updated_at: int(time.time())}
+        if payload is not None:
+            values[Job.payload] = payload
+
+        with get_db() as db:
+            updated = (
+                db.query(Job).filter_by(id=id).update(values, synchronize_session=False)
+            )
+            db.commit()
+            return bool(updated)
+
+    def complete_job(self, id: str, worker_id: str) -> bool:
+        now = int(time.time())
+        with get_db() as db:
+            updated = (
+                db.query(Job)
+                .filter(Job.id == id, Job.locked_by == worker_id)
+                .update(
+                    {
+                        Job.status: "completed",
+                        Job.error: None,
+                        Job.locked_by: None,
+                        Job.updated_at: now,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return bool(updated)
+
+    def fail_job(
+        self, id: str, worker_id: str, error: str, retry_delay: int
+    ) -> Optional[JobModel]:
+        """
+        Record a failed attempt. The job is retried after `retry_delay`
+        seconds while attempts remain, otherwise it is marked failed.
+        """
+        now = int(time.time())
+        with get_db() as db:
+            job = db.query(Job).filter(Job.id == id, Job.locked_by == worker_id).first()
+            if not job:
+                return None
+
+            if job.attempts < job.max_attempts:
+                job.status = "pending"
+                job.available_at = now + retry_delay
+            else:
+                job.status = "failed"
+
+            job.error = error
+            job.locked_by = None
+            job.updated_at = now
+            db.commit()
+            db.refresh(job)
+            return JobModel.model_validate(job)
+
+    def requeue_stale_jobs(self, timeout: int) -> list[JobModel]:
+        """
+        Release the jobs of workers that stopped sending heartbeats. A lost
+        attempt counts as an attempt, so a job that keeps crashing its worker
+        ends up failed instead of looping forever.
+        """
+        now = int(time.time())
+        with get_db() as db:
+            stale = (
+                db.query(Job)
+                .filter(Job.status == "running", Job.heartbeat_at < now - timeout)
+                .all()
+            )
+
+            jobs = []
+            for job in stale:
+                updated = (
+                    db.query(Job)
+                    .filter(
+                        Job.id == job.id,
+                        Job.status == "running",
+                        Job.locked_by == job.locked_by,
+                    )
+                    .update(
+                        {
+                            Job.status: (
+                                "pending"
+                                if job.attempts < job.max_attempts
+                                else "failed"
+                            ),
+                            Job.error: f"Worker {job.locked_by} stopped responding",
+                            Job.available_at: now,
+                            Job.locked_by: None,
+                            Job.updated_at: now,
+                        },
+                        synchronize_session=False,
+                    )
+                )
+                if updated:
+                    jobs.append(job.id)
+            db.commit()
+            db.expire_all()
+
+            return [
+                JobModel.model_validate(job)
+                for job in db.query(Job).filter(Job.id.in_(jobs)).all()
+            ]
+
+    def delete_finished_jobs(self, before: int) -> int:
+        with get_db() as db:
+            deleted = (
+                db.query(Job)
+                .filter(
+                    Job.status.in_(["completed", "failed"]), Job.updated_at < before
+                )
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+            return deleted
+
+
+Jobs = JobsTable()
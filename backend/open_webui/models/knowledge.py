@@ -483,6 +483,15 @@ class KnowledgeTable:
         except Exception:
             return []
 
+    def get_file_ids_by_id(self, knowledge_id: str) -> list[str]:
+        with get_db() as db:
+            return [
+                file_id
+                for (file_id,) in db.query(KnowledgeFile.file_id)
+                .filter_by(knowledge_id=knowledge_id)
+                .all()
+            ]
+
     def get_file_metadatas_by_id(self, knowledge_id: str) -> list[FileMetadataResponse]:
         try:
             with get_db() as db:
@@ -4,7 +4,7 @@ from typing import Optional
 
 from open_webui.internal.db import Base, get_db
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text
+from sqlalchemy import BigInteger, Column, LargeBinary, String, Text
 
 ####################
 # Memory DB Schema
@@ -20,6 +20,10 @@ class Memory(Base):
     updated_at = Column(BigInteger)
     created_at = Column(BigInteger)
 
+    # float32 embedding of the content and the model that produced it
+    embedding = Column(LargeBinary, nullable=True)
+    embedding_model = Column(Text, nullable=True)
+
 
 class MemoryModel(BaseModel):
     id: str
@@ -77,12 +81,49 @@ class MemoriesTable:
 
                 memory.content = content
                 memory.updated_at = int(time.time())
+                memory.embedding = None
+                memory.embedding_model = None
 
                 db.commit()
                 return self.get_memory_by_id(id)
             except Exception:
                 return None
 
+    def update_memory_embeddings(
+        self, embeddings: list[tuple[MemoryModel, bytes]], embedding_model: str
+    ) -> bool:
+        """
+        Store the embedding of each memory, unless its content has changed
+        since it was embedded.
+        """
+        with get_db() as db:
+            try:
+                for memory, embedding in embeddings:
+                    db.query(Memory).filter_by(
+                        id=memory.id, content=memory.content
+                    ).update(
+                        {"embedding": embedding, "embedding_model": embedding_model}
+                    )
+                db.commit()
+                return True
+            except Exception:
+                return False
+
+    def get_memory_embeddings_by_user_id(
+        self, user_id: str
+    ) -> list[tuple[MemoryModel, Optional[bytes], Optional[str]]]:
+        """The memories of a user with their stored embedding and its model."""
+        with get_db() as db:
+            memories = db.query(Memory).filter_by(user_id=user_id).all()
+            return [
+                (
+                    MemoryModel.model_validate(memory),
+                    memory.embedding,
+                    memory.embedding_model,
+                )
+                for memory in memories
+            ]
+
     def get_memories(self) -> list[MemoryModel]:
         with get_db() as db:
             try:
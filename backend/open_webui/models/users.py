@@ -1,4 +1,5 @@
 import time
+from functools import partial
 from typing import Optional
 
 from open_webui.internal.db import Base, JSONField, get_db
@@ -11,6 +12,7 @@ from open_webui.models.groups import Groups, GroupMember
 from open_webui.models.channels import ChannelMember
 
 from open_webui.utils.misc import throttle
+from open_webui.utils.scim import SCIMFilterError, compare_column, compile_filter
 
 
 from pydantic import BaseModel, ConfigDict
@@ -25,6 +27,7 @@ from sqlalchemy import (
     exists,
     select,
     cast,
+    true,
 )
 from sqlalchemy import or_, case
 from sqlalchemy.dialects.postgresql import JSONB
@@ -70,6 +73,9 @@ class User(Base):
 
     oauth = Column(JSON, nullable=True)
 
+    # Identifier of the user in the SCIM provisioning client
+    scim_external_id = Column(Text, nullable=True)
+
     last_active_at = Column(BigInteger)
     updated_at = Column(BigInteger)
     created_at = Column(BigInteger)
@@ -102,6 +108,8 @@ class UserModel(BaseModel):
 
     oauth: Optional[dict] = None
 
+    scim_external_id: Optional[str] = None
+
     last_active_at: int  # timestamp in epoch
     updated_at: int  # timestamp in epoch
     created_at: int  # timestamp in epoch
@@ -141,6 +149,29 @@ class ApiKeyModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+def compare_active(operator: str, value):
+    if operator == "pr":
+        return true()
+    if operator not in ("eq", "ne") or not isinstance(value, bool):
+        raise SCIMFilterError("active can only be compared to true or false")
+    if (operator == "eq") == value:
+        return User.role != "pending"
+    return User.role == "pending"
+
+
+# SCIM user attributes that filters can compare
+SCIM_USER_ATTRIBUTES = {
+    "id": partial(compare_column, User.id, case_exact=True),
+    "username": partial(compare_column, User.email),
+    "emails": partial(compare_column, User.email),
+    "emails.value": partial(compare_column, User.email),
+    "externalid": partial(compare_column, User.scim_external_id, case_exact=True),
+    "displayname": partial(compare_column, User.name),
+    "name.formatted": partial(compare_column, User.name),
+    "active": compare_active,
+}
+
+
 ####################
 # Forms
 ####################
@@ -452,6 +483,49 @@ class UsersTable:
                 "total": total,
             }
 
+    def get_scim_users(
+        self, filter: Optional[tuple] = None, skip: int = 0, limit: Optional[int] = None
+    ) -> dict:
+        """
+        Users matching a parsed SCIM filter, in a stable order for paging.
+        Raises SCIMFilterError for unsupported filters.
+        """
+        with get_db() as db:
+            query = db.query(User)
+            if filter is not None:
+                query = query.filter(compile_filter(filter, SCIM_USER_ATTRIBUTES))
+
+            total = query.count()
+            query = query.order_by(User.created_at.asc(), User.id.asc()).offset(skip)
+            if limit is not None:
+                query = query.limit(limit)
+
+            return {
+                "users": [UserModel.model_validate(user) for user in query.all()],
+                "total": total,
+            }
+
+    def get_member_names_by_group_ids(
+        self, group_ids: list[str]
+    ) -> dict[str, list[tuple[str, str]]]:
+        """The (id, name) of the members of each group, in one query."""
+        with get_db() as db:
+            members: dict[str, list[tuple[str, str]]] = {
+                group_id: [] for group_id in group_ids
+            }
+            if not group_ids:
+                return members
+
+            for group_id, user_id, name in (
+                db.query(GroupMember.group_id, User.id, User.name)
+                .join(User, User.id == GroupMember.user_id)
+                .filter(GroupMember.group_id.in_(group_ids))
+                .all()
+            ):
+                members[group_id].append((user_id, name))
+
+            return members
+
     def get_users_by_group_id(self, group_id: str) -> list[UserModel]:
         with get_db() as db:
             users = (
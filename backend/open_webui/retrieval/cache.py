@@ -0,0 +1,141 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from open_webui.config import CACHE_DIR, FILE_EMBEDDING_CACHE_MAX_SIZE
+from open_webui.utils.cache import LRUCache
+
+log = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Disk cache of the chunk embeddings of stored files, grouped by the SHA-256
+    of the file content (its blob).
+
+    Each entry is a float32 matrix keyed by the embedding config (engine,
+    endpoint and model) and the exact chunk texts that were embedded, so a
+    change in extraction, splitting or embedding settings simply misses.
+    Deleting a blob drops all its entries. Once the entries exceed `max_size`
+    bytes the least recently used are deleted; entries already on disk are
+    picked up, oldest first, on first use.
+    """
+
+    def __init__(self, path: str, max_size: int):
+        self.path = Path(path)
+        self.entries = LRUCache(
+            max_size, sizeof=lambda size: size, on_evict=self._on_evict
+        )
+
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+    @staticmethod
+    def get_key(texts: list[str], config: dict) -> str:
+        sha256 = hashlib.sha256(json.dumps(config, sort_keys=True).encode())
+        for text in texts:
+            sha256.update(hashlib.sha256(text.encode()).digest())
+        return sha256.hexdigest()
+
+    def _get_dir(self, blob_hash: str) -> Path:
+        return self.path / blob_hash[:2] / blob_hash
+
+    def _get_path(self, entry: str) -> Path:
+        blob_hash, key = entry.split("/")
+        return self._get_dir(blob_hash) / f"{key}.npy"
+
+    def _on_evict(self, entry: str, size: int):
+        self._get_path(entry).unlink(missing_ok=True)
+
+    def _load_entries(self):
+        with self._load_lock:
+            if self._loaded:
+                return
+            self._loaded = True
+
+            entries = []
+            for path in self.path.glob("*/*/*.npy"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append(
+                    (stat.st_mtime, f"{path.parent.name}/{path.stem}", stat.st_size)
+                )
+
+            for _, entry, size in sorted(entries):
+                if not self.entries.set(entry, size):
+                    self._on_evict(entry, size)
+
+    def get(self, blob_hash: str, key: str) -> Optional[list[list[float]]]:
+        self._load_entries()
+
+        entry = f"{blob_hash}/{key}"
+        path = self._get_path(entry)
+        try:
+            with open(path, "rb") as f:
+                embeddings = np.load(f).tolist()
+                size = os.fstat(f.fileno()).st_size
+        except FileNotFoundError:
+            self.entries.pop(entry)
+            return None
+        except Exception as e:
+            log.warning(f"Discarding unreadable embedding cache entry {path}: {e}")
+            self.entries.pop(entry)
+            path.unlink(missing_ok=True)
+            return None
+
+        # Also marks the entry as recently used
+        if self.entries.get(entry) is None:
+            # Written by another worker
+            self.entries.set(entry, size)
+        return embeddings
+
+    def set(self, blob_hash: str, key: str, embeddings: list[list[float]]):
+        if self.entries.max_size <= 0:
+            return
+        self._load_entries()
+
+        entry = f"{blob_hash}/{key}"
+        path = self._get_path(entry)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    np.save(f, np.asarray(embeddings, dtype=np.float32))
+                size = os.path.getsize(tmp_path)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except Exception as e:
+            log.warning(f"Failed to cache embeddings for blob {blob_hash}: {e}")
+            return
+
+        if not self.entries.set(entry, size):
+            # Larger than the whole cache
+            path.unlink(missing_ok=True)
+
+    def delete(self, blob_hash: str):
+        directory = self._get_dir(blob_hash)
+        for path in directory.glob("*.npy"):
+            self.entries.pop(f"{blob_hash}/{path.stem}")
+        shutil.rmtree(directory, ignore_errors=True)
+
+    def clear(self):
+        self.entries.clear()
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+EMBEDDING_CACHE = EmbeddingCache(
+    f"{CACHE_DIR}/embeddings", max_size=FILE_EMBEDDING_CACHE_MAX_SIZE
+)
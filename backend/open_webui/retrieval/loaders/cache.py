@@ -0,0 +1,139 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+from langchain_core.documents import Document
+
+from open_webui.utils.cache import LRUCache
+
+log = logging.getLogger(__name__)
+
+# Bump when the stored format or the loaders' output changes in a way that
+# should invalidate previously cached extractions
+CACHE_VERSION = 1
+
+
+class ExtractionCache:
+    """
+    Disk cache of extracted documents.
+
+    Entries are JSON files named after a digest of (file hash, engine, engine
+    config) and sharded by the first two hex characters. Writes go through a
+    temporary file and `os.replace`, so concurrent workers never observe a
+    partial entry. Once the entries exceed `max_size` bytes the least recently
+    used are deleted; entries already on disk are picked up, oldest first, on
+    first use.
+    """
+
+    def __init__(self, path: str, max_size: int):
+        self.path = Path(path)
+        self.entries = LRUCache(
+            max_size, sizeof=lambda size: size, on_evict=self._on_evict
+        )
+
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+    @staticmethod
+    def get_key(file_hash: str, engine: str, config: dict) -> str:
+        payload = json.dumps(
+            {
+                "version": CACHE_VERSION,
+                "file_hash": file_hash,
+                "engine": engine,
+                "config": config,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _get_path(self, key: str) -> Path:
+        return self.path / key[:2] / f"{key}.json"
+
+    def _on_evict(self, key: str, size: int):
+        self._get_path(key).unlink(missing_ok=True)
+
+    def _load_entries(self):
+        with self._load_lock:
+            if self._loaded:
+                return
+            self._loaded = True
+
+            entries = []
+            for path in self.path.glob("*/*.json"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, path.stem, stat.st_size))
+
+            for _, key, size in sorted(entries):
+                if not self.entries.set(key, size):
+                    self._on_evict(key, size)
+
+    def get(self, key: str) -> Optional[list[Document]]:
+        self._load_entries()
+
+        path = self._get_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                items = json.load(f)
+                size = os.fstat(f.fileno()).st_size
+        except FileNotFoundError:
+            self.entries.pop(key)
+            return None
+        except Exception as e:
+            log.warning(f"Discarding unreadable extraction cache entry {path}: {e}")
+            self.delete(key)
+            return None
+
+        if self.entries.get(key) is None:
+            # Written by another worker
+            self.entries.set(key, size)
+
+        return [
+            Document(page_content=item["page_content"], metadata=item["metadata"])
+            for item in items
+        ]
+
+    def set(self, key: str, docs: list[Document]):
+        if self.entries.max_size <= 0:
+            return
+        self._load_entries()
+
+        path = self._get_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(
+                        [
+                            {"page_content": doc.page_content, "metadata": doc.metadata}
+                            for doc in docs
+                        ],
+                        f,
+                        default=str,
+                    )
+                size = os.path.getsize(tmp_path)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except Exception as e:
+            log.warning(f"Failed to write extraction cache entry {path}: {e}")
+            return
+
+        if not self.entries.set(key, size):
+            # Larger than the whole cache
+            path.unlink(missing_ok=True)
+
+    def delete(self, key: str):
+        self.entries.pop(key)
+        self._get_path(key).unlink(missing_ok=True)
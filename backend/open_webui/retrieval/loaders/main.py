@@ -3,6 +3,12 @@ import logging
 import ftfy
 import sys
 import json
+import math
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
 
 from azure.identity import DefaultAzureCredential
 from langchain_community.document_loaders import (
@@ -28,9 +34,18 @@ from open_webui.retrieval.loaders.external_document import ExternalDocumentLoade
 from open_webui.retrieval.loaders.mistral import MistralLoader
 from open_webui.retrieval.loaders.datalab_marker import DatalabMarkerLoader
 from open_webui.retrieval.loaders.mineru import MinerULoader
+from open_webui.retrieval.loaders.cache import ExtractionCache
+from open_webui.utils.misc import calculate_sha256
 
 
-from open_webui.env import GLOBAL_LOG_LEVEL
+from open_webui.env import (
+    GLOBAL_LOG_LEVEL,
+    ENABLE_CONTENT_EXTRACTION_CACHE,
+    CONTENT_EXTRACTION_CACHE_DIR,
+    CONTENT_EXTRACTION_CACHE_MAX_SIZE,
+    CONTENT_EXTRACTION_PROCESS_POOL_SIZE,
+    CONTENT_EXTRACTION_PDF_PAGES_PER_TASK,
+)
 
 logging.basicConfig(stream=sys.stdout, level=GLOBAL_LOG_LEVEL)
 log = logging.getLogger(__name__)
@@ -181,6 +196,155 @@ class DoclingLoader:
             raise Exception(f"Error calling Docling: {error_msg}")
 
 
+EXTRACTION_CACHE = ExtractionCache(
+    CONTENT_EXTRACTION_CACHE_DIR, CONTENT_EXTRACTION_CACHE_MAX_SIZE
+)
+
+# Local loaders that parse in Python and hold the GIL for the whole file
+CPU_BOUND_LOADERS = (
+    PyPDFLoader,
+    CSVLoader,
+    BSHTMLLoader,
+    Docx2txtLoader,
+    OutlookMessageLoader,
+    UnstructuredEPubLoader,
+    UnstructuredExcelLoader,
+    UnstructuredODTLoader,
+    UnstructuredPowerPointLoader,
+    UnstructuredRSTLoader,
+    UnstructuredXMLLoader,
+)
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Return the shared extraction process pool, or None when
+    CONTENT_EXTRACTION_PROCESS_POOL_SIZE is 0.
+
+    Workers are spawned rather than forked: the server process runs threads
+    and an event loop that must not be copied into the children.
+    """
+    global _process_pool
+
+    if CONTENT_EXTRACTION_PROCESS_POOL_SIZE <= 0:
+        return None
+
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=CONTENT_EXTRACTION_PROCESS_POOL_SIZE,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_pool
+
+
+def reset_process_pool():
+    global _process_pool
+
+    with _process_pool_lock:
+        pool, _process_pool = _process_pool, None
+
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def fix_documents(docs: list[Document]) -> list[Document]:
+    return [
+        Document(page_content=ftfy.fix_text(doc.page_content), metadata=doc.metadata)
+        for doc in docs
+    ]
+
+
+def load_pdf_in_pool(
+    pool: ProcessPoolExecutor, file_path: str, extract_images: bool
+) -> list[Document]:
+    """
+    Parse a PDF with PyPDF, spreading page ranges over the process pool.
+    Produces the same documents as `PyPDFLoader(file_path).load()`.
+    """
+    import pypdf
+
+    page_count = len(pypdf.PdfReader(file_path).pages)
+    pages_per_task = max(
+        CONTENT_EXTRACTION_PDF_PAGES_PER_TASK,
+        math.ceil(page_count / CONTENT_EXTRACTION_PROCESS_POOL_SIZE),
+    )
+
+    futures = [
+        pool.submit(
+            _load_pdf_pages_in_worker,
+            file_path,
+            extract_images,
+            start,
+            min(start + pages_per_task, page_count),
+        )
+        for start in range(0, page_count, pages_per_task)
+    ]
+
+    docs = []
+    try:
+        for future in futures:
+            docs.extend(future.result())
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+
+    return docs
+
+
+def _load_in_worker(
+    engine: str, kwargs: dict, filename: str, file_content_type: str, file_path: str
+) -> list[Document]:
+    loader = Loader(engine, **kwargs)._get_loader(
+        filename, file_content_type, file_path
+    )
+    return fix_documents(loader.load())
+
+
+def _load_pdf_pages_in_worker(
+    file_path: str, extract_images: bool, start: int, stop: int
+) -> list[Document]:
+    # Parse a copy of the page range, then restore the numbering of the whole
+    # file so the documents match those PyPDFLoader returns for these pages
+    import io
+
+    import pypdf
+    from langchain_community.document_loaders.blob_loaders import Blob
+    from langchain_community.document_loaders.parsers.pdf import PyPDFParser
+
+    reader = pypdf.PdfReader(file_path)
+    page_labels = reader.page_labels
+
+    writer = pypdf.PdfWriter()
+    for page_number in range(start, stop):
+        writer.add_page(reader.pages[page_number])
+    # Keep the original document info, without the writer's own producer
+    writer.metadata = reader.metadata or {}
+
+    buffer = io.BytesIO()
+    writer.write(buffer)
+
+    parser = PyPDFParser(extract_images=extract_images)
+    docs = parser.parse(Blob.from_data(buffer.getvalue(), path=file_path))
+
+    return [
+        Document(
+            page_content=ftfy.fix_text(doc.page_content),
+            metadata=doc.metadata
+            | {
+                "total_pages": len(reader.pages),
+                "page": start + index,
+                "page_label": page_labels[start + index],
+            },
+        )
+        for index, doc in enumerate(docs)
+    ]
+
+
 class Loader:
     def __init__(self, engine: str = "", **kwargs):
         self.engine = engine
@@ -191,14 +355,63 @@ class Loader:
         self, filename: str, file_content_type: str, file_path: str
     ) -> list[Document]:
         loader = self._get_loader(filename, file_content_type, file_path)
-        docs = loader.load()
 
-        return [
-            Document(
-                page_content=ftfy.fix_text(doc.page_content), metadata=doc.metadata
-            )
-            for doc in docs
-        ]
+        # Plain text is cheaper to re-read than to cache
+        if not ENABLE_CONTENT_EXTRACTION_CACHE or isinstance(loader, TextLoader):
+            return self._load(loader, filename, file_content_type, file_path)
+
+        # The resolved loader class is part of the key: engines fall back to
+        # other loaders depending on the file type and configuration
+        key = EXTRACTION_CACHE.get_key(
+            calculate_sha256(file_path, 1024 * 1024),
+            f"{self.engine}:{type(loader).__name__}",
+            self._get_cache_config(),
+        )
+
+        docs = EXTRACTION_CACHE.get(key)
+        if docs is not None:
+            log.debug(f"Using cached extraction for {filename}")
+            return docs
+
+        docs = self._load(loader, filename, file_content_type, file_path)
+        EXTRACTION_CACHE.set(key, docs)
+        return docs
+
+    def _load(
+        self, loader, filename: str, file_content_type: str, file_path: str
+    ) -> list[Document]:
+        pool = get_process_pool()
+        if pool is None or not isinstance(loader, CPU_BOUND_LOADERS):
+            return fix_documents(loader.load())
+
+        try:
+            if isinstance(loader, PyPDFLoader):
+                return load_pdf_in_pool(
+                    pool, file_path, self.kwargs.get("PDF_EXTRACT_IMAGES")
+                )
+
+            return pool.submit(
+                _load_in_worker,
+                self.engine,
+                {key: value for key, value in self.kwargs.items() if key != "user"},
+                filename,
+                file_content_type,
+                file_path,
+            ).result()
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory), replace the pool for the
+            # next request rather than retrying the same file in this process
+            reset_process_pool()
+            raise
+
+    def _get_cache_config(self) -> dict:
+        # Credentials don't change the extracted content, so rotating a key
+        # doesn't invalidate the cache
+        return {
+            key: value
+            for key, value in self.kwargs.items()
+            if key != "user" and not key.endswith("_KEY")
+        }
 
     def _is_text_file(self, file_ext: str, file_content_type: str) -> bool:
         return file_ext in known_source_ext or (
@@ -0,0 +1,244 @@
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from open_webui.env import INSTANCE_ID, MEMORY_INDEX_CACHE_SIZE, REDIS_KEY_PREFIX
+from open_webui.models.memories import MemoryModel
+from open_webui.retrieval.vector.main import SearchResult
+
+log = logging.getLogger(__name__)
+
+MEMORY_INVALIDATION_CHANNEL = f"{REDIS_KEY_PREFIX}:memories:invalidate"
+
+
+def to_embedding(vector) -> np.ndarray:
+    """Normalized float32 copy of `vector`, as stored and searched."""
+    vector = np.asarray(vector, dtype=np.float32).ravel()
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+def get_memory_metadata(memory: MemoryModel) -> dict:
+    return {"created_at": memory.created_at, "updated_at": memory.updated_at}
+
+
+class MemoryIndex:
+    """
+    The embedded memories of one user, searched by cosine similarity with a
+    single matrix product. Rows are normalized float32 embeddings; deleting
+    a memory moves the last row into its place, so updates stay O(dim).
+    """
+
+    def __init__(self, model: str, memories: list[tuple[MemoryModel, np.ndarray]]):
+        self.model = model
+        self.lock = threading.Lock()
+
+        self.ids: list[str] = []
+        self.positions: dict[str, int] = {}
+        self.documents: list[str] = []
+        self.metadatas: list[dict] = []
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+
+        for memory, embedding in memories:
+            self.upsert(memory, embedding)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def upsert(self, memory: MemoryModel, embedding: np.ndarray):
+        with self.lock:
+            if embedding.shape[0] != self.matrix.shape[1]:
+                if len(self.ids):
+                    raise ValueError(
+                        f"Embedding dimension {embedding.shape[0]} does not match "
+                        f"the memory index ({self.matrix.shape[1]})"
+                    )
+                self.matrix = np.zeros((0, embedding.shape[0]), dtype=np.float32)
+
+            position = self.positions.get(memory.id)
+            if position is None:
+                position = len(self.ids)
+                if position == self.matrix.shape[0]:
+                    # Grow geometrically, additions are amortized O(dim)
+                    matrix = np.zeros(
+                        (max(2 * position, 16), embedding.shape[0]), dtype=np.float32
+                    )
+                    matrix[:position] = self.matrix[:position]
+                    self.matrix = matrix
+
+                self.positions[memory.id] = position
+                self.ids.append(memory.id)
+                self.documents.append(memory.content)
+                self.metadatas.append(get_memory_metadata(memory))
+            else:
+                self.documents[position] = memory.content
+                self.metadatas[position] = get_memory_metadata(memory)
+
+            self.matrix[position] = embedding
+
+    def delete(self, id: str):
+        with self.lock:
+            position = self.positions.pop(id, None)
+            if position is None:
+                return
+
+            last = len(self.ids) - 1
+            if position != last:
+                self.ids[position] = self.ids[last]
+                self.documents[position] = self.documents[last]
+                self.metadatas[position] = self.metadatas[last]
+                self.matrix[position] = self.matrix[last]
+                self.positions[self.ids[position]] = position
+
+            self.ids.pop()
+            self.documents.pop()
+            self.metadatas.pop()
+
+    def search(self, vector, limit: int = 1) -> SearchResult:
+        """
+        The `limit` most similar memories, with the scores mapped from cosine
+        similarity to 0 (worst) -> 1 (best) like the vector DB clients do.
+        """
+        query = to_embedding(vector)
+
+        with self.lock:
+            count = len(self.ids)
+            limit = min(max(limit or 1, 1), count)
+            if not limit:
+                return SearchResult(
+                    ids=[[]], documents=[[]], metadatas=[[]], distances=[[]]
+                )
+
+            scores = self.matrix[:count] @ query
+            if limit < count:
+                top = np.argpartition(-scores, limit - 1)[:limit]
+                top = top[np.argsort(-scores[top])]
+            else:
+                top = np.argsort(-scores)
+
+            return SearchResult(
+                ids=[[self.ids[i] for i in top]],
+                documents=[[self.documents[i] for i in top]],
+                metadatas=[[dict(self.metadatas[i]) for i in top]],
+                distances=[[float((1 + scores[i]) / 2) for i in top]],
+            )
+
+
+class MemoryIndexCache:
+    """
+    Least recently used memory indexes, one per user.
+
+    Every change to a user's memories updates their cached index or drops it.
+    An index built from memories read before a change is not cached, as
+    tracked by a counter of changes.
+    """
+
+    def __init__(self, size: int = MEMORY_INDEX_CACHE_SIZE):
+        self.size = size
+        self.indexes: OrderedDict[str, MemoryIndex] = OrderedDict()
+        self.lock = threading.Lock()
+        self.changes = 0
+
+    def get(self, user_id: str, model: str) -> Optional[MemoryIndex]:
+        with self.lock:
+            index = self.indexes.get(user_id)
+            if index is None:
+                return None
+            if index.model != model:
+                # Embedded with a previous embedding model
+                del self.indexes[user_id]
+                return None
+
+            self.indexes.move_to_end(user_id)
+            return index
+
+    def get_version(self) -> int:
+        with self.lock:
+            return self.changes
+
+    def set(self, user_id: str, index: MemoryIndex, version: int) -> bool:
+        """Cache `index` unless a change was made since `version`."""
+        with self.lock:
+            if version != self.changes:
+                return False
+
+            self.indexes[user_id] = index
+            self.indexes.move_to_end(user_id)
+            while len(self.indexes) > self.size:
+                self.indexes.popitem(last=False)
+            return True
+
+    def upsert(
+        self, user_id: str, memory: MemoryModel, embedding: np.ndarray, model: str
+    ):
+        with self.lock:
+            self.changes += 1
+            index = self.indexes.get(user_id)
+            if index is None:
+                return
+
+            try:
+                if index.model != model:
+                    raise ValueError(f"Memory index uses {index.model}")
+                index.upsert(memory, embedding)
+            except Exception as e:
+                log.debug(f"Dropping memory index of user {user_id}: {e}")
+                del self.indexes[user_id]
+
+    def delete(self, user_id: str, id: str):
+        with self.lock:
+            self.changes += 1
+            index = self.indexes.get(user_id)
+            if index is not None:
+                index.delete(id)
+
+    def invalidate(self, user_id: str):
+        with self.lock:
+            self.changes += 1
+            self.indexes.pop(user_id, None)
+
+
+MEMORY_INDEXES = MemoryIndexCache()
+
+
+def get_worker_id() -> str:
+    # INSTANCE_ID may be shared by the workers of one deployment
+    return f"{INSTANCE_ID}:{os.getpid()}"
+
+
+async def broadcast_memory_change(redis, user_id: str):
+    """
+    Make the other workers drop their memory index of `user_id` after its
+    memories changed here, so they don't keep finding edited or deleted ones.
+    """
+    if redis is None:
+        return
+
+    try:
+        await redis.publish(
+            MEMORY_INVALIDATION_CHANNEL,
+            json.dumps({"user_id": user_id, "worker_id": get_worker_id()}),
+        )
+    except Exception as e:
+        log.warning(f"Failed to broadcast the memory change of user {user_id}: {e}")
+
+
+async def memory_invalidation_listener(app):
+    pubsub = app.state.redis.pubsub()
+    await pubsub.subscribe(MEMORY_INVALIDATION_CHANNEL)
+
+    async for message in pubsub.listen():
+        if message["type"] != "message":
+            continue
+        try:
+            data = json.loads(message["data"])
+            # This worker already applied its own changes to its index
+            if data.get("worker_id") != get_worker_id():
+                MEMORY_INDEXES.invalidate(data["user_id"])
+        except Exception as e:
+            log.exception(f"Error handling memory invalidation: {e}")
@@ -6,10 +6,10 @@ import requests
 import aiohttp
 import asyncio
 import hashlib
-from concurrent.futures import ThreadPoolExecutor
 import time
 import re
 
+import numpy as np
 from urllib.parse import quote
 from huggingface_hub import snapshot_download
 from langchain_classic.retrievers import (
@@ -30,7 +30,7 @@ from open_webui.models.knowledge import Knowledges
 from open_webui.models.chats import Chats
 from open_webui.models.notes import Notes
 
-from open_webui.retrieval.vector.main import GetResult
+from open_webui.retrieval.vector.main import GetResult, SearchResult
 from open_webui.utils.access_control import has_access
 from open_webui.utils.headers import include_user_info_headers
 from open_webui.utils.misc import get_message_list
@@ -90,6 +90,10 @@ class VectorSearchRetriever(BaseRetriever):
     collection_name: Any
     embedding_function: Any
     top_k: int
+    # Embedding of the query and its search result, when already computed
+    # together with other queries
+    query_embedding: Optional[list[float]] = None
+    search_result: Optional[SearchResult] = None
 
     def _get_relevant_documents(
         self, query: str, *, run_manager: CallbackManagerForRetrieverRun
@@ -111,12 +115,18 @@ class VectorSearchRetriever(BaseRetriever):
         *,
         run_manager: CallbackManagerForRetrieverRun,
     ) -> list[Document]:
-        embedding = await self.embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)
-        result = VECTOR_DB_CLIENT.search(
-            collection_name=self.collection_name,
-            vectors=[embedding],
-            limit=self.top_k,
-        )
+        result = self.search_result
+        if result is None:
+            embedding = self.query_embedding
+            if embedding is None:
+                embedding = await self.embedding_function(
+                    query, RAG_EMBEDDING_QUERY_PREFIX
+                )
+            result = VECTOR_DB_CLIENT.search(
+                collection_name=self.collection_name,
+                vectors=[embedding],
+                limit=self.top_k,
+            )
 
         ids = result.ids[0]
         metadatas = result.metadatas[0]
@@ -216,6 +226,8 @@ async def query_doc_with_hybrid_search(
     r: float,
     hybrid_bm25_weight: float,
     enable_enriched_texts: bool = False,
+    query_embedding: Optional[list[float]] = None,
+    vector_search_result: Optional[SearchResult] = None,
 ) -> dict:
     try:
         # First check if collection_result has the required attributes
@@ -254,6 +266,8 @@ async def query_doc_with_hybrid_search(
             collection_name=collection_name,
             embedding_function=embedding_function,
             top_k=k,
+            query_embedding=query_embedding,
+            search_result=vector_search_result,
         )
 
         if hybrid_bm25_weight <= 0:
@@ -275,6 +289,7 @@ async def query_doc_with_hybrid_search(
             top_n=k_reranker,
             reranking_function=reranking_function,
             r_score=r,
+            query_embedding=query_embedding,
         )
 
         compression_retriever = ContextualCompressionRetriever(
@@ -336,6 +351,16 @@ def merge_get_results(get_results: list[dict]) -> dict:
     return result
 
 
+def get_search_result_row(result: SearchResult, idx: int) -> SearchResult:
+    """The results of the `idx`-th query vector of a batched search."""
+    return SearchResult(
+        ids=[result.ids[idx]],
+        distances=[result.distances[idx]],
+        documents=[result.documents[idx]],
+        metadatas=[result.metadatas[idx]],
+    )
+
+
 def merge_and_sort_query_results(query_results: list[dict], k: int) -> dict:
     # Initialize lists to store combined data
     combined = dict()  # To store documents with unique document hashes
@@ -383,6 +408,45 @@ def merge_and_sort_query_results(query_results: list[dict], k: int) -> dict:
     }
 
 
+def query_docs_in_memory(
+    documents: list[str],
+    metadatas: list[dict],
+    embeddings: list[list[float]],
+    query_embeddings: list[list[float]],
+    k: int,
+) -> dict:
+    """
+    The `k` documents most similar to any of the queries by cosine similarity,
+    scored with a single matrix product instead of a vector DB collection.
+    Results are sorted like `merge_and_sort_query_results`.
+    """
+    if not documents or not query_embeddings:
+        return {"distances": [[]], "documents": [[]], "metadatas": [[]]}
+
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    queries = np.asarray(query_embeddings, dtype=np.float32)
+    matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+    queries /= np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+
+    # Best cosine similarity of each document over the queries
+    scores = (queries @ matrix.T).max(axis=0)
+
+    k = min(max(k, 1), len(documents))
+    if k < len(documents):
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+    else:
+        top = np.argsort(-scores)
+
+    return {
+        # Mapped from cosine similarity to 0 (worst) -> 1 (best) like the
+        # vector DB clients do
+        "distances": [[float((1 + scores[i]) / 2) for i in top]],
+        "documents": [[documents[i] for i in top]],
+        "metadatas": [[metadatas[i] for i in top]],
+    }
+
+
 def get_all_items_from_collections(collection_names: list[str]) -> dict:
     results = []
 
@@ -406,23 +470,7 @@ async def query_collection(
     embedding_function,
     k: int,
 ) -> dict:
-    results = []
-    error = False
-
-    def process_query_collection(collection_name, query_embedding):
-        try:
-            if collection_name:
-                result = query_doc(
-                    collection_name=collection_name,
-                    k=k,
-                    query_embedding=query_embedding,
-                )
-                if result is not None:
-                    return result.model_dump(), None
-            return None, None
-        except Exception as e:
-            log.exception(f"Error when querying the collection: {e}")
-            return None, e
+    collection_names = [name for name in collection_names if name]
 
     # Generate all query embeddings (in one call)
     query_embeddings = await embedding_function(
@@ -432,23 +480,25 @@ async def query_collection(
         f"query_collection: processing {len(queries)} queries across {len(collection_names)} collections"
     )
 
-    with ThreadPoolExecutor() as executor:
-        future_results = []
-        for query_embedding in query_embeddings:
-            for collection_name in collection_names:
-                result = executor.submit(
-                    process_query_collection, collection_name, query_embedding
-                )
-                future_results.append(result)
-        task_results = [future.result() for future in future_results]
+    # Search every collection for every query (in one call)
+    search_results = await asyncio.to_thread(
+        VECTOR_DB_CLIENT.search_batch,
+        collection_names=collection_names,
+        vectors=query_embeddings,
+        limit=k,
+    )
 
-    for result, err in task_results:
-        if err is not None:
-            error = True
-        elif result is not None:
-            results.append(result)
+    results = []
+    for collection_name in collection_names:
+        result = search_results.get(collection_name)
+        if result is not None:
+            log.info(f"query_collection:result {collection_name} {result.ids}")
+            results.extend(
+                get_search_result_row(result, idx).model_dump()
+                for idx in range(len(result.ids))
+            )
 
-    if error and not results:
+    if collection_names and not results:
         log.warning("All collection queries failed. No results returned.")
 
     return merge_and_sort_query_results(results, k=k)
@@ -486,12 +536,40 @@ async def query_collection_with_hybrid_search(
         f"Starting hybrid search for {len(queries)} queries in {len(collection_names)} collections..."
     )
 
-    async def process_query(collection_name, query):
+    # Embed all queries in one call and run the vector search of every
+    # (collection, query) pair in another, instead of once per pair
+    searched_collections = [
+        collection_name
+        for collection_name in collection_names
+        if collection_results[collection_name] is not None
+    ]
+    query_embeddings = [None] * len(queries)
+    search_results = {}
+    if searched_collections and (hybrid_bm25_weight < 1 or reranking_function is None):
+        query_embeddings = await embedding_function(
+            queries, prefix=RAG_EMBEDDING_QUERY_PREFIX
+        )
+    if searched_collections and hybrid_bm25_weight < 1:
+        search_results = await asyncio.to_thread(
+            VECTOR_DB_CLIENT.search_batch,
+            collection_names=searched_collections,
+            vectors=query_embeddings,
+            limit=k,
+        )
+
+    async def process_query(collection_name, idx):
+        search_result = search_results.get(collection_name)
         try:
             result = await query_doc_with_hybrid_search(
                 collection_name=collection_name,
                 collection_result=collection_results[collection_name],
-                query=query,
+                query=queries[idx],
+                query_embedding=query_embeddings[idx],
+                vector_search_result=(
+                    get_search_result_row(search_result, idx)
+                    if search_result is not None
+                    else None
+                ),
                 embedding_function=embedding_function,
                 k=k,
                 reranking_function=reranking_function,
@@ -508,15 +586,14 @@ async def query_collection_with_hybrid_search(
     # Prepare tasks for all collections and queries
     # Avoid running any tasks for collections that failed to fetch data (have assigned None)
     tasks = [
-        (collection_name, query)
-        for collection_name in collection_names
-        if collection_results[collection_name] is not None
-        for query in queries
+        (collection_name, idx)
+        for collection_name in searched_collections
+        for idx in range(len(queries))
     ]
 
     # Run all queries in parallel using asyncio.gather
     task_results = await asyncio.gather(
-        *[process_query(collection_name, query) for collection_name, query in tasks]
+        *[process_query(collection_name, idx) for collection_name, idx in tasks]
     )
 
     for result, err in task_results:
@@ -1248,6 +1325,7 @@ class RerankCompressor(BaseDocumentCompressor):
     top_n: int
     reranking_function: Any
     r_score: float
+    query_embedding: Optional[list[float]] = None
 
     class Config:
         extra = "forbid"
@@ -1286,9 +1364,11 @@ class RerankCompressor(BaseDocumentCompressor):
         else:
             from sentence_transformers import util
 
-            query_embedding = await self.embedding_function(
-                query, RAG_EMBEDDING_QUERY_PREFIX
-            )
+            query_embedding = self.query_embedding
+            if query_embedding is None:
+                query_embedding = await self.embedding_function(
+                    query, RAG_EMBEDDING_QUERY_PREFIX
+                )
             document_embedding = await self.embedding_function(
                 [doc.page_content for doc in documents], RAG_EMBEDDING_CONTENT_PREFIX
             )
@@ -0,0 +1,125 @@
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from open_webui.models.collection_aliases import CollectionAliases
+from open_webui.retrieval.vector.main import (
+    GetResult,
+    SearchResult,
+    VectorDBBase,
+    VectorItem,
+)
+
+log = logging.getLogger(__name__)
+
+
+class AliasedVectorDBClient(VectorDBBase):
+    """
+    Vector DB client resolving collection names through collection aliases.
+
+    A collection can be rebuilt under another name and swapped in by pointing
+    its alias at the new collection, so readers never see it half built.
+    Reads use aliases reloaded every `ttl` seconds; after a swap, the previous
+    collection must stay around for that long before it is deleted. Writes
+    look the alias up every time, so they never land in a replaced collection
+    once the swap is committed.
+    """
+
+    def __init__(self, client: VectorDBBase, ttl: float = 5.0):
+        self.client = client
+        self.ttl = ttl
+
+        self._aliases: dict[str, str] = {}
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        # Backend specific extensions
+        return getattr(self.client, name)
+
+    def _get_aliases(self) -> dict[str, str]:
+        if time.monotonic() - self._loaded_at > self.ttl:
+            with self._lock:
+                if time.monotonic() - self._loaded_at > self.ttl:
+                    try:
+                        self._aliases = CollectionAliases.get_aliases()
+                    except Exception as e:
+                        # Keep serving the last known aliases
+                        log.warning(f"Failed to load collection aliases: {e}")
+                    self._loaded_at = time.monotonic()
+        return self._aliases
+
+    def refresh(self):
+        self._loaded_at = 0.0
+
+    def resolve(self, collection_name: str, cached: bool = True) -> str:
+        if not cached:
+            try:
+                return CollectionAliases.get_alias(collection_name) or collection_name
+            except Exception as e:
+                log.warning(f"Failed to load alias of {collection_name}: {e}")
+        return self._get_aliases().get(collection_name, collection_name)
+
+    def swap_collection(self, collection_name: str, target: str) -> Optional[str]:
+        """
+        Serve `collection_name` from the `target` collection. Returns the
+        collection that served it until now, which the caller should delete
+        once `ttl` has passed.
+        """
+        previous = CollectionAliases.set_alias(collection_name, target)
+        self.refresh()
+
+        if previous is None and self.client.has_collection(collection_name):
+            previous = collection_name
+        return previous
+
+    def has_collection(self, collection_name: str) -> bool:
+        return self.client.has_collection(self.resolve(collection_name))
+
+    def delete_collection(self, collection_name: str) -> None:
+        target = CollectionAliases.delete_alias(collection_name)
+        self.refresh()
+
+        if target is not None and target != collection_name:
+            self.client.delete_collection(target)
+            # Drop anything written under the plain name by stale readers
+            if self.client.has_collection(collection_name):
+                self.client.delete_collection(collection_name)
+        else:
+            self.client.delete_collection(collection_name)
+
+    # Arguments other than the collection are passed through unchanged, so
+    # each backend keeps its own defaults
+
+    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+        return self.client.insert(self.resolve(collection_name, cached=False), items)
+
+    def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        return self.client.upsert(self.resolve(collection_name, cached=False), items)
+
+    def search(self, collection_name: str, *args, **kwargs) -> Optional[SearchResult]:
+        return self.client.search(self.resolve(collection_name), *args, **kwargs)
+
+    def search_batch(
+        self, collection_names: List[str], *args, **kwargs
+    ) -> Dict[str, Optional[SearchResult]]:
+        targets = {name: self.resolve(name) for name in collection_names}
+        results = self.client.search_batch(list(targets.values()), *args, **kwargs)
+        return {name: results.get(target) for name, target in targets.items()}
+
+    def query(self, collection_name: str, *args, **kwargs) -> Optional[GetResult]:
+        return self.client.query(self.resolve(collection_name), *args, **kwargs)
+
+    def get(self, collection_name: str, *args, **kwargs) -> Optional[GetResult]:
+        return self.client.get(self.resolve(collection_name), *args, **kwargs)
+
+    def delete(self, collection_name: str, *args, **kwargs) -> None:
+        return self.client.delete(
+            self.resolve(collection_name, cached=False), *args, **kwargs
+        )
+
+    def reset(self) -> None:
+        CollectionAliases.delete_all_aliases()
+        self.refresh()
+        return self.client.reset()
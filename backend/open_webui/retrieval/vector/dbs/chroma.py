@@ -29,6 +29,8 @@ log = logging.getLogger(__name__)
 
 
 class ChromaClient(VectorDBBase):
+    multi_vector_search = True
+
     def __init__(self):
         settings_dict = {
             "allow_reset": True,
@@ -82,9 +84,9 @@ class ChromaClient(VectorDBBase):
 
                 # chromadb has cosine distance, 2 (worst) -> 0 (best). Re-odering to 0 -> 1
                 # https://docs.trychroma.com/docs/collections/configure cosine equation
-                distances: list = result["distances"][0]
-                distances = [2 - dist for dist in distances]
-                distances = [[dist / 2 for dist in distances]]
+                distances = [
+                    [(2 - dist) / 2 for dist in row] for row in result["distances"]
+                ]
 
                 return SearchResult(
                     **{
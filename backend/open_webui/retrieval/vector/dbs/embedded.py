@@ -0,0 +1,837 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import numpy as np
+
+from open_webui.retrieval.vector.main import (
+    VectorDBBase,
+    VectorItem,
+    SearchResult,
+    GetResult,
+)
+from open_webui.retrieval.vector.utils import process_metadata
+from open_webui.config import (
+    EMBEDDED_VECTOR_DATA_PATH,
+    EMBEDDED_VECTOR_DTYPE,
+    EMBEDDED_VECTOR_HNSW_THRESHOLD,
+    EMBEDDED_VECTOR_COMPACTION_RATIO,
+)
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+try:
+    import fcntl
+except ImportError:
+    # Windows, where only a single process may use the data path
+    fcntl = None
+
+log = logging.getLogger(__name__)
+
+VECTORS_FILE = "vectors.bin"
+RECORDS_FILE = "records.jsonl"
+DELETED_FILE = "deleted.npy"
+MANIFEST_FILE = "manifest.json"
+HNSW_FILE = "hnsw.bin"
+LOCK_FILE = "collection.lock"
+READERS_LOCK_FILE = "readers.lock"
+
+# Rows scored per matrix multiplication during exact search
+SEARCH_BLOCK_SIZE = 65536
+# Rows read per step when streaming records
+GET_BATCH_SIZE = 1000
+
+SAFE_COLLECTION_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_.-]{1,128}$")
+
+
+def collection_dir_name(collection_name: str) -> str:
+    if SAFE_COLLECTION_NAME_PATTERN.match(collection_name) and collection_name not in (
+        ".",
+        "..",
+    ):
+        return collection_name
+    return hashlib.sha256(collection_name.encode()).hexdigest()
+
+
+def lock_file(path: str, shared: bool = False, blocking: bool = True):
+    """
+    Open and flock `path`, shared between every process using the data path.
+    Returns the open file, whose closing releases the lock, or None if a
+    non-blocking lock is held elsewhere.
+    """
+    if fcntl is None:
+        return open(os.devnull)
+
+    operation = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+    if not blocking:
+        operation |= fcntl.LOCK_NB
+
+    while True:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        f = open(path, "a")
+        try:
+            fcntl.flock(f, operation)
+        except BlockingIOError:
+            f.close()
+            return None
+
+        try:
+            if os.path.samestat(os.fstat(f.fileno()), os.stat(path)):
+                return f
+        except FileNotFoundError:
+            pass
+        # The collection was deleted while waiting, lock its new file instead
+        f.close()
+
+
+@contextmanager
+def file_lock(path: str, shared: bool = False):
+    f = lock_file(path, shared=shared)
+    try:
+        yield
+    finally:
+        f.close()
+
+
+def matches_filter(metadata: Optional[dict], filter: Optional[dict]) -> bool:
+    if not filter:
+        return True
+    if not metadata:
+        return False
+
+    for key, value in filter.items():
+        if key not in metadata:
+            return False
+        if metadata[key] != value and str(metadata[key]) != str(value):
+            return False
+    return True
+
+
+class EmbeddedCollection:
+    """
+    One collection on disk:
+
+    - vectors.bin: append-only, L2-normalised row-major matrix (memory-mapped)
+    - records.jsonl: one {"id", "text", "metadata"} line per matrix row
+    - deleted.npy: tombstone flag per row
+    - manifest.json: name, dimension, dtype, committed row count and a
+      version bumped by every write
+
+    Updates append a new row and tombstone the old one; compaction rewrites
+    the files without tombstoned rows.
+
+    Several processes (workers) may share a collection: every access holds
+    a file lock, shared for reads and exclusive for writes, and reloads the
+    in-memory state when another process changed the manifest's version.
+    """
+
+    def __init__(self, path: str, name: str, dtype: str):
+        self.path = path
+        self.name = name
+        self.lock = threading.RLock()
+        self.file_locked = False
+
+        self.compacting = False
+        # Readers paging through rows, which compaction would renumber
+        self.readers = 0
+
+        self._reset(dtype)
+        with self.locked(shared=True):
+            pass
+
+    def _reset(self, dtype: Optional[str] = None):
+        self.manifest = {
+            "name": self.name,
+            "dim": None,
+            "dtype": dtype or self.manifest["dtype"],
+            "count": 0,
+        }
+        # (inode, mtime, size) of the manifest the state was loaded from
+        self.manifest_key = None
+        self.ids: list[str] = []
+        self.offsets: list[int] = []
+        self.records_size = 0
+        self.id_to_row: dict[str, int] = {}
+        self.deleted = np.zeros(0, dtype=bool)
+
+        self._matrix = None
+        self._hnsw = None
+        self._hnsw_count = 0
+
+    @contextmanager
+    def locked(self, shared: bool = False):
+        """
+        Hold the collection for reading (`shared`) or writing, across threads
+        and processes, with the state of the files on disk loaded.
+        """
+        with self.lock:
+            if self.file_locked:
+                yield
+                return
+
+            with file_lock(self._file(LOCK_FILE), shared=shared):
+                self.file_locked = True
+                try:
+                    self._refresh()
+                    yield
+                finally:
+                    self.file_locked = False
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self.manifest["dim"]
+
+    @property
+    def dtype(self):
+        return np.dtype(self.manifest["dtype"])
+
+    @property
+    def count(self) -> int:
+        return self.manifest["count"]
+
+    @property
+    def live_count(self) -> int:
+        return self.count - int(self.deleted.sum())
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _manifest_key(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self._file(MANIFEST_FILE))
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _refresh(self):
+        key = self._manifest_key()
+        if key == self.manifest_key:
+            return
+
+        if key is None:
+            # Deleted by another process
+            self._reset()
+            return
+
+        with open(self._file(MANIFEST_FILE), "r") as f:
+            manifest = json.load(f)
+
+        if self.manifest_key is None or manifest.get("version") != self.manifest.get(
+            "version"
+        ):
+            self._reset()
+            self._load(manifest)
+        else:
+            # Only the size of the saved search graph changed
+            self.manifest = manifest
+        self.manifest_key = key
+
+    def _load(self, manifest: dict):
+        self.manifest = manifest
+        count = self.manifest["count"]
+
+        # Rows appended after the last committed count (e.g. an interrupted
+        # write) are ignored, and truncated away by the next append
+        with open(self._file(RECORDS_FILE), "rb") as f:
+            offset = 0
+            for line in f:
+                if len(self.ids) == count:
+                    break
+                self.ids.append(json.loads(line)["id"])
+                self.offsets.append(offset)
+                offset += len(line)
+
+        if len(self.ids) < count:
+            count = len(self.ids)
+            self.manifest["count"] = count
+        self.records_size = offset
+
+        if os.path.exists(self._file(DELETED_FILE)):
+            self.deleted = np.load(self._file(DELETED_FILE))[:count]
+        self.deleted = np.concatenate(
+            [self.deleted, np.zeros(count - len(self.deleted), dtype=bool)]
+        )
+
+        for row, id in enumerate(self.ids):
+            if not self.deleted[row]:
+                self.id_to_row[id] = row
+
+    def _save_manifest(self, write: bool = True):
+        """
+        Save the manifest, with a new version for writes so other processes
+        reload the collection. Saving the search graph is not a write and may
+        happen under a shared lock, hence the per-process temporary file.
+        """
+        if write:
+            self.manifest["version"] = self.manifest.get("version", 0) + 1
+
+        tmp_path = self._file(f"{MANIFEST_FILE}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp_path, self._file(MANIFEST_FILE))
+        self.manifest_key = self._manifest_key()
+
+    def _save_deleted(self):
+        tmp_path = self._file(f"{DELETED_FILE}.tmp.npy")
+        np.save(tmp_path, self.deleted)
+        os.replace(tmp_path, self._file(DELETED_FILE))
+
+    def matrix(self) -> np.ndarray:
+        if self._matrix is None or len(self._matrix) != self.count:
+            if self.count == 0:
+                return np.zeros((0, self.dim or 0), dtype=self.dtype)
+            self._matrix = np.memmap(
+                self._file(VECTORS_FILE),
+                dtype=self.dtype,
+                mode="r",
+                shape=(self.count, self.dim),
+            )
+        return self._matrix
+
+    def read_records(self, rows: list[int]) -> list[dict]:
+        records = []
+        with open(self._file(RECORDS_FILE), "rb") as f:
+            for row in rows:
+                f.seek(self.offsets[row])
+                records.append(json.loads(f.readline()))
+        return records
+
+    def iter_records(self) -> Iterator[tuple[int, dict]]:
+        """Yield (row, record) for live rows without loading the whole file."""
+        with open(self._file(RECORDS_FILE), "rb") as f:
+            for row in range(self.count):
+                line = f.readline()
+                if not self.deleted[row]:
+                    yield row, json.loads(line)
+
+    def read_page(self, start: int, stop: int, size: int) -> tuple[list[dict], int]:
+        """
+        Read up to `size` live records from rows [start, stop). Returns them
+        with the row the next page starts at.
+        """
+        records = []
+        row = start
+        if row >= stop:
+            return records, row
+
+        with open(self._file(RECORDS_FILE), "rb") as f:
+            f.seek(self.offsets[row])
+            while row < stop and len(records) < size:
+                line = f.readline()
+                if not self.deleted[row]:
+                    records.append(json.loads(line))
+                row += 1
+        return records, row
+
+    def append(self, items: list[VectorItem], overwrite: bool):
+        vectors = []
+        records = []
+        replaced_rows = []
+        seen = {}
+
+        for item in items:
+            if item["id"] in self.id_to_row:
+                if not overwrite:
+                    continue
+                replaced_rows.append(self.id_to_row[item["id"]])
+
+            if item["id"] in seen:
+                if not overwrite:
+                    continue
+                # Last occurrence within the same call wins
+                vectors[seen[item["id"]]] = None
+                records[seen[item["id"]]] = None
+
+            seen[item["id"]] = len(vectors)
+            vectors.append(item["vector"])
+            records.append(
+                {
+                    "id": item["id"],
+                    "text": item["text"],
+                    "metadata": process_metadata(item["metadata"]),
+                }
+            )
+
+        vectors = [vector for vector in vectors if vector is not None]
+        records = [record for record in records if record is not None]
+        if not records:
+            return
+
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2:
+            raise ValueError("All vectors in a batch must have the same dimension.")
+
+        if self.dim is None:
+            os.makedirs(self.path, exist_ok=True)
+            self.manifest["dim"] = int(matrix.shape[1])
+        elif matrix.shape[1] != self.dim:
+            raise ValueError(
+                f"Vector dimension {matrix.shape[1]} does not match collection dimension {self.dim}."
+            )
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        matrix = (matrix / norms).astype(self.dtype)
+
+        # Drop rows of an interrupted write before appending after the
+        # committed ones
+        with open(self._file(VECTORS_FILE), "ab") as f:
+            f.truncate(self.count * self.dim * self.dtype.itemsize)
+            f.write(matrix.tobytes())
+
+        offset = self.records_size
+        with open(self._file(RECORDS_FILE), "ab") as f:
+            f.truncate(offset)
+            for record in records:
+                line = (json.dumps(record, default=str) + "\n").encode("utf-8")
+                f.write(line)
+                self.offsets.append(offset)
+                offset += len(line)
+        self.records_size = offset
+
+        start = self.count
+        for row, record in enumerate(records, start=start):
+            self.ids.append(record["id"])
+            self.id_to_row[record["id"]] = row
+
+        self.deleted = np.concatenate(
+            [self.deleted, np.zeros(len(records), dtype=bool)]
+        )
+        for row in replaced_rows:
+            self.deleted[row] = True
+            self._hnsw_mark_deleted(row)
+
+        # Committing the count is what makes the appended rows visible
+        self.manifest["count"] = start + len(records)
+        if replaced_rows:
+            self._save_deleted()
+        self._save_manifest()
+
+    def delete_rows(self, rows: list[int]):
+        rows = [row for row in rows if not self.deleted[row]]
+        if not rows:
+            return
+
+        for row in rows:
+            self.deleted[row] = True
+            self.id_to_row.pop(self.ids[row], None)
+            self._hnsw_mark_deleted(row)
+        self._save_deleted()
+        self._save_manifest()
+
+    def needs_compaction(self) -> bool:
+        return (
+            self.count > 0
+            and not self.compacting
+            and not self.readers
+            and (self.count - self.live_count) / self.count
+            >= EMBEDDED_VECTOR_COMPACTION_RATIO
+        )
+
+    def compact(self):
+        """Rewrite the collection without tombstoned rows."""
+        with self.locked():
+            readers_lock = None
+            try:
+                # Not while any process pages through the rows
+                readers_lock = lock_file(self._file(READERS_LOCK_FILE), blocking=False)
+                if self.readers or readers_lock is None:
+                    # Scheduled again by the next write
+                    return
+
+                live_rows = np.flatnonzero(~self.deleted)
+
+                tmp_vectors = self._file(f"{VECTORS_FILE}.tmp")
+                tmp_records = self._file(f"{RECORDS_FILE}.tmp")
+
+                matrix = self.matrix()
+                with open(tmp_vectors, "wb") as f:
+                    for i in range(0, len(live_rows), SEARCH_BLOCK_SIZE):
+                        f.write(
+                            np.ascontiguousarray(
+                                matrix[live_rows[i : i + SEARCH_BLOCK_SIZE]]
+                            ).tobytes()
+                        )
+
+                ids = []
+                offsets = []
+                offset = 0
+                with open(tmp_records, "wb") as out:
+                    for _, record in self.iter_records():
+                        line = (json.dumps(record, default=str) + "\n").encode("utf-8")
+                        out.write(line)
+                        ids.append(record["id"])
+                        offsets.append(offset)
+                        offset += len(line)
+
+                self._matrix = None
+                self._hnsw = None
+                self._hnsw_count = 0
+
+                os.replace(tmp_vectors, self._file(VECTORS_FILE))
+                os.replace(tmp_records, self._file(RECORDS_FILE))
+                if os.path.exists(self._file(HNSW_FILE)):
+                    os.remove(self._file(HNSW_FILE))
+
+                self.ids = ids
+                self.offsets = offsets
+                self.records_size = offset
+                self.id_to_row = {id: row for row, id in enumerate(ids)}
+                self.deleted = np.zeros(len(ids), dtype=bool)
+                self.manifest["count"] = len(ids)
+                self._save_deleted()
+                self._save_manifest()
+
+                log.info(
+                    f"Compacted collection '{self.manifest['name']}' to {len(ids)} rows."
+                )
+            except Exception as e:
+                log.exception(f"Error compacting collection: {e}")
+            finally:
+                if readers_lock is not None:
+                    readers_lock.close()
+                self.compacting = False
+
+    def _hnsw_mark_deleted(self, row: int):
+        # Rows not yet added to the graph are masked when they are added
+        if self._hnsw is not None and row < self._hnsw_count:
+            try:
+                self._hnsw.mark_deleted(row)
+            except RuntimeError:
+                # Already marked
+                pass
+
+    def _get_hnsw(self):
+        if self._hnsw is None:
+            index = hnswlib.Index(space="ip", dim=self.dim)
+            hnsw_path = self._file(HNSW_FILE)
+
+            if (
+                os.path.exists(hnsw_path)
+                and self.manifest.get("hnsw_count", 0) <= self.count
+            ):
+                index.load_index(hnsw_path, max_elements=self.count)
+                self._hnsw = index
+                self._hnsw_count = self.manifest.get("hnsw_count", 0)
+
+                # The saved graph may predate later tombstones
+                for row in np.flatnonzero(self.deleted[: self._hnsw_count]):
+                    self._hnsw_mark_deleted(int(row))
+            else:
+                index.init_index(max_elements=self.count, ef_construction=200, M=16)
+                self._hnsw = index
+                self._hnsw_count = 0
+
+        if self._hnsw_count < self.count:
+            matrix = self.matrix()
+            self._hnsw.resize_index(max(self.count, self._hnsw.get_max_elements()))
+            self._hnsw.add_items(
+                np.asarray(matrix[self._hnsw_count :], dtype=np.float32),
+                np.arange(self._hnsw_count, self.count),
+            )
+            for row in np.flatnonzero(self.deleted[self._hnsw_count :]):
+                self._hnsw.mark_deleted(int(row) + self._hnsw_count)
+
+            self._hnsw_count = self.count
+            tmp_path = self._file(f"{HNSW_FILE}.{os.getpid()}.tmp")
+            self._hnsw.save_index(tmp_path)
+            os.replace(tmp_path, self._file(HNSW_FILE))
+            self.manifest["hnsw_count"] = self.count
+            self._save_manifest(write=False)
+
+        return self._hnsw
+
+    def search(self, vectors: np.ndarray, limit: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return (rows, cosine similarities) of shape (len(vectors), k)."""
+        limit = min(limit, self.live_count)
+        if limit <= 0:
+            return (
+                np.zeros((len(vectors), 0), dtype=np.int64),
+                np.zeros((len(vectors), 0), dtype=np.float32),
+            )
+
+        if hnswlib is not None and self.live_count >= EMBEDDED_VECTOR_HNSW_THRESHOLD:
+            index = self._get_hnsw()
+            index.set_ef(max(limit * 2, 64))
+            rows, distances = index.knn_query(vectors, k=limit)
+            return rows.astype(np.int64), 1 - distances
+
+        # Exact search: score the memory-mapped matrix block by block
+        matrix = self.matrix()
+        scores = np.empty((len(vectors), self.count), dtype=np.float32)
+        for i in range(0, self.count, SEARCH_BLOCK_SIZE):
+            block = np.asarray(matrix[i : i + SEARCH_BLOCK_SIZE], dtype=np.float32)
+            scores[:, i : i + len(block)] = vectors @ block.T
+        scores[:, self.deleted] = -np.inf
+
+        rows = np.argpartition(-scores, limit - 1, axis=1)[:, :limit]
+        row_scores = np.take_along_axis(scores, rows, axis=1)
+        order = np.argsort(-row_scores, axis=1)
+        return (
+            np.take_along_axis(rows, order, axis=1),
+            np.take_along_axis(row_scores, order, axis=1),
+        )
+
+
+class EmbeddedVectorClient(VectorDBBase):
+    """
+    Single-node vector store that keeps every collection in memory-mapped
+    files under EMBEDDED_VECTOR_DATA_PATH. Intended for small and medium
+    deployments that do not want to run a separate vector database.
+    """
+
+    multi_vector_search = True
+
+    def __init__(self):
+        self.path = EMBEDDED_VECTOR_DATA_PATH
+        self.dtype = EMBEDDED_VECTOR_DTYPE
+        os.makedirs(self.path, exist_ok=True)
+
+        self.collections: dict[str, EmbeddedCollection] = {}
+        self.lock = threading.Lock()
+        self.compaction_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="embedded-vector-compaction"
+        )
+
+    def _collection_path(self, collection_name: str) -> str:
+        return os.path.join(self.path, collection_dir_name(collection_name))
+
+    def _get_collection(
+        self, collection_name: str, create: bool = False
+    ) -> Optional[EmbeddedCollection]:
+        with self.lock:
+            collection = self.collections.get(collection_name)
+            if collection is not None:
+                return collection
+
+            path = self._collection_path(collection_name)
+            if not create and not os.path.exists(os.path.join(path, MANIFEST_FILE)):
+                return None
+
+            collection = EmbeddedCollection(path, collection_name, self.dtype)
+            self.collections[collection_name] = collection
+            return collection
+
+    def _schedule_compaction(self, collection: EmbeddedCollection):
+        # Called with the collection locked
+        if collection.needs_compaction():
+            collection.compacting = True
+            self.compaction_executor.submit(collection.compact)
+
+    def has_collection(self, collection_name: str) -> bool:
+        collection = self._get_collection(collection_name)
+        if collection is None:
+            return False
+        with collection.locked(shared=True):
+            return collection.count > 0
+
+    def delete_collection(self, collection_name: str):
+        with self.lock:
+            collection = self.collections.pop(collection_name, None)
+            path = self._collection_path(collection_name)
+
+        if collection is not None:
+            with collection.locked():
+                shutil.rmtree(path, ignore_errors=True)
+        else:
+            with file_lock(os.path.join(path, LOCK_FILE)):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def insert(self, collection_name: str, items: list[VectorItem]):
+        collection = self._get_collection(collection_name, create=True)
+        with collection.locked():
+            collection.append(items, overwrite=False)
+
+    def upsert(self, collection_name: str, items: list[VectorItem]):
+        collection = self._get_collection(collection_name, create=True)
+        with collection.locked():
+            collection.append(items, overwrite=True)
+            self._schedule_compaction(collection)
+
+    def search(
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        limit: Optional[int] = None,
+    ) -> Optional[SearchResult]:
+        try:
+            collection = self._get_collection(collection_name)
+            if collection is None or not vectors:
+                return None
+
+            queries = np.asarray(vectors, dtype=np.float32)
+            norms = np.linalg.norm(queries, axis=1, keepdims=True)
+            norms[norms == 0] = 1
+            queries = queries / norms
+
+            with collection.locked(shared=True):
+                if collection.dim != queries.shape[1]:
+                    raise ValueError(
+                        f"Query dimension {queries.shape[1]} does not match collection dimension {collection.dim}."
+                    )
+
+                rows, scores = collection.search(
+                    queries, limit if limit is not None else collection.live_count
+                )
+
+                ids, documents, metadatas, distances = [], [], [], []
+                for query_rows, query_scores in zip(rows, scores):
+                    records = collection.read_records([int(row) for row in query_rows])
+                    ids.append([record["id"] for record in records])
+                    documents.append([record["text"] for record in records])
+                    metadatas.append([record["metadata"] for record in records])
+                    # Cosine similarity [-1, 1] to the [0, 1] score range used by
+                    # the other backends
+                    distances.append(
+                        [(float(score) + 1.0) / 2.0 for score in query_scores]
+                    )
+
+            return SearchResult(
+                ids=ids, distances=distances, documents=documents, metadatas=metadatas
+            )
+        except Exception as e:
+            log.exception(f"Error during search: {e}")
+            return None
+
+    def iter_items(
+        self, collection_name: str, batch_size: int = GET_BATCH_SIZE
+    ) -> Iterator[GetResult]:
+        """
+        Stream the live items of a collection in batches of `batch_size`.
+
+        Like keyset pagination, each page is read under the collection lock
+        starting at the row after the previous page, so writers are not
+        blocked between pages and nothing but the current page is loaded.
+        Items written after the iteration started are not included.
+        """
+        collection = self._get_collection(collection_name)
+        if collection is None:
+            return
+
+        # Held while paging, so no process compacts the rows meanwhile
+        readers_lock = lock_file(
+            os.path.join(collection.path, READERS_LOCK_FILE), shared=True
+        )
+        with collection.locked(shared=True):
+            stop = collection.count
+            collection.readers += 1
+
+        try:
+            row = 0
+            while row < stop:
+                with collection.locked(shared=True):
+                    # Fewer rows if another process deleted the collection
+                    stop = min(stop, collection.count)
+                    records, row = collection.read_page(row, stop, batch_size)
+
+                if records:
+                    yield GetResult(
+                        ids=[[record["id"] for record in records]],
+                        documents=[[record["text"] for record in records]],
+                        metadatas=[[record["metadata"] for record in records]],
+                    )
+        finally:
+            # Compaction skipped meanwhile is scheduled again by the next write
+            with collection.lock:
+                collection.readers -= 1
+            readers_lock.close()
+
+    def _collect(
+        self,
+        collection_name: str,
+        filter: Optional[dict] = None,
+        limit: Optional[int] = None,
+    ) -> Optional[GetResult]:
+        collection = self._get_collection(collection_name)
+        if collection is None:
+            return None
+
+        ids, documents, metadatas = [], [], []
+        for batch in self.iter_items(collection_name):
+            for id, document, metadata in zip(
+                batch.ids[0], batch.documents[0], batch.metadatas[0]
+            ):
+                if not matches_filter(metadata, filter):
+                    continue
+
+                ids.append(id)
+                documents.append(document)
+                metadatas.append(metadata)
+
+                if limit is not None and len(ids) >= limit:
+                    return GetResult(
+                        ids=[ids], documents=[documents], metadatas=[metadatas]
+                    )
+
+        return GetResult(ids=[ids], documents=[documents], metadatas=[metadatas])
+
+    def query(
+        self, collection_name: str, filter: dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        try:
+            result = self._collect(collection_name, filter=filter, limit=limit)
+            if result is None or not result.ids[0]:
+                return None
+            return result
+        except Exception as e:
+            log.exception(f"Error during query: {e}")
+            return None
+
+    def get(
+        self, collection_name: str, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        try:
+            return self._collect(collection_name, limit=limit)
+        except Exception as e:
+            log.exception(f"Error during get: {e}")
+            return None
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[list[str]] = None,
+        filter: Optional[dict] = None,
+    ):
+        collection = self._get_collection(collection_name)
+        if collection is None:
+            return
+
+        with collection.locked():
+            if ids:
+                rows = [
+                    collection.id_to_row[id] for id in ids if id in collection.id_to_row
+                ]
+                if filter:
+                    records = collection.read_records(rows)
+                    rows = [
+                        row
+                        for row, record in zip(rows, records)
+                        if matches_filter(record["metadata"], filter)
+                    ]
+            else:
+                rows = [
+                    row
+                    for row, record in collection.iter_records()
+                    if matches_filter(record["metadata"], filter)
+                ]
+
+            collection.delete_rows(rows)
+            log.info(f"Deleted {len(rows)} items from collection '{collection_name}'.")
+
+            self._schedule_compaction(collection)
+
+    def reset(self):
+        with self.lock:
+            self.collections = {}
+            shutil.rmtree(self.path, ignore_errors=True)
+            os.makedirs(self.path, exist_ok=True)
@@ -30,6 +30,8 @@ log = logging.getLogger(__name__)
 
 
 class MilvusClient(VectorDBBase):
+    multi_vector_search = True
+
     def __init__(self):
         self.collection_prefix = "open_webui"
         if MILVUS_TOKEN is None:
@@ -33,6 +33,8 @@ RESOURCE_ID_FIELD = "resource_id"
 
 
 class MilvusClient(VectorDBBase):
+    multi_vector_search = True
+
     def __init__(self):
         # Milvus collection names can only contain numbers, letters, and underscores.
         self.collection_prefix = MILVUS_COLLECTION_PREFIX.replace("-", "_")
@@ -1,4 +1,7 @@
+from contextlib import contextmanager
 from typing import Optional, List, Dict, Any, Tuple
+import csv
+import io
 import logging
 import json
 from sqlalchemy import (
@@ -20,8 +23,8 @@ from sqlalchemy import (
 from sqlalchemy.sql import true
 from sqlalchemy.pool import NullPool, QueuePool
 
-from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
-from sqlalchemy.dialects.postgresql import JSONB, array
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.dialects.postgresql import JSONB, array, insert as pg_insert
 from pgvector.sqlalchemy import Vector, HALFVEC
 from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.exc import NoSuchTableError
@@ -49,6 +52,8 @@ from open_webui.config import (
     PGVECTOR_HNSW_EF_CONSTRUCTION,
     PGVECTOR_IVFFLAT_LISTS,
     PGVECTOR_USE_HALFVEC,
+    PGVECTOR_INDEX_HALFVEC,
+    PGVECTOR_INSERT_BATCH_SIZE,
 )
 
 
@@ -56,7 +61,16 @@ VECTOR_LENGTH = PGVECTOR_INITIALIZE_MAX_VECTOR_LENGTH
 USE_HALFVEC = PGVECTOR_USE_HALFVEC
 
 VECTOR_TYPE_FACTORY = HALFVEC if USE_HALFVEC else Vector
-VECTOR_OPCLASS = "halfvec_cosine_ops" if USE_HALFVEC else "vector_cosine_ops"
+# Index a half-precision copy of full-precision vectors to halve index memory
+INDEX_HALFVEC = PGVECTOR_INDEX_HALFVEC and not USE_HALFVEC
+VECTOR_OPCLASS = (
+    "halfvec_cosine_ops" if USE_HALFVEC or INDEX_HALFVEC else "vector_cosine_ops"
+)
+VECTOR_INDEX_EXPRESSION = (
+    f"((vector::halfvec({VECTOR_LENGTH})) {VECTOR_OPCLASS})"
+    if INDEX_HALFVEC
+    else f"(vector {VECTOR_OPCLASS})"
+)
 Base = declarative_base()
 
 log = logging.getLogger(__name__)
@@ -70,6 +84,15 @@ def pgcrypto_decrypt(col, key, outtype="text"):
     return func.cast(func.pgp_sym_decrypt(col, literal(key)), outtype)
 
 
+def vector_cosine_distance(vector_col, query_vector):
+    # Must match the indexed expression for the vector index to be used
+    if INDEX_HALFVEC:
+        return cast(vector_col, HALFVEC(VECTOR_LENGTH)).cosine_distance(
+            cast(query_vector, HALFVEC(VECTOR_LENGTH))
+        )
+    return vector_col.cosine_distance(query_vector)
+
+
 class DocumentChunk(Base):
     __tablename__ = "document_chunk"
 
@@ -90,9 +113,9 @@ class PgvectorClient(VectorDBBase):
 
         # if no pgvector uri, use the existing database connection
         if not PGVECTOR_DB_URL:
-            from open_webui.internal.db import Session
+            from open_webui.internal.db import SessionLocal
 
-            self.session = Session
+            self.SessionLocal = SessionLocal
         else:
             if isinstance(PGVECTOR_POOL_SIZE, int):
                 if PGVECTOR_POOL_SIZE > 0:
@@ -112,73 +135,87 @@ class PgvectorClient(VectorDBBase):
             else:
                 engine = create_engine(PGVECTOR_DB_URL, pool_pre_ping=True)
 
-            SessionLocal = sessionmaker(
+            self.SessionLocal = sessionmaker(
                 autocommit=False, autoflush=False, bind=engine, expire_on_commit=False
             )
-            self.session = scoped_session(SessionLocal)
 
-        try:
-            # Ensure the pgvector extension is available
-            # Use a conditional check to avoid permission issues on Azure PostgreSQL
-            if PGVECTOR_CREATE_EXTENSION:
-                self.session.execute(
-                    text(
-                        """
-                    DO $$
-                    BEGIN
-                    IF NOT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'vector') THEN
-                        CREATE EXTENSION IF NOT EXISTS vector;
-                    END IF;
-                    END $$;
-                """
-                    )
-                )
-
-            if PGVECTOR_PGCRYPTO:
-                # Ensure the pgcrypto extension is available for encryption
+        with self.get_session() as session:
+            try:
+                # Ensure the pgvector extension is available
                 # Use a conditional check to avoid permission issues on Azure PostgreSQL
-                self.session.execute(
-                    text(
-                        """
-                    DO $$
-                    BEGIN
-                       IF NOT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pgcrypto') THEN
-                          CREATE EXTENSION IF NOT EXISTS pgcrypto;
-                       END IF;
-                    END $$;
-                """
+                if PGVECTOR_CREATE_EXTENSION:
+                    session.execute(
+                        text(
+                            """
+                        DO $$
+                        BEGIN
+                        IF NOT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'vector') THEN
+                            CREATE EXTENSION IF NOT EXISTS vector;
+                        END IF;
+                        END $$;
+                    """
+                        )
                     )
-                )
 
-                if not PGVECTOR_PGCRYPTO_KEY:
-                    raise ValueError(
-                        "PGVECTOR_PGCRYPTO_KEY must be set when PGVECTOR_PGCRYPTO is enabled."
+                if PGVECTOR_PGCRYPTO:
+                    # Ensure the pgcrypto extension is available for encryption
+                    # Use a conditional check to avoid permission issues on Azure PostgreSQL
+                    session.execute(
+                        text(
+                            """
+                        DO $$
+                        BEGIN
+                           IF NOT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pgcrypto') THEN
+                              CREATE EXTENSION IF NOT EXISTS pgcrypto;
+                           END IF;
+                        END $$;
+                    """
+                        )
                     )
 
-            # Check vector length consistency
-            self.check_vector_length()
+                    if not PGVECTOR_PGCRYPTO_KEY:
+                        raise ValueError(
+                            "PGVECTOR_PGCRYPTO_KEY must be set when PGVECTOR_PGCRYPTO is enabled."
+                        )
 
-            # Create the tables if they do not exist
-            # Base.metadata.create_all requires a bind (engine or connection)
-            # Get the connection from the session
-            connection = self.session.connection()
-            Base.metadata.create_all(bind=connection)
+                # Check vector length consistency
+                self.check_vector_length(session)
 
-            index_method, index_options = self._vector_index_configuration()
-            self._ensure_vector_index(index_method, index_options)
+                # Create the tables if they do not exist
+                # Base.metadata.create_all requires a bind (engine or connection)
+                # Get the connection from the session
+                connection = session.connection()
+                Base.metadata.create_all(bind=connection)
 
-            self.session.execute(
-                text(
-                    "CREATE INDEX IF NOT EXISTS idx_document_chunk_collection_name "
-                    "ON document_chunk (collection_name);"
+                index_method, index_options = self._vector_index_configuration()
+                self._ensure_vector_index(session, index_method, index_options)
+
+                session.execute(
+                    text(
+                        "CREATE INDEX IF NOT EXISTS idx_document_chunk_collection_name "
+                        "ON document_chunk (collection_name);"
+                    )
                 )
-            )
-            self.session.commit()
-            log.info("Initialization complete.")
-        except Exception as e:
-            self.session.rollback()
-            log.exception(f"Error during initialization: {e}")
-            raise
+                session.commit()
+                log.info("Initialization complete.")
+            except Exception as e:
+                session.rollback()
+                log.exception(f"Error during initialization: {e}")
+                raise
+
+    @contextmanager
+    def get_session(self):
+        """
+        Yield a session bound to its own pooled connection for one operation.
+
+        The client is used concurrently from threadpool workers (e.g. file
+        processing), so sessions are never shared between calls.
+        """
+        session = self.SessionLocal()
+        try:
+            yield session
+        finally:
+            session.close()
 
     @staticmethod
     def _extract_index_method(index_def: Optional[str]) -> Optional[str]:
@@ -213,9 +250,11 @@ class PgvectorClient(VectorDBBase):
 
         return index_method, index_options
 
-    def _ensure_vector_index(self, index_method: str, index_options: str) -> None:
+    def _ensure_vector_index(
+        self, session, index_method: str, index_options: str
+    ) -> None:
         index_name = "idx_document_chunk_vector"
-        existing_index_def = self.session.execute(
+        existing_index_def = session.execute(
             text(
                 """
                 SELECT indexdef
@@ -237,14 +276,21 @@ class PgvectorClient(VectorDBBase):
                 "and recreate it with the new method before restarting Open WebUI."
             )
 
+        if existing_index_def and VECTOR_OPCLASS not in existing_index_def:
+            raise RuntimeError(
+                f"Existing pgvector index '{index_name}' does not use operator class '{VECTOR_OPCLASS}' "
+                "required by the current PGVECTOR_USE_HALFVEC/PGVECTOR_INDEX_HALFVEC configuration. "
+                "Drop the index manually and restart Open WebUI to recreate it."
+            )
+
         if not existing_index_def:
             index_sql = (
                 f"CREATE INDEX IF NOT EXISTS {index_name} "
-                f"ON document_chunk USING {index_method} (vector {VECTOR_OPCLASS})"
+                f"ON document_chunk USING {index_method} {VECTOR_INDEX_EXPRESSION}"
             )
             if index_options:
                 index_sql = f"{index_sql} {index_options}"
-            self.session.execute(text(index_sql))
+            session.execute(text(index_sql))
             log.info(
                 "Ensured vector index '%s' using %s%s.",
                 index_name,
@@ -252,7 +298,7 @@ class PgvectorClient(VectorDBBase):
                 f" {index_options}" if index_options else "",
             )
 
-    def check_vector_length(self) -> None:
+    def check_vector_length(self, session) -> None:
         """
         Check if the VECTOR_LENGTH matches the existing vector column dimension in the database.
         Raises an exception if there is a mismatch.
@@ -261,7 +307,7 @@ class PgvectorClient(VectorDBBase):
         try:
             # Attempt to reflect the 'document_chunk' table
             document_chunk_table = Table(
-                "document_chunk", metadata, autoload_with=self.session.bind
+                "document_chunk", metadata, autoload_with=session.bind
             )
         except NoSuchTableError:
             # Table does not exist; no action needed
@@ -301,127 +347,191 @@ class PgvectorClient(VectorDBBase):
             vector = vector[:VECTOR_LENGTH]
         return vector
 
-    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
-        try:
-            if PGVECTOR_PGCRYPTO:
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    # Use raw SQL for BYTEA/pgcrypto
-                    # Ensure metadata is converted to its JSON text representation
-                    json_metadata = json.dumps(item["metadata"])
-                    self.session.execute(
-                        text(
-                            """
-                            INSERT INTO document_chunk
-                            (id, vector, collection_name, text, vmetadata)
-                            VALUES (
-                                :id, :vector, :collection_name,
-                                pgp_sym_encrypt(:text, :key),
-                                pgp_sym_encrypt(:metadata_text, :key)
-                            )
-                            ON CONFLICT (id) DO NOTHING
-                        """
-                        ),
+    def _batches(self, items: List[VectorItem]):
+        # A single ON CONFLICT statement can't touch the same row twice, so
+        # duplicate ids are dropped (last one wins), like sequential upserts
+        unique_items = {item["id"]: item for item in items}
+        if len(unique_items) < len(items):
+            log.warning(
+                f"Dropping {len(items) - len(unique_items)} items with duplicate ids, "
+                "keeping the last item for each id"
+            )
+            items = list(unique_items.values())
+        batch_size = max(PGVECTOR_INSERT_BATCH_SIZE, 1)
+        for i in range(0, len(items), batch_size):
+            yield items[i : i + batch_size]
+
+    def _on_conflict(self, stmt, overwrite: bool):
+        if overwrite:
+            return stmt.on_conflict_do_update(
+                index_elements=[DocumentChunk.id],
+                set_={
+                    "vector": stmt.excluded.vector,
+                    "collection_name": stmt.excluded.collection_name,
+                    "text": stmt.excluded.text,
+                    "vmetadata": stmt.excluded.vmetadata,
+                },
+            )
+        if PGVECTOR_PGCRYPTO:
+            # Encrypted inserts always skipped existing ids
+            return stmt.on_conflict_do_nothing(index_elements=[DocumentChunk.id])
+        # Inserting an existing id raises, like a plain insert
+        return stmt
+
+    def _write_multi_row(
+        self,
+        session,
+        collection_name: str,
+        items: List[VectorItem],
+        overwrite: bool,
+    ) -> None:
+        """
+        One multi-row INSERT per batch. Encrypted rows are
+        encrypted by pgcrypto inside the statement, so plaintext never lands in
+        a table.
+        """
+        for batch in self._batches(items):
+            rows = []
+            for item in batch:
+                vector = self.adjust_vector_length(item["vector"])
+                if PGVECTOR_PGCRYPTO:
+                    rows.append(
                         {
                             "id": item["id"],
                             "vector": vector,
                             "collection_name": collection_name,
-                            "text": item["text"],
-                            "metadata_text": json_metadata,
-                            "key": PGVECTOR_PGCRYPTO_KEY,
-                        },
-                    )
-                self.session.commit()
-                log.info(f"Encrypted & inserted {len(items)} into '{collection_name}'")
-
-            else:
-                new_items = []
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    new_chunk = DocumentChunk(
-                        id=item["id"],
-                        vector=vector,
-                        collection_name=collection_name,
-                        text=item["text"],
-                        vmetadata=process_metadata(item["metadata"]),
+                            "text": pgcrypto_encrypt(
+                                item["text"], PGVECTOR_PGCRYPTO_KEY
+                            ),
+                            "vmetadata": pgcrypto_encrypt(
+                                json.dumps(item["metadata"]), PGVECTOR_PGCRYPTO_KEY
+                            ),
+                        }
                     )
-                    new_items.append(new_chunk)
-                self.session.bulk_save_objects(new_items)
-                self.session.commit()
-                log.info(
-                    f"Inserted {len(new_items)} items into collection '{collection_name}'."
-                )
-        except Exception as e:
-            self.session.rollback()
-            log.exception(f"Error during insert: {e}")
-            raise
-
-    def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
-        try:
-            if PGVECTOR_PGCRYPTO:
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    json_metadata = json.dumps(item["metadata"])
-                    self.session.execute(
-                        text(
-                            """
-                            INSERT INTO document_chunk
-                            (id, vector, collection_name, text, vmetadata)
-                            VALUES (
-                                :id, :vector, :collection_name,
-                                pgp_sym_encrypt(:text, :key),
-                                pgp_sym_encrypt(:metadata_text, :key)
-                            )
-                            ON CONFLICT (id) DO UPDATE SET
-                              vector = EXCLUDED.vector,
-                              collection_name = EXCLUDED.collection_name,
-                              text = EXCLUDED.text,
-                              vmetadata = EXCLUDED.vmetadata
-                        """
-                        ),
+                else:
+                    rows.append(
                         {
                             "id": item["id"],
                             "vector": vector,
                             "collection_name": collection_name,
                             "text": item["text"],
-                            "metadata_text": json_metadata,
-                            "key": PGVECTOR_PGCRYPTO_KEY,
-                        },
+                            "vmetadata": process_metadata(item["metadata"]),
+                        }
                     )
-                self.session.commit()
-                log.info(f"Encrypted & upserted {len(items)} into '{collection_name}'")
-            else:
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    existing = (
-                        self.session.query(DocumentChunk)
-                        .filter(DocumentChunk.id == item["id"])
-                        .first()
+
+            stmt = pg_insert(DocumentChunk.__table__).values(rows)
+            session.execute(self._on_conflict(stmt, overwrite))
+
+    def _write_copy(
+        self,
+        session,
+        cursor,
+        collection_name: str,
+        items: List[VectorItem],
+        overwrite: bool,
+    ) -> None:
+        """
+        COPY rows into a transaction-scoped staging table, then move them into
+        document_chunk with a single INSERT ... SELECT.
+        """
+        vector_type = f"{'halfvec' if USE_HALFVEC else 'vector'}({VECTOR_LENGTH})"
+
+        session.execute(
+            text(
+                "CREATE TEMP TABLE IF NOT EXISTS document_chunk_staging "
+                "(id text, vector text, collection_name text, text text, vmetadata text) "
+                "ON COMMIT DROP"
+            )
+        )
+
+        for batch in self._batches(items):
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, quoting=csv.QUOTE_ALL)
+            for item in batch:
+                vector = self.adjust_vector_length(item["vector"])
+                writer.writerow(
+                    [
+                        item["id"],
+                        "[" + ",".join(str(float(v)) for v in vector) + "]",
+                        collection_name,
+                        item["text"],
+                        json.dumps(process_metadata(item["metadata"])),
+                    ]
+                )
+            buffer.seek(0)
+
+            cursor.copy_expert(
+                "COPY document_chunk_staging (id, vector, collection_name, text, vmetadata) "
+                "FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+
+        # Without overwrite, inserting an existing id raises like a plain insert
+        on_conflict = ""
+        if overwrite:
+            on_conflict = (
+                "ON CONFLICT (id) DO UPDATE SET "
+                "vector = EXCLUDED.vector, "
+                "collection_name = EXCLUDED.collection_name, "
+                "text = EXCLUDED.text, "
+                "vmetadata = EXCLUDED.vmetadata"
+            )
+        session.execute(
+            text(
+                f"""
+                INSERT INTO document_chunk (id, vector, collection_name, text, vmetadata)
+                SELECT id, vector::{vector_type}, collection_name, text, vmetadata::jsonb
+                FROM document_chunk_staging
+                {on_conflict}
+                """
+            )
+        )
+
+    def _write(
+        self, collection_name: str, items: List[VectorItem], overwrite: bool
+    ) -> None:
+        with self.get_session() as session:
+            try:
+                cursor = None
+                if not PGVECTOR_PGCRYPTO:
+                    # COPY is only available through psycopg2's raw cursor
+                    driver_connection = (
+                        session.connection().connection.driver_connection
                     )
-                    if existing:
-                        existing.vector = vector
-                        existing.text = item["text"]
-                        existing.vmetadata = process_metadata(item["metadata"])
-                        existing.collection_name = (
-                            collection_name  # Update collection_name if necessary
+                    if hasattr(driver_connection, "cursor"):
+                        cursor = driver_connection.cursor()
+                        if not hasattr(cursor, "copy_expert"):
+                            cursor = None
+
+                if cursor is not None:
+                    with cursor:
+                        self._write_copy(
+                            session, cursor, collection_name, items, overwrite
                         )
-                    else:
-                        new_chunk = DocumentChunk(
-                            id=item["id"],
-                            vector=vector,
-                            collection_name=collection_name,
-                            text=item["text"],
-                            vmetadata=process_metadata(item["metadata"]),
-                        )
-                        self.session.add(new_chunk)
-                self.session.commit()
-                log.info(
-                    f"Upserted {len(items)} items into collection '{collection_name}'."
+                else:
+                    self._write_multi_row(session, collection_name, items, overwrite)
+
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                log.exception(
+                    f"Error during {'upsert' if overwrite else 'insert'}: {e}"
                 )
-        except Exception as e:
-            self.session.rollback()
-            log.exception(f"Error during upsert: {e}")
-            raise
+                raise
+
+    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+        self._write(collection_name, items, overwrite=False)
+        log.info(
+            f"{'Encrypted & inserted' if PGVECTOR_PGCRYPTO else 'Inserted'} "
+            f"{len(items)} items into collection '{collection_name}'."
+        )
+
+    def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        self._write(collection_name, items, overwrite=True)
+        log.info(
+            f"{'Encrypted & upserted' if PGVECTOR_PGCRYPTO else 'Upserted'} "
+            f"{len(items)} items into collection '{collection_name}'."
+        )
 
     def search(
         self,
@@ -429,214 +539,246 @@ class PgvectorClient(VectorDBBase):
         vectors: List[List[float]],
         limit: Optional[int] = None,
     ) -> Optional[SearchResult]:
-        try:
-            if not vectors:
-                return None
-
-            # Adjust query vectors to VECTOR_LENGTH
-            vectors = [self.adjust_vector_length(vector) for vector in vectors]
-            num_queries = len(vectors)
-
-            def vector_expr(vector):
-                return cast(array(vector), VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
+        if not vectors:
+            return None
+        return self.search_batch([collection_name], vectors, limit)[collection_name]
 
-            # Create the values for query vectors
-            qid_col = column("qid", Integer)
-            q_vector_col = column("q_vector", VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
-            query_vectors = (
-                values(qid_col, q_vector_col)
-                .data(
-                    [(idx, vector_expr(vector)) for idx, vector in enumerate(vectors)]
+    def search_batch(
+        self,
+        collection_names: List[str],
+        vectors: List[List[float]],
+        limit: Optional[int] = None,
+    ) -> Dict[str, Optional[SearchResult]]:
+        collection_names = list(dict.fromkeys(collection_names))
+        if not vectors or not collection_names:
+            return {collection_name: None for collection_name in collection_names}
+
+        with self.get_session() as session:
+            try:
+                # Adjust query vectors to VECTOR_LENGTH
+                vectors = [self.adjust_vector_length(vector) for vector in vectors]
+                num_queries = len(vectors)
+
+                def vector_expr(vector):
+                    return cast(array(vector), VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
+
+                # Create the values for query vectors and searched collections
+                qid_col = column("qid", Integer)
+                q_vector_col = column("q_vector", VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
+                query_vectors = (
+                    values(qid_col, q_vector_col)
+                    .data(
+                        [
+                            (idx, vector_expr(vector))
+                            for idx, vector in enumerate(vectors)
+                        ]
+                    )
+                    .alias("query_vectors")
                 )
-                .alias("query_vectors")
-            )
-
-            result_fields = [
-                DocumentChunk.id,
-            ]
-            if PGVECTOR_PGCRYPTO:
-                result_fields.append(
-                    pgcrypto_decrypt(
-                        DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text
-                    ).label("text")
+                query_collections = (
+                    values(column("q_collection_name", Text))
+                    .data([(collection_name,) for collection_name in collection_names])
+                    .alias("query_collections")
                 )
+
+                result_fields = [
+                    DocumentChunk.id,
+                ]
+                if PGVECTOR_PGCRYPTO:
+                    result_fields.append(
+                        pgcrypto_decrypt(
+                            DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text
+                        ).label("text")
+                    )
+                    result_fields.append(
+                        pgcrypto_decrypt(
+                            DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
+                        ).label("vmetadata")
+                    )
+                else:
+                    result_fields.append(DocumentChunk.text)
+                    result_fields.append(DocumentChunk.vmetadata)
                 result_fields.append(
-                    pgcrypto_decrypt(
-                        DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
-                    ).label("vmetadata")
-                )
-            else:
-                result_fields.append(DocumentChunk.text)
-                result_fields.append(DocumentChunk.vmetadata)
-            result_fields.append(
-                (DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector)).label(
-                    "distance"
+                    (
+                        vector_cosine_distance(
+                            DocumentChunk.vector, query_vectors.c.q_vector
+                        )
+                    ).label("distance")
                 )
-            )
 
-            # Build the lateral subquery for each query vector
-            subq = (
-                select(*result_fields)
-                .where(DocumentChunk.collection_name == collection_name)
-                .order_by(
-                    (DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector))
+                # Build the lateral subquery for each (collection, query vector)
+                subq = (
+                    select(*result_fields)
+                    .where(
+                        DocumentChunk.collection_name
+                        == query_collections.c.q_collection_name
+                    )
+                    .order_by(
+                        (
+                            vector_cosine_distance(
+                                DocumentChunk.vector, query_vectors.c.q_vector
+                            )
+                        )
+                    )
                 )
-            )
-            if limit is not None:
-                subq = subq.limit(limit)
-            subq = subq.lateral("result")
-
-            # Build the main query by joining query_vectors and the lateral subquery
-            stmt = (
-                select(
-                    query_vectors.c.qid,
-                    subq.c.id,
-                    subq.c.text,
-                    subq.c.vmetadata,
-                    subq.c.distance,
+                if limit is not None:
+                    subq = subq.limit(limit)
+                subq = subq.lateral("result")
+
+                # Pair every collection with every query vector and join the
+                # lateral subquery, all in a single round trip
+                stmt = (
+                    select(
+                        query_collections.c.q_collection_name,
+                        query_vectors.c.qid,
+                        subq.c.id,
+                        subq.c.text,
+                        subq.c.vmetadata,
+                        subq.c.distance,
+                    )
+                    .select_from(query_collections)
+                    .join(query_vectors, true())
+                    .join(subq, true())
+                    .order_by(
+                        query_collections.c.q_collection_name,
+                        query_vectors.c.qid,
+                        subq.c.distance,
+                    )
                 )
-                .select_from(query_vectors)
-                .join(subq, true())
-                .order_by(query_vectors.c.qid, subq.c.distance)
-            )
-
-            result_proxy = self.session.execute(stmt)
-            results = result_proxy.all()
 
-            ids = [[] for _ in range(num_queries)]
-            distances = [[] for _ in range(num_queries)]
-            documents = [[] for _ in range(num_queries)]
-            metadatas = [[] for _ in range(num_queries)]
-
-            if not results:
-                return SearchResult(
-                    ids=ids,
-                    distances=distances,
-                    documents=documents,
-                    metadatas=metadatas,
-                )
-
-            for row in results:
-                qid = int(row.qid)
-                ids[qid].append(row.id)
-                # normalize and re-orders pgvec distance from [2, 0] to [0, 1] score range
-                # https://github.com/pgvector/pgvector?tab=readme-ov-file#querying
-                distances[qid].append((2.0 - row.distance) / 2.0)
-                documents[qid].append(row.text)
-                metadatas[qid].append(row.vmetadata)
-
-            self.session.rollback()  # read-only transaction
-            return SearchResult(
-                ids=ids, distances=distances, documents=documents, metadatas=metadatas
-            )
-        except Exception as e:
-            self.session.rollback()
-            log.exception(f"Error during search: {e}")
-            return None
+                result_proxy = session.execute(stmt)
+                results = result_proxy.all()
+
+                rows = {
+                    collection_name: {
+                        field: [[] for _ in range(num_queries)]
+                        for field in ("ids", "distances", "documents", "metadatas")
+                    }
+                    for collection_name in collection_names
+                }
+
+                for row in results:
+                    qid = int(row.qid)
+                    collection_rows = rows[row.q_collection_name]
+                    collection_rows["ids"][qid].append(row.id)
+                    # normalize and re-orders pgvec distance from [2, 0] to [0, 1] score range
+                    # https://github.com/pgvector/pgvector?tab=readme-ov-file#querying
+                    collection_rows["distances"][qid].append((2.0 - row.distance) / 2.0)
+                    collection_rows["documents"][qid].append(row.text)
+                    collection_rows["metadatas"][qid].append(row.vmetadata)
+
+                return {
+                    collection_name: SearchResult(**collection_rows)
+                    for collection_name, collection_rows in rows.items()
+                }
+            except Exception as e:
+                session.rollback()
+                log.exception(f"Error during search: {e}")
+                return {collection_name: None for collection_name in collection_names}
 
     def query(
         self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None
     ) -> Optional[GetResult]:
-        try:
-            if PGVECTOR_PGCRYPTO:
-                # Build where clause for vmetadata filter
-                where_clauses = [DocumentChunk.collection_name == collection_name]
-                for key, value in filter.items():
-                    # decrypt then check key: JSON filter after decryption
-                    where_clauses.append(
+        with self.get_session() as session:
+            try:
+                if PGVECTOR_PGCRYPTO:
+                    # Build where clause for vmetadata filter
+                    where_clauses = [DocumentChunk.collection_name == collection_name]
+                    for key, value in filter.items():
+                        # decrypt then check key: JSON filter after decryption
+                        where_clauses.append(
+                            pgcrypto_decrypt(
+                                DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
+                            )[key].astext
+                            == str(value)
+                        )
+                    stmt = select(
+                        DocumentChunk.id,
+                        pgcrypto_decrypt(
+                            DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text
+                        ).label("text"),
                         pgcrypto_decrypt(
                             DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
-                        )[key].astext
-                        == str(value)
+                        ).label("vmetadata"),
+                    ).where(*where_clauses)
+                    if limit is not None:
+                        stmt = stmt.limit(limit)
+                    results = session.execute(stmt).all()
+                else:
+                    query = session.query(DocumentChunk).filter(
+                        DocumentChunk.collection_name == collection_name
                     )
-                stmt = select(
-                    DocumentChunk.id,
-                    pgcrypto_decrypt(
-                        DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text
-                    ).label("text"),
-                    pgcrypto_decrypt(
-                        DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
-                    ).label("vmetadata"),
-                ).where(*where_clauses)
-                if limit is not None:
-                    stmt = stmt.limit(limit)
-                results = self.session.execute(stmt).all()
-            else:
-                query = self.session.query(DocumentChunk).filter(
-                    DocumentChunk.collection_name == collection_name
-                )
 
-                for key, value in filter.items():
-                    query = query.filter(
-                        DocumentChunk.vmetadata[key].astext == str(value)
-                    )
+                    for key, value in filter.items():
+                        query = query.filter(
+                            DocumentChunk.vmetadata[key].astext == str(value)
+                        )
 
-                if limit is not None:
-                    query = query.limit(limit)
+                    if limit is not None:
+                        query = query.limit(limit)
 
-                results = query.all()
+                    results = query.all()
 
-            if not results:
-                return None
+                if not results:
+                    return None
 
-            ids = [[result.id for result in results]]
-            documents = [[result.text for result in results]]
-            metadatas = [[result.vmetadata for result in results]]
+                ids = [[result.id for result in results]]
+                documents = [[result.text for result in results]]
+                metadatas = [[result.vmetadata for result in results]]
 
-            self.session.rollback()  # read-only transaction
-            return GetResult(
-                ids=ids,
-                documents=documents,
-                metadatas=metadatas,
-            )
-        except Exception as e:
-            self.session.rollback()
-            log.exception(f"Error during query: {e}")
-            return None
+                return GetResult(
+                    ids=ids,
+                    documents=documents,
+                    metadatas=metadatas,
+                )
+            except Exception as e:
+                session.rollback()
+                log.exception(f"Error during query: {e}")
+                return None
 
     def get(
         self, collection_name: str, limit: Optional[int] = None
     ) -> Optional[GetResult]:
-        try:
-            if PGVECTOR_PGCRYPTO:
-                stmt = select(
-                    DocumentChunk.id,
-                    pgcrypto_decrypt(
-                        DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text
-                    ).label("text"),
-                    pgcrypto_decrypt(
-                        DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
-                    ).label("vmetadata"),
-                ).where(DocumentChunk.collection_name == collection_name)
-                if limit is not None:
-                    stmt = stmt.limit(limit)
-                results = self.session.execute(stmt).all()
-                ids = [[row.id for row in results]]
-                documents = [[row.text for row in results]]
-                metadatas = [[row.vmetadata for row in results]]
-            else:
+        with self.get_session() as session:
+            try:
+                if PGVECTOR_PGCRYPTO:
+                    stmt = select(
+                        DocumentChunk.id,
+                        pgcrypto_decrypt(
+                            DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text
+                        ).label("text"),
+                        pgcrypto_decrypt(
+                            DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
+                        ).label("vmetadata"),
+                    ).where(DocumentChunk.collection_name == collection_name)
+                    if limit is not None:
+                        stmt = stmt.limit(limit)
+                    results = session.execute(stmt).all()
+                    ids = [[row.id for row in results]]
+                    documents = [[row.text for row in results]]
+                    metadatas = [[row.vmetadata for row in results]]
+                else:
 
-                query = self.session.query(DocumentChunk).filter(
-                    DocumentChunk.collection_name == collection_name
-                )
-                if limit is not None:
-                    query = query.limit(limit)
+                    query = session.query(DocumentChunk).filter(
+                        DocumentChunk.collection_name == collection_name
+                    )
+                    if limit is not None:
+                        query = query.limit(limit)
 
-                results = query.all()
+                    results = query.all()
 
-                if not results:
-                    return None
+                    if not results:
+                        return None
 
-                ids = [[result.id for result in results]]
-                documents = [[result.text for result in results]]
-                metadatas = [[result.vmetadata for result in results]]
+                    ids = [[result.id for result in results]]
+                    documents = [[result.text for result in results]]
+                    metadatas = [[result.vmetadata for result in results]]
 
-            self.session.rollback()  # read-only transaction
-            return GetResult(ids=ids, documents=documents, metadatas=metadatas)
-        except Exception as e:
-            self.session.rollback()
-            log.exception(f"Error during get: {e}")
-            return None
+                return GetResult(ids=ids, documents=documents, metadatas=metadatas)
+            except Exception as e:
+                session.rollback()
+                log.exception(f"Error during get: {e}")
+                return None
 
     def delete(
         self,
@@ -644,70 +786,76 @@ class PgvectorClient(VectorDBBase):
         ids: Optional[List[str]] = None,
         filter: Optional[Dict[str, Any]] = None,
     ) -> None:
-        try:
-            if PGVECTOR_PGCRYPTO:
-                wheres = [DocumentChunk.collection_name == collection_name]
-                if ids:
-                    wheres.append(DocumentChunk.id.in_(ids))
-                if filter:
-                    for key, value in filter.items():
-                        wheres.append(
-                            pgcrypto_decrypt(
-                                DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
-                            )[key].astext
-                            == str(value)
-                        )
-                stmt = DocumentChunk.__table__.delete().where(*wheres)
-                result = self.session.execute(stmt)
-                deleted = result.rowcount
-            else:
-                query = self.session.query(DocumentChunk).filter(
-                    DocumentChunk.collection_name == collection_name
+        with self.get_session() as session:
+            try:
+                if PGVECTOR_PGCRYPTO:
+                    wheres = [DocumentChunk.collection_name == collection_name]
+                    if ids:
+                        wheres.append(DocumentChunk.id.in_(ids))
+                    if filter:
+                        for key, value in filter.items():
+                            wheres.append(
+                                pgcrypto_decrypt(
+                                    DocumentChunk.vmetadata,
+                                    PGVECTOR_PGCRYPTO_KEY,
+                                    JSONB,
+                                )[key].astext
+                                == str(value)
+                            )
+                    stmt = DocumentChunk.__table__.delete().where(*wheres)
+                    result = session.execute(stmt)
+                    deleted = result.rowcount
+                else:
+                    query = session.query(DocumentChunk).filter(
+                        DocumentChunk.collection_name == collection_name
+                    )
+                    if ids:
+                        query = query.filter(DocumentChunk.id.in_(ids))
+                    if filter:
+                        for key, value in filter.items():
+                            query = query.filter(
+                                DocumentChunk.vmetadata[key].astext == str(value)
+                            )
+                    deleted = query.delete(synchronize_session=False)
+                session.commit()
+                log.info(
+                    f"Deleted {deleted} items from collection '{collection_name}'."
                 )
-                if ids:
-                    query = query.filter(DocumentChunk.id.in_(ids))
-                if filter:
-                    for key, value in filter.items():
-                        query = query.filter(
-                            DocumentChunk.vmetadata[key].astext == str(value)
-                        )
-                deleted = query.delete(synchronize_session=False)
-            self.session.commit()
-            log.info(f"Deleted {deleted} items from collection '{collection_name}'.")
-        except Exception as e:
-            self.session.rollback()
-            log.exception(f"Error during delete: {e}")
-            raise
+            except Exception as e:
+                session.rollback()
+                log.exception(f"Error during delete: {e}")
+                raise
 
     def reset(self) -> None:
-        try:
-            deleted = self.session.query(DocumentChunk).delete()
-            self.session.commit()
-            log.info(
-                f"Reset complete. Deleted {deleted} items from 'document_chunk' table."
-            )
-        except Exception as e:
-            self.session.rollback()
-            log.exception(f"Error during reset: {e}")
-            raise
+        with self.get_session() as session:
+            try:
+                deleted = session.query(DocumentChunk).delete()
+                session.commit()
+                log.info(
+                    f"Reset complete. Deleted {deleted} items from 'document_chunk' table."
+                )
+            except Exception as e:
+                session.rollback()
+                log.exception(f"Error during reset: {e}")
+                raise
 
     def close(self) -> None:
         pass
 
     def has_collection(self, collection_name: str) -> bool:
-        try:
-            exists = (
-                self.session.query(DocumentChunk)
-                .filter(DocumentChunk.collection_name == collection_name)
-                .first()
-                is not None
-            )
-            self.session.rollback()  # read-only transaction
-            return exists
-        except Exception as e:
-            self.session.rollback()
-            log.exception(f"Error checking collection existence: {e}")
-            return False
+        with self.get_session() as session:
+            try:
+                exists = (
+                    session.query(DocumentChunk)
+                    .filter(DocumentChunk.collection_name == collection_name)
+                    .first()
+                    is not None
+                )
+                return exists
+            except Exception as e:
+                session.rollback()
+                log.exception(f"Error checking collection existence: {e}")
+                return False
 
     def delete_collection(self, collection_name: str) -> None:
         self.delete(collection_name)
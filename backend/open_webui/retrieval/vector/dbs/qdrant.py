@@ -29,6 +29,8 @@ log = logging.getLogger(__name__)
 
 
 class QdrantClient(VectorDBBase):
+    multi_vector_search = True
+
     def __init__(self):
         self.collection_prefix = QDRANT_COLLECTION_PREFIX
         self.QDRANT_URI = QDRANT_URI
@@ -83,6 +85,22 @@ class QdrantClient(VectorDBBase):
             }
         )
 
+    def _responses_to_search_result(self, query_responses) -> SearchResult:
+        ids, documents, metadatas, distances = [], [], [], []
+        for query_response in query_responses:
+            get_result = self._result_to_get_result(query_response.points)
+            ids.extend(get_result.ids)
+            documents.extend(get_result.documents)
+            metadatas.extend(get_result.metadatas)
+            # qdrant distance is [-1, 1], normalize to [0, 1]
+            distances.append(
+                [(point.score + 1.0) / 2.0 for point in query_response.points]
+            )
+
+        return SearchResult(
+            ids=ids, documents=documents, metadatas=metadatas, distances=distances
+        )
+
     def _create_collection(self, collection_name: str, dimension: int):
         collection_name_with_prefix = f"{self.collection_prefix}_{collection_name}"
         self.client.create_collection(
@@ -151,19 +169,15 @@ class QdrantClient(VectorDBBase):
         if limit is None:
             limit = NO_LIMIT  # otherwise qdrant would set limit to 10!
 
-        query_response = self.client.query_points(
+        # One request for all query vectors
+        query_responses = self.client.query_batch_points(
             collection_name=f"{self.collection_prefix}_{collection_name}",
-            query=vectors[0],
-            limit=limit,
-        )
-        get_result = self._result_to_get_result(query_response.points)
-        return SearchResult(
-            ids=get_result.ids,
-            documents=get_result.documents,
-            metadatas=get_result.metadatas,
-            # qdrant distance is [-1, 1], normalize to [0, 1]
-            distances=[[(point.score + 1.0) / 2.0 for point in query_response.points]],
+            requests=[
+                models.QueryRequest(query=vector, limit=limit, with_payload=True)
+                for vector in vectors
+            ],
         )
+        return self._responses_to_search_result(query_responses)
 
     def query(self, collection_name: str, filter: dict, limit: Optional[int] = None):
         # Construct the filter string for querying
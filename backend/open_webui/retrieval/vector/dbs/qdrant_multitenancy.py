@@ -97,6 +97,33 @@ class QdrantClient(VectorDBBase):
             metadatas.append(payload["metadata"])
         return GetResult(ids=[ids], documents=[documents], metadatas=[metadatas])
 
+    def _responses_to_search_result(self, query_responses) -> SearchResult:
+        ids, documents, metadatas, distances = [], [], [], []
+        for query_response in query_responses:
+            get_result = self._result_to_get_result(query_response.points)
+            ids.extend(get_result.ids)
+            documents.extend(get_result.documents)
+            metadatas.extend(get_result.metadatas)
+            distances.append(
+                [(point.score + 1.0) / 2.0 for point in query_response.points]
+            )
+        return SearchResult(
+            ids=ids, documents=documents, metadatas=metadatas, distances=distances
+        )
+
+    def _search_requests(
+        self, tenant_id: str, vectors: List[List[float | int]], limit: int
+    ) -> List[models.QueryRequest]:
+        return [
+            models.QueryRequest(
+                query=vector,
+                limit=limit,
+                filter=models.Filter(must=[_tenant_filter(tenant_id)]),
+                with_payload=True,
+            )
+            for vector in vectors
+        ]
+
     def _get_collection_and_tenant_id(self, collection_name: str) -> Tuple[str, str]:
         """
         Maps the traditional collection name to multi-tenant collection and tenant ID.
@@ -266,20 +293,54 @@ class QdrantClient(VectorDBBase):
             log.debug(f"Collection {mt_collection} doesn't exist, search returns None")
             return None
 
-        tenant_filter = _tenant_filter(tenant_id)
-        query_response = self.client.query_points(
+        query_responses = self.client.query_batch_points(
             collection_name=mt_collection,
-            query=vectors[0],
-            limit=limit,
-            query_filter=models.Filter(must=[tenant_filter]),
-        )
-        get_result = self._result_to_get_result(query_response.points)
-        return SearchResult(
-            ids=get_result.ids,
-            documents=get_result.documents,
-            metadatas=get_result.metadatas,
-            distances=[[(point.score + 1.0) / 2.0 for point in query_response.points]],
+            requests=self._search_requests(tenant_id, vectors, limit),
         )
+        return self._responses_to_search_result(query_responses)
+
+    def search_batch(
+        self,
+        collection_names: List[str],
+        vectors: List[List[float | int]],
+        limit: int,
+    ) -> Dict[str, Optional[SearchResult]]:
+        """
+        Search several logical collections with one batch request per shared
+        collection, each tenant with all the query vectors.
+        """
+        collection_names = list(dict.fromkeys(collection_names))
+        results = {collection_name: None for collection_name in collection_names}
+        if not self.client or not vectors:
+            return results
+
+        tenants: Dict[str, List[Tuple[str, str]]] = {}
+        for collection_name in collection_names:
+            mt_collection, tenant_id = self._get_collection_and_tenant_id(
+                collection_name
+            )
+            tenants.setdefault(mt_collection, []).append((collection_name, tenant_id))
+
+        for mt_collection, collections in tenants.items():
+            try:
+                if not self.client.collection_exists(collection_name=mt_collection):
+                    continue
+
+                query_responses = self.client.query_batch_points(
+                    collection_name=mt_collection,
+                    requests=[
+                        request
+                        for _, tenant_id in collections
+                        for request in self._search_requests(tenant_id, vectors, limit)
+                    ],
+                )
+                for idx, (collection_name, _) in enumerate(collections):
+                    results[collection_name] = self._responses_to_search_result(
+                        query_responses[idx * len(vectors) : (idx + 1) * len(vectors)]
+                    )
+            except Exception as e:
+                log.exception(f"Error searching collection {mt_collection}: {e}")
+        return results
 
     def query(
         self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None
@@ -1,5 +1,9 @@
+from functools import partial
+
+from open_webui.retrieval.vector.aliases import AliasedVectorDBClient
 from open_webui.retrieval.vector.main import VectorDBBase
 from open_webui.retrieval.vector.type import VectorType
+from open_webui.utils.lazy import LazyObject
 from open_webui.config import (
     VECTOR_DB,
     ENABLE_QDRANT_MULTITENANCY_MODE,
@@ -71,8 +75,18 @@ class Vector:
                 from open_webui.retrieval.vector.dbs.weaviate import WeaviateClient
 
                 return WeaviateClient()
+            case VectorType.EMBEDDED:
+                from open_webui.retrieval.vector.dbs.embedded import (
+                    EmbeddedVectorClient,
+                )
+
+                return EmbeddedVectorClient()
             case _:
                 raise ValueError(f"Unsupported vector type: {vector_type}")
 
 
-VECTOR_DB_CLIENT = Vector.get_vector(VECTOR_DB)
+# Collection aliases let a rebuilt collection replace the live one atomically.
+# The backend client is connected on first use or by the startup warm-up.
+VECTOR_DB_CLIENT = AliasedVectorDBClient(
+    LazyObject(f"{VECTOR_DB} client", partial(Vector.get_vector, VECTOR_DB))
+)
@@ -1,7 +1,10 @@
+import logging
 from pydantic import BaseModel
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, Union
 
+log = logging.getLogger(__name__)
+
 
 class VectorItem(BaseModel):
     id: str
@@ -31,6 +34,10 @@ class VectorDBBase(ABC):
     implement all abstract methods.
     """
 
+    # Whether `search` returns one row per query vector, so `search_batch`
+    # can pass all of them at once instead of searching them one by one
+    multi_vector_search: bool = False
+
     @abstractmethod
     def has_collection(self, collection_name: str) -> bool:
         """Check if the collection exists in the vector DB."""
@@ -58,6 +65,50 @@ class VectorDBBase(ABC):
         """Search for similar vectors in a collection."""
         pass
 
+    def search_batch(
+        self,
+        collection_names: List[str],
+        vectors: List[List[Union[float, int]]],
+        limit: int,
+    ) -> Dict[str, Optional[SearchResult]]:
+        """
+        Search several collections for several query vectors at once.
+
+        Returns a SearchResult per collection with one row per query vector,
+        in the order of `vectors`, or None for collections that don't exist or
+        failed to be searched. Backends that can search many vectors or
+        collections in a single request override this.
+        """
+        results = {}
+        for collection_name in dict.fromkeys(collection_names):
+            try:
+                if self.multi_vector_search:
+                    results[collection_name] = self.search(
+                        collection_name, vectors, limit
+                    )
+                    continue
+
+                rows = []
+                for vector in vectors:
+                    row = self.search(collection_name, [vector], limit)
+                    if row is None:
+                        break
+                    rows.append(row)
+                if len(rows) < len(vectors):
+                    results[collection_name] = None
+                    continue
+
+                results[collection_name] = SearchResult(
+                    ids=[row.ids[0] for row in rows],
+                    distances=[row.distances[0] for row in rows],
+                    documents=[row.documents[0] for row in rows],
+                    metadatas=[row.metadatas[0] for row in rows],
+                )
+            except Exception as e:
+                log.exception(f"Error searching collection {collection_name}: {e}")
+                results[collection_name] = None
+        return results
+
     @abstractmethod
     def query(
         self, collection_name: str, filter: Dict, limit: Optional[int] = None
@@ -0,0 +1,247 @@
+import hashlib
+import json
+import logging
+import time
+from collections import defaultdict
+from email.utils import parsedate_to_datetime
+from typing import Any, Mapping, Optional
+
+from open_webui.env import (
+    REDIS_KEY_PREFIX,
+    WEB_PAGE_CACHE_TTL,
+    WEB_SEARCH_CACHE_BACKEND,
+    WEB_SEARCH_CACHE_MAX_SIZE,
+    WEB_SEARCH_CACHE_TTL,
+)
+from open_webui.utils.cache import LRUCache
+
+log = logging.getLogger(__name__)
+
+WEB_SEARCH_CACHE_KEY = f"{REDIS_KEY_PREFIX}:web_search:cache"
+
+# Pages past their freshness are kept this long to be revalidated with
+# If-None-Match / If-Modified-Since instead of being fetched again
+WEB_PAGE_CACHE_RETENTION = 24 * 3600
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def parse_cache_control(value: Optional[str]) -> dict[str, Optional[str]]:
+    directives = {}
+    for directive in (value or "").split(","):
+        name, _, argument = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
+
+
+def get_page_expiry(
+    headers: Mapping[str, str], default_ttl: int = WEB_PAGE_CACHE_TTL
+) -> Optional[float]:
+    """
+    When a response with `headers` stops being fresh, following Cache-Control
+    and Expires, or `default_ttl` seconds without them. None if it must not
+    be stored: the cache is shared by all users, so private responses aren't.
+    """
+    now = time.time()
+    cache_control = parse_cache_control(headers.get("Cache-Control"))
+    if "no-store" in cache_control or "private" in cache_control:
+        return None
+    if "no-cache" in cache_control:
+        # Stored, but revalidated before every use
+        return now
+
+    for directive in ("s-maxage", "max-age"):
+        if cache_control.get(directive):
+            try:
+                age = int(headers.get("Age") or 0)
+                return now + max(int(cache_control[directive]) - age, 0)
+            except ValueError:
+                return now
+
+    if headers.get("Expires"):
+        try:
+            return parsedate_to_datetime(headers["Expires"]).timestamp()
+        except (TypeError, ValueError):
+            # Invalid dates mean already expired
+            return now
+
+    return now + default_ttl
+
+
+class WebSearchCache:
+    """
+    Search engine results keyed by (engine, normalized query, options) and
+    fetched pages keyed by URL, shared by all users and chats.
+
+    Entries are JSON documents, kept in Redis with an expiry or in a local
+    LRU cache bounded by their total size. Hits and misses are counted per
+    search engine, and under "pages" for fetched pages.
+    """
+
+    def __init__(
+        self,
+        max_size: int = WEB_SEARCH_CACHE_MAX_SIZE,
+        backend: str = WEB_SEARCH_CACHE_BACKEND,
+        results_ttl: int = WEB_SEARCH_CACHE_TTL,
+        page_ttl: int = WEB_PAGE_CACHE_TTL,
+    ):
+        self.backend = backend
+        self.results_ttl = results_ttl
+        self.page_ttl = page_ttl
+        self.entries = LRUCache(max_size, sizeof=lambda entry: len(entry[1]))
+        self.counts: dict[str, dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "misses": 0}
+        )
+
+    def _use_redis(self, redis) -> bool:
+        return redis is not None and self.backend != "local"
+
+    async def _get(self, redis, key: str) -> Optional[Any]:
+        if self._use_redis(redis):
+            value = await redis.get(f"{WEB_SEARCH_CACHE_KEY}:{key}")
+        else:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] <= time.time():
+                self.entries.pop(key)
+                entry = None
+            value = entry[1] if entry is not None else None
+
+        return json.loads(value) if value is not None else None
+
+    async def _set(self, redis, key: str, value: Any, ttl: int):
+        data = json.dumps(value)
+        if self._use_redis(redis):
+            await redis.set(f"{WEB_SEARCH_CACHE_KEY}:{key}", data, ex=max(ttl, 1))
+        else:
+            self.entries.set(key, (time.time() + ttl, data))
+
+    def _count(self, name: str, hit: bool):
+        self.counts[name]["hits" if hit else "misses"] += 1
+
+    @staticmethod
+    def get_results_key(engine: str, query: str, options: Any = None) -> str:
+        return (
+            "results:"
+            + hashlib.sha256(
+                json.dumps([engine, normalize_query(query), options]).encode()
+            ).hexdigest()
+        )
+
+    async def get_results(
+        self, redis, engine: str, query: str, options: Any = None
+    ) -> Optional[list[dict]]:
+        if not self.results_ttl:
+            return None
+
+        try:
+            results = await self._get(
+                redis, self.get_results_key(engine, query, options)
+            )
+        except Exception as e:
+            log.warning(f"Failed to read cached web search results: {e}")
+            results = None
+
+        self._count(engine, results is not None)
+        return results
+
+    async def set_results(
+        self, redis, engine: str, query: str, results: list[dict], options: Any = None
+    ):
+        if not self.results_ttl or not results:
+            return
+
+        try:
+            await self._set(
+                redis,
+                self.get_results_key(engine, query, options),
+                results,
+                self.results_ttl,
+            )
+        except Exception as e:
+            log.warning(f"Failed to cache web search results: {e}")
+
+    @staticmethod
+    def get_page_key(url: str) -> str:
+        return "page:" + hashlib.sha256(url.encode()).hexdigest()
+
+    async def get_page(self, redis, url: str) -> Optional[dict]:
+        """
+        The cached page at `url`, with its "content", "metadata", "etag",
+        "last_modified" and "expires_at", even if no longer fresh.
+        """
+        if not self.page_ttl:
+            return None
+
+        try:
+            return await self._get(redis, self.get_page_key(url))
+        except Exception as e:
+            log.warning(f"Failed to read cached page: {e}")
+            return None
+
+    @staticmethod
+    def is_fresh(page: dict) -> bool:
+        return page["expires_at"] > time.time()
+
+    async def set_page(
+        self,
+        redis,
+        url: str,
+        content: str,
+        metadata: dict,
+        headers: Optional[Mapping[str, str]] = None,
+    ):
+        """Cache the page at `url` as fresh as the response `headers` allow."""
+        if not self.page_ttl:
+            return
+
+        headers = headers or {}
+        expires_at = get_page_expiry(headers, self.page_ttl)
+        if expires_at is None:
+            return
+
+        etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+        if expires_at <= time.time() and not (etag or last_modified):
+            # Could only be used after fetching it again
+            return
+
+        page = {
+            "content": content,
+            "metadata": metadata,
+            "etag": etag,
+            "last_modified": last_modified,
+            "expires_at": expires_at,
+        }
+        ttl = max(int(expires_at - time.time()), 0)
+        if etag or last_modified:
+            ttl = max(ttl, WEB_PAGE_CACHE_RETENTION)
+
+        try:
+            await self._set(redis, self.get_page_key(url), page, max(ttl, 1))
+        except Exception as e:
+            log.warning(f"Failed to cache page: {e}")
+
+    def count_page(self, hit: bool):
+        self._count("pages", hit)
+
+    def get_stats(self) -> dict:
+        return {
+            "backend": self.backend or "auto",
+            "local": self.entries.stats(),
+            "counts": {
+                name: {
+                    **counts,
+                    "hit_rate": (
+                        counts["hits"] / (counts["hits"] + counts["misses"])
+                        if counts["hits"] + counts["misses"]
+                        else 0.0
+                    ),
+                }
+                for name, counts in self.counts.items()
+            },
+        }
+
+
+WEB_SEARCH_CACHE = WebSearchCache()
@@ -0,0 +1,87 @@
+import asyncio
+import logging
+import time
+
+from open_webui.env import REDIS_KEY_PREFIX, WEB_SEARCH_COLLECTION_CLEANUP_INTERVAL
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+
+log = logging.getLogger(__name__)
+
+WEB_SEARCH_COLLECTIONS_KEY = f"{REDIS_KEY_PREFIX}:web_search:collections"
+
+
+class WebSearchCollections:
+    """
+    When each stored web search collection was last written, so the ones
+    older than WEB_SEARCH_COLLECTION_TTL can be deleted.
+
+    With Redis the times are kept in a sorted set shared by all instances, and
+    an expired collection is claimed by removing it from the set, so only one
+    instance deletes it. Otherwise they are kept per process.
+    """
+
+    def __init__(self):
+        self.updated_at: dict[str, float] = {}
+
+    async def add(self, redis, collection_name: str):
+        now = time.time()
+        if redis is not None:
+            await redis.zadd(WEB_SEARCH_COLLECTIONS_KEY, {collection_name: now})
+        else:
+            self.updated_at[collection_name] = now
+
+    async def pop_expired(self, redis, ttl: int) -> list[str]:
+        """Remove and return the collections not written in `ttl` seconds."""
+        expired_at = time.time() - ttl
+
+        if redis is None:
+            collection_names = [
+                collection_name
+                for collection_name, updated_at in self.updated_at.items()
+                if updated_at <= expired_at
+            ]
+            for collection_name in collection_names:
+                del self.updated_at[collection_name]
+            return collection_names
+
+        collection_names = []
+        for collection_name in await redis.zrangebyscore(
+            WEB_SEARCH_COLLECTIONS_KEY, "-inf", expired_at
+        ):
+            # Another instance may be cleaning up at the same time
+            if await redis.zrem(WEB_SEARCH_COLLECTIONS_KEY, collection_name):
+                collection_names.append(collection_name)
+        return collection_names
+
+    async def cleanup(self, redis, ttl: int) -> int:
+        collection_names = await self.pop_expired(redis, ttl)
+        for collection_name in collection_names:
+            try:
+                await asyncio.to_thread(
+                    VECTOR_DB_CLIENT.delete_collection, collection_name=collection_name
+                )
+            except Exception as e:
+                log.warning(f"Failed to delete web search collection: {e}")
+
+        if collection_names:
+            log.info(f"Deleted {len(collection_names)} expired web search collections")
+        return len(collection_names)
+
+
+WEB_SEARCH_COLLECTIONS = WebSearchCollections()
+
+
+async def web_search_collection_cleanup_loop(
+    app, interval: int = WEB_SEARCH_COLLECTION_CLEANUP_INTERVAL
+):
+    """Delete expired web search collections every `interval` seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        ttl = app.state.config.WEB_SEARCH_COLLECTION_TTL
+        if not ttl or ttl <= 0:
+            continue
+
+        try:
+            await WEB_SEARCH_COLLECTIONS.cleanup(app.state.redis, ttl)
+        except Exception as e:
+            log.exception(f"Error cleaning up web search collections: {e}")
@@ -20,6 +20,7 @@ from typing import (
 from fastapi.concurrency import run_in_threadpool
 import aiohttp
 import certifi
+from multidict import CIMultiDict
 import validators
 from langchain_community.document_loaders import PlaywrightURLLoader, WebBaseLoader
 from langchain_community.document_loaders.base import BaseLoader
@@ -27,6 +28,7 @@ from langchain_core.documents import Document
 
 from open_webui.retrieval.loaders.tavily import TavilyLoader
 from open_webui.retrieval.loaders.external_web import ExternalWebLoader
+from open_webui.retrieval.web.cache import WebSearchCache
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.config import (
     ENABLE_RAG_LOCAL_WEB_FETCH,
@@ -42,6 +44,7 @@ from open_webui.config import (
     EXTERNAL_WEB_LOADER_API_KEY,
     WEB_FETCH_FILTER_LIST,
 )
+from open_webui.env import WEB_LOADER_MAX_PAGE_SIZE
 from open_webui.utils.misc import is_string_allowed
 
 log = logging.getLogger(__name__)
@@ -548,23 +551,45 @@ class SafePlaywrightURLLoader(PlaywrightURLLoader, RateLimitMixin, URLProcessing
 class SafeWebBaseLoader(WebBaseLoader):
     """WebBaseLoader with enhanced error handling for URLs."""
 
-    def __init__(self, trust_env: bool = False, *args, **kwargs):
+    def __init__(
+        self,
+        trust_env: bool = False,
+        *args,
+        page_cache: Optional[WebSearchCache] = None,
+        redis=None,
+        url_timeout: Optional[float] = None,
+        **kwargs,
+    ):
         """Initialize SafeWebBaseLoader
         Args:
             trust_env (bool, optional): set to True if using proxy to make web requests, for example
                 using http(s)_proxy environment variables. Defaults to False.
+            page_cache (WebSearchCache, optional): reuse and revalidate fetched pages
+                following their caching headers.
+            redis (optional): the Redis client of the page cache.
+            url_timeout (float, optional): seconds to load each URL, retries included,
+                before it is skipped.
         """
         super().__init__(*args, **kwargs)
         self.trust_env = trust_env
+        self.page_cache = page_cache
+        self.redis = redis
+        self.url_timeout = url_timeout
 
-    async def _fetch(
-        self, url: str, retries: int = 3, cooldown: int = 2, backoff: float = 1.5
-    ) -> str:
+    async def _request(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        retries: int = 3,
+        cooldown: int = 2,
+        backoff: float = 1.5,
+    ) -> tuple[int, str, Any]:
+        """GET `url`, returning the status, text and headers of the response."""
         async with aiohttp.ClientSession(trust_env=self.trust_env) as session:
             for i in range(retries):
                 try:
                     kwargs: Dict = dict(
-                        headers=self.session.headers,
+                        headers={**self.session.headers, **(headers or {})},
                         cookies=self.session.cookies.get_dict(),
                     )
                     if not self.session.verify:
@@ -577,7 +602,11 @@ class SafeWebBaseLoader(WebBaseLoader):
                     ) as response:
                         if self.raise_for_status:
                             response.raise_for_status()
-                        return await response.text()
+                        return (
+                            response.status,
+                            await self._read_text(url, response),
+                            response.headers,
+                        )
                 except aiohttp.ClientConnectionError as e:
                     if i == retries - 1:
                         raise
@@ -589,6 +618,30 @@ class SafeWebBaseLoader(WebBaseLoader):
                         await asyncio.sleep(cooldown * backoff**i)
         raise ValueError("retry count exceeded")
 
+    @staticmethod
+    async def _read_text(url: str, response: aiohttp.ClientResponse) -> str:
+        """The response text, up to WEB_LOADER_MAX_PAGE_SIZE bytes of it."""
+        chunks, size = [], 0
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if WEB_LOADER_MAX_PAGE_SIZE and size > WEB_LOADER_MAX_PAGE_SIZE:
+                log.warning(f"Truncating {url} to {WEB_LOADER_MAX_PAGE_SIZE} bytes")
+                break
+
+        body = b"".join(chunks)
+        if WEB_LOADER_MAX_PAGE_SIZE:
+            body = body[:WEB_LOADER_MAX_PAGE_SIZE]
+        return body.decode(response.charset or "utf-8", errors="replace")
+
+    async def _fetch(
+        self, url: str, retries: int = 3, cooldown: int = 2, backoff: float = 1.5
+    ) -> str:
+        _, text, _ = await self._request(
+            url, retries=retries, cooldown=cooldown, backoff=backoff
+        )
+        return text
+
     def _unpack_fetch_results(
         self, results: Any, urls: List[str], parser: Union[str, None] = None
     ) -> List[Any]:
@@ -629,32 +682,169 @@ class SafeWebBaseLoader(WebBaseLoader):
                 # Log the error and continue with the next URL
                 log.exception(f"Error loading {path}: {e}")
 
-    async def alazy_load(self) -> AsyncIterator[Document]:
-        """Async lazy load text from the url(s) in web_path."""
-        results = await self.ascrape_all(self.web_paths)
-        for path, soup in zip(self.web_paths, results):
-            text = soup.get_text(**self.bs_get_text_kwargs)
-            metadata = {"source": path}
-            if title := soup.find("title"):
-                metadata["title"] = title.get_text()
-            if description := soup.find("meta", attrs={"name": "description"}):
-                metadata["description"] = description.get(
-                    "content", "No description found."
+    def _get_document(self, path: str, soup: Any) -> Document:
+        text = soup.get_text(**self.bs_get_text_kwargs)
+        metadata = {"source": path}
+        if title := soup.find("title"):
+            metadata["title"] = title.get_text()
+        if description := soup.find("meta", attrs={"name": "description"}):
+            metadata["description"] = description.get(
+                "content", "No description found."
+            )
+        if html := soup.find("html"):
+            metadata["language"] = html.get("lang", "No language found.")
+        return Document(page_content=text, metadata=metadata)
+
+    async def _load_cached(self, url: str, semaphore: asyncio.Semaphore) -> Document:
+        """
+        Load `url` through the page cache: fresh pages are reused, stale ones
+        are revalidated with their ETag or Last-Modified date.
+        """
+        page = await self.page_cache.get_page(self.redis, url)
+        if page is not None and self.page_cache.is_fresh(page):
+            self.page_cache.count_page(hit=True)
+            return Document(page_content=page["content"], metadata=page["metadata"])
+
+        headers = {}
+        if page is not None and page["etag"]:
+            headers["If-None-Match"] = page["etag"]
+        if page is not None and page["last_modified"]:
+            headers["If-Modified-Since"] = page["last_modified"]
+
+        async with semaphore:
+            try:
+                status, text, response_headers = await asyncio.wait_for(
+                    self._request(url, headers), self.url_timeout or None
+                )
+            except Exception as e:
+                if not self.continue_on_failure:
+                    raise e
+                log.warning(f"Error fetching {url}, skipping: {e!r}")
+                status, text, response_headers = None, "", {}
+
+        if page is not None and status in (304, None):
+            self.page_cache.count_page(hit=status == 304)
+            if status == 304:
+                # Still valid, fresh again for as long as the new headers allow
+                cached_headers = CIMultiDict(
+                    (name, value)
+                    for name, value in (
+                        ("ETag", page["etag"]),
+                        ("Last-Modified", page["last_modified"]),
+                    )
+                    if value
+                )
+                cached_headers.update(response_headers)
+                await self.page_cache.set_page(
+                    self.redis, url, page["content"], page["metadata"], cached_headers
+                )
+            return Document(page_content=page["content"], metadata=page["metadata"])
+
+        self.page_cache.count_page(hit=False)
+        document = self._get_document(url, self._unpack_fetch_results([text], [url])[0])
+        if status == 200:
+            await self.page_cache.set_page(
+                self.redis,
+                url,
+                document.page_content,
+                document.metadata,
+                response_headers,
+            )
+        return document
+
+    async def _load_uncached(self, url: str, semaphore: asyncio.Semaphore) -> Document:
+        async with semaphore:
+            try:
+                text = await asyncio.wait_for(
+                    self._fetch(url), self.url_timeout or None
                 )
-            if html := soup.find("html"):
-                metadata["language"] = html.get("lang", "No language found.")
-            yield Document(page_content=text, metadata=metadata)
+            except Exception as e:
+                if not self.continue_on_failure:
+                    raise e
+                log.warning(f"Error fetching {url}, skipping: {e!r}")
+                text = ""
+        return self._get_document(url, self._unpack_fetch_results([text], [url])[0])
+
+    async def alazy_load(self) -> AsyncIterator[Document]:
+        """
+        Async lazy load text from the url(s) in web_path, yielding each page as
+        soon as it is loaded. Closing the iterator cancels the pending loads.
+        """
+        semaphore = asyncio.Semaphore(self.requests_per_second)
+        load = self._load_uncached if self.page_cache is None else self._load_cached
+        tasks = [asyncio.create_task(load(path, semaphore)) for path in self.web_paths]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
 
     async def aload(self) -> list[Document]:
         """Load data into Document objects."""
         return [document async for document in self.alazy_load()]
 
 
+class CachedWebLoader(BaseLoader):
+    """
+    Page cache for the loaders that don't fetch pages themselves (e.g. through
+    a browser or an extraction API): fresh pages are reused, the others are
+    loaded by `loader_class` and cached for WEB_PAGE_CACHE_TTL.
+    """
+
+    def __init__(
+        self,
+        loader_class,
+        web_loader_args: dict,
+        page_cache: WebSearchCache,
+        redis=None,
+    ):
+        self.loader_class = loader_class
+        self.web_loader_args = web_loader_args
+        self.page_cache = page_cache
+        self.redis = redis
+
+    def lazy_load(self) -> Iterator[Document]:
+        yield from self.loader_class(**self.web_loader_args).lazy_load()
+
+    async def alazy_load(self) -> AsyncIterator[Document]:
+        urls = self.web_loader_args["web_paths"]
+        pages = await asyncio.gather(
+            *[self.page_cache.get_page(self.redis, url) for url in urls]
+        )
+
+        missing = []
+        for url, page in zip(urls, pages):
+            if page is not None and self.page_cache.is_fresh(page):
+                self.page_cache.count_page(hit=True)
+                yield Document(page_content=page["content"], metadata=page["metadata"])
+            else:
+                self.page_cache.count_page(hit=False)
+                missing.append(url)
+
+        if not missing:
+            return
+
+        loader = self.loader_class(**{**self.web_loader_args, "web_paths": missing})
+        async for document in loader.alazy_load():
+            source = document.metadata.get("source")
+            if source in missing:
+                await self.page_cache.set_page(
+                    self.redis, source, document.page_content, document.metadata
+                )
+            yield document
+
+    async def aload(self) -> list[Document]:
+        return [document async for document in self.alazy_load()]
+
+
 def get_web_loader(
     urls: Union[str, Sequence[str]],
     verify_ssl: bool = True,
     requests_per_second: int = 2,
     trust_env: bool = False,
+    page_cache: Optional[WebSearchCache] = None,
+    redis=None,
 ):
     # Check if the URLs are valid
     safe_urls = safe_validate_urls([urls] if isinstance(urls, str) else urls)
@@ -683,10 +873,15 @@ def get_web_loader(
 
             if timeout_value:
                 request_kwargs["timeout"] = timeout_value
+                web_loader_args["url_timeout"] = timeout_value
 
         if request_kwargs:
             web_loader_args["requests_kwargs"] = request_kwargs
 
+        if page_cache is not None:
+            web_loader_args["page_cache"] = page_cache
+            web_loader_args["redis"] = redis
+
     if WEB_LOADER_ENGINE.value == "playwright":
         WebLoaderClass = SafePlaywrightURLLoader
         web_loader_args["playwright_timeout"] = PLAYWRIGHT_TIMEOUT.value
@@ -709,7 +904,12 @@ def get_web_loader(
         web_loader_args["external_api_key"] = EXTERNAL_WEB_LOADER_API_KEY.value
 
     if WebLoaderClass:
-        web_loader = WebLoaderClass(**web_loader_args)
+        if page_cache is not None and WebLoaderClass is not SafeWebBaseLoader:
+            web_loader = CachedWebLoader(
+                WebLoaderClass, web_loader_args, page_cache, redis
+            )
+        else:
+            web_loader = WebLoaderClass(**web_loader_args)
 
         log.debug(
             "Using WEB_LOADER_ENGINE %s for %s URLs",
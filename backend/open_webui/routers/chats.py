@@ -3,8 +3,8 @@ import logging
 from typing import Optional
 
 
-from open_webui.utils.misc import get_message_list
 from open_webui.socket.main import get_event_emitter
+from open_webui.models.chat_stats import ChatStats, ChatUsageDailyResponse
 from open_webui.models.chats import (
     ChatForm,
     ChatImportForm,
@@ -19,17 +19,23 @@ from open_webui.models.folders import Folders
 
 from open_webui.config import ENABLE_ADMIN_CHAT_ACCESS, ENABLE_ADMIN_EXPORT
 from open_webui.constants import ERROR_MESSAGES
+from open_webui.env import CHAT_IMPORT_MAX_LINE_SIZE, CHAT_IMPORT_MAX_SIZE
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_permission
+from open_webui.utils.export import get_export_response, read_ndjson
 
 log = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Chats written per transaction by a streaming import
+IMPORT_BATCH_SIZE = 100
+
 ############################
 # GetChatList
 ############################
@@ -82,108 +88,7 @@ def get_session_user_chat_usage_stats(
         limit = items_per_page
         skip = (page - 1) * limit
 
-        result = Chats.get_chats_by_user_id(user.id, skip=skip, limit=limit)
-
-        chats = result.items
-        total = result.total
-
-        chat_stats = []
-        for chat in chats:
-            messages_map = chat.chat.get("history", {}).get("messages", {})
-            message_id = chat.chat.get("history", {}).get("currentId")
-
-            if messages_map and message_id:
-                try:
-                    history_models = {}
-                    history_message_count = len(messages_map)
-                    history_user_messages = []
-                    history_assistant_messages = []
-
-                    for message in messages_map.values():
-                        if message.get("role", "") == "user":
-                            history_user_messages.append(message)
-                        elif message.get("role", "") == "assistant":
-                            history_assistant_messages.append(message)
-                            model = message.get("model", None)
-                            if model:
-                                if model not in history_models:
-                                    history_models[model] = 0
-                                history_models[model] += 1
-
-                    average_user_message_content_length = (
-                        sum(
-                            len(message.get("content", ""))
-                            for message in history_user_messages
-                        )
-                        / len(history_user_messages)
-                        if len(history_user_messages) > 0
-                        else 0
-                    )
-                    average_assistant_message_content_length = (
-                        sum(
-                            len(message.get("content", ""))
-                            for message in history_assistant_messages
-                        )
-                        / len(history_assistant_messages)
-                        if len(history_assistant_messages) > 0
-                        else 0
-                    )
-
-                    response_times = []
-                    for message in history_assistant_messages:
-                        user_message_id = message.get("parentId", None)
-                        if user_message_id and user_message_id in messages_map:
-                            user_message = messages_map[user_message_id]
-                            response_time = message.get(
-                                "timestamp", 0
-                            ) - user_message.get("timestamp", 0)
-
-                            response_times.append(response_time)
-
-                    average_response_time = (
-                        sum(response_times) / len(response_times)
-                        if len(response_times) > 0
-                        else 0
-                    )
-
-                    message_list = get_message_list(messages_map, message_id)
-                    message_count = len(message_list)
-
-                    models = {}
-                    for message in reversed(message_list):
-                        if message.get("role") == "assistant":
-                            model = message.get("model", None)
-                            if model:
-                                if model not in models:
-                                    models[model] = 0
-                                models[model] += 1
-
-                            annotation = message.get("annotation", {})
-
-                    chat_stats.append(
-                        {
-                            "id": chat.id,
-                            "models": models,
-                            "message_count": message_count,
-                            "history_models": history_models,
-                            "history_message_count": history_message_count,
-                            "history_user_message_count": len(history_user_messages),
-                            "history_assistant_message_count": len(
-                                history_assistant_messages
-                            ),
-                            "average_response_time": average_response_time,
-                            "average_user_message_content_length": average_user_message_content_length,
-                            "average_assistant_message_content_length": average_assistant_message_content_length,
-                            "tags": chat.meta.get("tags", []),
-                            "last_message_at": message_list[-1].get("timestamp", None),
-                            "updated_at": chat.updated_at,
-                            "created_at": chat.created_at,
-                        }
-                    )
-                except Exception as e:
-                    pass
-
-        return ChatUsageStatsListResponse(items=chat_stats, total=total)
+        return Chats.get_chat_usage_stats_by_user_id(user.id, skip=skip, limit=limit)
 
     except Exception as e:
         log.exception(e)
@@ -192,6 +97,46 @@ def get_session_user_chat_usage_stats(
         )
 
 
+############################
+# GetDailyUsageStats
+# EXPERIMENTAL: may be removed in future releases
+############################
+
+
+@router.get("/stats/usage/daily", response_model=list[ChatUsageDailyResponse])
+def get_daily_usage_stats(
+    group_by: Optional[str] = "date",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    user_id: Optional[str] = None,
+    user=Depends(get_verified_user),
+):
+    """
+    Message usage summed per any comma separated combination of `date`,
+    `user_id` and `model`, between optional YYYY-MM-DD dates. Admins can
+    report on all users, other users only on themselves.
+    """
+    group_by = [name.strip() for name in (group_by or "").split(",") if name.strip()]
+    if any(name not in ("date", "user_id", "model") for name in group_by):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT("Invalid group_by"),
+        )
+
+    if user.role != "admin":
+        user_id = user.id
+
+    try:
+        return ChatStats.get_daily_usage(
+            group_by, user_id=user_id, start_date=start_date, end_date=end_date
+        )
+    except Exception as e:
+        log.exception(e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=ERROR_MESSAGES.DEFAULT()
+        )
+
+
 ############################
 # DeleteAllChats
 ############################
@@ -285,6 +230,62 @@ async def import_chats(form_data: ChatsImportForm, user=Depends(get_verified_use
         )
 
 
+class ChatsImportResponse(BaseModel):
+    count: int
+    errors: list[str] = []
+
+
+# Line errors reported back at most
+MAX_IMPORT_ERRORS = 100
+
+
+@router.post("/import/stream", response_model=ChatsImportResponse)
+async def import_chats_stream(request: Request, user=Depends(get_verified_user)):
+    """
+    Import chats from an NDJSON body, optionally gzip compressed, with one
+    chat per line as exported with `?format=ndjson`. Chats are written in
+    batches while the body is read; invalid lines are skipped and reported.
+    Bodies over CHAT_IMPORT_MAX_SIZE or lines over CHAT_IMPORT_MAX_LINE_SIZE
+    (decompressed) are rejected with 413, keeping the batches written so far.
+    """
+    count = 0
+    errors = []
+
+    def add_error(error: str):
+        if len(errors) < MAX_IMPORT_ERRORS:
+            errors.append(error)
+
+    async def import_batch(batch: list[ChatImportForm]):
+        nonlocal count
+        try:
+            await run_in_threadpool(Chats.import_chats, user.id, batch)
+            count += len(batch)
+        except Exception as e:
+            log.exception(e)
+            add_error(f"Failed to import {len(batch)} chats: {e}")
+
+    batch = []
+    async for line_number, item in read_ndjson(
+        request, CHAT_IMPORT_MAX_SIZE, CHAT_IMPORT_MAX_LINE_SIZE
+    ):
+        try:
+            if item is None:
+                raise ValueError("Invalid JSON")
+            batch.append(ChatImportForm(**item))
+        except Exception as e:
+            add_error(f"Line {line_number}: {e}")
+            continue
+
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            await import_batch(batch)
+            batch = []
+
+    if batch:
+        await import_batch(batch)
+
+    return ChatsImportResponse(count=count, errors=errors)
+
+
 ############################
 # GetChats
 ############################
@@ -380,10 +381,17 @@ async def get_user_pinned_chats(user=Depends(get_verified_user)):
 
 
 @router.get("/all", response_model=list[ChatResponse])
-async def get_user_chats(user=Depends(get_verified_user)):
+async def get_user_chats(format: Optional[str] = None, user=Depends(get_verified_user)):
+    if format:
+        return get_export_response(
+            (ChatResponse(**chat.model_dump()) for chat in Chats.iter_chats(user.id)),
+            format,
+            "chats",
+        )
+
     return [
         ChatResponse(**chat.model_dump())
-        for chat in Chats.get_chats_by_user_id(user.id)
+        for chat in Chats.get_chats_by_user_id(user.id).items
     ]
 
 
@@ -423,12 +431,21 @@ async def get_all_user_tags(user=Depends(get_verified_user)):
 
 
 @router.get("/all/db", response_model=list[ChatResponse])
-async def get_all_user_chats_in_db(user=Depends(get_admin_user)):
+async def get_all_user_chats_in_db(
+    format: Optional[str] = None, user=Depends(get_admin_user)
+):
     if not ENABLE_ADMIN_EXPORT:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
+
+    if format:
+        return get_export_response(
+            (ChatResponse(**chat.model_dump()) for chat in Chats.iter_chats()),
+            format,
+            "chats",
+        )
     return [ChatResponse(**chat.model_dump()) for chat in Chats.get_chats()]
 
 
@@ -14,6 +14,7 @@ from open_webui.utils.tools import (
     get_tool_server_data,
     get_tool_server_url,
     set_tool_servers,
+    TOOL_SERVER_CACHE,
 )
 from open_webui.utils.mcp.client import MCPClient
 from open_webui.models.oauth_sessions import OAuthSessions
@@ -160,6 +161,21 @@ async def get_tool_servers_config(request: Request, user=Depends(get_admin_user)
     }
 
 
+@router.post("/tool_servers/refresh")
+async def refresh_tool_servers(request: Request, user=Depends(get_admin_user)):
+    servers = await TOOL_SERVER_CACHE.refresh(request.app)
+    return {
+        "servers": [
+            {
+                "id": server.get("id"),
+                "url": server.get("url"),
+                "tools": len(server.get("specs") or []),
+            }
+            for server in servers
+        ]
+    }
+
+
 @router.post("/tool_servers", response_model=ToolServersConfigForm)
 async def set_tool_servers_config(
     request: Request,
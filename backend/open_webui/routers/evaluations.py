@@ -15,6 +15,7 @@ from open_webui.models.feedbacks import (
 
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.export import get_export_response
 
 router = APIRouter()
 
@@ -78,7 +79,12 @@ async def delete_all_feedbacks(user=Depends(get_admin_user)):
 
 
 @router.get("/feedbacks/all/export", response_model=list[FeedbackModel])
-async def export_all_feedbacks(user=Depends(get_admin_user)):
+async def export_all_feedbacks(
+    format: Optional[str] = None, user=Depends(get_admin_user)
+):
+    if format:
+        return get_export_response(Feedbacks.iter_feedbacks(), format, "feedbacks")
+
     feedbacks = Feedbacks.get_all_feedbacks()
     return feedbacks
 
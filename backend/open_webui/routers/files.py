@@ -21,9 +21,12 @@ from fastapi import (
     Query,
 )
 
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
 
+from open_webui.config import STORAGE_PRESIGNED_URL_REDIRECT
 from open_webui.constants import ERROR_MESSAGES
+from open_webui.env import ENABLE_INGESTION_QUEUE
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
 
 from open_webui.models.channels import Channels
@@ -42,11 +45,15 @@ from open_webui.models.groups import Groups
 from open_webui.routers.retrieval import ProcessFileForm, process_file
 from open_webui.routers.audio import transcribe
 
+from open_webui.models.blobs import FileBlobs
+from open_webui.retrieval.cache import EMBEDDING_CACHE
+from open_webui.storage.blobs import acquire_file_content, release_file_content
 from open_webui.storage.provider import Storage
 
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
+from open_webui.utils.ingestion import enqueue_file_processing
 from open_webui.utils.misc import strict_match_mime_type
 from pydantic import BaseModel
 
@@ -109,38 +116,43 @@ def has_access_to_file(
 ############################
 
 
-def process_uploaded_file(request, file, file_path, file_item, file_metadata, user):
-    try:
-        if file.content_type:
-            stt_supported_content_types = getattr(
-                request.app.state.config, "STT_SUPPORTED_CONTENT_TYPES", []
-            )
+def handle_uploaded_file(
+    request, content_type, file_path, file_item, file_metadata, user
+):
+    if content_type:
+        stt_supported_content_types = getattr(
+            request.app.state.config, "STT_SUPPORTED_CONTENT_TYPES", []
+        )
 
-            if strict_match_mime_type(stt_supported_content_types, file.content_type):
-                file_path = Storage.get_file(file_path)
-                result = transcribe(request, file_path, file_metadata, user)
+        if strict_match_mime_type(stt_supported_content_types, content_type):
+            file_path = Storage.get_file(file_path)
+            result = transcribe(request, file_path, file_metadata, user)
 
-                process_file(
-                    request,
-                    ProcessFileForm(
-                        file_id=file_item.id, content=result.get("text", "")
-                    ),
-                    user=user,
-                )
-            elif (not file.content_type.startswith(("image/", "video/"))) or (
-                request.app.state.config.CONTENT_EXTRACTION_ENGINE == "external"
-            ):
-                process_file(request, ProcessFileForm(file_id=file_item.id), user=user)
-            else:
-                raise Exception(
-                    f"File type {file.content_type} is not supported for processing"
-                )
-        else:
-            log.info(
-                f"File type {file.content_type} is not provided, but trying to process anyway"
+            process_file(
+                request,
+                ProcessFileForm(file_id=file_item.id, content=result.get("text", "")),
+                user=user,
             )
+        elif (not content_type.startswith(("image/", "video/"))) or (
+            request.app.state.config.CONTENT_EXTRACTION_ENGINE == "external"
+        ):
             process_file(request, ProcessFileForm(file_id=file_item.id), user=user)
+        else:
+            raise Exception(f"File type {content_type} is not supported for processing")
+    else:
+        log.info(
+            f"File type {content_type} is not provided, but trying to process anyway"
+        )
+        process_file(request, ProcessFileForm(file_id=file_item.id), user=user)
+
 
+def process_uploaded_file(
+    request, content_type, file_path, file_item, file_metadata, user
+):
+    try:
+        handle_uploaded_file(
+            request, content_type, file_path, file_item, file_metadata, user
+        )
     except Exception as e:
         log.error(f"Error processing file: {file_item.id}")
         Files.update_file_data_by_id(
@@ -219,7 +231,7 @@ def upload_file_handler(
         id = str(uuid.uuid4())
         name = filename
         filename = f"{id}_{filename}"
-        contents, file_path = Storage.upload_file(
+        upload_meta, file_path = Storage.upload_file(
             file.file,
             filename,
             {
@@ -229,6 +241,8 @@ def upload_file_handler(
                 "OpenWebUI-File-Id": id,
             },
         )
+        # Identical content is stored once and shared between files
+        file_path = acquire_file_content(file_path, upload_meta)
 
         file_item = Files.insert_new_file(
             user.id,
@@ -243,13 +257,17 @@ def upload_file_handler(
                     "meta": {
                         "name": name,
                         "content_type": file.content_type,
-                        "size": len(contents),
+                        "size": upload_meta["size"],
+                        "sha256": upload_meta["sha256"],
                         "data": file_metadata,
                     },
                 }
             ),
         )
 
+        if not file_item:
+            release_file_content(file_path, upload_meta)
+
         if "channel_id" in file_metadata:
             channel = Channels.get_channel_by_id_and_user_id(
                 file_metadata["channel_id"], user.id
@@ -258,11 +276,21 @@ def upload_file_handler(
                 Channels.add_file_to_channel_by_id(channel.id, file_item.id, user.id)
 
         if process:
-            if background_tasks and process_in_background:
+            if (
+                background_tasks
+                and process_in_background
+                and ENABLE_INGESTION_QUEUE
+                and enqueue_file_processing(
+                    file_item, file.content_type, file_metadata, user
+                )
+            ):
+                # Processed by an ingestion worker
+                return {"status": True, **file_item.model_dump()}
+            elif background_tasks and process_in_background:
                 background_tasks.add_task(
                     process_uploaded_file,
                     request,
-                    file,
+                    file.content_type,
                     file_path,
                     file_item,
                     file_metadata,
@@ -272,7 +300,7 @@ def upload_file_handler(
             else:
                 process_uploaded_file(
                     request,
-                    file,
+                    file.content_type,
                     file_path,
                     file_item,
                     file_metadata,
@@ -369,6 +397,8 @@ async def delete_all_files(user=Depends(get_admin_user)):
     if result:
         try:
             Storage.delete_all_files()
+            FileBlobs.delete_all_blobs()
+            EMBEDDING_CACHE.clear()
             VECTOR_DB_CLIENT.reset()
         except Exception as e:
             log.exception(e)
@@ -445,6 +475,9 @@ async def get_file_process_status(
                                 event = {"status": status}
                                 if status == "failed":
                                     event["error"] = data.get("error")
+                                if data.get("job"):
+                                    # Queue position, attempts and retries
+                                    event["job"] = data["job"]
 
                                 yield f"data: {json.dumps(event)}\n\n"
                                 if status in ("completed", "failed"):
@@ -462,7 +495,10 @@ async def get_file_process_status(
                 media_type="text/event-stream",
             )
         else:
-            return {"status": file.data.get("status", "pending")}
+            return {
+                "status": file.data.get("status", "pending"),
+                **({"job": file.data["job"]} if file.data.get("job") else {}),
+            }
     else:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -566,37 +602,46 @@ async def get_file_content_by_id(
         or has_access_to_file(id, "read", user)
     ):
         try:
-            file_path = Storage.get_file(file.path)
-            file_path = Path(file_path)
-
-            # Check if the file already exists in the cache
-            if file_path.is_file():
-                # Handle Unicode filenames
-                filename = file.meta.get("name", file.filename)
-                encoded_filename = quote(filename)  # RFC5987 encoding
+            content_type = file.meta.get("content_type")
 
-                content_type = file.meta.get("content_type")
-                filename = file.meta.get("name", file.filename)
-                encoded_filename = quote(filename)
-                headers = {}
+            # Handle Unicode filenames
+            filename = file.meta.get("name", file.filename)
+            encoded_filename = quote(filename)  # RFC5987 encoding
+            headers = {}
 
-                if attachment:
+            if attachment:
+                headers["Content-Disposition"] = (
+                    f"attachment; filename*=UTF-8''{encoded_filename}"
+                )
+            else:
+                if content_type == "application/pdf" or filename.lower().endswith(
+                    ".pdf"
+                ):
+                    headers["Content-Disposition"] = (
+                        f"inline; filename*=UTF-8''{encoded_filename}"
+                    )
+                    content_type = "application/pdf"
+                elif content_type != "text/plain":
                     headers["Content-Disposition"] = (
                         f"attachment; filename*=UTF-8''{encoded_filename}"
                     )
-                else:
-                    if content_type == "application/pdf" or filename.lower().endswith(
-                        ".pdf"
-                    ):
-                        headers["Content-Disposition"] = (
-                            f"inline; filename*=UTF-8''{encoded_filename}"
-                        )
-                        content_type = "application/pdf"
-                    elif content_type != "text/plain":
-                        headers["Content-Disposition"] = (
-                            f"attachment; filename*=UTF-8''{encoded_filename}"
-                        )
 
+            if STORAGE_PRESIGNED_URL_REDIRECT:
+                url = await run_in_threadpool(
+                    Storage.get_presigned_url,
+                    file.path,
+                    content_type,
+                    headers.get("Content-Disposition"),
+                )
+                if url:
+                    return RedirectResponse(url)
+
+            file_path = await run_in_threadpool(Storage.get_file, file.path)
+            file_path = Path(file_path)
+
+            # Check if the file already exists in the cache
+            if file_path.is_file():
+                # FileResponse answers Range requests with 206 partial content
                 return FileResponse(file_path, headers=headers, media_type=content_type)
 
             else:
@@ -641,7 +686,7 @@ async def get_html_file_content_by_id(id: str, user=Depends(get_verified_user)):
         or has_access_to_file(id, "read", user)
     ):
         try:
-            file_path = Storage.get_file(file.path)
+            file_path = await run_in_threadpool(Storage.get_file, file.path)
             file_path = Path(file_path)
 
             # Check if the file already exists in the cache
@@ -692,7 +737,17 @@ async def get_file_content_by_id(id: str, user=Depends(get_verified_user)):
         }
 
         if file_path:
-            file_path = Storage.get_file(file_path)
+            if STORAGE_PRESIGNED_URL_REDIRECT:
+                url = await run_in_threadpool(
+                    Storage.get_presigned_url,
+                    file_path,
+                    file.meta.get("content_type"),
+                    headers["Content-Disposition"],
+                )
+                if url:
+                    return RedirectResponse(url)
+
+            file_path = await run_in_threadpool(Storage.get_file, file_path)
             file_path = Path(file_path)
 
             # Check if the file already exists in the cache
@@ -748,7 +803,7 @@ async def delete_file_by_id(id: str, user=Depends(get_verified_user)):
         result = Files.delete_file_by_id(id)
         if result:
             try:
-                Storage.delete_file(file.path)
+                release_file_content(file.path, file.meta)
                 VECTOR_DB_CLIENT.delete(collection_name=f"file-{id}")
             except Exception as e:
                 log.exception(e)
@@ -18,6 +18,9 @@ from open_webui.utils.plugin import (
     load_function_module_by_id,
     replace_imports,
     get_function_module_from_cache,
+    invalidate_plugin_module,
+    wait_for_frontmatter_requirements,
+    REQUIREMENTS_INSTALLER,
 )
 from open_webui.config import CACHE_DIR
 from open_webui.constants import ERROR_MESSAGES
@@ -46,6 +49,21 @@ async def get_function_list(user=Depends(get_admin_user)):
     return Functions.get_function_list()
 
 
+############################
+# GetRequirementsStatus
+############################
+
+
+@router.get("/requirements", response_model=list[dict])
+async def get_requirements_status(user=Depends(get_admin_user)):
+    """
+    Install status of the requirement sets of functions and tools, with the
+    ids of the functions (`function:{id}`) and tools (`tool:{id}`) needing
+    each one.
+    """
+    return REQUIREMENTS_INSTALLER.get_status()
+
+
 ############################
 # ExportFunctions
 ############################
@@ -147,6 +165,9 @@ async def sync_functions(
     try:
         for function in form_data.functions:
             function.content = replace_imports(function.content)
+            await wait_for_frontmatter_requirements(
+                function.content, f"function:{function.id}"
+            )
             function_module, function_type, frontmatter = load_function_module_by_id(
                 function.id,
                 content=function.content,
@@ -164,7 +185,12 @@ async def sync_functions(
                     )
                     raise e
 
-        return Functions.sync_functions(user.id, form_data.functions)
+        function_ids = {function.id for function in Functions.get_functions()}
+        functions = Functions.sync_functions(user.id, form_data.functions)
+        for function_id in function_ids | {function.id for function in functions}:
+            await invalidate_plugin_module(request, "function", function_id)
+
+        return functions
     except Exception as e:
         log.exception(f"Failed to load a function: {e}")
         raise HTTPException(
@@ -194,16 +220,17 @@ async def create_new_function(
     if function is None:
         try:
             form_data.content = replace_imports(form_data.content)
+            await wait_for_frontmatter_requirements(
+                form_data.content, f"function:{form_data.id}"
+            )
             function_module, function_type, frontmatter = load_function_module_by_id(
                 form_data.id,
                 content=form_data.content,
             )
             form_data.meta.manifest = frontmatter
 
-            FUNCTIONS = request.app.state.FUNCTIONS
-            FUNCTIONS[form_data.id] = function_module
-
             function = Functions.insert_new_function(user.id, function_type, form_data)
+            await invalidate_plugin_module(request, "function", form_data.id)
 
             function_cache_dir = CACHE_DIR / "functions" / form_data.id
             function_cache_dir.mkdir(parents=True, exist_ok=True)
@@ -314,18 +341,17 @@ async def update_function_by_id(
 ):
     try:
         form_data.content = replace_imports(form_data.content)
+        await wait_for_frontmatter_requirements(form_data.content, f"function:{id}")
         function_module, function_type, frontmatter = load_function_module_by_id(
             id, content=form_data.content
         )
         form_data.meta.manifest = frontmatter
 
-        FUNCTIONS = request.app.state.FUNCTIONS
-        FUNCTIONS[id] = function_module
-
         updated = {**form_data.model_dump(exclude={"id"}), "type": function_type}
         log.debug(updated)
 
         function = Functions.update_function_by_id(id, updated)
+        await invalidate_plugin_module(request, "function", id)
 
         if function_type == "filter" and getattr(function_module, "toggle", None):
             Functions.update_function_metadata_by_id(id, {"toggle": True})
@@ -357,9 +383,7 @@ async def delete_function_by_id(
     result = Functions.delete_function_by_id(id)
 
     if result:
-        FUNCTIONS = request.app.state.FUNCTIONS
-        if id in FUNCTIONS:
-            del FUNCTIONS[id]
+        await invalidate_plugin_module(request, "function", id)
 
     return result
 
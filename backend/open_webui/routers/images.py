@@ -26,10 +26,12 @@ from open_webui.utils.images.comfyui import (
     ComfyUICreateImageForm,
     ComfyUIEditImageForm,
     ComfyUIWorkflow,
-    comfyui_upload_image,
     comfyui_create_image,
     comfyui_edit_image,
+    get_base_urls,
+    get_comfyui_client,
 )
+from open_webui.socket.main import get_event_emitter
 from pydantic import BaseModel
 
 log = logging.getLogger(__name__)
@@ -360,11 +362,9 @@ async def verify_url(request: Request, user=Depends(get_admin_user)):
                 "Authorization": f"Bearer {request.app.state.config.COMFYUI_API_KEY}"
             }
         try:
-            r = requests.get(
-                url=f"{request.app.state.config.COMFYUI_BASE_URL}/object_info",
-                headers=headers,
-            )
-            r.raise_for_status()
+            for base_url in get_base_urls(request.app.state.config.COMFYUI_BASE_URL):
+                r = requests.get(url=f"{base_url}/object_info", headers=headers)
+                r.raise_for_status()
             return True
         except Exception:
             request.app.state.config.ENABLE_IMAGE_GENERATION = False
@@ -392,10 +392,8 @@ def get_models(request: Request, user=Depends(get_verified_user)):
             headers = {
                 "Authorization": f"Bearer {request.app.state.config.COMFYUI_API_KEY}"
             }
-            r = requests.get(
-                url=f"{request.app.state.config.COMFYUI_BASE_URL}/object_info",
-                headers=headers,
-            )
+            base_url = get_base_urls(request.app.state.config.COMFYUI_BASE_URL)[0]
+            r = requests.get(url=f"{base_url}/object_info", headers=headers)
             info = r.json()
 
             workflow = json.loads(request.app.state.config.COMFYUI_WORKFLOW)
@@ -496,6 +494,24 @@ def get_image_data(data: str, headers=None):
         return None, None
 
 
+def get_progress_event_emitter(metadata: Optional[dict], user):
+    """
+    Event emitter for the progress of a generation requested from a chat.
+    Progress is only shown live and not saved to the chat message.
+    """
+    if not metadata or not metadata.get("chat_id") or not metadata.get("message_id"):
+        return None
+
+    return get_event_emitter(
+        {
+            "user_id": user.id,
+            "chat_id": metadata["chat_id"],
+            "message_id": metadata["message_id"],
+        },
+        update_db=False,
+    )
+
+
 def upload_image(request, image_data, content_type, metadata, user):
     image_format = mimetypes.guess_extension(content_type)
     file = UploadFile(
@@ -720,25 +736,22 @@ async def image_generations(
                     **data,
                 }
             )
+            client = await get_comfyui_client(
+                request.app.state.config.COMFYUI_BASE_URL,
+                request.app.state.config.COMFYUI_API_KEY,
+            )
             res = await comfyui_create_image(
                 model,
                 form_data,
-                user.id,
-                request.app.state.config.COMFYUI_BASE_URL,
-                request.app.state.config.COMFYUI_API_KEY,
+                client,
+                get_progress_event_emitter(metadata, user),
             )
             log.debug(f"res: {res}")
 
             images = []
 
             for image in res["data"]:
-                headers = None
-                if request.app.state.config.COMFYUI_API_KEY:
-                    headers = {
-                        "Authorization": f"Bearer {request.app.state.config.COMFYUI_API_KEY}"
-                    }
-
-                image_data, content_type = get_image_data(image["url"], headers)
+                image_data, content_type = await client.get_image_data(image["url"])
                 _, url = upload_image(
                     request,
                     image_data,
@@ -1016,14 +1029,15 @@ async def image_edits(
                     for img in form_data.image:
                         files.append(get_image_file_item(img))
 
-                # Upload images to ComfyUI and get their names
+                # Upload images to the ComfyUI instance that edits them and
+                # get their names
+                client = await get_comfyui_client(
+                    request.app.state.config.IMAGES_EDIT_COMFYUI_BASE_URL,
+                    request.app.state.config.IMAGES_EDIT_COMFYUI_API_KEY,
+                )
                 comfyui_images = []
                 for file_item in files:
-                    res = await comfyui_upload_image(
-                        file_item,
-                        request.app.state.config.IMAGES_EDIT_COMFYUI_BASE_URL,
-                        request.app.state.config.IMAGES_EDIT_COMFYUI_API_KEY,
-                    )
+                    res = await client.upload_image(file_item)
                     comfyui_images.append(res.get("name", file_item[1][0]))
             except Exception as e:
                 log.debug(f"Error uploading images to ComfyUI: {e}")
@@ -1051,9 +1065,8 @@ async def image_edits(
             res = await comfyui_edit_image(
                 model,
                 form_data,
-                user.id,
-                request.app.state.config.IMAGES_EDIT_COMFYUI_BASE_URL,
-                request.app.state.config.IMAGES_EDIT_COMFYUI_API_KEY,
+                client,
+                get_progress_event_emitter(metadata, user),
             )
             log.debug(f"res: {res}")
 
@@ -1071,13 +1084,7 @@ async def image_edits(
             images = []
 
             for image_url in image_urls:
-                headers = None
-                if request.app.state.config.IMAGES_EDIT_COMFYUI_API_KEY:
-                    headers = {
-                        "Authorization": f"Bearer {request.app.state.config.IMAGES_EDIT_COMFYUI_API_KEY}"
-                    }
-
-                image_data, content_type = get_image_data(image_url, headers)
+                image_data, content_type = await client.get_image_data(image_url)
                 _, url = upload_image(
                     request,
                     image_data,
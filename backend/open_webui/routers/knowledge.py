@@ -13,18 +13,23 @@ from open_webui.models.knowledge import (
     KnowledgeUserResponse,
 )
 from open_webui.models.files import Files, FileModel, FileMetadataResponse
+from open_webui.models.jobs import Jobs
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
 from open_webui.routers.retrieval import (
     process_file,
     ProcessFileForm,
-    process_files_batch,
+    save_files_batch,
     BatchProcessFilesForm,
 )
+from open_webui.storage.blobs import release_file_content
 from open_webui.storage.provider import Storage
 
 from open_webui.constants import ERROR_MESSAGES
+from open_webui.env import ENABLE_INGESTION_QUEUE
 from open_webui.utils.auth import get_verified_user
 from open_webui.utils.access_control import has_access, has_permission
+from open_webui.utils.ingestion import KNOWLEDGE_REINDEX_JOB, enqueue_knowledge_files
+from open_webui.utils.reindex import start_knowledge_reindex
 
 
 from open_webui.config import BYPASS_ADMIN_ACCESS_CONTROL
@@ -197,60 +202,60 @@ async def create_new_knowledge(
 
 @router.post("/reindex", response_model=bool)
 async def reindex_knowledge_files(request: Request, user=Depends(get_verified_user)):
+    """
+    Rebuild the collections of all knowledge bases in the background. Each
+    one keeps serving its current collection until its rebuild is complete.
+    """
     if user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=ERROR_MESSAGES.UNAUTHORIZED,
         )
 
-    knowledge_bases = Knowledges.get_knowledge_bases()
-
-    log.info(f"Starting reindexing for {len(knowledge_bases)} knowledge bases")
+    job = start_knowledge_reindex(request.app, user)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT("Error starting reindex"),
+        )
 
-    for knowledge_base in knowledge_bases:
-        try:
-            files = Knowledges.get_files_by_id(knowledge_base.id)
-            try:
-                if VECTOR_DB_CLIENT.has_collection(collection_name=knowledge_base.id):
-                    VECTOR_DB_CLIENT.delete_collection(
-                        collection_name=knowledge_base.id
-                    )
-            except Exception as e:
-                log.error(f"Error deleting collection {knowledge_base.id}: {str(e)}")
-                continue  # Skip, don't raise
-
-            failed_files = []
-            for file in files:
-                try:
-                    await run_in_threadpool(
-                        process_file,
-                        request,
-                        ProcessFileForm(
-                            file_id=file.id, collection_name=knowledge_base.id
-                        ),
-                        user=user,
-                    )
-                except Exception as e:
-                    log.error(
-                        f"Error processing file {file.filename} (ID: {file.id}): {str(e)}"
-                    )
-                    failed_files.append({"file_id": file.id, "error": str(e)})
-                    continue
+    log.info(f"Reindexing knowledge bases in job {job.id}")
+    return True
 
-        except Exception as e:
-            log.error(f"Error processing knowledge base {knowledge_base.id}: {str(e)}")
-            # Don't raise, just continue
-            continue
 
-        if failed_files:
-            log.warning(
-                f"Failed to process {len(failed_files)} files in knowledge base {knowledge_base.id}"
-            )
-            for failed in failed_files:
-                log.warning(f"File ID: {failed['file_id']}, Error: {failed['error']}")
+@router.get("/reindex/status")
+async def get_reindex_status(user=Depends(get_verified_user)):
+    if user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=ERROR_MESSAGES.UNAUTHORIZED,
+        )
 
-    log.info(f"Reindexing completed.")
-    return True
+    job = Jobs.get_latest_job_by_type(KNOWLEDGE_REINDEX_JOB)
+    if not job:
+        return {"status": None}
+
+    progress = job.progress or {}
+    return {
+        "id": job.id,
+        "status": job.status,
+        "attempts": job.attempts,
+        "error": job.error,
+        "total": progress.get("total", 0),
+        "completed": progress.get("completed", 0),
+        "failed": progress.get("failed", 0),
+        "eta": progress.get("eta") if job.status in ("pending", "running") else None,
+        "knowledge": {
+            id: {
+                "status": knowledge["status"],
+                "files": len(knowledge["files"]),
+                "errors": knowledge["errors"],
+            }
+            for id, knowledge in progress.get("knowledge", {}).items()
+        },
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+    }
 
 
 ############################
@@ -261,6 +266,8 @@ async def reindex_knowledge_files(request: Request, user=Depends(get_verified_us
 class KnowledgeFilesResponse(KnowledgeResponse):
     files: Optional[list[FileMetadataResponse]] = None
     write_access: Optional[bool] = False
+    # Set when the files were queued for an ingestion worker
+    job_id: Optional[str] = None
 
 
 @router.get("/{id}", response_model=Optional[KnowledgeFilesResponse])
@@ -440,6 +447,16 @@ def add_file_to_knowledge_by_id(
             detail=ERROR_MESSAGES.FILE_NOT_PROCESSED,
         )
 
+    if ENABLE_INGESTION_QUEUE:
+        # The file is added to the knowledge base once a worker processed it
+        job = enqueue_knowledge_files(id, [file], user)
+        if job:
+            return KnowledgeFilesResponse(
+                **knowledge.model_dump(),
+                files=Knowledges.get_file_metadatas_by_id(knowledge.id),
+                job_id=job.id,
+            )
+
     # Add content to the vector database
     try:
         process_file(
@@ -508,6 +525,15 @@ def update_file_from_knowledge_by_id(
         collection_name=knowledge.id, filter={"file_id": form_data.file_id}
     )
 
+    if ENABLE_INGESTION_QUEUE:
+        job = enqueue_knowledge_files(id, [file], user)
+        if job:
+            return KnowledgeFilesResponse(
+                **knowledge.model_dump(),
+                files=Knowledges.get_file_metadatas_by_id(knowledge.id),
+                job_id=job.id,
+            )
+
     # Add content to the vector database
     try:
         process_file(
@@ -599,7 +625,11 @@ def remove_file_from_knowledge_by_id(
             pass
 
         # Delete file from database
-        Files.delete_file_by_id(form_data.file_id)
+        if Files.delete_file_by_id(form_data.file_id):
+            try:
+                release_file_content(file.path, file.meta)
+            except Exception as e:
+                log.exception(e)
 
     if knowledge:
         return KnowledgeFilesResponse(
@@ -754,12 +784,20 @@ async def add_files_to_knowledge_batch(
             )
         files.append(file)
 
+    if ENABLE_INGESTION_QUEUE:
+        # Files are added to the knowledge base once a worker processed them
+        job = enqueue_knowledge_files(id, files, user)
+        if job:
+            return KnowledgeFilesResponse(
+                **knowledge.model_dump(),
+                files=Knowledges.get_file_metadatas_by_id(knowledge.id),
+                job_id=job.id,
+            )
+
     # Process files
     try:
-        result = await process_files_batch(
-            request=request,
-            form_data=BatchProcessFilesForm(files=files, collection_name=id),
-            user=user,
+        result = await save_files_batch(
+            request, BatchProcessFilesForm(files=files, collection_name=id), user
         )
     except Exception as e:
         log.error(
@@ -790,3 +828,30 @@ async def add_files_to_knowledge_batch(
         **knowledge.model_dump(),
         files=Knowledges.get_file_metadatas_by_id(knowledge.id),
     )
+
+
+@router.get("/{id}/files/batch/{job_id}")
+async def get_knowledge_files_batch_status(
+    id: str, job_id: str, user=Depends(get_verified_user)
+):
+    """
+    Status and progress of a queued batch of files
+    """
+    job = Jobs.get_job_by_id(job_id)
+    if (
+        not job
+        or job.payload.get("knowledge_id") != id
+        or (job.user_id != user.id and user.role != "admin")
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERROR_MESSAGES.NOT_FOUND,
+        )
+
+    return {
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "progress": job.progress,
+        "error": job.error,
+    }
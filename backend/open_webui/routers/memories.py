@@ -1,10 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 import logging
-import asyncio
 from typing import Optional
 
+import numpy as np
+
+from open_webui.env import ENABLE_MEMORY_VECTOR_DB
 from open_webui.models.memories import Memories, MemoryModel
+from open_webui.models.users import UserModel
+from open_webui.retrieval.memory_index import (
+    MEMORY_INDEXES,
+    MemoryIndex,
+    broadcast_memory_change,
+    get_memory_metadata,
+    to_embedding,
+)
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
 from open_webui.utils.auth import get_verified_user
 
@@ -19,6 +29,95 @@ async def get_embeddings(request: Request):
     return {"result": await request.app.state.EMBEDDING_FUNCTION("hello world")}
 
 
+############################
+# Memory Index
+############################
+
+
+def get_embedding_model(request: Request) -> str:
+    config = request.app.state.config
+    return f"{config.RAG_EMBEDDING_ENGINE}:{config.RAG_EMBEDDING_MODEL}"
+
+
+async def embed_memories(
+    request: Request, memories: list[MemoryModel], user: UserModel
+) -> list[np.ndarray]:
+    """Embed and store the embeddings of `memories`."""
+    if not memories:
+        return []
+
+    vectors = await request.app.state.EMBEDDING_FUNCTION(
+        [memory.content for memory in memories], user=user
+    )
+    if not vectors or len(vectors) != len(memories):
+        raise HTTPException(status_code=500, detail="Failed to embed memories")
+    embeddings = [to_embedding(vector) for vector in vectors]
+
+    Memories.update_memory_embeddings(
+        [
+            (memory, embedding.tobytes())
+            for memory, embedding in zip(memories, embeddings)
+        ],
+        get_embedding_model(request),
+    )
+    return embeddings
+
+
+async def save_memory_embedding(
+    request: Request, memory: MemoryModel, user: UserModel
+) -> np.ndarray:
+    """Embed a new or updated memory and apply it to the memory index."""
+    (embedding,) = await embed_memories(request, [memory], user)
+    MEMORY_INDEXES.upsert(user.id, memory, embedding, get_embedding_model(request))
+    await broadcast_memory_change(getattr(request.app.state, "redis", None), user.id)
+
+    if ENABLE_MEMORY_VECTOR_DB:
+        VECTOR_DB_CLIENT.upsert(
+            collection_name=f"user-memory-{user.id}",
+            items=[
+                {
+                    "id": memory.id,
+                    "text": memory.content,
+                    "vector": embedding.tolist(),
+                    "metadata": get_memory_metadata(memory),
+                }
+            ],
+        )
+
+    return embedding
+
+
+async def get_memory_index(request: Request, user: UserModel) -> MemoryIndex:
+    """
+    The cached memory index of the user, built from the stored embeddings
+    otherwise. Memories without an embedding of the current model, e.g.
+    added before the index existed, are embedded once and stored.
+    """
+    model = get_embedding_model(request)
+    index = MEMORY_INDEXES.get(user.id, model)
+    if index is not None:
+        return index
+
+    version = MEMORY_INDEXES.get_version()
+    memories, missing = [], []
+    for memory, embedding, embedding_model in Memories.get_memory_embeddings_by_user_id(
+        user.id
+    ):
+        if embedding is not None and embedding_model == model:
+            memories.append((memory, np.frombuffer(embedding, dtype=np.float32)))
+        else:
+            missing.append(memory)
+
+    if missing:
+        log.info(f"Embedding {len(missing)} memories of user {user.id}")
+        embeddings = await embed_memories(request, missing, user)
+        memories.extend(zip(missing, embeddings))
+
+    index = MemoryIndex(model, memories)
+    MEMORY_INDEXES.set(user.id, index, version)
+    return index
+
+
 ############################
 # GetMemories
 ############################
@@ -49,20 +148,7 @@ async def add_memory(
     user=Depends(get_verified_user),
 ):
     memory = Memories.insert_new_memory(user.id, form_data.content)
-
-    vector = await request.app.state.EMBEDDING_FUNCTION(memory.content, user=user)
-
-    VECTOR_DB_CLIENT.upsert(
-        collection_name=f"user-memory-{user.id}",
-        items=[
-            {
-                "id": memory.id,
-                "text": memory.content,
-                "vector": vector,
-                "metadata": {"created_at": memory.created_at},
-            }
-        ],
-    )
+    await save_memory_embedding(request, memory, user)
 
     return memory
 
@@ -81,19 +167,12 @@ class QueryMemoryForm(BaseModel):
 async def query_memory(
     request: Request, form_data: QueryMemoryForm, user=Depends(get_verified_user)
 ):
-    memories = Memories.get_memories_by_user_id(user.id)
-    if not memories:
+    index = await get_memory_index(request, user)
+    if not len(index):
         raise HTTPException(status_code=404, detail="No memories found for user")
 
     vector = await request.app.state.EMBEDDING_FUNCTION(form_data.content, user=user)
-
-    results = VECTOR_DB_CLIENT.search(
-        collection_name=f"user-memory-{user.id}",
-        vectors=[vector],
-        limit=form_data.k,
-    )
-
-    return results
+    return index.search(vector, limit=form_data.k)
 
 
 ############################
@@ -103,33 +182,29 @@ async def query_memory(
 async def reset_memory_from_vector_db(
     request: Request, user=Depends(get_verified_user)
 ):
-    VECTOR_DB_CLIENT.delete_collection(f"user-memory-{user.id}")
-
     memories = Memories.get_memories_by_user_id(user.id)
+    embeddings = await embed_memories(request, memories, user)
+    MEMORY_INDEXES.invalidate(user.id)
+    await broadcast_memory_change(getattr(request.app.state, "redis", None), user.id)
 
-    # Generate vectors in parallel
-    vectors = await asyncio.gather(
-        *[
-            request.app.state.EMBEDDING_FUNCTION(memory.content, user=user)
-            for memory in memories
-        ]
-    )
+    try:
+        VECTOR_DB_CLIENT.delete_collection(f"user-memory-{user.id}")
+    except Exception as e:
+        log.debug(e)
 
-    VECTOR_DB_CLIENT.upsert(
-        collection_name=f"user-memory-{user.id}",
-        items=[
-            {
-                "id": memory.id,
-                "text": memory.content,
-                "vector": vectors[idx],
-                "metadata": {
-                    "created_at": memory.created_at,
-                    "updated_at": memory.updated_at,
-                },
-            }
-            for idx, memory in enumerate(memories)
-        ],
-    )
+    if ENABLE_MEMORY_VECTOR_DB and memories:
+        VECTOR_DB_CLIENT.upsert(
+            collection_name=f"user-memory-{user.id}",
+            items=[
+                {
+                    "id": memory.id,
+                    "text": memory.content,
+                    "vector": embeddings[idx].tolist(),
+                    "metadata": get_memory_metadata(memory),
+                }
+                for idx, memory in enumerate(memories)
+            ],
+        )
 
     return True
 
@@ -140,14 +215,19 @@ async def reset_memory_from_vector_db(
 
 
 @router.delete("/delete/user", response_model=bool)
-async def delete_memory_by_user_id(user=Depends(get_verified_user)):
+async def delete_memory_by_user_id(request: Request, user=Depends(get_verified_user)):
     result = Memories.delete_memories_by_user_id(user.id)
 
     if result:
+        MEMORY_INDEXES.invalidate(user.id)
+        await broadcast_memory_change(
+            getattr(request.app.state, "redis", None), user.id
+        )
         try:
+            # Also removes collections written before the memory index
             VECTOR_DB_CLIENT.delete_collection(f"user-memory-{user.id}")
         except Exception as e:
-            log.error(e)
+            log.debug(e)
         return True
 
     return False
@@ -172,22 +252,7 @@ async def update_memory_by_id(
         raise HTTPException(status_code=404, detail="Memory not found")
 
     if form_data.content is not None:
-        vector = await request.app.state.EMBEDDING_FUNCTION(memory.content, user=user)
-
-        VECTOR_DB_CLIENT.upsert(
-            collection_name=f"user-memory-{user.id}",
-            items=[
-                {
-                    "id": memory.id,
-                    "text": memory.content,
-                    "vector": vector,
-                    "metadata": {
-                        "created_at": memory.created_at,
-                        "updated_at": memory.updated_at,
-                    },
-                }
-            ],
-        )
+        await save_memory_embedding(request, memory, user)
 
     return memory
 
@@ -198,13 +263,20 @@ async def update_memory_by_id(
 
 
 @router.delete("/{memory_id}", response_model=bool)
-async def delete_memory_by_id(memory_id: str, user=Depends(get_verified_user)):
+async def delete_memory_by_id(
+    memory_id: str, request: Request, user=Depends(get_verified_user)
+):
     result = Memories.delete_memory_by_id_and_user_id(memory_id, user.id)
 
     if result:
-        VECTOR_DB_CLIENT.delete(
-            collection_name=f"user-memory-{user.id}", ids=[memory_id]
+        MEMORY_INDEXES.delete(user.id, memory_id)
+        await broadcast_memory_change(
+            getattr(request.app.state, "redis", None), user.id
         )
+        if ENABLE_MEMORY_VECTOR_DB:
+            VECTOR_DB_CLIENT.delete(
+                collection_name=f"user-memory-{user.id}", ids=[memory_id]
+            )
         return True
 
     return False
@@ -7,9 +7,10 @@ import asyncio
 
 import re
 import uuid
+from contextlib import aclosing
 from datetime import datetime
 from pathlib import Path
-from typing import Iterator, List, Optional, Sequence, Union
+from typing import AsyncIterator, Callable, Iterator, List, Optional, Sequence, Union
 
 from fastapi import (
     Depends,
@@ -44,36 +45,14 @@ from open_webui.storage.provider import Storage
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
 
 # Document loaders
-from open_webui.retrieval.loaders.main import Loader
+from open_webui.retrieval.cache import EMBEDDING_CACHE
 from open_webui.retrieval.loaders.youtube import YoutubeLoader
 
 # Web search engines
 from open_webui.retrieval.web.main import SearchResult
 from open_webui.retrieval.web.utils import get_web_loader
-from open_webui.retrieval.web.ollama import search_ollama_cloud
-from open_webui.retrieval.web.perplexity_search import search_perplexity_search
-from open_webui.retrieval.web.brave import search_brave
-from open_webui.retrieval.web.kagi import search_kagi
-from open_webui.retrieval.web.mojeek import search_mojeek
-from open_webui.retrieval.web.bocha import search_bocha
-from open_webui.retrieval.web.duckduckgo import search_duckduckgo
-from open_webui.retrieval.web.google_pse import search_google_pse
-from open_webui.retrieval.web.jina_search import search_jina
-from open_webui.retrieval.web.searchapi import search_searchapi
-from open_webui.retrieval.web.serpapi import search_serpapi
-from open_webui.retrieval.web.searxng import search_searxng
-from open_webui.retrieval.web.yacy import search_yacy
-from open_webui.retrieval.web.serper import search_serper
-from open_webui.retrieval.web.serply import search_serply
-from open_webui.retrieval.web.serpstack import search_serpstack
-from open_webui.retrieval.web.tavily import search_tavily
-from open_webui.retrieval.web.bing import search_bing
-from open_webui.retrieval.web.azure import search_azure
-from open_webui.retrieval.web.exa import search_exa
-from open_webui.retrieval.web.perplexity import search_perplexity
-from open_webui.retrieval.web.sougou import search_sougou
-from open_webui.retrieval.web.firecrawl import search_firecrawl
-from open_webui.retrieval.web.external import search_external
+from open_webui.retrieval.web.cache import WEB_SEARCH_CACHE
+from open_webui.retrieval.web.collections import WEB_SEARCH_COLLECTIONS
 
 from open_webui.retrieval.utils import (
     get_content_from_url,
@@ -84,6 +63,7 @@ from open_webui.retrieval.utils import (
     query_collection_with_hybrid_search,
     query_doc,
     query_doc_with_hybrid_search,
+    query_docs_in_memory,
 )
 from open_webui.retrieval.vector.utils import filter_metadata
 from open_webui.utils.misc import (
@@ -91,6 +71,8 @@ from open_webui.utils.misc import (
     sanitize_text_for_db,
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.ingestion import enqueue_files_batch
+from open_webui.utils.lazy import lazy_import
 
 from open_webui.config import (
     ENV,
@@ -102,6 +84,7 @@ from open_webui.config import (
     DEFAULT_LOCALE,
     RAG_EMBEDDING_CONTENT_PREFIX,
     RAG_EMBEDDING_QUERY_PREFIX,
+    ENABLE_FILE_EMBEDDING_CACHE,
 )
 from open_webui.env import (
     DEVICE_TYPE,
@@ -110,10 +93,49 @@ from open_webui.env import (
     SENTENCE_TRANSFORMERS_MODEL_KWARGS,
     SENTENCE_TRANSFORMERS_CROSS_ENCODER_BACKEND,
     SENTENCE_TRANSFORMERS_CROSS_ENCODER_MODEL_KWARGS,
+    ENABLE_INGESTION_QUEUE,
 )
 
 from open_webui.constants import ERROR_MESSAGES
 
+# Document loaders and web search engines pull in many dependencies, they
+# are imported when first used
+Loader = lazy_import("open_webui.retrieval.loaders.main", "Loader", warm=True)
+search_ollama_cloud = lazy_import(
+    "open_webui.retrieval.web.ollama", "search_ollama_cloud"
+)
+search_perplexity_search = lazy_import(
+    "open_webui.retrieval.web.perplexity_search", "search_perplexity_search"
+)
+search_brave = lazy_import("open_webui.retrieval.web.brave", "search_brave")
+search_kagi = lazy_import("open_webui.retrieval.web.kagi", "search_kagi")
+search_mojeek = lazy_import("open_webui.retrieval.web.mojeek", "search_mojeek")
+search_bocha = lazy_import("open_webui.retrieval.web.bocha", "search_bocha")
+search_duckduckgo = lazy_import(
+    "open_webui.retrieval.web.duckduckgo", "search_duckduckgo"
+)
+search_google_pse = lazy_import(
+    "open_webui.retrieval.web.google_pse", "search_google_pse"
+)
+search_jina = lazy_import("open_webui.retrieval.web.jina_search", "search_jina")
+search_searchapi = lazy_import("open_webui.retrieval.web.searchapi", "search_searchapi")
+search_serpapi = lazy_import("open_webui.retrieval.web.serpapi", "search_serpapi")
+search_searxng = lazy_import("open_webui.retrieval.web.searxng", "search_searxng")
+search_yacy = lazy_import("open_webui.retrieval.web.yacy", "search_yacy")
+search_serper = lazy_import("open_webui.retrieval.web.serper", "search_serper")
+search_serply = lazy_import("open_webui.retrieval.web.serply", "search_serply")
+search_serpstack = lazy_import("open_webui.retrieval.web.serpstack", "search_serpstack")
+search_tavily = lazy_import("open_webui.retrieval.web.tavily", "search_tavily")
+search_bing = lazy_import("open_webui.retrieval.web.bing", "search_bing")
+search_azure = lazy_import("open_webui.retrieval.web.azure", "search_azure")
+search_exa = lazy_import("open_webui.retrieval.web.exa", "search_exa")
+search_perplexity = lazy_import(
+    "open_webui.retrieval.web.perplexity", "search_perplexity"
+)
+search_sougou = lazy_import("open_webui.retrieval.web.sougou", "search_sougou")
+search_firecrawl = lazy_import("open_webui.retrieval.web.firecrawl", "search_firecrawl")
+search_external = lazy_import("open_webui.retrieval.web.external", "search_external")
+
 log = logging.getLogger(__name__)
 
 ##########################################
@@ -515,6 +537,8 @@ async def get_rag_config(request: Request, user=Depends(get_admin_user)):
             "WEB_LOADER_CONCURRENT_REQUESTS": request.app.state.config.WEB_LOADER_CONCURRENT_REQUESTS,
             "WEB_SEARCH_DOMAIN_FILTER_LIST": request.app.state.config.WEB_SEARCH_DOMAIN_FILTER_LIST,
             "BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL": request.app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL,
+            "WEB_SEARCH_RETRIEVAL_MODE": request.app.state.config.WEB_SEARCH_RETRIEVAL_MODE,
+            "WEB_SEARCH_COLLECTION_TTL": request.app.state.config.WEB_SEARCH_COLLECTION_TTL,
             "BYPASS_WEB_SEARCH_WEB_LOADER": request.app.state.config.BYPASS_WEB_SEARCH_WEB_LOADER,
             "OLLAMA_CLOUD_WEB_SEARCH_API_KEY": request.app.state.config.OLLAMA_CLOUD_WEB_SEARCH_API_KEY,
             "SEARXNG_QUERY_URL": request.app.state.config.SEARXNG_QUERY_URL,
@@ -549,6 +573,7 @@ async def get_rag_config(request: Request, user=Depends(get_admin_user)):
             "SOUGOU_API_SK": request.app.state.config.SOUGOU_API_SK,
             "WEB_LOADER_ENGINE": request.app.state.config.WEB_LOADER_ENGINE,
             "WEB_LOADER_TIMEOUT": request.app.state.config.WEB_LOADER_TIMEOUT,
+            "WEB_LOADER_DEADLINE": request.app.state.config.WEB_LOADER_DEADLINE,
             "ENABLE_WEB_LOADER_SSL_VERIFICATION": request.app.state.config.ENABLE_WEB_LOADER_SSL_VERIFICATION,
             "PLAYWRIGHT_WS_URL": request.app.state.config.PLAYWRIGHT_WS_URL,
             "PLAYWRIGHT_TIMEOUT": request.app.state.config.PLAYWRIGHT_TIMEOUT,
@@ -575,6 +600,8 @@ class WebConfig(BaseModel):
     WEB_LOADER_CONCURRENT_REQUESTS: Optional[int] = None
     WEB_SEARCH_DOMAIN_FILTER_LIST: Optional[List[str]] = []
     BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL: Optional[bool] = None
+    WEB_SEARCH_RETRIEVAL_MODE: Optional[str] = None
+    WEB_SEARCH_COLLECTION_TTL: Optional[int] = None
     BYPASS_WEB_SEARCH_WEB_LOADER: Optional[bool] = None
     OLLAMA_CLOUD_WEB_SEARCH_API_KEY: Optional[str] = None
     SEARXNG_QUERY_URL: Optional[str] = None
@@ -609,6 +636,7 @@ class WebConfig(BaseModel):
     SOUGOU_API_SK: Optional[str] = None
     WEB_LOADER_ENGINE: Optional[str] = None
     WEB_LOADER_TIMEOUT: Optional[str] = None
+    WEB_LOADER_DEADLINE: Optional[float] = None
     ENABLE_WEB_LOADER_SSL_VERIFICATION: Optional[bool] = None
     PLAYWRIGHT_WS_URL: Optional[str] = None
     PLAYWRIGHT_TIMEOUT: Optional[int] = None
@@ -1046,6 +1074,19 @@ async def update_rag_config(
         request.app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL = (
             form_data.web.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL
         )
+        if form_data.web.WEB_SEARCH_RETRIEVAL_MODE is not None:
+            if form_data.web.WEB_SEARCH_RETRIEVAL_MODE not in ("collection", "memory"):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=ERROR_MESSAGES.DEFAULT("Invalid web search retrieval mode"),
+                )
+            request.app.state.config.WEB_SEARCH_RETRIEVAL_MODE = (
+                form_data.web.WEB_SEARCH_RETRIEVAL_MODE
+            )
+        if form_data.web.WEB_SEARCH_COLLECTION_TTL is not None:
+            request.app.state.config.WEB_SEARCH_COLLECTION_TTL = max(
+                form_data.web.WEB_SEARCH_COLLECTION_TTL, 0
+            )
         request.app.state.config.BYPASS_WEB_SEARCH_WEB_LOADER = (
             form_data.web.BYPASS_WEB_SEARCH_WEB_LOADER
         )
@@ -1102,6 +1143,10 @@ async def update_rag_config(
         # Web loader settings
         request.app.state.config.WEB_LOADER_ENGINE = form_data.web.WEB_LOADER_ENGINE
         request.app.state.config.WEB_LOADER_TIMEOUT = form_data.web.WEB_LOADER_TIMEOUT
+        if form_data.web.WEB_LOADER_DEADLINE is not None:
+            request.app.state.config.WEB_LOADER_DEADLINE = max(
+                form_data.web.WEB_LOADER_DEADLINE, 0
+            )
 
         request.app.state.config.ENABLE_WEB_LOADER_SSL_VERIFICATION = (
             form_data.web.ENABLE_WEB_LOADER_SSL_VERIFICATION
@@ -1208,6 +1253,8 @@ async def update_rag_config(
             "WEB_LOADER_CONCURRENT_REQUESTS": request.app.state.config.WEB_LOADER_CONCURRENT_REQUESTS,
             "WEB_SEARCH_DOMAIN_FILTER_LIST": request.app.state.config.WEB_SEARCH_DOMAIN_FILTER_LIST,
             "BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL": request.app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL,
+            "WEB_SEARCH_RETRIEVAL_MODE": request.app.state.config.WEB_SEARCH_RETRIEVAL_MODE,
+            "WEB_SEARCH_COLLECTION_TTL": request.app.state.config.WEB_SEARCH_COLLECTION_TTL,
             "BYPASS_WEB_SEARCH_WEB_LOADER": request.app.state.config.BYPASS_WEB_SEARCH_WEB_LOADER,
             "OLLAMA_CLOUD_WEB_SEARCH_API_KEY": request.app.state.config.OLLAMA_CLOUD_WEB_SEARCH_API_KEY,
             "SEARXNG_QUERY_URL": request.app.state.config.SEARXNG_QUERY_URL,
@@ -1242,6 +1289,7 @@ async def update_rag_config(
             "SOUGOU_API_SK": request.app.state.config.SOUGOU_API_SK,
             "WEB_LOADER_ENGINE": request.app.state.config.WEB_LOADER_ENGINE,
             "WEB_LOADER_TIMEOUT": request.app.state.config.WEB_LOADER_TIMEOUT,
+            "WEB_LOADER_DEADLINE": request.app.state.config.WEB_LOADER_DEADLINE,
             "ENABLE_WEB_LOADER_SSL_VERIFICATION": request.app.state.config.ENABLE_WEB_LOADER_SSL_VERIFICATION,
             "PLAYWRIGHT_WS_URL": request.app.state.config.PLAYWRIGHT_WS_URL,
             "PLAYWRIGHT_TIMEOUT": request.app.state.config.PLAYWRIGHT_TIMEOUT,
@@ -1266,6 +1314,78 @@ async def update_rag_config(
 ####################################
 
 
+def split_docs(request: Request, docs: list[Document]) -> list[Document]:
+    """Split `docs` into chunks with the configured text splitter."""
+    if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=request.app.state.config.CHUNK_SIZE,
+            chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+            add_start_index=True,
+        )
+        docs = text_splitter.split_documents(docs)
+    elif request.app.state.config.TEXT_SPLITTER == "token":
+        log.info(
+            f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}"
+        )
+
+        tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
+        text_splitter = TokenTextSplitter(
+            encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
+            chunk_size=request.app.state.config.CHUNK_SIZE,
+            chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+            add_start_index=True,
+        )
+        docs = text_splitter.split_documents(docs)
+    elif request.app.state.config.TEXT_SPLITTER == "markdown_header":
+        log.info("Using markdown header text splitter")
+
+        # Define headers to split on - covering most common markdown header levels
+        headers_to_split_on = [
+            ("#", "Header 1"),
+            ("##", "Header 2"),
+            ("###", "Header 3"),
+            ("####", "Header 4"),
+            ("#####", "Header 5"),
+            ("######", "Header 6"),
+        ]
+
+        markdown_splitter = MarkdownHeaderTextSplitter(
+            headers_to_split_on=headers_to_split_on,
+            strip_headers=False,  # Keep headers in content for context
+        )
+
+        md_split_docs = []
+        for doc in docs:
+            md_header_splits = markdown_splitter.split_text(doc.page_content)
+            text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=request.app.state.config.CHUNK_SIZE,
+                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+                add_start_index=True,
+            )
+            md_header_splits = text_splitter.split_documents(md_header_splits)
+
+            # Convert back to Document objects, preserving original metadata
+            for split_chunk in md_header_splits:
+                headings_list = []
+                # Extract header values in order based on headers_to_split_on
+                for _, header_meta_key_name in headers_to_split_on:
+                    if header_meta_key_name in split_chunk.metadata:
+                        headings_list.append(split_chunk.metadata[header_meta_key_name])
+
+                md_split_docs.append(
+                    Document(
+                        page_content=split_chunk.page_content,
+                        metadata={**doc.metadata, "headings": headings_list},
+                    )
+                )
+
+        docs = md_split_docs
+    else:
+        raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
+
+    return docs
+
+
 def save_docs_to_vector_db(
     request: Request,
     docs,
@@ -1275,7 +1395,16 @@ def save_docs_to_vector_db(
     split: bool = True,
     add: bool = False,
     user=None,
+    blob_hash: Optional[str] = None,
+    embeddings: Optional[list[list[float]]] = None,
 ) -> bool:
+    """
+    Split, embed and insert `docs` into `collection_name`. When `blob_hash`
+    (the SHA-256 of the source file) is given, the embeddings are cached
+    for that content and reused by other files with identical chunks.
+    `embeddings` are those of already split `docs`, if embedded beforehand.
+    """
+
     def _get_docs_info(docs: list[Document]) -> str:
         docs_info = set()
 
@@ -1310,74 +1439,7 @@ def save_docs_to_vector_db(
                 raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
 
     if split:
-        if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        elif request.app.state.config.TEXT_SPLITTER == "token":
-            log.info(
-                f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}"
-            )
-
-            tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
-            text_splitter = TokenTextSplitter(
-                encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        elif request.app.state.config.TEXT_SPLITTER == "markdown_header":
-            log.info("Using markdown header text splitter")
-
-            # Define headers to split on - covering most common markdown header levels
-            headers_to_split_on = [
-                ("#", "Header 1"),
-                ("##", "Header 2"),
-                ("###", "Header 3"),
-                ("####", "Header 4"),
-                ("#####", "Header 5"),
-                ("######", "Header 6"),
-            ]
-
-            markdown_splitter = MarkdownHeaderTextSplitter(
-                headers_to_split_on=headers_to_split_on,
-                strip_headers=False,  # Keep headers in content for context
-            )
-
-            md_split_docs = []
-            for doc in docs:
-                md_header_splits = markdown_splitter.split_text(doc.page_content)
-                text_splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=request.app.state.config.CHUNK_SIZE,
-                    chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                    add_start_index=True,
-                )
-                md_header_splits = text_splitter.split_documents(md_header_splits)
-
-                # Convert back to Document objects, preserving original metadata
-                for split_chunk in md_header_splits:
-                    headings_list = []
-                    # Extract header values in order based on headers_to_split_on
-                    for _, header_meta_key_name in headers_to_split_on:
-                        if header_meta_key_name in split_chunk.metadata:
-                            headings_list.append(
-                                split_chunk.metadata[header_meta_key_name]
-                            )
-
-                    md_split_docs.append(
-                        Document(
-                            page_content=split_chunk.page_content,
-                            metadata={**doc.metadata, "headings": headings_list},
-                        )
-                    )
-
-            docs = md_split_docs
-        else:
-            raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
+        docs = split_docs(request, docs)
 
     if len(docs) == 0:
         raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
@@ -1409,19 +1471,25 @@ def save_docs_to_vector_db(
                 return True
 
         log.info(f"generating embeddings for {collection_name}")
+        embedding_url = (
+            request.app.state.config.RAG_OPENAI_API_BASE_URL
+            if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
+            else (
+                request.app.state.config.RAG_OLLAMA_BASE_URL
+                if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
+                else request.app.state.config.RAG_AZURE_OPENAI_BASE_URL
+            )
+        )
+        azure_api_version = (
+            request.app.state.config.RAG_AZURE_OPENAI_API_VERSION
+            if request.app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
+            else None
+        )
         embedding_function = get_embedding_function(
             request.app.state.config.RAG_EMBEDDING_ENGINE,
             request.app.state.config.RAG_EMBEDDING_MODEL,
             request.app.state.ef,
-            (
-                request.app.state.config.RAG_OPENAI_API_BASE_URL
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
-                else (
-                    request.app.state.config.RAG_OLLAMA_BASE_URL
-                    if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
-                    else request.app.state.config.RAG_AZURE_OPENAI_BASE_URL
-                )
-            ),
+            embedding_url,
             (
                 request.app.state.config.RAG_OPENAI_API_KEY
                 if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
@@ -1432,23 +1500,45 @@ def save_docs_to_vector_db(
                 )
             ),
             request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
-            azure_api_version=(
-                request.app.state.config.RAG_AZURE_OPENAI_API_VERSION
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
-                else None
-            ),
+            azure_api_version=azure_api_version,
             enable_async=request.app.state.config.ENABLE_ASYNC_EMBEDDING,
         )
 
-        # Run async embedding in sync context
-        embeddings = asyncio.run(
-            embedding_function(
-                list(map(lambda x: x.replace("\n", " "), texts)),
-                prefix=RAG_EMBEDDING_CONTENT_PREFIX,
-                user=user,
+        embedding_texts = list(map(lambda x: x.replace("\n", " "), texts))
+
+        if embeddings is None and blob_hash and ENABLE_FILE_EMBEDDING_CACHE:
+            embedding_cache_key = EMBEDDING_CACHE.get_key(
+                embedding_texts,
+                {
+                    "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
+                    # Local models have no endpoint
+                    "url": (
+                        embedding_url
+                        if request.app.state.config.RAG_EMBEDDING_ENGINE
+                        else None
+                    ),
+                    "azure_api_version": azure_api_version,
+                    "model": request.app.state.config.RAG_EMBEDDING_MODEL,
+                    "prefix": RAG_EMBEDDING_CONTENT_PREFIX,
+                },
             )
-        )
-        log.info(f"embeddings generated {len(embeddings)} for {len(texts)} items")
+            embeddings = EMBEDDING_CACHE.get(blob_hash, embedding_cache_key)
+            if embeddings is not None:
+                log.info(f"reusing {len(embeddings)} cached embeddings")
+
+        if embeddings is None:
+            # Run async embedding in sync context
+            embeddings = asyncio.run(
+                embedding_function(
+                    embedding_texts,
+                    prefix=RAG_EMBEDDING_CONTENT_PREFIX,
+                    user=user,
+                )
+            )
+            log.info(f"embeddings generated {len(embeddings)} for {len(texts)} items")
+
+            if blob_hash and ENABLE_FILE_EMBEDDING_CACHE:
+                EMBEDDING_CACHE.set(blob_hash, embedding_cache_key, embeddings)
 
         items = [
             {
@@ -1658,6 +1748,7 @@ def process_file(
                         },
                         add=(True if form_data.collection_name else False),
                         user=user,
+                        blob_hash=(file.meta or {}).get("sha256"),
                     )
                     log.info(f"added {len(docs)} items to collection {collection_name}")
 
@@ -2102,11 +2193,159 @@ def search_web(
         raise Exception("No search engine API key found in environment variables")
 
 
+# Engines whose results may depend on the user or chat, e.g. the external
+# engine receives the user info headers and chat id, so they can't be shared
+UNCACHED_WEB_SEARCH_ENGINES = {"external"}
+
+
+async def search_web_with_cache(
+    request: Request, engine: str, query: str, user=None
+) -> list[SearchResult]:
+    """`search_web`, reusing the cached results of the same query if any."""
+    if engine in UNCACHED_WEB_SEARCH_ENGINES:
+        return await run_in_threadpool(search_web, request, engine, query, user)
+
+    options = [
+        request.app.state.config.WEB_SEARCH_RESULT_COUNT,
+        request.app.state.config.WEB_SEARCH_DOMAIN_FILTER_LIST,
+    ]
+    results = await WEB_SEARCH_CACHE.get_results(
+        request.app.state.redis, engine, query, options
+    )
+    if results is not None:
+        return [SearchResult(**result) for result in results]
+
+    results = await run_in_threadpool(search_web, request, engine, query, user)
+    if results:
+        await WEB_SEARCH_CACHE.set_results(
+            request.app.state.redis,
+            engine,
+            query,
+            [dict(result) for result in results],
+            options,
+        )
+    return results
+
+
+def rank_web_search_chunks(
+    request: Request,
+    chunks: list[Document],
+    embeddings: list[list[float]],
+    query_embeddings: list[list[float]],
+) -> list[Document]:
+    """
+    The chunks most relevant to the queries, ranked in-process when
+    WEB_SEARCH_RETRIEVAL_MODE is "memory". Nothing is stored.
+    """
+    result = query_docs_in_memory(
+        [sanitize_text_for_db(chunk.page_content) for chunk in chunks],
+        [chunk.metadata for chunk in chunks],
+        embeddings,
+        query_embeddings,
+        request.app.state.config.TOP_K,
+    )
+    return [
+        Document(page_content=document, metadata=metadata)
+        for document, metadata in zip(result["documents"][0], result["metadatas"][0])
+    ]
+
+
+async def embed_web_pages(
+    request: Request,
+    pages: AsyncIterator[Document],
+    embed: bool = True,
+    user=None,
+    event_emitter: Optional[Callable] = None,
+    total: int = 0,
+) -> tuple[list[Document], list[Document], list[list[float]]]:
+    """
+    Split and embed web pages as they are loaded instead of once all of them
+    are. Chunks are embedded in batches filled across pages while the next
+    pages load. After WEB_LOADER_DEADLINE seconds, the pages still loading are
+    dropped and the search continues with the others.
+
+    Returns the loaded pages, their chunks and the chunk embeddings.
+    """
+    docs, chunks, batches = [], [], []
+    embedded = 0
+    # Small batches would be embedded one request (or model call) at a time
+    batch_size = max(request.app.state.config.RAG_EMBEDDING_BATCH_SIZE, 32)
+
+    def embed_chunks(end: int):
+        nonlocal embedded
+        texts = [
+            sanitize_text_for_db(chunk.page_content).replace("\n", " ")
+            for chunk in chunks[embedded:end]
+        ]
+        batches.append(
+            asyncio.create_task(
+                request.app.state.EMBEDDING_FUNCTION(
+                    texts, prefix=RAG_EMBEDDING_CONTENT_PREFIX, user=user
+                )
+            )
+        )
+        embedded = end
+
+    async def load():
+        async with aclosing(pages) as documents:
+            async for doc in documents:
+                docs.append(doc)
+                if event_emitter:
+                    await event_emitter(
+                        {
+                            "type": "status",
+                            "data": {
+                                "action": "web_search_page_loaded",
+                                "description": "Loaded {{count}} of {{total}} sites",
+                                "url": doc.metadata.get("source"),
+                                "count": len(docs),
+                                "total": total,
+                                "done": False,
+                            },
+                        }
+                    )
+
+                if embed:
+                    chunks.extend(await run_in_threadpool(split_docs, request, [doc]))
+                    while len(chunks) - embedded >= batch_size:
+                        embed_chunks(embedded + batch_size)
+
+    try:
+        try:
+            await asyncio.wait_for(
+                load(), request.app.state.config.WEB_LOADER_DEADLINE or None
+            )
+        except asyncio.TimeoutError:
+            log.info(
+                f"Web loader deadline reached, continuing with {len(docs)} of {total} pages"
+            )
+
+        if embedded < len(chunks):
+            embed_chunks(len(chunks))
+
+        embeddings = [
+            embedding for batch in await asyncio.gather(*batches) for embedding in batch
+        ]
+    finally:
+        for batch in batches:
+            batch.cancel()
+
+    return docs, chunks, embeddings
+
+
 @router.post("/process/web/search")
 async def process_web_search(
     request: Request, form_data: SearchForm, user=Depends(get_verified_user)
 ):
+    return await run_web_search(request, form_data, user=user)
+
 
+async def run_web_search(
+    request: Request,
+    form_data: SearchForm,
+    user=None,
+    event_emitter: Optional[Callable] = None,
+):
     urls = []
     result_items = []
 
@@ -2126,8 +2365,7 @@ async def process_web_search(
 
             async def search_with_limit(query):
                 async with semaphore:
-                    return await run_in_threadpool(
-                        search_web,
+                    return await search_web_with_cache(
                         request,
                         request.app.state.config.WEB_SEARCH_ENGINE,
                         query,
@@ -2138,8 +2376,7 @@ async def process_web_search(
         else:
             # Unlimited parallel execution (previous behavior)
             search_tasks = [
-                run_in_threadpool(
-                    search_web,
+                search_web_with_cache(
                     request,
                     request.app.state.config.WEB_SEARCH_ENGINE,
                     query,
@@ -2180,7 +2417,7 @@ async def process_web_search(
                 item for result in search_results for item in result if result
             ]
 
-            docs = [
+            snippets = [
                 Document(
                     page_content=result.snippet,
                     metadata={
@@ -2193,14 +2430,53 @@ async def process_web_search(
                 for result in search_results
                 if hasattr(result, "snippet") and result.snippet is not None
             ]
+
+            async def iterate_snippets():
+                for snippet in snippets:
+                    yield snippet
+
+            pages = iterate_snippets()
         else:
             loader = get_web_loader(
                 urls,
                 verify_ssl=request.app.state.config.ENABLE_WEB_LOADER_SSL_VERIFICATION,
                 requests_per_second=request.app.state.config.WEB_LOADER_CONCURRENT_REQUESTS,
                 trust_env=request.app.state.config.WEB_SEARCH_TRUST_ENV,
+                page_cache=WEB_SEARCH_CACHE,
+                redis=request.app.state.redis,
+            )
+            pages = loader.alazy_load()
+
+        bypass_embedding = (
+            request.app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL
+        )
+        in_memory = (
+            not bypass_embedding
+            and request.app.state.config.WEB_SEARCH_RETRIEVAL_MODE == "memory"
+        )
+
+        query_embeddings = None
+        if in_memory:
+            # Embedded while the pages load
+            query_embeddings = asyncio.create_task(
+                request.app.state.EMBEDDING_FUNCTION(
+                    form_data.queries, prefix=RAG_EMBEDDING_QUERY_PREFIX, user=user
+                )
+            )
+
+        try:
+            docs, chunks, embeddings = await embed_web_pages(
+                request,
+                pages,
+                embed=not bypass_embedding,
+                user=user,
+                event_emitter=event_emitter,
+                total=len(urls),
             )
-            docs = await loader.aload()
+        except BaseException:
+            if query_embeddings is not None:
+                query_embeddings.cancel()
+            raise
 
         urls = [
             doc.metadata.get("source") for doc in docs if doc.metadata.get("source")
@@ -2209,7 +2485,12 @@ async def process_web_search(
             dict(item) for item in result_items if item.link in urls
         ]  # only keep the search results that have been loaded
 
-        if request.app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL:
+        if bypass_embedding or in_memory:
+            if in_memory:
+                docs = rank_web_search_chunks(
+                    request, chunks, embeddings, await query_embeddings
+                )
+
             return {
                 "status": True,
                 "collection_name": None,
@@ -2236,14 +2517,24 @@ async def process_web_search(
                 await run_in_threadpool(
                     save_docs_to_vector_db,
                     request,
-                    docs,
+                    chunks,
                     collection_name,
                     overwrite=True,
+                    split=False,
                     user=user,
+                    embeddings=embeddings,
                 )
             except Exception as e:
                 log.debug(f"error saving docs: {e}")
 
+            if request.app.state.config.WEB_SEARCH_COLLECTION_TTL > 0:
+                try:
+                    await WEB_SEARCH_COLLECTIONS.add(
+                        request.app.state.redis, collection_name
+                    )
+                except Exception as e:
+                    log.warning(f"Failed to track web search collection: {e}")
+
             return {
                 "status": True,
                 "collection_names": [collection_name],
@@ -2259,6 +2550,12 @@ async def process_web_search(
         )
 
 
+@router.get("/web/search/cache")
+async def get_web_search_cache_stats(user=Depends(get_admin_user)):
+    """Hit rates of the search result and page caches of this instance."""
+    return WEB_SEARCH_CACHE.get_stats()
+
+
 class QueryDocForm(BaseModel):
     collection_name: str
     query: str
@@ -2489,6 +2786,8 @@ class BatchProcessFilesResult(BaseModel):
 class BatchProcessFilesResponse(BaseModel):
     results: List[BatchProcessFilesResult]
     errors: List[BatchProcessFilesResult]
+    # Set when the files were queued for an ingestion worker
+    job_id: Optional[str] = None
 
 
 @router.post("/process/files/batch")
@@ -2498,7 +2797,29 @@ async def process_files_batch(
     user=Depends(get_verified_user),
 ) -> BatchProcessFilesResponse:
     """
-    Process a batch of files and save them to the vector database.
+    Process a batch of files and save them to the vector database, or queue
+    them for an ingestion worker when the queue is enabled.
+    """
+    if ENABLE_INGESTION_QUEUE:
+        job = enqueue_files_batch(form_data.collection_name, form_data.files, user)
+        if job:
+            return BatchProcessFilesResponse(
+                results=[
+                    BatchProcessFilesResult(file_id=file.id, status="pending")
+                    for file in form_data.files
+                ],
+                errors=[],
+                job_id=job.id,
+            )
+
+    return await save_files_batch(request, form_data, user)
+
+
+async def save_files_batch(
+    request: Request, form_data: BatchProcessFilesForm, user
+) -> BatchProcessFilesResponse:
+    """
+    Embed a batch of files and save them to the vector database.
     """
 
     collection_name = form_data.collection_name
@@ -2539,7 +2860,7 @@ async def process_files_batch(
             )
 
         except Exception as e:
-            log.error(f"process_files_batch: Error processing file {file.id}: {str(e)}")
+            log.error(f"save_files_batch: Error processing file {file.id}: {str(e)}")
             file_errors.append(
                 BatchProcessFilesResult(file_id=file.id, status="failed", error=str(e))
             )
@@ -2563,7 +2884,7 @@ async def process_files_batch(
 
         except Exception as e:
             log.error(
-                f"process_files_batch: Error saving documents to vector DB: {str(e)}"
+                f"save_files_batch: Error saving documents to vector DB: {str(e)}"
             )
             for file_result in file_results:
                 file_result.status = "failed"
@@ -5,6 +5,7 @@ Provides System for Cross-domain Identity Management endpoints for users and gro
 NOTE: This is an experimental implementation and may not fully comply with SCIM 2.0 standards, and is subject to change.
 """
 
+import json
 import logging
 import uuid
 import time
@@ -13,7 +14,7 @@ from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Query, Header, status
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, ValidationError
 
 from open_webui.models.users import Users, UserModel
 from open_webui.models.groups import Groups, GroupModel
@@ -24,6 +25,7 @@ from open_webui.utils.auth import (
     get_verified_user,
 )
 from open_webui.constants import ERROR_MESSAGES
+from open_webui.utils.scim import SCIMFilterError, parse_filter
 
 log = logging.getLogger(__name__)
 
@@ -34,14 +36,25 @@ SCIM_USER_SCHEMA = "urn:ietf:params:scim:schemas:core:2.0:User"
 SCIM_GROUP_SCHEMA = "urn:ietf:params:scim:schemas:core:2.0:Group"
 SCIM_LIST_RESPONSE_SCHEMA = "urn:ietf:params:scim:api:messages:2.0:ListResponse"
 SCIM_ERROR_SCHEMA = "urn:ietf:params:scim:api:messages:2.0:Error"
+SCIM_BULK_REQUEST_SCHEMA = "urn:ietf:params:scim:api:messages:2.0:BulkRequest"
+SCIM_BULK_RESPONSE_SCHEMA = "urn:ietf:params:scim:api:messages:2.0:BulkResponse"
 
 # SCIM Resource Types
 SCIM_RESOURCE_TYPE_USER = "User"
 SCIM_RESOURCE_TYPE_GROUP = "Group"
 
+# Most resources returned per page of a list
+SCIM_MAX_RESULTS = 200
 
-def scim_error(status_code: int, detail: str, scim_type: Optional[str] = None):
-    """Create a SCIM-compliant error response"""
+# Limits of a bulk request
+SCIM_BULK_MAX_OPERATIONS = 1000
+SCIM_BULK_MAX_PAYLOAD_SIZE = 1048576
+
+
+def get_scim_error_body(
+    status_code: int, detail: str, scim_type: Optional[str] = None
+) -> dict:
+    """Create a SCIM-compliant error body"""
     error_body = {
         "schemas": [SCIM_ERROR_SCHEMA],
         "status": str(status_code),
@@ -57,7 +70,15 @@ def scim_error(status_code: int, detail: str, scim_type: Optional[str] = None):
     elif status_code == 400:
         error_body["scimType"] = "invalidSyntax"
 
-    return JSONResponse(status_code=status_code, content=error_body)
+    return error_body
+
+
+def scim_error(status_code: int, detail: str, scim_type: Optional[str] = None):
+    """Create a SCIM-compliant error response"""
+    return JSONResponse(
+        status_code=status_code,
+        content=get_scim_error_body(status_code, detail, scim_type),
+    )
 
 
 class SCIMError(BaseModel):
@@ -174,6 +195,7 @@ class SCIMGroup(BaseModel):
 
     schemas: List[str] = [SCIM_GROUP_SCHEMA]
     id: str
+    externalId: Optional[str] = None
     displayName: str
     members: Optional[List[SCIMGroupMember]] = []
     meta: SCIMMeta
@@ -185,6 +207,7 @@ class SCIMGroupCreateRequest(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
     schemas: List[str] = [SCIM_GROUP_SCHEMA]
+    externalId: Optional[str] = None
     displayName: str
     members: Optional[List[SCIMGroupMember]] = []
 
@@ -195,6 +218,7 @@ class SCIMGroupUpdateRequest(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
     schemas: List[str] = [SCIM_GROUP_SCHEMA]
+    externalId: Optional[str] = None
     displayName: Optional[str] = None
     members: Optional[List[SCIMGroupMember]] = None
 
@@ -224,6 +248,24 @@ class SCIMPatchRequest(BaseModel):
     Operations: List[SCIMPatchOperation]
 
 
+class SCIMBulkOperation(BaseModel):
+    """SCIM Bulk Operation"""
+
+    method: str  # "POST", "PUT", "PATCH", "DELETE"
+    path: str
+    bulkId: Optional[str] = None
+    version: Optional[str] = None
+    data: Optional[Any] = None
+
+
+class SCIMBulkRequest(BaseModel):
+    """SCIM Bulk Request"""
+
+    schemas: List[str] = [SCIM_BULK_REQUEST_SCHEMA]
+    failOnErrors: Optional[int] = None
+    Operations: List[SCIMBulkOperation]
+
+
 def get_scim_auth(
     request: Request, authorization: Optional[str] = Header(None)
 ) -> bool:
@@ -296,15 +338,30 @@ def get_scim_auth(
         )
 
 
-def user_to_scim(user: UserModel, request: Request) -> SCIMUser:
-    """Convert internal User model to SCIM User"""
+def get_excluded_attributes(excluded_attributes: Optional[str]) -> set[str]:
+    return {
+        attribute.strip().lower()
+        for attribute in (excluded_attributes or "").split(",")
+        if attribute.strip()
+    }
+
+
+def user_to_scim(
+    user: UserModel, request: Request, groups: Optional[list[GroupModel]] = None
+) -> SCIMUser:
+    """
+    Convert internal User model to SCIM User, with its groups if given,
+    e.g. read in one query for a page of users
+    """
     # Parse display name into name components
     name_parts = user.name.split(" ", 1) if user.name else ["", ""]
     given_name = name_parts[0] if name_parts else ""
     family_name = name_parts[1] if len(name_parts) > 1 else ""
 
     # Get user's groups
-    user_groups = Groups.get_groups_by_member_id(user.id)
+    user_groups = groups
+    if user_groups is None:
+        user_groups = Groups.get_groups_by_member_id(user.id)
     groups = [
         {
             "value": group.id,
@@ -317,6 +374,7 @@ def user_to_scim(user: UserModel, request: Request) -> SCIMUser:
 
     return SCIMUser(
         id=user.id,
+        externalId=user.scim_external_id,
         userName=user.email,
         name=SCIMName(
             formatted=user.name,
@@ -345,26 +403,35 @@ def user_to_scim(user: UserModel, request: Request) -> SCIMUser:
     )
 
 
-def group_to_scim(group: GroupModel, request: Request) -> SCIMGroup:
-    """Convert internal Group model to SCIM Group"""
-    member_ids = Groups.get_group_user_ids_by_id(group.id)
-    members = []
-
-    for user_id in member_ids:
-        user = Users.get_user_by_id(user_id)
-        if user:
-            members.append(
-                SCIMGroupMember(
-                    value=user.id,
-                    ref=f"{request.base_url}api/v1/scim/v2/Users/{user.id}",
-                    display=user.name,
-                )
-            )
+def group_to_scim(
+    group: GroupModel,
+    request: Request,
+    members: Optional[list[tuple[str, str]]] = None,
+    exclude_members: bool = False,
+) -> SCIMGroup:
+    """
+    Convert internal Group model to SCIM Group, with the (id, name) of its
+    members if given, e.g. read in one query for a page of groups
+    """
+    if members is None and not exclude_members:
+        members = Users.get_member_names_by_group_ids([group.id])[group.id]
 
     return SCIMGroup(
         id=group.id,
+        externalId=group.scim_external_id,
         displayName=group.name,
-        members=members,
+        members=(
+            None
+            if exclude_members
+            else [
+                SCIMGroupMember(
+                    value=user_id,
+                    ref=f"{request.base_url}api/v1/scim/v2/Users/{user_id}",
+                    display=name,
+                )
+                for user_id, name in members
+            ]
+        ),
         meta=SCIMMeta(
             resourceType=SCIM_RESOURCE_TYPE_GROUP,
             created=datetime.fromtimestamp(
@@ -385,8 +452,12 @@ async def get_service_provider_config():
     return {
         "schemas": ["urn:ietf:params:scim:schemas:core:2.0:ServiceProviderConfig"],
         "patch": {"supported": True},
-        "bulk": {"supported": False, "maxOperations": 1000, "maxPayloadSize": 1048576},
-        "filter": {"supported": True, "maxResults": 200},
+        "bulk": {
+            "supported": True,
+            "maxOperations": SCIM_BULK_MAX_OPERATIONS,
+            "maxPayloadSize": SCIM_BULK_MAX_PAYLOAD_SIZE,
+        },
+        "filter": {"supported": True, "maxResults": SCIM_MAX_RESULTS},
         "changePassword": {"supported": False},
         "sort": {"supported": False},
         "etag": {"supported": False},
@@ -480,37 +551,40 @@ async def get_schemas():
 async def get_users(
     request: Request,
     startIndex: int = Query(1, ge=1),
-    count: int = Query(20, ge=1, le=100),
+    count: int = Query(20, ge=0),
     filter: Optional[str] = None,
+    excludedAttributes: Optional[str] = None,
     _: bool = Depends(get_scim_auth),
 ):
     """List SCIM Users"""
-    skip = startIndex - 1
-    limit = count
-
-    # Get users from database
-    if filter:
-        # Simple filter parsing - supports userName eq "email"
-        # In production, you'd want a more robust filter parser
-        if "userName eq" in filter:
-            email = filter.split('"')[1]
-            user = Users.get_user_by_email(email)
-            users_list = [user] if user else []
-            total = 1 if user else 0
-        else:
-            response = Users.get_users(skip=skip, limit=limit)
-            users_list = response["users"]
-            total = response["total"]
+    try:
+        response = Users.get_scim_users(
+            parse_filter(filter),
+            skip=startIndex - 1,
+            limit=min(count, SCIM_MAX_RESULTS),
+        )
+    except SCIMFilterError as e:
+        return scim_error(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+            scim_type="invalidFilter",
+        )
+
+    users_list = response["users"]
+
+    # Get the groups of the whole page at once
+    if "groups" in get_excluded_attributes(excludedAttributes):
+        user_groups = {user.id: [] for user in users_list}
     else:
-        response = Users.get_users(skip=skip, limit=limit)
-        users_list = response["users"]
-        total = response["total"]
+        user_groups = Groups.get_groups_by_member_ids([user.id for user in users_list])
 
     # Convert to SCIM format
-    scim_users = [user_to_scim(user, request) for user in users_list]
+    scim_users = [
+        user_to_scim(user, request, user_groups[user.id]) for user in users_list
+    ]
 
     return SCIMListResponse(
-        totalResults=total,
+        totalResults=response["total"],
         itemsPerPage=len(scim_users),
         startIndex=startIndex,
         Resources=scim_users,
@@ -580,7 +654,12 @@ async def create_user(
             detail="Failed to create user",
         )
 
-    return user_to_scim(new_user, request)
+    if user_data.externalId:
+        new_user = Users.update_user_by_id(
+            new_user.id, {"scim_external_id": user_data.externalId}
+        )
+
+    return user_to_scim(new_user, request, [])
 
 
 @router.put("/Users/{user_id}", response_model=SCIMUser)
@@ -623,6 +702,9 @@ async def update_user(
     if user_data.photos and len(user_data.photos) > 0:
         update_data["profile_image_url"] = user_data.photos[0].value
 
+    if user_data.externalId is not None:
+        update_data["scim_external_id"] = user_data.externalId
+
     # Update user
     updated_user = Users.update_user_by_id(user_id, update_data)
     if not updated_user:
@@ -653,20 +735,37 @@ async def patch_user(
 
     for operation in patch_data.Operations:
         op = operation.op.lower()
-        path = operation.path
-        value = operation.value
+        if op not in ("add", "replace"):
+            continue
+
+        # Without a path, the value holds the attributes to replace
+        if operation.path:
+            values = {operation.path: operation.value}
+        elif isinstance(operation.value, dict):
+            values = operation.value
+        else:
+            continue
 
-        if op == "replace":
+        for path, value in values.items():
+            path = path.lower()
             if path == "active":
+                if isinstance(value, str):
+                    value = value.lower() == "true"
                 update_data["role"] = "user" if value else "pending"
-            elif path == "userName":
-                update_data["email"] = value
-            elif path == "displayName":
-                update_data["name"] = value
-            elif path == "emails[primary eq true].value":
+            elif path in (
+                "username",
+                "emails[primary eq true].value",
+                'emails[type eq "work"].value',
+            ):
                 update_data["email"] = value
-            elif path == "name.formatted":
+            elif path == "emails" and isinstance(value, list) and value:
+                email = value[0].get("value") if isinstance(value[0], dict) else None
+                if email:
+                    update_data["email"] = email
+            elif path in ("displayname", "name.formatted"):
                 update_data["name"] = value
+            elif path == "externalid":
+                update_data["scim_external_id"] = value
 
     # Update user
     if update_data:
@@ -706,30 +805,72 @@ async def delete_user(
     return None
 
 
+def get_member_ids(value: Any) -> list[str]:
+    """The user ids of the members in a PATCH value."""
+    if isinstance(value, dict):
+        value = [value]
+    return [
+        member["value"]
+        for member in value or []
+        if isinstance(member, dict) and member.get("value")
+    ]
+
+
+def get_filter_values(node: Optional[tuple], attribute: str) -> list[str]:
+    """The values of a filter made of `attribute eq` comparisons joined by or."""
+    if node is None:
+        return []
+    if node[0] == "or":
+        return get_filter_values(node[1], attribute) + get_filter_values(
+            node[2], attribute
+        )
+    if node[0] == "eq" and node[1] == attribute:
+        return [node[2]]
+    raise SCIMFilterError(f"Unsupported filter on {attribute}")
+
+
 # Groups endpoints
 @router.get("/Groups", response_model=SCIMListResponse)
 async def get_groups(
     request: Request,
     startIndex: int = Query(1, ge=1),
-    count: int = Query(20, ge=1, le=100),
+    count: int = Query(20, ge=0),
     filter: Optional[str] = None,
+    excludedAttributes: Optional[str] = None,
     _: bool = Depends(get_scim_auth),
 ):
     """List SCIM Groups"""
-    # Get all groups
-    groups_list = Groups.get_all_groups()
+    try:
+        response = Groups.get_scim_groups(
+            parse_filter(filter),
+            skip=startIndex - 1,
+            limit=min(count, SCIM_MAX_RESULTS),
+        )
+    except SCIMFilterError as e:
+        return scim_error(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+            scim_type="invalidFilter",
+        )
+
+    groups_list = response["groups"]
 
-    # Apply pagination
-    total = len(groups_list)
-    start = startIndex - 1
-    end = start + count
-    paginated_groups = groups_list[start:end]
+    # Get the members of the whole page at once
+    exclude_members = "members" in get_excluded_attributes(excludedAttributes)
+    members = (
+        {}
+        if exclude_members
+        else Users.get_member_names_by_group_ids([group.id for group in groups_list])
+    )
 
     # Convert to SCIM format
-    scim_groups = [group_to_scim(group, request) for group in paginated_groups]
+    scim_groups = [
+        group_to_scim(group, request, members.get(group.id), exclude_members)
+        for group in groups_list
+    ]
 
     return SCIMListResponse(
-        totalResults=total,
+        totalResults=response["total"],
         itemsPerPage=len(scim_groups),
         startIndex=startIndex,
         Resources=scim_groups,
@@ -803,6 +944,11 @@ async def create_group(
 
         new_group = Groups.get_group_by_id(new_group.id)
 
+    if group_data.externalId:
+        new_group = Groups.update_group_scim_external_id_by_id(
+            new_group.id, group_data.externalId
+        )
+
     return group_to_scim(new_group, request)
 
 
@@ -834,6 +980,9 @@ async def update_group(
         member_ids = [member.value for member in group_data.members]
         Groups.set_group_user_ids_by_id(group_id, member_ids)
 
+    if group_data.externalId is not None:
+        Groups.update_group_scim_external_id_by_id(group_id, group_data.externalId)
+
     # Update group
     updated_group = Groups.update_group_by_id(group_id, update_form)
     if not updated_group:
@@ -869,30 +1018,45 @@ async def patch_group(
 
     for operation in patch_data.Operations:
         op = operation.op.lower()
-        path = operation.path
-        value = operation.value
 
-        if op == "replace":
-            if path == "displayName":
-                update_form.name = value
-            elif path == "members":
-                # Replace all members
-                Groups.set_group_user_ids_by_id(
-                    group_id, [member["value"] for member in value]
-                )
+        # Without a path, the value holds the attributes to change
+        if operation.path:
+            values = {operation.path: operation.value}
+        elif isinstance(operation.value, dict):
+            values = operation.value
+        else:
+            continue
 
-        elif op == "add":
-            if path == "members":
-                # Add members
-                if isinstance(value, list):
-                    for member in value:
-                        if isinstance(member, dict) and "value" in member:
-                            Groups.add_users_to_group(group_id, [member["value"]])
-        elif op == "remove":
-            if path and path.startswith("members[value eq"):
-                # Remove specific member
-                member_id = path.split('"')[1]
-                Groups.remove_users_from_group(group_id, [member_id])
+        for path, value in values.items():
+            attribute = path.lower()
+
+            if attribute == "displayname" and op in ("add", "replace"):
+                update_form.name = value
+            elif attribute == "externalid" and op in ("add", "replace"):
+                Groups.update_group_scim_external_id_by_id(group_id, value)
+            elif attribute == "members":
+                # Members are changed in one statement per operation
+                member_ids = get_member_ids(value)
+                if op == "replace":
+                    Groups.set_group_user_ids_by_id(group_id, member_ids)
+                elif op == "add":
+                    Groups.add_users_to_group(group_id, member_ids)
+                elif op == "remove":
+                    if value is None:
+                        Groups.set_group_user_ids_by_id(group_id, [])
+                    else:
+                        Groups.remove_users_from_group(group_id, member_ids)
+            elif attribute.startswith("members[") and op == "remove":
+                # e.g. members[value eq "id"] or members[value eq "a" or value eq "b"]
+                try:
+                    member_ids = get_filter_values(parse_filter(path), "members.value")
+                except SCIMFilterError as e:
+                    return scim_error(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=str(e),
+                        scim_type="invalidPath",
+                    )
+                Groups.remove_users_from_group(group_id, member_ids)
 
     # Update group
     updated_group = Groups.update_group_by_id(group_id, update_form)
@@ -927,3 +1091,174 @@ async def delete_group(
         )
 
     return None
+
+
+# Bulk endpoint
+def resolve_bulk_ids(value: Any, bulk_ids: dict[str, str]) -> Any:
+    """Replace "bulkId:<id>" references with the ids of created resources."""
+    if isinstance(value, str) and value.startswith("bulkId:"):
+        bulk_id = value[len("bulkId:") :]
+        if bulk_id not in bulk_ids:
+            raise ValueError(f"Unknown bulkId {bulk_id}")
+        return bulk_ids[bulk_id]
+    if isinstance(value, list):
+        return [resolve_bulk_ids(item, bulk_ids) for item in value]
+    if isinstance(value, dict):
+        return {key: resolve_bulk_ids(item, bulk_ids) for key, item in value.items()}
+    return value
+
+
+SCIM_BULK_HANDLERS = {
+    ("Users", "POST"): (create_user, SCIMUserCreateRequest),
+    ("Users", "PUT"): (update_user, SCIMUserUpdateRequest),
+    ("Users", "PATCH"): (patch_user, SCIMPatchRequest),
+    ("Users", "DELETE"): (delete_user, None),
+    ("Groups", "POST"): (create_group, SCIMGroupCreateRequest),
+    ("Groups", "PUT"): (update_group, SCIMGroupUpdateRequest),
+    ("Groups", "PATCH"): (patch_group, SCIMPatchRequest),
+    ("Groups", "DELETE"): (delete_group, None),
+}
+
+
+async def run_bulk_operation(
+    request: Request, operation: SCIMBulkOperation, bulk_ids: dict[str, str]
+) -> dict:
+    """Run one bulk operation through the matching endpoint."""
+    method = operation.method.upper()
+    result = {"method": method}
+    if operation.bulkId:
+        result["bulkId"] = operation.bulkId
+
+    def error(status_code: int, detail: str, scim_type: Optional[str] = None):
+        return {
+            **result,
+            "status": str(status_code),
+            "response": get_scim_error_body(status_code, detail, scim_type),
+        }
+
+    try:
+        segments = [
+            resolve_bulk_ids(segment, bulk_ids)
+            for segment in operation.path.strip("/").split("/")
+        ]
+        data = resolve_bulk_ids(operation.data, bulk_ids)
+    except ValueError as e:
+        return error(status.HTTP_409_CONFLICT, str(e), "invalidValue")
+
+    resource_type, resource_id = segments[0], (segments[1:] or [None])[0]
+    handler = SCIM_BULK_HANDLERS.get((resource_type, method))
+    if (
+        handler is None
+        or len(segments) > 2
+        or (method == "POST") != (resource_id is None)
+    ):
+        return error(
+            status.HTTP_400_BAD_REQUEST,
+            f"Unsupported operation {method} {operation.path}",
+            "invalidPath",
+        )
+
+    endpoint, form_class = handler
+    try:
+        args = [resource_id] if resource_id else []
+        args.append(request)
+        if form_class is not None:
+            args.append(form_class.model_validate(data or {}))
+        response = await endpoint(*args, True)
+    except HTTPException as e:
+        return error(e.status_code, str(e.detail))
+    except ValidationError as e:
+        return error(status.HTTP_400_BAD_REQUEST, str(e), "invalidSyntax")
+    except Exception as e:
+        log.exception(f"SCIM bulk operation {method} {operation.path} failed: {e}")
+        return error(status.HTTP_500_INTERNAL_SERVER_ERROR, str(e))
+
+    if isinstance(response, JSONResponse):
+        return {
+            **result,
+            "status": str(response.status_code),
+            "response": json.loads(response.body),
+        }
+
+    if response is not None:
+        result["location"] = response.meta.location
+        if method == "POST" and operation.bulkId:
+            bulk_ids[operation.bulkId] = response.id
+    else:
+        result["location"] = (
+            f"{request.base_url}api/v1/scim/v2/{resource_type}/{resource_id}"
+        )
+
+    result["status"] = str(
+        {"POST": status.HTTP_201_CREATED, "DELETE": status.HTTP_204_NO_CONTENT}.get(
+            method, status.HTTP_200_OK
+        )
+    )
+    return result
+
+
+async def get_bulk_request(request: Request) -> SCIMBulkRequest:
+    """
+    Read and parse a bulk request, refusing payloads over maxPayloadSize
+    before anything is parsed. The body is counted as it is received, so a
+    wrong Content-Length can't get a larger payload through.
+    """
+    content_length = request.headers.get("content-length", "")
+    if not content_length.isdigit():
+        raise HTTPException(
+            status_code=status.HTTP_411_LENGTH_REQUIRED,
+            detail="Bulk requests require a Content-Length header",
+        )
+
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Bulk requests are limited to {SCIM_BULK_MAX_PAYLOAD_SIZE} bytes",
+    )
+    if int(content_length) > SCIM_BULK_MAX_PAYLOAD_SIZE:
+        raise too_large
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > SCIM_BULK_MAX_PAYLOAD_SIZE:
+            raise too_large
+
+    if len(body) != int(content_length):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Request body does not match its Content-Length",
+        )
+
+    try:
+        return SCIMBulkRequest.model_validate_json(bytes(body))
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/Bulk")
+async def bulk(
+    request: Request,
+    _: bool = Depends(get_scim_auth),
+    bulk_data: SCIMBulkRequest = Depends(get_bulk_request),
+):
+    """Run SCIM Bulk operations in order, e.g. a directory sync in one request"""
+    if len(bulk_data.Operations) > SCIM_BULK_MAX_OPERATIONS:
+        return scim_error(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Bulk requests are limited to {SCIM_BULK_MAX_OPERATIONS} operations",
+            scim_type="tooMany",
+        )
+
+    bulk_ids = {}
+    errors = 0
+    results = []
+    for operation in bulk_data.Operations:
+        if bulk_data.failOnErrors and errors >= bulk_data.failOnErrors:
+            break
+
+        result = await run_bulk_operation(request, operation, bulk_ids)
+        if int(result["status"]) >= 400:
+            errors += 1
+        results.append(result)
+
+    return {"schemas": [SCIM_BULK_RESPONSE_SCHEMA], "Operations": results}
@@ -21,6 +21,8 @@ from open_webui.utils.plugin import (
     load_tool_module_by_id,
     replace_imports,
     get_tool_module_from_cache,
+    invalidate_plugin_module,
+    wait_for_frontmatter_requirements,
 )
 from open_webui.utils.tools import get_tool_specs
 from open_webui.utils.auth import get_admin_user, get_verified_user
@@ -296,16 +298,17 @@ async def create_new_tools(
     if tools is None:
         try:
             form_data.content = replace_imports(form_data.content)
+            await wait_for_frontmatter_requirements(
+                form_data.content, f"tool:{form_data.id}"
+            )
             tool_module, frontmatter = load_tool_module_by_id(
                 form_data.id, content=form_data.content
             )
             form_data.meta.manifest = frontmatter
 
-            TOOLS = request.app.state.TOOLS
-            TOOLS[form_data.id] = tool_module
-
-            specs = get_tool_specs(TOOLS[form_data.id])
+            specs = get_tool_specs(tool_module)
             tools = Tools.insert_new_tool(user.id, form_data, specs)
+            await invalidate_plugin_module(request, "tool", form_data.id)
 
             tool_cache_dir = CACHE_DIR / "tools" / form_data.id
             tool_cache_dir.mkdir(parents=True, exist_ok=True)
@@ -385,13 +388,11 @@ async def update_tools_by_id(
 
     try:
         form_data.content = replace_imports(form_data.content)
+        await wait_for_frontmatter_requirements(form_data.content, f"tool:{id}")
         tool_module, frontmatter = load_tool_module_by_id(id, content=form_data.content)
         form_data.meta.manifest = frontmatter
 
-        TOOLS = request.app.state.TOOLS
-        TOOLS[id] = tool_module
-
-        specs = get_tool_specs(TOOLS[id])
+        specs = get_tool_specs(tool_module)
 
         updated = {
             **form_data.model_dump(exclude={"id"}),
@@ -400,6 +401,7 @@ async def update_tools_by_id(
 
         log.debug(updated)
         tools = Tools.update_tool_by_id(id, updated)
+        await invalidate_plugin_module(request, "tool", id)
 
         if tools:
             return tools
@@ -444,9 +446,7 @@ async def delete_tools_by_id(
 
     result = Tools.delete_tool_by_id(id)
     if result:
-        TOOLS = request.app.state.TOOLS
-        if id in TOOLS:
-            del TOOLS[id]
+        await invalidate_plugin_module(request, "tool", id)
 
     return result
 
@@ -486,11 +486,7 @@ async def get_tools_valves_spec_by_id(
 ):
     tools = Tools.get_tool_by_id(id)
     if tools:
-        if id in request.app.state.TOOLS:
-            tools_module = request.app.state.TOOLS[id]
-        else:
-            tools_module, _ = load_tool_module_by_id(id)
-            request.app.state.TOOLS[id] = tools_module
+        tools_module = get_tool_module(request, id)
 
         if hasattr(tools_module, "Valves"):
             Valves = tools_module.Valves
@@ -529,11 +525,7 @@ async def update_tools_valves_by_id(
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
 
-    if id in request.app.state.TOOLS:
-        tools_module = request.app.state.TOOLS[id]
-    else:
-        tools_module, _ = load_tool_module_by_id(id)
-        request.app.state.TOOLS[id] = tools_module
+    tools_module = get_tool_module(request, id)
 
     if not hasattr(tools_module, "Valves"):
         raise HTTPException(
@@ -586,11 +578,7 @@ async def get_tools_user_valves_spec_by_id(
 ):
     tools = Tools.get_tool_by_id(id)
     if tools:
-        if id in request.app.state.TOOLS:
-            tools_module = request.app.state.TOOLS[id]
-        else:
-            tools_module, _ = load_tool_module_by_id(id)
-            request.app.state.TOOLS[id] = tools_module
+        tools_module = get_tool_module(request, id)
 
         if hasattr(tools_module, "UserValves"):
             UserValves = tools_module.UserValves
@@ -610,11 +598,7 @@ async def update_tools_user_valves_by_id(
     tools = Tools.get_tool_by_id(id)
 
     if tools:
-        if id in request.app.state.TOOLS:
-            tools_module = request.app.state.TOOLS[id]
-        else:
-            tools_module, _ = load_tool_module_by_id(id)
-            request.app.state.TOOLS[id] = tools_module
+        tools_module = get_tool_module(request, id)
 
         if hasattr(tools_module, "UserValves"):
             UserValves = tools_module.UserValves
@@ -0,0 +1,52 @@
+import logging
+from typing import Optional
+
+from open_webui.models.blobs import FileBlobs
+from open_webui.retrieval.cache import EMBEDDING_CACHE
+from open_webui.storage.provider import Storage
+
+log = logging.getLogger(__name__)
+
+
+def acquire_file_content(file_path: str, meta: dict) -> str:
+    """
+    Register freshly uploaded content (`meta` as returned by
+    `Storage.upload_file`) and return the storage path the file should use.
+
+    If identical content is already stored, the new copy is deleted and the
+    existing path is shared instead.
+    """
+    blob, created = FileBlobs.acquire_blob(meta["sha256"], file_path, meta.get("size"))
+
+    if not created:
+        log.info(f"Deduplicated upload {file_path} with {blob.path}")
+        try:
+            Storage.delete_file(file_path)
+        except Exception as e:
+            log.warning(f"Failed to delete duplicate upload {file_path}: {e}")
+
+    return blob.path
+
+
+def release_file_content(file_path: Optional[str], meta: Optional[dict]):
+    """
+    Drop a file's reference to its stored content, deleting the content (and
+    its cached embeddings) once no other file references it.
+    """
+    if not file_path:
+        return
+
+    hash = (meta or {}).get("sha256")
+    blob = FileBlobs.get_blob_by_hash(hash) if hash else None
+
+    if blob is None or blob.path != file_path:
+        # Stored before deduplication, the file owns its copy
+        Storage.delete_file(file_path)
+        if hash and blob is None:
+            EMBEDDING_CACHE.delete(hash)
+        return
+
+    released = FileBlobs.release_blob(hash)
+    if released:
+        Storage.delete_file(released.path)
+        EMBEDDING_CACHE.delete(hash)
@@ -0,0 +1,173 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from open_webui.utils.cache import LRUCache
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedFile:
+    local_path: str
+    version: str
+    size: int
+    # When the copy was last handed out to a reader (monotonic)
+    used_at: float = 0.0
+
+
+class LocalFileCache:
+    """
+    Read-through cache of remote objects on local disk.
+
+    Each entry records the object version (ETag or generation) its local copy
+    was downloaded at. Reads revalidate the version with a metadata request
+    and only download when it changed or no copy is cached. Concurrent reads
+    of the same object share one download, and the least recently used copies
+    are deleted once the cached bytes exceed `max_size`.
+
+    Callers get a path and open it later, so an evicted copy handed out less
+    than `evict_delay` seconds ago is only deleted once that much time has
+    passed since. Readers that already opened it are unaffected either way.
+    """
+
+    def __init__(self, max_size: int, evict_delay: int = 0):
+        self.evict_delay = evict_delay
+        self.entries = LRUCache(
+            max_size, sizeof=lambda entry: entry.size, on_evict=self._on_evict
+        )
+
+        # Per-key download locks with the number of their users, dropped once
+        # no one uses them so the dict doesn't grow with every key ever read
+        self._locks: dict[str, tuple[threading.Lock, int]] = {}
+        self._locks_lock = threading.Lock()
+
+        # Evicted copies waiting for their readers, path -> deadline
+        self._pending: dict[str, float] = {}
+        self._pending_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.entries.max_size > 0
+
+    @contextmanager
+    def _key_lock(self, key: str):
+        with self._locks_lock:
+            lock, users = self._locks.get(key, (None, 0))
+            lock = lock or threading.Lock()
+            self._locks[key] = (lock, users + 1)
+
+        try:
+            with lock:
+                yield
+        finally:
+            with self._locks_lock:
+                users = self._locks[key][1] - 1
+                if users:
+                    self._locks[key] = (lock, users)
+                else:
+                    del self._locks[key]
+
+    @staticmethod
+    def _remove(local_path: str):
+        try:
+            os.remove(local_path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            log.warning(f"Failed to evict local copy {local_path}: {e}")
+
+    def _on_evict(self, key: str, entry: CachedFile):
+        log.debug(f"Evicting local copy of {key}")
+        deadline = entry.used_at + self.evict_delay
+        if deadline > time.monotonic():
+            with self._pending_lock:
+                self._pending[entry.local_path] = deadline
+        else:
+            self._remove(entry.local_path)
+
+    def _remove_expired(self):
+        now = time.monotonic()
+        # Removed under the lock so a new download can't reuse the path meanwhile
+        with self._pending_lock:
+            for path in [path for path, at in self._pending.items() if at <= now]:
+                del self._pending[path]
+                self._remove(path)
+
+    def _keep(self, local_path: str):
+        # The path is in use again, e.g. the object was downloaded anew
+        with self._pending_lock:
+            self._pending.pop(local_path, None)
+
+    def get(
+        self,
+        key: str,
+        local_path: str,
+        get_version: Callable[[], Optional[str]],
+        download: Callable[[str], None],
+    ) -> str:
+        """
+        Return `local_path` holding the current version of `key`.
+
+        `get_version` returns the remote version (None if unknown) and
+        `download` writes the object to the path it is given.
+        """
+        self._remove_expired()
+
+        with self._key_lock(key):
+            version = get_version() if self.enabled else None
+
+            entry = self.entries.get(key)
+            if (
+                entry is not None
+                and version is not None
+                and entry.version == version
+                and entry.local_path == local_path
+                and os.path.isfile(local_path)
+            ):
+                entry.used_at = time.monotonic()
+                return local_path
+
+            self._keep(local_path)
+
+            # Download next to the destination and swap it in atomically, so
+            # readers of the previous copy never see a partial file
+            tmp_path = f"{local_path}.{uuid.uuid4().hex}.tmp"
+            try:
+                download(tmp_path)
+                os.replace(tmp_path, local_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+            self.put(key, local_path, version)
+            return local_path
+
+    def put(self, key: str, local_path: str, version: Optional[str]):
+        """Track an existing local copy, e.g. the one written on upload."""
+        self._keep(local_path)
+        if not self.enabled or version is None:
+            self.entries.pop(key)
+            return
+
+        self.entries.set(
+            key,
+            CachedFile(
+                local_path=local_path,
+                version=version,
+                size=os.path.getsize(local_path),
+                used_at=time.monotonic(),
+            ),
+        )
+
+    def discard(self, key: str):
+        self.entries.pop(key)
+
+    def clear(self):
+        self.entries.clear()
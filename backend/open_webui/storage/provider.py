@@ -4,9 +4,14 @@ import json
 import logging
 import re
 from abc import ABC, abstractmethod
-from typing import BinaryIO, Tuple, Dict
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+
+import hashlib
+from datetime import datetime, timedelta, timezone
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import ClientError
 from open_webui.config import (
@@ -25,18 +30,90 @@ from open_webui.config import (
     AZURE_STORAGE_CONTAINER_NAME,
     AZURE_STORAGE_KEY,
     STORAGE_PROVIDER,
+    STORAGE_LOCAL_CACHE_MAX_SIZE,
+    STORAGE_LOCAL_CACHE_EVICT_DELAY,
+    STORAGE_PRESIGNED_URL_EXPIRY,
     UPLOAD_DIR,
 )
 from google.cloud import storage
 from google.cloud.exceptions import GoogleCloudError, NotFound
 from open_webui.constants import ERROR_MESSAGES
 from azure.identity import DefaultAzureCredential
-from azure.storage.blob import BlobServiceClient
+from azure.storage.blob import BlobSasPermissions, BlobServiceClient, generate_blob_sas
 from azure.core.exceptions import ResourceNotFoundError
+from open_webui.storage.cache import LocalFileCache
 
 
 log = logging.getLogger(__name__)
 
+# Size of the reads from the incoming upload
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Part size for multipart/resumable/block uploads to object stores
+# (S3 needs >= 5 MiB, GCS a multiple of 256 KiB)
+MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Local copies of remote objects, shared by the s3, gcs and azure providers
+LOCAL_FILE_CACHE = LocalFileCache(
+    STORAGE_LOCAL_CACHE_MAX_SIZE, evict_delay=STORAGE_LOCAL_CACHE_EVICT_DELAY
+)
+
+
+class UploadStream:
+    """
+    Read-only stream over an upload that computes its size and SHA-256 as it
+    is consumed and copies every chunk into `sink` (the local copy).
+
+    The first chunk is read eagerly so empty uploads are rejected before
+    anything is sent to an object store.
+    """
+
+    def __init__(self, file: BinaryIO, sink: Optional[BinaryIO] = None):
+        self.file = file
+        self.sink = sink
+        self.size = 0
+        self._sha256 = hashlib.sha256()
+        self._pending = self._consume(file.read(UPLOAD_CHUNK_SIZE))
+
+        if not self._pending:
+            raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+
+    def _consume(self, chunk: bytes) -> bytes:
+        if chunk:
+            self.size += len(chunk)
+            self._sha256.update(chunk)
+            if self.sink is not None:
+                self.sink.write(chunk)
+        return chunk
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            chunk, self._pending = self._pending, b""
+            return chunk + self._consume(self.file.read())
+
+        chunk, self._pending = self._pending[:size], self._pending[size:]
+        if len(chunk) < size:
+            chunk += self._consume(self.file.read(size - len(chunk)))
+        return chunk
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        # Position as seen by the consumer, not including the read-ahead
+        return self.size - len(self._pending)
+
+    def drain(self):
+        while self.read(UPLOAD_CHUNK_SIZE):
+            pass
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        return {"size": self.size, "sha256": self._sha256.hexdigest()}
+
 
 class StorageProvider(ABC):
     @abstractmethod
@@ -46,7 +123,11 @@ class StorageProvider(ABC):
     @abstractmethod
     def upload_file(
         self, file: BinaryIO, filename: str, tags: Dict[str, str]
-    ) -> Tuple[bytes, str]:
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Stream `file` to storage without holding it in memory. Returns the
+        upload's metadata (`size`, `sha256`) and its storage path.
+        """
         pass
 
     @abstractmethod
@@ -57,19 +138,43 @@ class StorageProvider(ABC):
     def delete_file(self, file_path: str) -> None:
         pass
 
+    def get_presigned_url(
+        self,
+        file_path: str,
+        content_type: Optional[str] = None,
+        content_disposition: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Return a short-lived URL the client can download the file from
+        directly, or None if the provider can't sign one.
+        """
+        return None
+
 
 class LocalStorageProvider(StorageProvider):
     @staticmethod
     def upload_file(
         file: BinaryIO, filename: str, tags: Dict[str, str]
-    ) -> Tuple[bytes, str]:
-        contents = file.read()
-        if not contents:
-            raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+    ) -> Tuple[Dict[str, Any], str]:
+        with LocalStorageProvider.open_upload(file, filename) as stream:
+            stream.drain()
+        return stream.meta, f"{UPLOAD_DIR}/{filename}"
+
+    @staticmethod
+    @contextmanager
+    def open_upload(file: BinaryIO, filename: str) -> Iterator[UploadStream]:
+        """
+        Yield an `UploadStream` over `file` that writes the local copy as it is
+        read. The partial local file is removed if the upload fails.
+        """
         file_path = f"{UPLOAD_DIR}/{filename}"
-        with open(file_path, "wb") as f:
-            f.write(contents)
-        return contents, file_path
+        try:
+            with open(file_path, "wb") as f:
+                yield UploadStream(file, sink=f)
+        except BaseException:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            raise
 
     @staticmethod
     def get_file(file_path: str) -> str:
@@ -137,6 +242,10 @@ class S3StorageProvider(StorageProvider):
 
         self.bucket_name = S3_BUCKET_NAME
         self.key_prefix = S3_KEY_PREFIX if S3_KEY_PREFIX else ""
+        self.transfer_config = TransferConfig(
+            multipart_threshold=MULTIPART_CHUNK_SIZE,
+            multipart_chunksize=MULTIPART_CHUNK_SIZE,
+        )
 
     @staticmethod
     def sanitize_tag_value(s: str) -> str:
@@ -145,12 +254,26 @@ class S3StorageProvider(StorageProvider):
 
     def upload_file(
         self, file: BinaryIO, filename: str, tags: Dict[str, str]
-    ) -> Tuple[bytes, str]:
+    ) -> Tuple[Dict[str, Any], str]:
         """Handles uploading of the file to S3 storage."""
-        _, file_path = LocalStorageProvider.upload_file(file, filename, tags)
         s3_key = os.path.join(self.key_prefix, filename)
         try:
-            self.s3_client.upload_file(file_path, self.bucket_name, s3_key)
+            with LocalStorageProvider.open_upload(file, filename) as stream:
+                # Multipart upload straight from the request stream
+                self.s3_client.upload_fileobj(
+                    stream,
+                    self.bucket_name,
+                    s3_key,
+                    Config=self.transfer_config,
+                )
+                stream.drain()
+
+            file_path = f"s3://{self.bucket_name}/{s3_key}"
+            LOCAL_FILE_CACHE.put(
+                file_path,
+                self._get_local_file_path(s3_key),
+                self._get_version(s3_key),
+            )
             if S3_ENABLE_TAGGING and tags:
                 sanitized_tags = {
                     self.sanitize_tag_value(k): self.sanitize_tag_value(v)
@@ -166,10 +289,7 @@ class S3StorageProvider(StorageProvider):
                     Key=s3_key,
                     Tagging=tagging,
                 )
-            return (
-                open(file_path, "rb").read(),
-                f"s3://{self.bucket_name}/{s3_key}",
-            )
+            return stream.meta, file_path
         except ClientError as e:
             raise RuntimeError(f"Error uploading file to S3: {e}")
 
@@ -177,12 +297,33 @@ class S3StorageProvider(StorageProvider):
         """Handles downloading of the file from S3 storage."""
         try:
             s3_key = self._extract_s3_key(file_path)
-            local_file_path = self._get_local_file_path(s3_key)
-            self.s3_client.download_file(self.bucket_name, s3_key, local_file_path)
-            return local_file_path
+            return LOCAL_FILE_CACHE.get(
+                file_path,
+                self._get_local_file_path(s3_key),
+                get_version=lambda: self._get_version(s3_key),
+                download=lambda path: self.s3_client.download_file(
+                    self.bucket_name, s3_key, path
+                ),
+            )
         except ClientError as e:
             raise RuntimeError(f"Error downloading file from S3: {e}")
 
+    def get_presigned_url(
+        self,
+        file_path: str,
+        content_type: Optional[str] = None,
+        content_disposition: Optional[str] = None,
+    ) -> Optional[str]:
+        params = {"Bucket": self.bucket_name, "Key": self._extract_s3_key(file_path)}
+        if content_type:
+            params["ResponseContentType"] = content_type
+        if content_disposition:
+            params["ResponseContentDisposition"] = content_disposition
+
+        return self.s3_client.generate_presigned_url(
+            "get_object", Params=params, ExpiresIn=STORAGE_PRESIGNED_URL_EXPIRY
+        )
+
     def delete_file(self, file_path: str) -> None:
         """Handles deletion of the file from S3 storage."""
         try:
@@ -191,6 +332,8 @@ class S3StorageProvider(StorageProvider):
         except ClientError as e:
             raise RuntimeError(f"Error deleting file from S3: {e}")
 
+        LOCAL_FILE_CACHE.discard(file_path)
+
         # Always delete from local storage
         LocalStorageProvider.delete_file(file_path)
 
@@ -210,6 +353,8 @@ class S3StorageProvider(StorageProvider):
         except ClientError as e:
             raise RuntimeError(f"Error deleting all files from S3: {e}")
 
+        LOCAL_FILE_CACHE.clear()
+
         # Always delete from local storage
         LocalStorageProvider.delete_all_files()
 
@@ -220,6 +365,10 @@ class S3StorageProvider(StorageProvider):
     def _get_local_file_path(self, s3_key: str) -> str:
         return f"{UPLOAD_DIR}/{s3_key.split('/')[-1]}"
 
+    def _get_version(self, s3_key: str) -> str:
+        response = self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
+        return response["ETag"]
+
 
 class GCSStorageProvider(StorageProvider):
     def __init__(self):
@@ -238,13 +387,20 @@ class GCSStorageProvider(StorageProvider):
 
     def upload_file(
         self, file: BinaryIO, filename: str, tags: Dict[str, str]
-    ) -> Tuple[bytes, str]:
+    ) -> Tuple[Dict[str, Any], str]:
         """Handles uploading of the file to GCS storage."""
-        contents, file_path = LocalStorageProvider.upload_file(file, filename, tags)
         try:
-            blob = self.bucket.blob(filename)
-            blob.upload_from_filename(file_path)
-            return contents, "gs://" + self.bucket_name + "/" + filename
+            with LocalStorageProvider.open_upload(file, filename) as stream:
+                # Resumable upload in MULTIPART_CHUNK_SIZE chunks
+                blob = self.bucket.blob(filename, chunk_size=MULTIPART_CHUNK_SIZE)
+                blob.upload_from_file(stream)
+                stream.drain()
+
+            file_path = "gs://" + self.bucket_name + "/" + filename
+            LOCAL_FILE_CACHE.put(
+                file_path, f"{UPLOAD_DIR}/{filename}", str(blob.generation)
+            )
+            return stream.meta, file_path
         except GoogleCloudError as e:
             raise RuntimeError(f"Error uploading file to GCS: {e}")
 
@@ -252,14 +408,38 @@ class GCSStorageProvider(StorageProvider):
         """Handles downloading of the file from GCS storage."""
         try:
             filename = file_path.removeprefix("gs://").split("/")[1]
-            local_file_path = f"{UPLOAD_DIR}/{filename}"
             blob = self.bucket.get_blob(filename)
-            blob.download_to_filename(local_file_path)
-
-            return local_file_path
+            if blob is None:
+                raise NotFound(f"{file_path} not found")
+
+            return LOCAL_FILE_CACHE.get(
+                file_path,
+                f"{UPLOAD_DIR}/{filename}",
+                get_version=lambda: str(blob.generation),
+                download=blob.download_to_filename,
+            )
         except NotFound as e:
             raise RuntimeError(f"Error downloading file from GCS: {e}")
 
+    def get_presigned_url(
+        self,
+        file_path: str,
+        content_type: Optional[str] = None,
+        content_disposition: Optional[str] = None,
+    ) -> Optional[str]:
+        filename = file_path.removeprefix("gs://").split("/")[1]
+        try:
+            return self.bucket.blob(filename).generate_signed_url(
+                version="v4",
+                expiration=timedelta(seconds=STORAGE_PRESIGNED_URL_EXPIRY),
+                response_type=content_type,
+                response_disposition=content_disposition,
+            )
+        except Exception as e:
+            # Signing needs service account credentials
+            log.warning(f"Unable to sign GCS URL for {file_path}: {e}")
+            return None
+
     def delete_file(self, file_path: str) -> None:
         """Handles deletion of the file from GCS storage."""
         try:
@@ -269,6 +449,8 @@ class GCSStorageProvider(StorageProvider):
         except NotFound as e:
             raise RuntimeError(f"Error deleting file from GCS: {e}")
 
+        LOCAL_FILE_CACHE.discard(file_path)
+
         # Always delete from local storage
         LocalStorageProvider.delete_file(file_path)
 
@@ -283,6 +465,8 @@ class GCSStorageProvider(StorageProvider):
         except NotFound as e:
             raise RuntimeError(f"Error deleting all files from GCS: {e}")
 
+        LOCAL_FILE_CACHE.clear()
+
         # Always delete from local storage
         LocalStorageProvider.delete_all_files()
 
@@ -310,28 +494,66 @@ class AzureStorageProvider(StorageProvider):
 
     def upload_file(
         self, file: BinaryIO, filename: str, tags: Dict[str, str]
-    ) -> Tuple[bytes, str]:
+    ) -> Tuple[Dict[str, Any], str]:
         """Handles uploading of the file to Azure Blob Storage."""
-        contents, file_path = LocalStorageProvider.upload_file(file, filename, tags)
-        try:
-            blob_client = self.container_client.get_blob_client(filename)
-            blob_client.upload_blob(contents, overwrite=True)
-            return contents, f"{self.endpoint}/{self.container_name}/{filename}"
-        except Exception as e:
-            raise RuntimeError(f"Error uploading file to Azure Blob Storage: {e}")
+        with LocalStorageProvider.open_upload(file, filename) as stream:
+            try:
+                # Staged block upload of an unknown-length stream
+                blob_client = self.container_client.get_blob_client(filename)
+                result = blob_client.upload_blob(
+                    stream, overwrite=True, max_block_size=MULTIPART_CHUNK_SIZE
+                )
+            except Exception as e:
+                raise RuntimeError(f"Error uploading file to Azure Blob Storage: {e}")
+            stream.drain()
+
+        file_path = f"{self.endpoint}/{self.container_name}/{filename}"
+        LOCAL_FILE_CACHE.put(file_path, f"{UPLOAD_DIR}/{filename}", result.get("etag"))
+        return stream.meta, file_path
 
     def get_file(self, file_path: str) -> str:
         """Handles downloading of the file from Azure Blob Storage."""
         try:
             filename = file_path.split("/")[-1]
-            local_file_path = f"{UPLOAD_DIR}/{filename}"
             blob_client = self.container_client.get_blob_client(filename)
-            with open(local_file_path, "wb") as download_file:
-                download_file.write(blob_client.download_blob().readall())
-            return local_file_path
+
+            def download(path: str):
+                with open(path, "wb") as download_file:
+                    blob_client.download_blob().readinto(download_file)
+
+            return LOCAL_FILE_CACHE.get(
+                file_path,
+                f"{UPLOAD_DIR}/{filename}",
+                get_version=lambda: blob_client.get_blob_properties().etag,
+                download=download,
+            )
         except ResourceNotFoundError as e:
             raise RuntimeError(f"Error downloading file from Azure Blob Storage: {e}")
 
+    def get_presigned_url(
+        self,
+        file_path: str,
+        content_type: Optional[str] = None,
+        content_disposition: Optional[str] = None,
+    ) -> Optional[str]:
+        # Account SAS signing needs the storage key
+        if not AZURE_STORAGE_KEY:
+            return None
+
+        blob_client = self.container_client.get_blob_client(file_path.split("/")[-1])
+        sas_token = generate_blob_sas(
+            account_name=self.blob_service_client.account_name,
+            container_name=self.container_name,
+            blob_name=blob_client.blob_name,
+            account_key=AZURE_STORAGE_KEY,
+            permission=BlobSasPermissions(read=True),
+            expiry=datetime.now(timezone.utc)
+            + timedelta(seconds=STORAGE_PRESIGNED_URL_EXPIRY),
+            content_type=content_type,
+            content_disposition=content_disposition,
+        )
+        return f"{blob_client.url}?{sas_token}"
+
     def delete_file(self, file_path: str) -> None:
         """Handles deletion of the file from Azure Blob Storage."""
         try:
@@ -341,6 +563,8 @@ class AzureStorageProvider(StorageProvider):
         except ResourceNotFoundError as e:
             raise RuntimeError(f"Error deleting file from Azure Blob Storage: {e}")
 
+        LOCAL_FILE_CACHE.discard(file_path)
+
         # Always delete from local storage
         LocalStorageProvider.delete_file(file_path)
 
@@ -353,6 +577,8 @@ class AzureStorageProvider(StorageProvider):
         except Exception as e:
             raise RuntimeError(f"Error deleting all files from Azure Blob Storage: {e}")
 
+        LOCAL_FILE_CACHE.clear()
+
         # Always delete from local storage
         LocalStorageProvider.delete_all_files()
 
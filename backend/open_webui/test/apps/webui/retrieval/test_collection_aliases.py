@@ -0,0 +1,59 @@
+from open_webui.retrieval.vector import aliases
+from open_webui.retrieval.vector.aliases import AliasedVectorDBClient
+
+
+class FakeAliases:
+    def __init__(self):
+        self.aliases = {}
+
+    def get_aliases(self):
+        return dict(self.aliases)
+
+    def set_alias(self, name, target):
+        previous = self.aliases.get(name)
+        self.aliases[name] = target
+        return previous
+
+    def delete_alias(self, name):
+        return self.aliases.pop(name, None)
+
+
+class FakeClient:
+    def __init__(self, collections):
+        self.collections = set(collections)
+        self.queried = []
+
+    def has_collection(self, collection_name):
+        return collection_name in self.collections
+
+    def delete_collection(self, collection_name):
+        self.collections.discard(collection_name)
+
+    def query(self, collection_name, filter, limit=-1):
+        self.queried.append((collection_name, limit))
+
+
+class TestAliasedVectorDBClient:
+    def test_swap_serves_new_collection(self, monkeypatch):
+        monkeypatch.setattr(aliases, "CollectionAliases", FakeAliases())
+        client = FakeClient({"kb", "kb-shadow"})
+        vector_db = AliasedVectorDBClient(client)
+
+        assert vector_db.swap_collection("kb", "kb-shadow") == "kb"
+
+        vector_db.query(collection_name="kb", filter={})
+        assert client.queried == [("kb-shadow", -1)]
+
+        # The next rebuild replaces the previous shadow collection
+        assert vector_db.swap_collection("kb", "kb-next") == "kb-shadow"
+
+    def test_delete_collection_removes_alias_and_target(self, monkeypatch):
+        monkeypatch.setattr(aliases, "CollectionAliases", FakeAliases())
+        client = FakeClient({"kb", "kb-shadow"})
+        vector_db = AliasedVectorDBClient(client)
+
+        vector_db.swap_collection("kb", "kb-shadow")
+        vector_db.delete_collection("kb")
+
+        assert client.collections == set()
+        assert vector_db.resolve("kb") == "kb"
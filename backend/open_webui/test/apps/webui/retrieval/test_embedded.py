@@ -0,0 +1,231 @@
+import multiprocessing
+import time
+
+import numpy as np
+import pytest
+
+from open_webui.retrieval.vector.dbs import embedded
+from open_webui.retrieval.vector.main import GetResult, SearchResult
+
+
+def make_items(vectors, prefix="id"):
+    return [
+        {
+            "id": f"{prefix}-{i}",
+            "text": f"text {i}",
+            "vector": vector,
+            "metadata": {"file_id": f"file-{i % 2}", "page": i},
+        }
+        for i, vector in enumerate(vectors)
+    ]
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setattr(embedded, "EMBEDDED_VECTOR_DATA_PATH", str(tmp_path))
+    return embedded.EmbeddedVectorClient()
+
+
+def test_insert_and_search(client):
+    client.insert("docs", make_items([[1, 0, 0], [0, 1, 0], [0, 0, 1]]))
+
+    assert client.has_collection("docs")
+    assert not client.has_collection("missing")
+
+    result = client.search("docs", vectors=[[0.9, 0.1, 0]], limit=2)
+    assert isinstance(result, SearchResult)
+    assert result.ids == [["id-0", "id-1"]]
+    assert result.documents[0][0] == "text 0"
+    assert result.metadatas[0][0]["page"] == 0
+    assert 0 <= result.distances[0][1] <= result.distances[0][0] <= 1
+
+
+def test_search_multiple_queries(client):
+    client.insert("docs", make_items([[1, 0], [0, 1]]))
+
+    result = client.search("docs", vectors=[[1, 0], [0, 1]], limit=1)
+    assert result.ids == [["id-0"], ["id-1"]]
+
+
+def test_insert_ignores_existing_ids_and_upsert_replaces(client):
+    client.insert("docs", make_items([[1, 0], [0, 1]]))
+    client.insert(
+        "docs", [{"id": "id-0", "text": "new", "vector": [0, 1], "metadata": {}}]
+    )
+    assert client.get("docs").documents[0][0] == "text 0"
+
+    client.upsert(
+        "docs", [{"id": "id-0", "text": "new", "vector": [0, 1], "metadata": {}}]
+    )
+    result = client.get("docs")
+    assert sorted(result.ids[0]) == ["id-0", "id-1"]
+    assert "new" in result.documents[0]
+
+
+def test_query_and_delete_by_filter(client):
+    client.insert("docs", make_items([[1, 0], [0, 1], [1, 1], [1, 2]]))
+
+    result = client.query("docs", filter={"file_id": "file-0"})
+    assert isinstance(result, GetResult)
+    assert sorted(result.ids[0]) == ["id-0", "id-2"]
+
+    assert client.query("docs", filter={"file_id": "missing"}) is None
+
+    client.delete("docs", filter={"file_id": "file-0"})
+    assert sorted(client.get("docs").ids[0]) == ["id-1", "id-3"]
+
+    client.delete("docs", ids=["id-1"])
+    assert client.get("docs").ids == [["id-3"]]
+
+    result = client.search("docs", vectors=[[1, 0]], limit=5)
+    assert result.ids == [["id-3"]]
+
+
+def test_get_streams_in_batches(client):
+    client.insert("docs", make_items(np.random.rand(25, 4).tolist()))
+
+    batches = list(client.iter_items("docs", batch_size=10))
+    assert [len(batch.ids[0]) for batch in batches] == [10, 10, 5]
+    assert len(client.get("docs", limit=7).ids[0]) == 7
+
+
+def test_paging_does_not_block_writers_or_compaction(client, monkeypatch):
+    monkeypatch.setattr(embedded, "EMBEDDED_VECTOR_COMPACTION_RATIO", 0.5)
+    client.insert("docs", make_items(np.random.rand(25, 4).tolist()))
+
+    batches = client.iter_items("docs", batch_size=10)
+    first = next(batches)
+
+    # Writes go through between pages, without renumbering the rows
+    client.delete("docs", ids=[f"id-{i}" for i in range(20)])
+    client.insert("docs", make_items([[1, 0, 0, 0]], prefix="new"))
+    collection = client._get_collection("docs")
+    assert collection.count == 26
+
+    rest = [id for batch in batches for id in batch.ids[0]]
+    assert first.ids[0] == [f"id-{i}" for i in range(10)]
+    assert rest == [f"id-{i}" for i in range(20, 25)]
+
+    # Compaction runs on the next write once the reader is done
+    assert collection.count == 26
+    client.delete("docs", ids=["id-20"])
+    client.compaction_executor.shutdown(wait=True)
+    assert collection.count == 5
+
+
+def test_persists_across_clients(client, monkeypatch, tmp_path):
+    client.insert("docs", make_items([[1, 0], [0, 1]]))
+    client.delete("docs", ids=["id-1"])
+    client.compaction_executor.shutdown(wait=True)
+
+    reopened = embedded.EmbeddedVectorClient()
+    assert reopened.get("docs").ids == [["id-0"]]
+    assert reopened.search("docs", vectors=[[0, 1]], limit=1).ids == [["id-0"]]
+
+
+def test_clients_sharing_a_path_see_each_others_writes(client, monkeypatch):
+    monkeypatch.setattr(embedded, "EMBEDDED_VECTOR_COMPACTION_RATIO", 0.5)
+    other = embedded.EmbeddedVectorClient()
+
+    client.insert("docs", make_items([[1, 0], [0, 1]], prefix="a"))
+    other.insert("docs", make_items([[1, 1], [1, 2]], prefix="b"))
+    client.upsert(
+        "docs", [{"id": "b-1", "text": "new", "vector": [2, 1], "metadata": {}}]
+    )
+
+    for reader in (client, other):
+        result = reader.get("docs")
+        assert sorted(result.ids[0]) == ["a-0", "a-1", "b-0", "b-1"]
+        assert "new" in result.documents[0]
+    assert other.search("docs", vectors=[[0, 1]], limit=1).ids == [["a-1"]]
+
+    # Compaction in one client renumbers the rows of the other
+    other.delete("docs", ids=["a-0", "b-0"])
+    other.compaction_executor.shutdown(wait=True)
+    assert other._get_collection("docs").count == 2
+    assert sorted(client.get("docs").ids[0]) == ["a-1", "b-1"]
+    client.insert("docs", make_items([[3, 1]], prefix="c"))
+    assert sorted(other.get("docs").ids[0]) == ["a-1", "b-1", "c-0"]
+
+    other.delete_collection("docs")
+    assert not client.has_collection("docs")
+    client.insert("docs", make_items([[1, 0]], prefix="d"))
+    assert other.get("docs").ids == [["d-0"]]
+
+
+def insert_batches(prefix: str, count: int):
+    client = embedded.EmbeddedVectorClient()
+    for i in range(count):
+        client.insert("docs", make_items([[i, 1], [1, i]], prefix=f"{prefix}-{i}"))
+
+
+@pytest.mark.skipif(embedded.fcntl is None, reason="needs file locks")
+def test_concurrent_writes_from_processes(client):
+    # Forked after the fixture patched the data path
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(target=insert_batches, args=(prefix, 20))
+        for prefix in ("a", "b")
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=30)
+        assert process.exitcode == 0
+
+    result = client.get("docs")
+    assert len(result.ids[0]) == len(set(result.ids[0])) == 80
+    for id, document in zip(result.ids[0], result.documents[0]):
+        assert document == f"text {id.rsplit('-', 1)[1]}"
+
+    reopened = embedded.EmbeddedVectorClient()
+    assert len(reopened.get("docs").ids[0]) == 80
+
+
+def test_compaction_drops_tombstones(client, monkeypatch):
+    monkeypatch.setattr(embedded, "EMBEDDED_VECTOR_COMPACTION_RATIO", 0.5)
+    client.insert("docs", make_items([[1, 0], [0, 1], [1, 1], [1, 2]]))
+    client.delete("docs", ids=["id-0", "id-1", "id-2"])
+
+    client.compaction_executor.shutdown(wait=True)
+
+    collection = client._get_collection("docs")
+    assert collection.count == 1
+    assert client.get("docs").ids == [["id-3"]]
+    assert client.search("docs", vectors=[[1, 0]], limit=5).ids == [["id-3"]]
+
+
+def test_dimension_mismatch(client):
+    client.insert("docs", make_items([[1, 0]]))
+
+    with pytest.raises(ValueError):
+        client.insert("docs", make_items([[1, 0, 0]], prefix="other"))
+    assert client.search("docs", vectors=[[1, 0, 0]], limit=1) is None
+
+
+def test_delete_collection_and_reset(client):
+    client.insert("docs", make_items([[1, 0]]))
+    client.insert("other collection/with unsafe name", make_items([[1, 0]]))
+    assert client.has_collection("other collection/with unsafe name")
+
+    client.delete_collection("docs")
+    assert not client.has_collection("docs")
+    assert client.search("docs", vectors=[[1, 0]], limit=1) is None
+
+    client.reset()
+    assert not client.has_collection("other collection/with unsafe name")
+
+
+def test_hnsw_search(client, monkeypatch):
+    pytest.importorskip("hnswlib")
+    monkeypatch.setattr(embedded, "EMBEDDED_VECTOR_HNSW_THRESHOLD", 10)
+
+    vectors = np.random.rand(100, 8).tolist()
+    client.insert("docs", make_items(vectors))
+
+    assert client.search("docs", vectors=[vectors[5]], limit=1).ids == [["id-5"]]
+
+    client.delete("docs", ids=["id-5"])
+    result = client.search("docs", vectors=[vectors[5]], limit=3)
+    assert "id-5" not in result.ids[0]
+    assert len(result.ids[0]) == 3
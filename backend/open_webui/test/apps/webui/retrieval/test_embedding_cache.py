@@ -0,0 +1,60 @@
+from open_webui.retrieval.cache import EmbeddingCache
+
+
+class TestEmbeddingCache:
+    config = {"engine": "", "url": None, "model": "all-MiniLM-L6-v2", "prefix": None}
+
+    def test_roundtrip_and_delete(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path), max_size=1024 * 1024)
+        key = cache.get_key(["a", "b"], self.config)
+
+        assert cache.get("blob", key) is None
+
+        cache.set("blob", key, [[0.5, 1.0], [0.25, 2.0]])
+        assert cache.get("blob", key) == [[0.5, 1.0], [0.25, 2.0]]
+
+        cache.delete("blob")
+        assert cache.get("blob", key) is None
+
+    def test_key_depends_on_texts_and_config(self):
+        key = EmbeddingCache.get_key(["a", "b"], self.config)
+
+        assert key == EmbeddingCache.get_key(["a", "b"], self.config)
+        assert key != EmbeddingCache.get_key(["ab"], self.config)
+        assert key != EmbeddingCache.get_key(
+            ["a", "b"], {**self.config, "model": "other"}
+        )
+        assert EmbeddingCache.get_key(
+            ["a", "b"], {**self.config, "engine": "openai", "url": "http://a/v1"}
+        ) != EmbeddingCache.get_key(
+            ["a", "b"], {**self.config, "engine": "openai", "url": "http://b/v1"}
+        )
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        embeddings = [[float(i) for i in range(64)]]
+        cache = EmbeddingCache(str(tmp_path), max_size=1024 * 1024)
+        cache.set("blob", "probe", embeddings)
+        size = cache.entries.size
+
+        cache = EmbeddingCache(str(tmp_path / "bounded"), max_size=2 * size)
+        cache.set("a", "key", embeddings)
+        cache.set("b", "key", embeddings)
+        assert cache.get("a", "key") == embeddings
+
+        cache.set("c", "key", embeddings)
+        assert cache.get("b", "key") is None
+        assert not (tmp_path / "bounded" / "b" / "b" / "key.npy").exists()
+        assert cache.get("a", "key") == embeddings
+
+        # Entries left on disk count towards the bound of a new process
+        cache = EmbeddingCache(str(tmp_path / "bounded"), max_size=size)
+        cache.set("d", "key", embeddings)
+        assert len(list((tmp_path / "bounded").glob("*/*/*.npy"))) == 1
+        assert cache.get("d", "key") == embeddings
+
+    def test_disabled_when_max_size_is_zero(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path), max_size=0)
+        cache.set("blob", "key", [[1.0]])
+
+        assert cache.get("blob", "key") is None
+        assert not list(tmp_path.iterdir())
@@ -0,0 +1,76 @@
+import os
+
+from langchain_core.documents import Document
+
+from open_webui.retrieval.loaders.cache import ExtractionCache
+
+
+class TestExtractionCache:
+    def test_roundtrip(self, tmp_path):
+        cache = ExtractionCache(str(tmp_path), 1024 * 1024)
+        key = cache.get_key("abc", ":PyPDFLoader", {"PDF_EXTRACT_IMAGES": False})
+        docs = [Document(page_content="hello", metadata={"page": 0, "source": "a"})]
+
+        assert cache.get(key) is None
+
+        cache.set(key, docs)
+        cached = cache.get(key)
+
+        assert [doc.page_content for doc in cached] == ["hello"]
+        assert cached[0].metadata == {"page": 0, "source": "a"}
+
+    def test_key_depends_on_hash_engine_and_config(self):
+        key = ExtractionCache.get_key(
+            "abc", "tika:TikaLoader", {"TIKA_SERVER_URL": "x"}
+        )
+
+        assert key == ExtractionCache.get_key(
+            "abc", "tika:TikaLoader", {"TIKA_SERVER_URL": "x"}
+        )
+        assert key != ExtractionCache.get_key(
+            "abd", "tika:TikaLoader", {"TIKA_SERVER_URL": "x"}
+        )
+        assert key != ExtractionCache.get_key(
+            "abc", ":PyPDFLoader", {"TIKA_SERVER_URL": "x"}
+        )
+        assert key != ExtractionCache.get_key(
+            "abc", "tika:TikaLoader", {"TIKA_SERVER_URL": "y"}
+        )
+
+    def test_corrupt_entry_is_discarded(self, tmp_path):
+        cache = ExtractionCache(str(tmp_path), 1024 * 1024)
+        key = cache.get_key("abc", "", {})
+        cache.set(key, [Document(page_content="hello")])
+
+        path = tmp_path / key[:2] / f"{key}.json"
+        path.write_text("{not json")
+
+        assert cache.get(key) is None
+        assert not path.exists()
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        cache = ExtractionCache(str(tmp_path), 300)
+        keys = [cache.get_key(str(index), "", {}) for index in range(3)]
+
+        cache.set(keys[0], [Document(page_content="a" * 100)])
+        cache.set(keys[1], [Document(page_content="b" * 100)])
+        cache.get(keys[0])
+        cache.set(keys[2], [Document(page_content="c" * 100)])
+
+        assert cache.get(keys[1]) is None
+        assert not (tmp_path / keys[1][:2] / f"{keys[1]}.json").exists()
+        assert cache.get(keys[0])[0].page_content == "a" * 100
+        assert cache.get(keys[2])[0].page_content == "c" * 100
+
+    def test_existing_entries_count_towards_the_limit(self, tmp_path):
+        cache = ExtractionCache(str(tmp_path), 1024 * 1024)
+        old_key, new_key = cache.get_key("old", "", {}), cache.get_key("new", "", {})
+        cache.set(old_key, [Document(page_content="a" * 100)])
+        os.utime(tmp_path / old_key[:2] / f"{old_key}.json", (0, 0))
+
+        # Restarted with room for one entry
+        cache = ExtractionCache(str(tmp_path), 200)
+        cache.set(new_key, [Document(page_content="b" * 100)])
+
+        assert cache.get(old_key) is None
+        assert cache.get(new_key)[0].page_content == "b" * 100
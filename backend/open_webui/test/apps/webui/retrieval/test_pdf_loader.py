@@ -0,0 +1,35 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from langchain_community.document_loaders import PyPDFLoader
+
+from open_webui.retrieval.loaders import main
+from open_webui.retrieval.loaders.main import fix_documents, load_pdf_in_pool
+
+fpdf = pytest.importorskip("fpdf")
+
+
+def test_pdf_pages_loaded_in_pool_match_pypdf_loader(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "CONTENT_EXTRACTION_PROCESS_POOL_SIZE", 2)
+    monkeypatch.setattr(main, "CONTENT_EXTRACTION_PDF_PAGES_PER_TASK", 2)
+
+    pdf = fpdf.FPDF()
+    pdf.set_title("Pages")
+    for index in range(5):
+        pdf.add_page()
+        pdf.set_font("helvetica", size=12)
+        pdf.cell(text=f"Page {index + 1}")
+    path = str(tmp_path / "pages.pdf")
+    pdf.output(path)
+
+    with ProcessPoolExecutor(
+        max_workers=2, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        docs = load_pdf_in_pool(pool, path, extract_images=False)
+
+    expected = fix_documents(PyPDFLoader(path).load())
+    assert [doc.page_content for doc in docs] == [
+        f"Page {index + 1}" for index in range(5)
+    ]
+    assert [doc.metadata for doc in docs] == [doc.metadata for doc in expected]
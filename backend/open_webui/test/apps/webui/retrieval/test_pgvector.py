@@ -0,0 +1,33 @@
+import logging
+
+from open_webui.retrieval.vector.dbs.pgvector import PgvectorClient
+
+
+def test_batches_keeps_last_duplicate_and_warns(caplog):
+    # _batches doesn't need a database connection
+    client = PgvectorClient.__new__(PgvectorClient)
+    items = [
+        {"id": "a", "text": "first"},
+        {"id": "b", "text": "other"},
+        {"id": "a", "text": "second"},
+    ]
+
+    with caplog.at_level(logging.WARNING):
+        batches = list(client._batches(items))
+
+    assert [item for batch in batches for item in batch] == [
+        {"id": "a", "text": "second"},
+        {"id": "b", "text": "other"},
+    ]
+    assert "1 items with duplicate ids" in caplog.text
+
+
+def test_batches_without_duplicates_does_not_warn(caplog):
+    client = PgvectorClient.__new__(PgvectorClient)
+    items = [{"id": str(i), "text": str(i)} for i in range(3)]
+
+    with caplog.at_level(logging.WARNING):
+        batches = list(client._batches(items))
+
+    assert [item for batch in batches for item in batch] == items
+    assert not caplog.text
@@ -0,0 +1,124 @@
+"""
+Ingestion benchmark for the pgvector backend.
+
+Starts a throwaway pgvector Postgres container and ingests 100k chunks the way
+file processing does (many `insert` calls of a few hundred chunks each), then
+reports throughput. It is skipped unless RUN_BENCHMARKS=true since it needs
+Docker and takes a while:
+
+    RUN_BENCHMARKS=true pytest -s open_webui/test/apps/webui/retrieval/test_pgvector_benchmark.py
+"""
+
+import logging
+import os
+import random
+import time
+import uuid
+
+import pytest
+
+log = logging.getLogger(__name__)
+
+DOCKER_CONTAINER_NAME = "pgvector-benchmark-container-will-get-deleted"
+DOCKER_PORT = 8082
+
+TOTAL_CHUNKS = int(os.environ.get("BENCHMARK_TOTAL_CHUNKS", 100_000))
+CHUNKS_PER_FILE = 500
+VECTOR_LENGTH = 384
+
+pytestmark = pytest.mark.skipif(
+    os.environ.get("RUN_BENCHMARKS", "false").lower() != "true",
+    reason="set RUN_BENCHMARKS=true to run benchmarks",
+)
+
+
+def random_items(count: int) -> list[dict]:
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "text": f"chunk {i} " + "lorem ipsum " * 40,
+            "vector": [random.random() for _ in range(VECTOR_LENGTH)],
+            "metadata": {"source": "benchmark.pdf", "page": i},
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture(scope="module")
+def pgvector_client():
+    import docker
+    from pytest_docker.plugin import get_docker_ip
+    from sqlalchemy import create_engine
+
+    docker_client = docker.from_env()
+    docker_client.containers.run(
+        "pgvector/pgvector:pg16",
+        detach=True,
+        environment={
+            "POSTGRES_USER": "user",
+            "POSTGRES_PASSWORD": "example",
+            "POSTGRES_DB": "openwebui",
+        },
+        name=DOCKER_CONTAINER_NAME,
+        ports={5432: ("0.0.0.0", DOCKER_PORT)},
+    )
+
+    try:
+        database_url = (
+            f"postgresql://user:example@{get_docker_ip()}:{DOCKER_PORT}/openwebui"
+        )
+
+        retries = 10
+        while retries > 0:
+            try:
+                create_engine(database_url).connect().close()
+                break
+            except Exception as e:
+                log.warning(e)
+                time.sleep(3)
+                retries -= 1
+
+        # import must be after setting env!
+        os.environ["PGVECTOR_DB_URL"] = database_url
+        os.environ["PGVECTOR_INITIALIZE_MAX_VECTOR_LENGTH"] = str(VECTOR_LENGTH)
+        os.environ["PGVECTOR_POOL_SIZE"] = "8"
+
+        from open_webui.retrieval.vector.dbs.pgvector import PgvectorClient
+
+        yield PgvectorClient()
+    finally:
+        docker_client.containers.get(DOCKER_CONTAINER_NAME).remove(force=True)
+
+
+def test_ingest_100k_chunks(pgvector_client):
+    from sqlalchemy import text
+
+    collection_name = "benchmark"
+
+    items = random_items(TOTAL_CHUNKS)
+
+    start = time.perf_counter()
+    for i in range(0, TOTAL_CHUNKS, CHUNKS_PER_FILE):
+        pgvector_client.insert(collection_name, items[i : i + CHUNKS_PER_FILE])
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"\ninserted {TOTAL_CHUNKS} chunks in {elapsed:.1f}s "
+        f"({TOTAL_CHUNKS / elapsed:.0f} chunks/s)"
+    )
+
+    start = time.perf_counter()
+    pgvector_client.upsert(collection_name, items[:CHUNKS_PER_FILE])
+    print(f"upserted {CHUNKS_PER_FILE} chunks in {time.perf_counter() - start:.2f}s")
+
+    with pgvector_client.get_session() as session:
+        count = session.execute(
+            text("SELECT count(*) FROM document_chunk WHERE collection_name = :name"),
+            {"name": collection_name},
+        ).scalar()
+    assert count == TOTAL_CHUNKS
+
+    result = pgvector_client.search(
+        collection_name, vectors=[items[0]["vector"]], limit=5
+    )
+    assert result.ids[0][0] == items[0]["id"]
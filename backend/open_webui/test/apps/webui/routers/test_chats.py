@@ -234,3 +234,64 @@ class TestChats(AbstractPostgresTest):
 
         chat = self.chats.get_chat_by_id(chat_id)
         assert chat.share_id is None
+
+    def test_get_daily_usage_stats(self):
+        from open_webui.models.chats import ChatForm
+
+        messages = {
+            "u": {
+                "id": "u",
+                "role": "user",
+                "content": "hello",
+                "timestamp": 1700000000,
+            },
+            "a": {
+                "id": "a",
+                "parentId": "u",
+                "role": "assistant",
+                "content": "hi",
+                "model": "m",
+                "timestamp": 1700000003,
+                "done": True,
+            },
+        }
+        self.chats.insert_new_chat(
+            "2",
+            ChatForm(chat={"history": {"currentId": "a", "messages": messages}}),
+        )
+
+        with mock_webui_user(id="2"):
+            response = self.fast_api_client.get(
+                self.create_url("/stats/usage/daily?group_by=date,model&user_id=3")
+            )
+        assert response.status_code == 200
+        assert response.json() == [
+            {
+                "date": "2023-11-14",
+                "user_id": None,
+                "model": "",
+                "user_message_count": 1,
+                "assistant_message_count": 0,
+                "user_content_length": 5,
+                "assistant_content_length": 0,
+                "response_time_sum": 0,
+                "response_time_count": 0,
+            },
+            {
+                "date": "2023-11-14",
+                "user_id": None,
+                "model": "m",
+                "user_message_count": 0,
+                "assistant_message_count": 1,
+                "user_content_length": 0,
+                "assistant_content_length": 2,
+                "response_time_sum": 3,
+                "response_time_count": 1,
+            },
+        ]
+
+        with mock_webui_user(id="2"):
+            response = self.fast_api_client.get(
+                self.create_url("/stats/usage/daily?group_by=chat_id")
+            )
+        assert response.status_code == 400
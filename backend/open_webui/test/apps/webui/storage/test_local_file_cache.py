@@ -0,0 +1,128 @@
+import threading
+import time
+
+from open_webui.storage.cache import LocalFileCache
+
+
+class FakeRemote:
+    def __init__(self, content: bytes):
+        self.content = content
+        self.version = "v1"
+        self.downloads = 0
+
+    def get_version(self):
+        return self.version
+
+    def download(self, path):
+        self.downloads += 1
+        time.sleep(0.05)
+        with open(path, "wb") as f:
+            f.write(self.content)
+
+
+class TestLocalFileCache:
+    def test_reuses_local_copy_while_version_matches(self, tmp_path):
+        cache = LocalFileCache(max_size=1024)
+        remote = FakeRemote(b"hello")
+        local_path = str(tmp_path / "a.txt")
+
+        for _ in range(3):
+            path = cache.get(
+                "s3://b/a.txt", local_path, remote.get_version, remote.download
+            )
+
+        assert path == local_path
+        assert remote.downloads == 1
+
+        remote.version, remote.content = "v2", b"changed"
+        cache.get("s3://b/a.txt", local_path, remote.get_version, remote.download)
+
+        assert remote.downloads == 2
+        assert (tmp_path / "a.txt").read_bytes() == b"changed"
+
+    def test_concurrent_reads_share_one_download(self, tmp_path):
+        cache = LocalFileCache(max_size=1024)
+        remote = FakeRemote(b"hello")
+        local_path = str(tmp_path / "a.txt")
+
+        threads = [
+            threading.Thread(
+                target=cache.get,
+                args=("s3://b/a.txt", local_path, remote.get_version, remote.download),
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert remote.downloads == 1
+        # The per-key lock is dropped once no read uses it
+        assert not cache._locks
+
+    def test_failed_download_releases_lock(self, tmp_path):
+        cache = LocalFileCache(max_size=1024)
+
+        def download(path):
+            raise OSError("unreachable")
+
+        try:
+            cache.get("s3://b/a.txt", str(tmp_path / "a.txt"), lambda: "v1", download)
+        except OSError:
+            pass
+
+        assert not cache._locks
+        assert not list(tmp_path.iterdir())
+
+    def test_evicts_least_recently_used_copies(self, tmp_path):
+        cache = LocalFileCache(max_size=10)
+
+        for name in ["a", "b", "c"]:
+            remote = FakeRemote(b"12345")
+            cache.get(name, str(tmp_path / name), remote.get_version, remote.download)
+
+        assert not (tmp_path / "a").exists()
+        assert (tmp_path / "b").exists()
+        assert (tmp_path / "c").exists()
+
+    def test_disabled_cache_always_downloads(self, tmp_path):
+        cache = LocalFileCache(max_size=0)
+        remote = FakeRemote(b"hello")
+        local_path = str(tmp_path / "a.txt")
+
+        cache.get("a", local_path, remote.get_version, remote.download)
+        cache.get("a", local_path, remote.get_version, remote.download)
+
+        assert remote.downloads == 2
+
+    def test_recently_used_copies_are_deleted_after_delay(self, tmp_path):
+        cache = LocalFileCache(max_size=10, evict_delay=1)
+
+        for name in ["a", "b", "c"]:
+            remote = FakeRemote(b"12345")
+            cache.get(name, str(tmp_path / name), remote.get_version, remote.download)
+
+        # Evicted, but a reader may not have opened it yet
+        assert (tmp_path / "a").exists()
+
+        time.sleep(1.1)
+        remote = FakeRemote(b"12345")
+        cache.get("b", str(tmp_path / "b"), remote.get_version, remote.download)
+
+        assert not (tmp_path / "a").exists()
+        assert (tmp_path / "b").exists()
+
+    def test_downloading_again_keeps_evicted_path(self, tmp_path):
+        cache = LocalFileCache(max_size=5, evict_delay=1)
+        remote = FakeRemote(b"12345")
+
+        cache.get("a", str(tmp_path / "a"), remote.get_version, remote.download)
+        cache.get("b", str(tmp_path / "b"), remote.get_version, remote.download)
+        cache.get("a", str(tmp_path / "a"), remote.get_version, remote.download)
+
+        time.sleep(1.1)
+        cache.get("a", str(tmp_path / "a"), remote.get_version, remote.download)
+
+        assert (tmp_path / "a").exists()
+        assert not (tmp_path / "b").exists()
@@ -1,3 +1,4 @@
+import hashlib
 import io
 import os
 import boto3
@@ -66,13 +67,16 @@ class TestLocalStorageProvider:
 
     def test_upload_file(self, monkeypatch, tmp_path):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
-        contents, file_path = self.Storage.upload_file(self.file_bytesio, self.filename)
+        meta, file_path = self.Storage.upload_file(self.file_bytesio, self.filename, {})
         assert (upload_dir / self.filename).exists()
         assert (upload_dir / self.filename).read_bytes() == self.file_content
-        assert contents == self.file_content
+        assert meta == {
+            "size": len(self.file_content),
+            "sha256": hashlib.sha256(self.file_content).hexdigest(),
+        }
         assert file_path == str(upload_dir / self.filename)
         with pytest.raises(ValueError):
-            self.Storage.upload_file(self.file_bytesio_empty, self.filename)
+            self.Storage.upload_file(self.file_bytesio_empty, self.filename, {})
 
     def test_get_file(self, monkeypatch, tmp_path):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
@@ -114,26 +118,29 @@ class TestS3StorageProvider:
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
         # S3 checks
         with pytest.raises(Exception):
-            self.Storage.upload_file(io.BytesIO(self.file_content), self.filename)
+            self.Storage.upload_file(io.BytesIO(self.file_content), self.filename, {})
         self.s3_client.create_bucket(Bucket=self.Storage.bucket_name)
-        contents, s3_file_path = self.Storage.upload_file(
-            io.BytesIO(self.file_content), self.filename
+        meta, s3_file_path = self.Storage.upload_file(
+            io.BytesIO(self.file_content), self.filename, {}
         )
         object = self.s3_client.Object(self.Storage.bucket_name, self.filename)
         assert self.file_content == object.get()["Body"].read()
         # local checks
         assert (upload_dir / self.filename).exists()
         assert (upload_dir / self.filename).read_bytes() == self.file_content
-        assert contents == self.file_content
+        assert meta == {
+            "size": len(self.file_content),
+            "sha256": hashlib.sha256(self.file_content).hexdigest(),
+        }
         assert s3_file_path == "s3://" + self.Storage.bucket_name + "/" + self.filename
         with pytest.raises(ValueError):
-            self.Storage.upload_file(self.file_bytesio_empty, self.filename)
+            self.Storage.upload_file(self.file_bytesio_empty, self.filename, {})
 
     def test_get_file(self, monkeypatch, tmp_path):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
         self.s3_client.create_bucket(Bucket=self.Storage.bucket_name)
-        contents, s3_file_path = self.Storage.upload_file(
-            io.BytesIO(self.file_content), self.filename
+        meta, s3_file_path = self.Storage.upload_file(
+            io.BytesIO(self.file_content), self.filename, {}
         )
         file_path = self.Storage.get_file(s3_file_path)
         assert file_path == str(upload_dir / self.filename)
@@ -142,8 +149,8 @@ class TestS3StorageProvider:
     def test_delete_file(self, monkeypatch, tmp_path):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
         self.s3_client.create_bucket(Bucket=self.Storage.bucket_name)
-        contents, s3_file_path = self.Storage.upload_file(
-            io.BytesIO(self.file_content), self.filename
+        meta, s3_file_path = self.Storage.upload_file(
+            io.BytesIO(self.file_content), self.filename, {}
         )
         assert (upload_dir / self.filename).exists()
         self.Storage.delete_file(s3_file_path)
@@ -158,12 +165,12 @@ class TestS3StorageProvider:
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
         # create 2 files
         self.s3_client.create_bucket(Bucket=self.Storage.bucket_name)
-        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename)
+        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename, {})
         object = self.s3_client.Object(self.Storage.bucket_name, self.filename)
         assert self.file_content == object.get()["Body"].read()
         assert (upload_dir / self.filename).exists()
         assert (upload_dir / self.filename).read_bytes() == self.file_content
-        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename_extra)
+        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename_extra, {})
         object = self.s3_client.Object(self.Storage.bucket_name, self.filename_extra)
         assert self.file_content == object.get()["Body"].read()
         assert (upload_dir / self.filename).exists()
@@ -228,25 +235,28 @@ class TestGCSStorageProvider:
         # catch error if bucket does not exist
         with pytest.raises(Exception):
             self.Storage.bucket = monkeypatch(self.Storage, "bucket", None)
-            self.Storage.upload_file(io.BytesIO(self.file_content), self.filename)
-        contents, gcs_file_path = self.Storage.upload_file(
-            io.BytesIO(self.file_content), self.filename
+            self.Storage.upload_file(io.BytesIO(self.file_content), self.filename, {})
+        meta, gcs_file_path = self.Storage.upload_file(
+            io.BytesIO(self.file_content), self.filename, {}
         )
         object = self.Storage.bucket.get_blob(self.filename)
         assert self.file_content == object.download_as_bytes()
         # local checks
         assert (upload_dir / self.filename).exists()
         assert (upload_dir / self.filename).read_bytes() == self.file_content
-        assert contents == self.file_content
+        assert meta == {
+            "size": len(self.file_content),
+            "sha256": hashlib.sha256(self.file_content).hexdigest(),
+        }
         assert gcs_file_path == "gs://" + self.Storage.bucket_name + "/" + self.filename
         # test error if file is empty
         with pytest.raises(ValueError):
-            self.Storage.upload_file(self.file_bytesio_empty, self.filename)
+            self.Storage.upload_file(self.file_bytesio_empty, self.filename, {})
 
     def test_get_file(self, monkeypatch, tmp_path, setup):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
-        contents, gcs_file_path = self.Storage.upload_file(
-            io.BytesIO(self.file_content), self.filename
+        meta, gcs_file_path = self.Storage.upload_file(
+            io.BytesIO(self.file_content), self.filename, {}
         )
         file_path = self.Storage.get_file(gcs_file_path)
         assert file_path == str(upload_dir / self.filename)
@@ -254,8 +264,8 @@ class TestGCSStorageProvider:
 
     def test_delete_file(self, monkeypatch, tmp_path, setup):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
-        contents, gcs_file_path = self.Storage.upload_file(
-            io.BytesIO(self.file_content), self.filename
+        meta, gcs_file_path = self.Storage.upload_file(
+            io.BytesIO(self.file_content), self.filename, {}
         )
         # ensure that local directory has the uploaded file as well
         assert (upload_dir / self.filename).exists()
@@ -268,13 +278,13 @@ class TestGCSStorageProvider:
     def test_delete_all_files(self, monkeypatch, tmp_path, setup):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
         # create 2 files
-        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename)
+        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename, {})
         object = self.Storage.bucket.get_blob(self.filename)
         assert (upload_dir / self.filename).exists()
         assert (upload_dir / self.filename).read_bytes() == self.file_content
         assert self.Storage.bucket.get_blob(self.filename).name == self.filename
         assert self.file_content == object.download_as_bytes()
-        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename_extra)
+        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename_extra, {})
         object = self.Storage.bucket.get_blob(self.filename_extra)
         assert (upload_dir / self.filename_extra).exists()
         assert (upload_dir / self.filename_extra).read_bytes() == self.file_content
@@ -343,21 +353,22 @@ class TestAzureStorageProvider:
             "Container does not exist"
         )
         with pytest.raises(Exception):
-            self.Storage.upload_file(io.BytesIO(self.file_content), self.filename)
+            self.Storage.upload_file(io.BytesIO(self.file_content), self.filename, {})
 
         # Reset side effect and create container
         self.Storage.container_client.get_blob_client.side_effect = None
         self.Storage.create_container()
-        contents, azure_file_path = self.Storage.upload_file(
-            io.BytesIO(self.file_content), self.filename
+        meta, azure_file_path = self.Storage.upload_file(
+            io.BytesIO(self.file_content), self.filename, {}
         )
 
         # Assertions
         self.Storage.container_client.get_blob_client.assert_called_with(self.filename)
-        self.Storage.container_client.get_blob_client().upload_blob.assert_called_once_with(
-            self.file_content, overwrite=True
-        )
-        assert contents == self.file_content
+        self.Storage.container_client.get_blob_client().upload_blob.assert_called_once()
+        assert meta == {
+            "size": len(self.file_content),
+            "sha256": hashlib.sha256(self.file_content).hexdigest(),
+        }
         assert (
             azure_file_path
             == f"https://myaccount.blob.core.windows.net/{self.Storage.container_name}/{self.filename}"
@@ -366,14 +377,14 @@ class TestAzureStorageProvider:
         assert (upload_dir / self.filename).read_bytes() == self.file_content
 
         with pytest.raises(ValueError):
-            self.Storage.upload_file(self.file_bytesio_empty, self.filename)
+            self.Storage.upload_file(self.file_bytesio_empty, self.filename, {})
 
     def test_get_file(self, monkeypatch, tmp_path):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
         self.Storage.create_container()
 
         # Mock upload behavior
-        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename)
+        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename, {})
         # Mock blob download behavior
         self.Storage.container_client.get_blob_client().download_blob().readall.return_value = (
             self.file_content
@@ -391,7 +402,7 @@ class TestAzureStorageProvider:
         self.Storage.create_container()
 
         # Mock file upload
-        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename)
+        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename, {})
         # Mock deletion
         self.Storage.container_client.get_blob_client().delete_blob.return_value = None
 
@@ -406,8 +417,8 @@ class TestAzureStorageProvider:
         self.Storage.create_container()
 
         # Mock file uploads
-        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename)
-        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename_extra)
+        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename, {})
+        self.Storage.upload_file(io.BytesIO(self.file_content), self.filename_extra, {})
 
         # Mock listing and deletion behavior
         self.Storage.container_client.list_blobs.return_value = [
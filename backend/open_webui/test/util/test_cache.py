@@ -0,0 +1,72 @@
+from open_webui.utils.cache import LRUCache
+
+
+class TestLRUCache:
+    def test_get_and_set(self):
+        cache = LRUCache(max_size=100)
+
+        assert cache.set("a", b"12345")
+        assert cache.get("a") == b"12345"
+        assert cache.get("missing") is None
+        assert cache.size == 5
+
+    def test_evicts_least_recently_used_by_size(self):
+        cache = LRUCache(max_size=10)
+
+        cache.set("a", b"1234")
+        cache.set("b", b"1234")
+        cache.get("a")
+        cache.set("c", b"1234")
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.size == 8
+
+    def test_replacing_value_updates_size(self):
+        cache = LRUCache(max_size=10)
+
+        cache.set("a", b"1234")
+        cache.set("a", b"12")
+
+        assert cache.size == 2
+        assert len(cache) == 1
+
+    def test_oversized_values_are_not_cached(self):
+        cache = LRUCache(max_size=4)
+
+        assert not cache.set("a", b"12345")
+        assert "a" not in cache
+
+    def test_disabled_cache(self):
+        cache = LRUCache(max_size=0)
+
+        assert not cache.set("a", b"1")
+        assert cache.get("a") is None
+
+    def test_stats(self):
+        cache = LRUCache(max_size=10)
+        cache.set("a", b"1")
+        cache.get("a")
+        cache.get("b")
+
+        assert cache.stats() == {
+            "entries": 1,
+            "size": 1,
+            "max_size": 10,
+            "hits": 1,
+            "misses": 1,
+        }
+
+    def test_on_evict_receives_evicted_entries(self):
+        evicted = []
+        cache = LRUCache(
+            max_size=8, on_evict=lambda key, value: evicted.append((key, value))
+        )
+
+        cache.set("a", b"1234")
+        cache.set("b", b"1234")
+        cache.set("a", b"12")
+        cache.set("c", b"1234")
+
+        assert evicted == [("b", b"1234")]
@@ -0,0 +1,106 @@
+import uuid
+
+from open_webui.models.chat_stats import ChatStats, get_branch_stats, get_chat_deltas
+
+
+def get_chat(messages: dict, current_id: str) -> dict:
+    return {"history": {"messages": messages, "currentId": current_id}}
+
+
+USER = {"id": "u", "role": "user", "content": "hello", "timestamp": 100}
+ANSWER = {
+    "id": "a",
+    "role": "assistant",
+    "content": "hi",
+    "model": "m",
+    "timestamp": 103,
+    "parentId": "u",
+    "done": True,
+}
+
+
+def test_get_chat_deltas_counts_new_and_changed_messages():
+    old_chat = get_chat({"u": USER}, "u")
+    new_chat = get_chat({"u": USER, "a": ANSWER}, "a")
+
+    deltas = get_chat_deltas(old_chat, new_chat)
+    assert deltas == {
+        ("1970-01-01", "m"): {
+            "assistant_message_count": 1,
+            "assistant_content_length": 2,
+            "response_time_sum": 3,
+            "response_time_count": 1,
+        }
+    }
+
+    # Editing the content only changes the length
+    newer_chat = get_chat({"u": USER, "a": {**ANSWER, "content": "hi!"}}, "a")
+    assert get_chat_deltas(new_chat, newer_chat, message_ids=["a"]) == {
+        ("1970-01-01", "m"): {"assistant_content_length": 1}
+    }
+    assert get_chat_deltas(new_chat, new_chat) == {}
+
+
+def test_get_chat_deltas_skips_unfinished_messages():
+    streaming = {**ANSWER, "done": False}
+    old_chat = get_chat({"u": USER, "a": {**streaming, "content": ""}}, "a")
+    new_chat = get_chat({"u": USER, "a": streaming}, "a")
+
+    assert get_chat_deltas(old_chat, new_chat, message_ids=["a"]) == {}
+    assert get_chat_deltas(new_chat, get_chat({"u": USER, "a": ANSWER}, "a")) == {
+        ("1970-01-01", "m"): {
+            "assistant_message_count": 1,
+            "assistant_content_length": 2,
+            "response_time_sum": 3,
+            "response_time_count": 1,
+        }
+    }
+
+
+def test_get_branch_stats():
+    other = {**ANSWER, "id": "b", "model": "n"}
+    chat = get_chat({"u": USER, "a": ANSWER, "b": other}, "a")
+
+    assert get_branch_stats(chat) == {
+        "history_message_count": 3,
+        "message_count": 2,
+        "models": {"m": 1},
+        "last_message_at": 103,
+    }
+
+
+def test_update_chat_stats_counts_messages_once_finished():
+    chat_id, user_id = str(uuid.uuid4()), f"test_{uuid.uuid4().hex}"
+    streaming = {**ANSWER, "content": "", "done": False}
+
+    chat = get_chat({"u": USER, "a": streaming}, "a")
+    stat = ChatStats.update_chat_stats(chat_id, user_id, None, chat)
+    assert (stat.user_message_count, stat.assistant_message_count) == (1, 0)
+
+    # Streamed content doesn't touch the stats
+    streamed = get_chat({"u": USER, "a": {**streaming, "content": "h"}}, "a")
+    assert ChatStats.update_chat_stats(chat_id, user_id, chat, streamed, ["a"]) is None
+
+    finished = get_chat({"u": USER, "a": ANSWER}, "a")
+    stat = ChatStats.update_chat_stats(chat_id, user_id, streamed, finished, ["a"])
+    assert stat.assistant_message_count == 1
+    assert stat.assistant_content_length == 2
+    assert stat.history_models == {"m": 1}
+    assert stat.message_count == 2
+
+    # Writing it again, e.g. with follow ups, counts nothing twice
+    followed = get_chat({"u": USER, "a": {**ANSWER, "followUps": ["?"]}}, "a")
+    assert (
+        ChatStats.update_chat_stats(chat_id, user_id, finished, followed, ["a"]) is None
+    )
+
+    usage = ChatStats.get_daily_usage(["date", "model"], user_id=user_id)
+    assert [(row.date, row.model) for row in usage] == [
+        ("1970-01-01", ""),
+        ("1970-01-01", "m"),
+    ]
+    assert usage[0].user_message_count == 1
+    assert usage[1].assistant_message_count == 1
+    assert usage[1].response_time_sum == 3
+
+    ChatStats.delete_chat_stats_by_chat_ids([chat_id])
@@ -0,0 +1,119 @@
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from open_webui.utils.images.comfyui import (
+    PREVIEW_IMAGE,
+    ComfyUIScheduler,
+    get_base_urls,
+)
+
+
+class FakeComfyUI:
+    """Minimal ComfyUI running every prompt in two steps."""
+
+    def __init__(self, queue_remaining: int = 0):
+        self.queue_remaining = queue_remaining
+        self.sockets = {}
+        self.prompts = []
+
+        self.app = web.Application()
+        self.app.router.add_get("/ws", self.ws)
+        self.app.router.add_post("/prompt", self.prompt)
+        self.app.router.add_get("/history/{prompt_id}", self.history)
+        self.app.router.add_get("/view", self.view)
+
+    async def ws(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.sockets[request.query["clientId"]] = ws
+        await ws.send_json(
+            {
+                "type": "status",
+                "data": {
+                    "status": {"exec_info": {"queue_remaining": self.queue_remaining}}
+                },
+            }
+        )
+        async for _ in ws:
+            pass
+        return ws
+
+    async def prompt(self, request):
+        body = await request.json()
+        prompt_id = body["prompt_id"]
+        self.prompts.append(prompt_id)
+        asyncio.create_task(self.run(self.sockets[body["client_id"]], prompt_id))
+        return web.json_response({"prompt_id": prompt_id})
+
+    async def run(self, ws, prompt_id):
+        await ws.send_json(
+            {"type": "execution_start", "data": {"prompt_id": prompt_id}}
+        )
+        for step in (1, 2):
+            await ws.send_json(
+                {
+                    "type": "progress",
+                    "data": {"value": step, "max": 2, "prompt_id": prompt_id},
+                }
+            )
+        await ws.send_bytes(
+            PREVIEW_IMAGE.to_bytes(4, "big") + (2).to_bytes(4, "big") + b"png"
+        )
+        await ws.send_json(
+            {"type": "executing", "data": {"node": None, "prompt_id": prompt_id}}
+        )
+
+    async def history(self, request):
+        prompt_id = request.match_info["prompt_id"]
+        image = {"filename": "out.png", "subfolder": "", "type": "output"}
+        return web.json_response({prompt_id: {"outputs": {"9": {"images": [image]}}}})
+
+    async def view(self, request):
+        return web.Response(body=b"image", content_type="image/png")
+
+
+def test_get_base_urls():
+    assert get_base_urls("http://a/; http://b ;") == ["http://a", "http://b"]
+
+
+@pytest.mark.asyncio
+async def test_run_workflow_on_least_busy_instance():
+    busy, idle = FakeComfyUI(queue_remaining=5), FakeComfyUI()
+    async with TestServer(busy.app) as busy_server, TestServer(idle.app) as idle_server:
+        base_url = ";".join(
+            str(server.make_url("")).rstrip("/")
+            for server in (busy_server, idle_server)
+        )
+
+        # Connect to both to learn their queues
+        scheduler = ComfyUIScheduler()
+        for url in get_base_urls(base_url):
+            await scheduler.get_client(url, None).connect()
+        await asyncio.sleep(0.1)
+
+        events = []
+
+        async def event_emitter(event):
+            events.append(event)
+
+        client = await scheduler.get_available_client(base_url, None)
+        result = await client.run_workflow({"1": {}}, event_emitter)
+
+        assert idle.prompts and not busy.prompts
+        assert [event["type"] for event in events] == ["status", "status", "files"]
+        assert events[1]["data"]["description"] == "Generating image (2/2)"
+        assert events[2]["data"]["files"][0]["url"] == "data:image/png;base64,cG5n"
+
+        url = result["data"][0]["url"]
+        assert url.endswith("/view?filename=out.png&subfolder=&type=output")
+        assert await client.get_image_data(url) == (b"image", "image/png")
+
+        clients = list(scheduler.clients.values())
+        await scheduler.close()
+        assert not scheduler.clients
+        assert all(client.session is None for client in clients)
+        assert all(client.reader is None for client in clients)
@@ -0,0 +1,82 @@
+import gzip
+import json
+
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from open_webui.utils.export import iter_json_gzip, iter_ndjson, read_ndjson
+
+
+class Item(BaseModel):
+    id: int
+
+
+def test_iter_ndjson():
+    data = b"".join(iter_ndjson(Item(id=i) for i in range(3)))
+    assert data == b'{"id":0}\n{"id":1}\n{"id":2}\n'
+
+
+def test_iter_json_gzip():
+    data = b"".join(iter_json_gzip(Item(id=i) for i in range(3)))
+    assert json.loads(gzip.decompress(data)) == [{"id": 0}, {"id": 1}, {"id": 2}]
+
+    data = b"".join(iter_json_gzip([]))
+    assert json.loads(gzip.decompress(data)) == []
+
+
+class FakeRequest:
+    def __init__(self, body: bytes, chunk_size: int = 7, headers: dict = None):
+        self.body = body
+        self.chunk_size = chunk_size
+        self.headers = headers or {}
+
+    async def stream(self):
+        for i in range(0, len(self.body), self.chunk_size):
+            yield self.body[i : i + self.chunk_size]
+
+
+async def read_all(request, max_size=1024, max_line_size=64):
+    return [item async for item in read_ndjson(request, max_size, max_line_size)]
+
+
+@pytest.mark.asyncio
+async def test_read_ndjson_splits_lines_across_chunks():
+    body = b'{"id":0}\n\nnot json\n{"id":1}\n[1]\n{"id":2}'
+
+    assert await read_all(FakeRequest(body)) == [
+        (1, {"id": 0}),
+        (3, None),
+        (4, {"id": 1}),
+        (5, None),
+        (6, {"id": 2}),
+    ]
+    assert await read_all(FakeRequest(gzip.compress(body))) == await read_all(
+        FakeRequest(body, chunk_size=1)
+    )
+
+
+@pytest.mark.asyncio
+async def test_read_ndjson_rejects_long_lines():
+    body = b'{"id":0}\n{"text":"' + b"x" * 100 + b'"}\n'
+
+    for request in (FakeRequest(body), FakeRequest(body, chunk_size=1024)):
+        with pytest.raises(HTTPException) as exc:
+            await read_all(request)
+        assert exc.value.status_code == 413
+        assert "Line 2" in exc.value.detail
+
+
+@pytest.mark.asyncio
+async def test_read_ndjson_limits_decompressed_size():
+    body = b'{"id":0}\n' * 1000
+    items = []
+
+    with pytest.raises(HTTPException) as exc:
+        async for item in read_ndjson(
+            FakeRequest(gzip.compress(body), chunk_size=1024), 1000, 64
+        ):
+            items.append(item)
+
+    assert exc.value.status_code == 413
+    assert len(items) <= 100
@@ -0,0 +1,132 @@
+"""
+Filter chain tests. The stream benchmark is skipped unless RUN_BENCHMARKS=true:
+
+    RUN_BENCHMARKS=true pytest -s open_webui/test/util/test_filter.py
+"""
+
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+from open_webui.utils import filter as filter_utils
+from open_webui.utils.filter import (
+    CompiledFilter,
+    FilterChain,
+    FilterChainCache,
+    get_filter_chain,
+)
+from open_webui.utils.plugin import RequirementsNotReadyError
+
+STREAM_TOKENS = int(os.environ.get("BENCHMARK_STREAM_TOKENS", 100_000))
+
+
+class Filter:
+    class Valves(BaseModel):
+        priority: int = 0
+        suffix: str = ""
+
+    class UserValves(BaseModel):
+        enabled: bool = True
+
+    def __init__(self):
+        self.valves = self.Valves()
+
+    def inlet(self, body: dict, __user__: dict) -> dict:
+        if __user__["valves"].enabled:
+            body["messages"].append(self.valves.suffix)
+        return body
+
+    async def stream(self, event: dict, __id__: str) -> dict:
+        event["seen"] = event.get("seen", 0) + 1
+        return event
+
+
+def get_user(enabled: bool) -> dict:
+    return {
+        "id": "user",
+        "settings": {"functions": {"valves": {"b": {"enabled": enabled}}}},
+    }
+
+
+@pytest.mark.asyncio
+async def test_filter_chain_applies_valves_and_user_valves():
+    chain = FilterChain(
+        [
+            CompiledFilter("a", Filter(), {"suffix": "a"}),
+            CompiledFilter("b", Filter(), {"suffix": "b"}),
+        ]
+    )
+
+    body = await chain.run(
+        "inlet", {"messages": []}, {"__user__": get_user(False), "__model__": {}}
+    )
+    assert body["messages"] == ["a"]
+
+    body = await chain.run("inlet", {"messages": []}, {"__user__": get_user(True)})
+    assert body["messages"] == ["a", "b"]
+
+    assert await chain.run("stream", {}, {}) == {"seen": 2}
+    assert await chain.run("outlet", {"x": 1}, {}) == {"x": 1}
+
+
+def test_filter_chain_skips_filters_with_pending_requirements(monkeypatch):
+    functions = [SimpleNamespace(id=id, is_global=True) for id in ("ready", "pending")]
+    installed = set()
+
+    def get_function_module(request, function_id):
+        if function_id == "pending" and function_id not in installed:
+            raise RequirementsNotReadyError("Installing requirements")
+        return Filter()
+
+    monkeypatch.setattr(filter_utils, "FILTER_CHAINS", FilterChainCache())
+    monkeypatch.setattr(filter_utils, "get_function_module", get_function_module)
+    monkeypatch.setattr(
+        filter_utils.Functions,
+        "get_functions_stamp_by_type",
+        lambda type: (len(functions), 1),
+    )
+    monkeypatch.setattr(
+        filter_utils.Functions,
+        "get_functions_by_type",
+        lambda type, active_only, include_valves: functions,
+    )
+    monkeypatch.setattr(
+        filter_utils.Functions, "get_function_valves_by_id", lambda id: {}
+    )
+
+    assert get_filter_chain(None, {"id": "model"}).ids == ["ready"]
+    # Not cached: compiled again, with the filter, once it can be loaded
+    installed.add("pending")
+    assert get_filter_chain(None, {"id": "model"}).ids == ["pending", "ready"]
+    assert get_filter_chain(None, {"id": "model"}) is get_filter_chain(
+        None, {"id": "model"}
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(
+    os.environ.get("RUN_BENCHMARKS", "false").lower() != "true",
+    reason="set RUN_BENCHMARKS=true to run benchmarks",
+)
+async def test_stream_filter_throughput():
+    chain = FilterChain(
+        [CompiledFilter(str(i), Filter(), {"priority": i}) for i in range(3)]
+    )
+    extra_params = {"__user__": get_user(True), "__id__": None}
+
+    start = time.perf_counter()
+    for i in range(STREAM_TOKENS):
+        await chain.run(
+            "stream",
+            {"choices": [{"delta": {"content": f"token {i}"}}]},
+            {"__body__": {}, **extra_params},
+        )
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"\n{STREAM_TOKENS} tokens through 3 stream filters in {elapsed:.2f}s, "
+        f"{STREAM_TOKENS / elapsed:,.0f} tokens/s"
+    )
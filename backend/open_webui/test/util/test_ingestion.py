@@ -0,0 +1,108 @@
+import time
+import uuid
+
+from open_webui.utils import ingestion
+from open_webui.models.jobs import Jobs
+from open_webui.utils.ingestion import get_retry_delay, get_size_penalty
+
+MiB = 1024 * 1024
+
+
+class TestIngestionQueue:
+    def test_small_files_have_no_penalty(self):
+        assert get_size_penalty(None) == 0
+        assert get_size_penalty(MiB) == 0
+
+    def test_penalty_grows_per_doubling(self, monkeypatch):
+        monkeypatch.setattr(ingestion, "INGESTION_QUEUE_SIZE_PENALTY", 10)
+
+        assert get_size_penalty(2 * MiB) == 10
+        assert get_size_penalty(3 * MiB) == 20
+        assert get_size_penalty(64 * MiB) == 60
+
+    def test_retry_delay_backs_off_exponentially(self, monkeypatch):
+        monkeypatch.setattr(ingestion, "INGESTION_QUEUE_RETRY_BACKOFF", 5)
+
+        assert [get_retry_delay(attempts) for attempts in (1, 2, 3)] == [5, 10, 20]
+
+
+class TestJobsTable:
+    """Claim, fail and requeue against the `job` table."""
+
+    def queue(self, count=1, **kwargs):
+        type = f"test_{uuid.uuid4().hex}"
+        jobs = [
+            Jobs.insert_new_job(type, "user", {"index": index}, **kwargs)
+            for index in range(count)
+        ]
+        return type, jobs
+
+    def test_claim_locks_each_job_once(self):
+        type, jobs = self.queue(2)
+
+        first = Jobs.claim_job("worker-1", [type])
+        second = Jobs.claim_job("worker-2", [type])
+
+        assert {first.id, second.id} == {job.id for job in jobs}
+        assert (first.status, first.attempts, first.locked_by) == (
+            "running",
+            1,
+            "worker-1",
+        )
+        assert Jobs.claim_job("worker-3", [type]) is None
+
+    def test_claim_prefers_better_ranked_jobs(self):
+        type = f"test_{uuid.uuid4().hex}"
+        large = Jobs.insert_new_job(type, "user", {}, delay=60)
+        small = Jobs.insert_new_job(type, "user", {})
+
+        assert Jobs.claim_job("worker", [type]).id == small.id
+        assert Jobs.claim_job("worker", [type]).id == large.id
+
+    def test_fail_retries_after_delay_then_gives_up(self):
+        type, (job,) = self.queue(max_attempts=2)
+
+        Jobs.claim_job("worker", [type])
+        # Only the worker holding the lock can fail a job
+        assert Jobs.fail_job(job.id, "other", "boom", retry_delay=0) is None
+
+        retried = Jobs.fail_job(job.id, "worker", "boom", retry_delay=60)
+        assert (retried.status, retried.error, retried.locked_by) == (
+            "pending",
+            "boom",
+            None,
+        )
+        assert retried.available_at >= int(time.time()) + 59
+        assert Jobs.claim_job("worker", [type]) is None
+
+        # Released jobs can't be failed twice
+        assert Jobs.fail_job(job.id, "worker", "boom", retry_delay=0) is None
+
+    def test_fail_marks_job_failed_without_attempts_left(self):
+        type, (job,) = self.queue(max_attempts=1)
+
+        Jobs.claim_job("worker", [type])
+        failed = Jobs.fail_job(job.id, "worker", "boom", retry_delay=0)
+
+        assert failed.status == "failed"
+        assert Jobs.claim_job("worker", [type]) is None
+
+    def test_requeue_releases_jobs_of_silent_workers(self):
+        type, (job,) = self.queue(max_attempts=2)
+
+        Jobs.claim_job("dead-worker", [type])
+        assert job.id not in [j.id for j in Jobs.requeue_stale_jobs(timeout=60)]
+
+        time.sleep(1.1)
+        requeued = {j.id: j for j in Jobs.requeue_stale_jobs(timeout=0)}
+        assert requeued[job.id].status == "pending"
+        assert requeued[job.id].locked_by is None
+        # The lost attempt counts
+        assert Jobs.complete_job(job.id, "dead-worker") is False
+
+        claimed = Jobs.claim_job("worker", [type])
+        assert (claimed.id, claimed.attempts) == (job.id, 2)
+
+        time.sleep(1.1)
+        requeued = {j.id: j for j in Jobs.requeue_stale_jobs(timeout=0)}
+        assert requeued[job.id].status == "failed"
@@ -0,0 +1,59 @@
+import pytest
+
+from open_webui.utils import lazy
+from open_webui.utils.lazy import WARM_UP_OBJECTS, LazyObject, lazy_import
+
+
+def test_lazy_object_loads_once_on_first_use():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return "value"
+
+    obj = LazyObject("test", loader, warm=False)
+    assert not obj.loaded and not calls
+    assert obj not in WARM_UP_OBJECTS
+
+    assert obj.upper() == "VALUE"
+    assert obj.load() == "value"
+    assert obj.loaded and len(calls) == 1
+
+
+def test_lazy_import():
+    dumps = lazy_import("json", "dumps")
+    assert dumps.__name__ == "dumps"
+    assert dumps([1]) == "[1]"
+
+
+def test_failed_load_is_retried_after_backoff(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(lazy.time, "monotonic", lambda: now[0])
+    calls = []
+
+    def loader():
+        calls.append(1)
+        if len(calls) < 3:
+            raise RuntimeError("unavailable")
+        return "value"
+
+    obj = LazyObject("test", loader, warm=False)
+    for _ in range(3):
+        with pytest.raises(RuntimeError, match="unavailable"):
+            obj.load()
+    assert len(calls) == 1
+
+    now[0] += lazy.RETRY_BACKOFF
+    with pytest.raises(RuntimeError):
+        obj.load()
+    assert len(calls) == 2
+
+    # The backoff doubled
+    now[0] += lazy.RETRY_BACKOFF
+    with pytest.raises(RuntimeError):
+        obj.load()
+    assert len(calls) == 2
+
+    now[0] += lazy.RETRY_BACKOFF
+    assert obj.load() == "value"
+    assert obj.loaded and len(calls) == 3
@@ -0,0 +1,108 @@
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from open_webui.models.memories import MemoryModel
+from open_webui.retrieval import memory_index
+from open_webui.retrieval.memory_index import (
+    MemoryIndex,
+    MemoryIndexCache,
+    broadcast_memory_change,
+    memory_invalidation_listener,
+    to_embedding,
+)
+
+
+def get_memory(id: str, content: str) -> MemoryModel:
+    return MemoryModel(
+        id=id, user_id="user", content=content, created_at=1, updated_at=1
+    )
+
+
+def test_memory_index_search_and_updates():
+    index = MemoryIndex(
+        "model",
+        [
+            (get_memory(str(i), f"memory {i}"), to_embedding(np.eye(4)[i]))
+            for i in range(4)
+        ],
+    )
+
+    result = index.search([0.1, 0.9, 0.2, 0], limit=2)
+    assert result.ids == [["1", "2"]]
+    assert result.documents == [["memory 1", "memory 2"]]
+    assert result.distances[0][0] > result.distances[0][1]
+
+    index.delete("1")
+    index.upsert(get_memory("0", "updated"), to_embedding([0, 1, 0, 0]))
+    index.upsert(get_memory("4", "added"), to_embedding([0, 0, 0, 1]))
+
+    assert len(index) == 4
+    result = index.search([0, 1, 0, 0], limit=10)
+    assert result.ids[0][0] == "0"
+    assert result.documents[0][0] == "updated"
+    assert sorted(result.ids[0]) == ["0", "2", "3", "4"]
+
+
+def test_memory_index_cache_skips_stale_builds():
+    cache = MemoryIndexCache(size=1)
+
+    version = cache.get_version()
+    cache.delete("a", "memory")
+    assert not cache.set("a", MemoryIndex("model", []), version)
+    assert cache.get("a", "model") is None
+
+    assert cache.set("a", MemoryIndex("model", []), cache.get_version())
+    assert cache.get("a", "other model") is None
+
+    cache.set("a", MemoryIndex("model", []), cache.get_version())
+    cache.set("b", MemoryIndex("model", []), cache.get_version())
+    assert cache.get("a", "model") is None
+    assert cache.get("b", "model") is not None
+
+
+class FakePubSub:
+    def __init__(self, messages: list[str]):
+        self.messages = messages
+
+    async def subscribe(self, channel: str):
+        pass
+
+    async def listen(self):
+        yield {"type": "subscribe", "data": 1}
+        for data in self.messages:
+            yield {"type": "message", "data": data}
+
+
+class FakeRedis:
+    def __init__(self):
+        self.published = []
+
+    async def publish(self, channel: str, data: str):
+        self.published.append(data)
+
+    def pubsub(self):
+        return FakePubSub(self.published)
+
+
+@pytest.mark.asyncio
+async def test_memory_changes_drop_the_index_in_other_workers(monkeypatch):
+    cache = MemoryIndexCache()
+    monkeypatch.setattr(memory_index, "MEMORY_INDEXES", cache)
+    for user_id in ("a", "b"):
+        cache.set(user_id, MemoryIndex("model", []), cache.get_version())
+
+    redis = FakeRedis()
+    await broadcast_memory_change(redis, "a")
+    # Published by another worker
+    redis.published.append(json.dumps({"user_id": "b", "worker_id": "other"}))
+
+    await memory_invalidation_listener(
+        SimpleNamespace(state=SimpleNamespace(redis=redis))
+    )
+
+    # Its own change was already applied to the index of this worker
+    assert cache.get("a", "model") is not None
+    assert cache.get("b", "model") is None
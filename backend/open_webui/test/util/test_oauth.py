@@ -0,0 +1,103 @@
+import asyncio
+import time
+
+import pytest
+
+from open_webui.models.oauth_sessions import OAuthSessionModel
+from open_webui.utils import oauth
+from open_webui.utils.oauth import OAuthSessionCache
+
+
+def get_session(access_token: str, expires_in: int) -> OAuthSessionModel:
+    return OAuthSessionModel(
+        id="s",
+        user_id="u",
+        provider="p",
+        token={"access_token": access_token, "refresh_token": "r"},
+        expires_at=int(time.time()) + expires_in,
+        created_at=0,
+        updated_at=0,
+    )
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = {"session": get_session("old", 10)}
+
+    def update_session_by_id(session_id, token):
+        store["session"] = get_session(token["access_token"], 3600)
+        return store["session"]
+
+    monkeypatch.setattr(oauth, "load_oauth_session", lambda key: store["session"])
+    monkeypatch.setattr(
+        oauth.OAuthSessions, "update_session_by_id", update_session_by_id
+    )
+    return store
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_are_single_flight(store):
+    cache, key = OAuthSessionCache(ttl=60), ("session", "s", "u")
+    calls = []
+
+    async def perform(session):
+        calls.append(session.id)
+        await asyncio.sleep(0.01)
+        return {"access_token": "new"}
+
+    session = cache.load(key)
+    sessions = await asyncio.gather(
+        *[cache.refresh(None, key, session, perform) for _ in range(10)]
+    )
+
+    assert len(calls) == 1
+    assert {session.token["access_token"] for session in sessions} == {"new"}
+    assert cache.get(key).token["access_token"] == "new"
+
+
+@pytest.mark.asyncio
+async def test_refreshed_token_is_not_refreshed_again(store):
+    cache, key = OAuthSessionCache(ttl=60), ("session", "s", "u")
+    stale = cache.load(key)
+
+    # Refreshed by another worker since it was read
+    store["session"] = get_session("other", 3600)
+
+    async def perform(session):
+        raise AssertionError("unexpected refresh")
+
+    session = await cache.refresh(None, key, stale, perform)
+    assert session.token["access_token"] == "other"
+
+
+def test_expired_sessions_are_pruned(store, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(oauth.time, "time", lambda: now[0])
+
+    cache = OAuthSessionCache(ttl=60, active_window=0)
+    for user_id in ("a", "b"):
+        cache.load(("session", "s", user_id))
+    assert len(cache.entries) == 2
+
+    now[0] += 30
+    cache.get(("session", "s", "a"))
+    now[0] += 40
+    cache.load(("session", "s", "c"))
+
+    # Without the refresh loop nothing keeps expired sessions
+    assert list(cache.entries) == [("session", "s", "c")]
+
+
+def test_active_sessions_are_kept_for_refresh(store, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(oauth.time, "time", lambda: now[0])
+
+    cache = OAuthSessionCache(ttl=60, active_window=600)
+    cache.load(("session", "s", "a"))
+    now[0] += 300
+    cache.load(("session", "s", "b"))
+    assert len(cache.entries) == 2
+
+    now[0] += 400
+    cache.get(("session", "s", "b"))
+    assert list(cache.entries) == [("session", "s", "b")]
@@ -0,0 +1,72 @@
+import time
+
+from open_webui.utils.plugin import (
+    PluginModuleVersion,
+    RequirementsInstaller,
+    are_requirements_satisfied,
+    get_content_hash,
+    is_module_current,
+    parse_requirements,
+)
+
+
+def get_version(updated_at: int, content: str, loaded_at: int) -> PluginModuleVersion:
+    return PluginModuleVersion(updated_at, get_content_hash(content), loaded_at, 0)
+
+
+def fail():
+    raise AssertionError("unexpected DB read")
+
+
+def test_cached_module_is_not_checked_within_ttl():
+    version = get_version(100, "a", 200)
+    version.validated_at = time.time()
+    assert is_module_current(version, fail, fail)
+
+
+def test_cached_module_is_checked_by_stamp_then_content():
+    # Unchanged stamp older than the read: no content fetch
+    version = get_version(100, "a", 200)
+    assert is_module_current(version, lambda: 100, fail)
+
+    # Moved stamp with the same content, e.g. a valves update
+    version = get_version(100, "a", 200)
+    assert is_module_current(version, lambda: 300, lambda: "a")
+    assert version.updated_at == 300
+
+    # Stamp from the second the content was read is ambiguous
+    version = get_version(200, "a", 200)
+    assert not is_module_current(version, lambda: 200, lambda: "b")
+
+    # Deleted
+    version = get_version(100, "a", 200)
+    assert not is_module_current(version, lambda: None, fail)
+
+
+def test_requirements_are_deduplicated_and_checked():
+    assert parse_requirements(" b, a>=1 ,b,") == ("a>=1", "b")
+    assert are_requirements_satisfied(parse_requirements("pytest, pydantic>=2"))
+    assert not are_requirements_satisfied(("pydantic<1",))
+    assert not are_requirements_satisfied(("surely-not-installed-package",))
+
+
+def test_requirements_installer_runs_pip_in_background(tmp_path):
+    calls = []
+
+    class Installer(RequirementsInstaller):
+        def pip(self, *args, index=True):
+            # Nothing to install from the wheel dir until wheels are built
+            calls.append(args[0])
+            return calls != ["install"]
+
+    installer = Installer(str(tmp_path))
+    requirements = ("surely-not-installed-package",)
+    assert not installer.is_ready(requirements)
+
+    entry = installer.submit(requirements, "function:a")
+    assert installer.submit(requirements, "tool:b") is entry
+
+    assert installer.wait(requirements, timeout=10)["status"] == "installed"
+    assert entry["sources"] == ["function:a", "tool:b"]
+    assert calls == ["install", "wheel", "install"]
+    assert installer.is_ready(requirements)
@@ -0,0 +1,96 @@
+from types import SimpleNamespace
+
+from open_webui.retrieval.vector import aliases
+from open_webui.retrieval.vector.aliases import AliasedVectorDBClient
+from open_webui.retrieval.vector.main import GetResult
+from open_webui.utils import reindex
+
+
+class FakeAliases:
+    def __init__(self):
+        self.aliases = {}
+
+    def get_aliases(self):
+        return dict(self.aliases)
+
+    def get_alias(self, name):
+        return self.aliases.get(name)
+
+    def set_alias(self, name, target):
+        previous = self.aliases.get(name)
+        self.aliases[name] = target
+        return previous
+
+
+class FakeClient:
+    """Collections of file ids."""
+
+    def __init__(self, collections):
+        self.collections = collections
+
+    def has_collection(self, collection_name):
+        return collection_name in self.collections
+
+    def delete_collection(self, collection_name):
+        self.collections.pop(collection_name, None)
+
+    def insert(self, collection_name, file_ids):
+        self.collections.setdefault(collection_name, set()).update(file_ids)
+
+    def delete(self, collection_name, filter):
+        self.collections.get(collection_name, set()).discard(filter["file_id"])
+
+    def query(self, collection_name, filter, limit=None):
+        ids = [filter["file_id"]] * (
+            filter["file_id"] in self.collections.get(collection_name, set())
+        )
+        return GetResult(ids=[ids], documents=[ids], metadatas=[[{}] * len(ids)])
+
+
+class FakeKnowledges:
+    def __init__(self, file_ids):
+        self.file_ids = file_ids
+
+    def get_file_ids_by_id(self, knowledge_id):
+        return list(self.file_ids)
+
+    def get_knowledge_by_id(self, id):
+        return SimpleNamespace(id=id)
+
+
+def test_files_added_during_the_swap_window_are_kept(monkeypatch):
+    monkeypatch.setattr(aliases, "CollectionAliases", FakeAliases())
+    client = FakeClient({"kb": {"file-1"}})
+    vector_db = AliasedVectorDBClient(client, ttl=60)
+    knowledges = FakeKnowledges(["file-1"])
+
+    monkeypatch.setattr(reindex, "VECTOR_DB_CLIENT", vector_db)
+    monkeypatch.setattr(reindex, "Knowledges", knowledges)
+    monkeypatch.setattr(reindex.Jobs, "update_job_progress", lambda *args: None)
+    monkeypatch.setattr(
+        reindex,
+        "reindex_file",
+        lambda request, file_id, collection_name, user, resume=False: client.insert(
+            collection_name, [file_id]
+        ),
+    )
+
+    def sleep(delay):
+        # A process still resolving the old alias adds a file meanwhile
+        knowledges.file_ids.append("file-2")
+        client.insert("kb", ["file-2"])
+
+    monkeypatch.setattr(reindex.time, "sleep", sleep)
+
+    job = SimpleNamespace(id="job-id", payload={"knowledge_ids": ["kb"]}, progress={})
+    reindex.reindex_knowledge_bases(None, job, user=None)
+
+    target = reindex.get_shadow_collection_name("kb", job.id)
+    assert vector_db.resolve("kb", cached=False) == target
+    assert client.collections == {target: {"file-1", "file-2"}}
+
+    # Writes after the swap go to the new collection despite cached aliases
+    vector_db._aliases = {}
+    vector_db._loaded_at = float("inf")
+    vector_db.insert("kb", ["file-3"])
+    assert client.collections[target] == {"file-1", "file-2", "file-3"}
@@ -0,0 +1,337 @@
+import json
+import uuid
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from open_webui.models.groups import Groups
+from open_webui.models.users import Users
+from open_webui.routers import scim
+from open_webui.utils.scim import SCIMFilterError, parse_filter
+
+
+def test_parse_filter_precedence_and_grouping():
+    assert parse_filter('userName eq "a@x.com"') == ("eq", "username", "a@x.com")
+
+    # and binds tighter than or
+    assert parse_filter('userName sw "a" or displayName co "b" and active eq true') == (
+        "or",
+        ("sw", "username", "a"),
+        ("and", ("co", "displayname", "b"), ("eq", "active", True)),
+    )
+    assert parse_filter('not (externalId pr) and (id eq "1" or id eq "2")') == (
+        "and",
+        ("not", ("pr", "externalid")),
+        ("or", ("eq", "id", "1"), ("eq", "id", "2")),
+    )
+
+
+def test_parse_filter_paths_and_values():
+    # Schema URNs are dropped, value paths are flattened
+    assert parse_filter(
+        'urn:ietf:params:scim:schemas:core:2.0:User:userName eq "a"'
+    ) == ("eq", "username", "a")
+    assert parse_filter('members[value eq "u1" or value eq "u2"]') == (
+        "or",
+        ("eq", "members.value", "u1"),
+        ("eq", "members.value", "u2"),
+    )
+    assert parse_filter(r'displayName eq "say \"hi\" (x)"') == (
+        "eq",
+        "displayname",
+        'say "hi" (x)',
+    )
+
+
+@pytest.mark.parametrize(
+    "text",
+    ['userName xx "a"', 'userName eq "a" and', "(userName pr", 'userName eq "a" )'],
+)
+def test_parse_filter_rejects_invalid_filters(text):
+    with pytest.raises(SCIMFilterError):
+        parse_filter(text)
+
+
+@pytest.fixture
+def prefix():
+    """Unique prefix of the users and groups of a test, removed afterwards."""
+    prefix = uuid.uuid4().hex[:8]
+    admin = None
+    if Users.get_super_admin_user() is None:
+        # Groups are created on behalf of the first admin
+        admin = Users.insert_new_user(
+            str(uuid.uuid4()), "Admin", f"admin-{prefix}@example.com", role="admin"
+        )
+
+    yield prefix
+
+    for group in Groups.get_scim_groups(parse_filter(f'displayName sw "{prefix}"'))[
+        "groups"
+    ]:
+        Groups.delete_group_by_id(group.id)
+    for user in Users.get_scim_users(parse_filter(f'userName sw "{prefix}"'))["users"]:
+        Users.delete_user_by_id(user.id)
+    if admin:
+        Users.delete_user_by_id(admin.id)
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(scim.router, prefix="/scim/v2")
+    app.state.ENABLE_SCIM = True
+    app.state.SCIM_TOKEN = "token"
+    return TestClient(app, headers={"Authorization": "Bearer token"})
+
+
+def get_user_data(prefix: str, index: int) -> dict:
+    email = f"{prefix}-{index}@example.com"
+    return {"userName": email, "displayName": email, "emails": [{"value": email}]}
+
+
+def create_user(client, prefix: str, index: int, active: bool = True) -> str:
+    response = client.post(
+        "/scim/v2/Users",
+        json={
+            "userName": f"{prefix}-{index}@example.com",
+            "displayName": f"User {index}",
+            "emails": [{"value": f"{prefix}-{index}@example.com"}],
+            "externalId": f"{prefix}-ext-{index}",
+            "active": active,
+        },
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def get_member_ids(client, group_id: str) -> set[str]:
+    response = client.get(f"/scim/v2/Groups/{group_id}")
+    return {member["value"] for member in response.json()["members"]}
+
+
+def test_list_users_filters_and_pages(client, prefix):
+    ids = [create_user(client, prefix, index, active=index != 2) for index in range(3)]
+
+    def list_users(filter: str, **params) -> dict:
+        response = client.get("/scim/v2/Users", params={"filter": filter, **params})
+        assert response.status_code == 200
+        return response.json()
+
+    # Pages are slices of one stable order
+    ordered = [
+        user["id"] for user in list_users(f'userName sw "{prefix}"')["Resources"]
+    ]
+    assert sorted(ordered) == sorted(ids)
+
+    page = list_users(f'userName sw "{prefix}"', count=2)
+    assert page["totalResults"] == 3
+    assert [user["id"] for user in page["Resources"]] == ordered[:2]
+
+    page = list_users(f'userName sw "{prefix}"', startIndex=3, count=2)
+    assert (page["totalResults"], page["startIndex"]) == (3, 3)
+    assert [user["id"] for user in page["Resources"]] == ordered[2:]
+
+    page = list_users(
+        f'userName sw "{prefix}" and (externalId eq "{prefix}-ext-0" or active eq false)'
+    )
+    assert sorted(user["id"] for user in page["Resources"]) == sorted([ids[0], ids[2]])
+    assert (
+        list_users(f'userName sw "{prefix}" and not (displayName co "1")')[
+            "totalResults"
+        ]
+        == 2
+    )
+
+    response = client.get("/scim/v2/Users", params={"filter": 'nickName eq "a"'})
+    assert response.status_code == 400
+    assert response.json()["scimType"] == "invalidFilter"
+
+
+def test_list_groups_filters_by_member(client, prefix):
+    user_ids = [create_user(client, prefix, index) for index in range(2)]
+    group_ids = [
+        client.post(
+            "/scim/v2/Groups",
+            json={
+                "displayName": f"{prefix} group {index}",
+                "members": [{"value": user_ids[index]}],
+            },
+        ).json()["id"]
+        for index in range(2)
+    ]
+
+    response = client.get(
+        "/scim/v2/Groups",
+        params={"filter": f'displayName sw "{prefix}" and members eq "{user_ids[1]}"'},
+    )
+    page = response.json()
+    assert page["totalResults"] == 1
+    assert page["Resources"][0]["id"] == group_ids[1]
+    assert [member["value"] for member in page["Resources"][0]["members"]] == [
+        user_ids[1]
+    ]
+
+    response = client.get(
+        "/scim/v2/Groups", params={"filter": f'displayName sw "{prefix}"'}
+    )
+    ordered = [group["id"] for group in response.json()["Resources"]]
+    assert sorted(ordered) == sorted(group_ids)
+
+    response = client.get(
+        "/scim/v2/Groups",
+        params={
+            "filter": f'displayName sw "{prefix}"',
+            "count": 1,
+            "startIndex": 2,
+            "excludedAttributes": "members",
+        },
+    )
+    page = response.json()
+    assert page["totalResults"] == 2
+    assert [group["id"] for group in page["Resources"]] == ordered[1:]
+    assert page["Resources"][0].get("members") is None
+
+
+def test_patch_group_members(client, prefix):
+    user_ids = [create_user(client, prefix, index) for index in range(3)]
+    group_id = client.post(
+        "/scim/v2/Groups", json={"displayName": f"{prefix} group"}
+    ).json()["id"]
+
+    def patch(*operations):
+        response = client.patch(
+            f"/scim/v2/Groups/{group_id}",
+            json={
+                "schemas": ["urn:ietf:params:scim:api:messages:2.0:PatchOp"],
+                "Operations": list(operations),
+            },
+        )
+        assert response.status_code == 200
+        return response
+
+    patch(
+        {
+            "op": "add",
+            "path": "members",
+            "value": [{"value": user_id} for user_id in user_ids],
+        }
+    )
+    assert get_member_ids(client, group_id) == set(user_ids)
+
+    patch({"op": "remove", "path": f'members[value eq "{user_ids[0]}"]'})
+    assert get_member_ids(client, group_id) == set(user_ids[1:])
+
+    patch({"op": "remove", "path": "members", "value": [{"value": user_ids[1]}]})
+    assert get_member_ids(client, group_id) == {user_ids[2]}
+
+    patch({"op": "remove", "path": "members"})
+    assert get_member_ids(client, group_id) == set()
+
+
+def test_bulk_resolves_bulk_ids(client, prefix):
+    response = client.post(
+        "/scim/v2/Bulk",
+        json={
+            "schemas": [scim.SCIM_BULK_REQUEST_SCHEMA],
+            "Operations": [
+                {
+                    "method": "POST",
+                    "path": "/Users",
+                    "bulkId": "user",
+                    "data": get_user_data(prefix, 0),
+                },
+                {
+                    "method": "POST",
+                    "path": "/Groups",
+                    "bulkId": "group",
+                    "data": {
+                        "displayName": f"{prefix} group",
+                        "members": [{"value": "bulkId:user"}],
+                    },
+                },
+                {
+                    "method": "PATCH",
+                    "path": "/Groups/bulkId:group",
+                    "data": {
+                        "Operations": [
+                            {"op": "replace", "path": "displayName", "value": "x"}
+                        ]
+                    },
+                },
+                {"method": "DELETE", "path": "/Users/bulkId:missing"},
+            ],
+        },
+    )
+    assert response.status_code == 200
+    results = response.json()["Operations"]
+    assert [result["status"] for result in results] == ["201", "201", "200", "409"]
+
+    user_id = results[0]["location"].rsplit("/", 1)[1]
+    group_id = results[1]["location"].rsplit("/", 1)[1]
+    assert get_member_ids(client, group_id) == {user_id}
+
+    # Renamed out of the prefix, so removed here
+    Groups.delete_group_by_id(group_id)
+
+
+def test_bulk_stops_after_fail_on_errors(client, prefix):
+    create_user(client, prefix, 0)
+    operations = [
+        {
+            "method": "POST",
+            "path": "/Users",
+            "data": get_user_data(prefix, index),
+        }
+        for index in (0, 0, 1)
+    ]
+
+    response = client.post(
+        "/scim/v2/Bulk", json={"failOnErrors": 2, "Operations": operations}
+    )
+    assert [result["status"] for result in response.json()["Operations"]] == [
+        "409",
+        "409",
+    ]
+    assert Users.get_user_by_email(f"{prefix}-1@example.com") is None
+
+
+def make_request(body: bytes, content_length=None) -> Request:
+    headers = []
+    if content_length is not None:
+        headers.append((b"content-length", str(content_length).encode()))
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return Request({"type": "http", "method": "POST", "headers": headers}, receive)
+
+
+@pytest.mark.asyncio
+async def test_bulk_payload_size_is_checked_before_parsing(monkeypatch):
+    monkeypatch.setattr(scim, "SCIM_BULK_MAX_PAYLOAD_SIZE", 64)
+    body = json.dumps({"Operations": []}).encode()
+
+    bulk_request = await scim.get_bulk_request(make_request(body, len(body)))
+    assert bulk_request.Operations == []
+
+    large = json.dumps({"Operations": [], "padding": "x" * 64}).encode()
+    for request, status_code in (
+        (make_request(body), 411),
+        (make_request(large, len(large)), 413),
+        # Lying about the size doesn't get more bytes through
+        (make_request(large, len(body)), 413),
+        (make_request(body, len(body) + 1), 400),
+    ):
+        with pytest.raises(HTTPException) as e:
+            await scim.get_bulk_request(request)
+        assert e.value.status_code == status_code
+
+
+def test_bulk_rejects_oversized_payload(client, monkeypatch):
+    monkeypatch.setattr(scim, "SCIM_BULK_MAX_PAYLOAD_SIZE", 64)
+    response = client.post(
+        "/scim/v2/Bulk", json={"Operations": [], "padding": "x" * 64}
+    )
+    assert response.status_code == 413
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from open_webui.utils.stages import Stage, run_stages
+
+
+def make_stage_func(name, events, delay=0.0):
+    async def func():
+        events.append(("start", name))
+        await asyncio.sleep(delay)
+        events.append(("end", name))
+
+    return func
+
+
+class TestRunStages:
+    def test_independent_stages_run_concurrently(self):
+        events = []
+        stages = [
+            Stage("a", make_stage_func("a", events, 0.05)),
+            Stage("b", make_stage_func("b", events, 0.05)),
+        ]
+
+        timings = asyncio.run(run_stages(stages))
+
+        assert events[:2] == [("start", "a"), ("start", "b")]
+        assert set(timings.keys()) == {"a", "b"}
+
+    def test_dependent_stage_waits_for_dependencies(self):
+        events = []
+        stages = [
+            Stage("a", make_stage_func("a", events, 0.05)),
+            Stage("b", make_stage_func("b", events, 0.01)),
+            Stage("c", make_stage_func("c", events), depends_on=["a", "b"]),
+        ]
+
+        asyncio.run(run_stages(stages))
+
+        assert events.index(("start", "c")) > events.index(("end", "a"))
+        assert events.index(("start", "c")) > events.index(("end", "b"))
+
+    def test_unknown_dependency_raises(self):
+        stages = [Stage("a", make_stage_func("a", []), depends_on=["missing"])]
+
+        with pytest.raises(ValueError, match="unknown or later stage"):
+            asyncio.run(run_stages(stages))
+
+    def test_failure_cancels_pending_stages(self):
+        events = []
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        stages = [
+            Stage("slow", make_stage_func("slow", events, 1)),
+            Stage("fail", fail),
+        ]
+
+        with pytest.raises(RuntimeError, match="boom"):
+            asyncio.run(run_stages(stages))
+
+        assert ("end", "slow") not in events
+
+    def test_timings_are_emitted(self):
+        emitted = []
+
+        async def event_emitter(event):
+            emitted.append(event)
+
+        asyncio.run(
+            run_stages(
+                [Stage("a", make_stage_func("a", []))], event_emitter=event_emitter
+            )
+        )
+
+        assert emitted[0]["data"]["action"] == "pipeline_timings"
+        assert "a" in emitted[0]["data"]["timings"]
+        assert emitted[0]["data"]["hidden"] is True
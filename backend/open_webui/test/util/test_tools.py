@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+import pytest
+
+from open_webui.utils import tools
+from open_webui.utils.tools import ToolServerCache, ToolServerSessions
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.gets = []
+
+    async def get(self, key):
+        self.gets.append(key)
+        return self.data.get(key)
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+
+def get_app(redis=None):
+    return SimpleNamespace(
+        state=SimpleNamespace(
+            redis=redis,
+            config=SimpleNamespace(TOOL_SERVER_CONNECTIONS=[]),
+            TOOL_SERVERS=[],
+        )
+    )
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    fetches = []
+
+    async def get_tool_servers_data(servers):
+        fetches.append(servers)
+        return [{"id": str(len(fetches)), "url": "http://tools", "specs": []}]
+
+    monkeypatch.setattr(tools, "get_tool_servers_data", get_tool_servers_data)
+    return fetches
+
+
+@pytest.mark.asyncio
+async def test_tool_servers_are_fetched_once_without_redis(fetches):
+    app, cache = get_app(), ToolServerCache()
+
+    assert (await cache.get(app))[0]["id"] == "1"
+    assert (await cache.get(app))[0]["id"] == "1"
+    assert len(fetches) == 1
+
+    await cache.refresh(app)
+    assert (await cache.get(app))[0]["id"] == "2"
+    assert app.state.TOOL_SERVERS[0]["id"] == "2"
+
+
+@pytest.mark.asyncio
+async def test_tool_servers_are_reloaded_when_the_version_moves(fetches):
+    redis = FakeRedis()
+    app, other_app = get_app(redis), get_app(redis)
+    cache, other_cache = ToolServerCache(), ToolServerCache()
+
+    await cache.refresh(app)
+    assert (await other_cache.get(other_app))[0]["id"] == "1"
+
+    # Unchanged version: only the counter is read
+    redis.gets.clear()
+    await other_cache.get(other_app)
+    assert redis.gets == [tools.TOOL_SERVERS_VERSION_KEY]
+
+    # Refreshed by another instance
+    await cache.refresh(app)
+    assert (await other_cache.get(other_app))[0]["id"] == "2"
+    assert len(fetches) == 2
+
+
+@pytest.mark.asyncio
+async def test_tool_server_sessions_are_reused_per_server():
+    sessions = ToolServerSessions()
+
+    session = sessions.get("http://a")
+    assert sessions.get("http://a") is session
+    assert sessions.get("http://b") is not session
+
+    await sessions.close(keep={"http://b"})
+    assert session.closed
+    assert list(sessions.sessions) == ["http://b"]
+
+    await sessions.close()
+    assert not sessions.sessions
@@ -0,0 +1,88 @@
+import pytest
+
+from open_webui.retrieval import utils
+from open_webui.retrieval.vector.main import SearchResult, VectorDBBase
+
+
+class SingleVectorClient(VectorDBBase):
+    """Backend searching one vector per call, like most of them used to."""
+
+    def __init__(self, collections: dict[str, list[tuple[str, float]]]):
+        self.collections = collections
+        self.calls = []
+
+    def search(self, collection_name, vectors, limit):
+        self.calls.append((collection_name, len(vectors)))
+        if collection_name not in self.collections:
+            return None
+        scored = sorted(
+            self.collections[collection_name],
+            key=lambda item: abs(item[1] - vectors[0][0]),
+        )[:limit]
+        return SearchResult(
+            ids=[[text for text, _ in scored]],
+            documents=[[text for text, _ in scored]],
+            metadatas=[[{"collection": collection_name} for _ in scored]],
+            distances=[[1 - abs(value - vectors[0][0]) for _, value in scored]],
+        )
+
+    def has_collection(self, collection_name):
+        return collection_name in self.collections
+
+    def delete_collection(self, collection_name):
+        pass
+
+    def insert(self, collection_name, items):
+        pass
+
+    def upsert(self, collection_name, items):
+        pass
+
+    def query(self, collection_name, filter, limit=None):
+        pass
+
+    def get(self, collection_name):
+        pass
+
+    def delete(self, collection_name, ids=None, filter=None):
+        pass
+
+    def reset(self):
+        pass
+
+
+def test_search_batch_falls_back_to_one_search_per_vector():
+    client = SingleVectorClient({"a": [("a1", 0.1), ("a2", 0.9)]})
+
+    results = client.search_batch(["a", "missing", "a"], [[0.1], [0.9]], limit=1)
+
+    assert results["a"].documents == [["a1"], ["a2"]]
+    assert results["missing"] is None
+    assert client.calls == [("a", 1), ("a", 1), ("missing", 1)]
+
+
+@pytest.mark.asyncio
+async def test_query_collection_embeds_and_searches_in_one_call(monkeypatch):
+    client = SingleVectorClient({"a": [("a1", 0.1), ("a2", 0.9)], "b": [("b1", 0.5)]})
+    searches = []
+
+    def search_batch(collection_names, vectors, limit):
+        searches.append((collection_names, vectors))
+        return client.search_batch(collection_names, vectors, limit)
+
+    monkeypatch.setattr(utils.VECTOR_DB_CLIENT, "search_batch", search_batch)
+
+    embeddings = []
+
+    async def embedding_function(queries, prefix=None, user=None):
+        embeddings.append(queries)
+        return [[0.1], [0.5]]
+
+    result = await utils.query_collection(
+        ["a", "b", ""], ["first", "second"], embedding_function, k=2
+    )
+
+    assert embeddings == [["first", "second"]]
+    assert searches == [(["a", "b"], [[0.1], [0.5]])]
+    assert result["documents"] == [["a1", "b1"]]
+    assert result["distances"][0] == pytest.approx([1.0, 1.0])
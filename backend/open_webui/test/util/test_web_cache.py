@@ -0,0 +1,112 @@
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from open_webui.retrieval.web import brave
+from open_webui.routers import retrieval
+from open_webui.retrieval.web.cache import WebSearchCache, get_page_expiry
+
+TESTDATA = Path(brave.__file__).parent / "testdata"
+
+
+class FakeResponse:
+    def __init__(self, data: dict):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+@pytest.mark.asyncio
+async def test_search_results_are_cached_by_normalized_query(monkeypatch):
+    data = json.loads((TESTDATA / "brave.json").read_text())
+    monkeypatch.setattr(
+        brave.requests, "get", lambda *args, **kwargs: FakeResponse(data)
+    )
+    cache = WebSearchCache(max_size=1024 * 1024, results_ttl=60)
+
+    assert await cache.get_results(None, "brave", "python", [3]) is None
+    results = [dict(result) for result in brave.search_brave("key", "python", 3)]
+    await cache.set_results(None, "brave", "python", results, [3])
+
+    assert await cache.get_results(None, "brave", "  Python ", [3]) == results
+    assert await cache.get_results(None, "brave", "python", [5]) is None
+    assert await cache.get_results(None, "bing", "python", [3]) is None
+
+    counts = cache.get_stats()["counts"]
+    assert counts["brave"] == {"hits": 1, "misses": 2, "hit_rate": 1 / 3}
+    assert counts["bing"]["hit_rate"] == 0.0
+
+
+def test_page_expiry_follows_caching_headers():
+    now = time.time()
+
+    assert get_page_expiry({"Cache-Control": "no-store"}) is None
+    assert get_page_expiry({"Cache-Control": "private, max-age=60"}) is None
+    assert get_page_expiry({"Cache-Control": "no-cache"}) == pytest.approx(now, abs=5)
+    assert get_page_expiry(
+        {"Cache-Control": "public, max-age=600", "Age": "100"}
+    ) == pytest.approx(now + 500, abs=5)
+    assert get_page_expiry(
+        {"Expires": "Thu, 01 Dec 1994 16:00:00 GMT"}
+    ) == pytest.approx(786297600)
+    assert get_page_expiry({}, default_ttl=30) == pytest.approx(now + 30, abs=5)
+
+
+@pytest.mark.asyncio
+async def test_pages_are_kept_for_revalidation_within_the_size_bound():
+    cache = WebSearchCache(max_size=1000, page_ttl=60)
+
+    # Stale at once, kept since it can be revalidated with its ETag
+    await cache.set_page(
+        None, "https://a", "a" * 300, {}, {"Cache-Control": "no-cache", "ETag": "1"}
+    )
+    page = await cache.get_page(None, "https://a")
+    assert page["etag"] == "1" and not cache.is_fresh(page)
+
+    # Stale without validators: useless, not stored
+    await cache.set_page(None, "https://b", "b", {}, {"Cache-Control": "max-age=0"})
+    assert await cache.get_page(None, "https://b") is None
+
+    await cache.set_page(None, "https://c", "c" * 600, {})
+    assert cache.is_fresh(await cache.get_page(None, "https://c"))
+
+    # Over 1000 bytes: the least recently used page is evicted
+    await cache.set_page(None, "https://d", "d" * 300, {})
+    assert await cache.get_page(None, "https://a") is None
+    assert cache.entries.size <= 1000
+
+
+@pytest.mark.asyncio
+async def test_per_user_engines_are_not_cached(monkeypatch):
+    cache = WebSearchCache(max_size=1024 * 1024, results_ttl=60)
+    monkeypatch.setattr(retrieval, "WEB_SEARCH_CACHE", cache)
+    searches = []
+
+    def search_web(request, engine, query, user=None):
+        searches.append((engine, user))
+        return [
+            retrieval.SearchResult(link=f"https://{user}", title=None, snippet=None)
+        ]
+
+    monkeypatch.setattr(retrieval, "search_web", search_web)
+    config = SimpleNamespace(
+        WEB_SEARCH_RESULT_COUNT=3, WEB_SEARCH_DOMAIN_FILTER_LIST=[]
+    )
+    request = SimpleNamespace(
+        app=SimpleNamespace(state=SimpleNamespace(config=config, redis=None))
+    )
+
+    for user in ("a", "b"):
+        results = await retrieval.search_web_with_cache(request, "external", "q", user)
+        assert results[0].link == f"https://{user}"
+        await retrieval.search_web_with_cache(request, "brave", "q", user)
+
+    assert searches == [("external", "a"), ("brave", "a"), ("external", "b")]
+    assert "external" not in cache.get_stats()["counts"]
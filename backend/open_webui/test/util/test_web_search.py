@@ -0,0 +1,43 @@
+import time
+
+import pytest
+
+from open_webui.retrieval.utils import query_docs_in_memory
+from open_webui.retrieval.web import collections
+from open_webui.retrieval.web.collections import WebSearchCollections
+
+
+def test_query_docs_in_memory_ranks_by_best_query():
+    result = query_docs_in_memory(
+        ["a", "b", "c"],
+        [{"i": 0}, {"i": 1}, {"i": 2}],
+        [[1, 0, 0], [0, 2, 0], [0, 1, 1]],
+        [[0, 1, 0], [0.9, 0, 0.1]],
+        k=2,
+    )
+
+    assert result["documents"] == [["b", "a"]]
+    assert result["metadatas"] == [[{"i": 1}, {"i": 0}]]
+    assert result["distances"][0][0] == pytest.approx(1.0)
+
+    empty = query_docs_in_memory([], [], [], [[1, 0]], k=3)
+    assert empty["documents"] == [[]]
+
+
+@pytest.mark.asyncio
+async def test_expired_web_search_collections_are_deleted(monkeypatch):
+    deleted = []
+    monkeypatch.setattr(
+        collections.VECTOR_DB_CLIENT,
+        "delete_collection",
+        lambda collection_name: deleted.append(collection_name),
+    )
+
+    registry = WebSearchCollections()
+    await registry.add(None, "web-search-old")
+    await registry.add(None, "web-search-new")
+    registry.updated_at["web-search-old"] = time.time() - 120
+
+    assert await registry.cleanup(None, ttl=60) == 1
+    assert deleted == ["web-search-old"]
+    assert list(registry.updated_at) == ["web-search-new"]
@@ -0,0 +1,103 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache bounded by the total size of its values.
+
+    `sizeof` returns the cost of a value (bytes by default); once the total
+    exceeds `max_size` the least recently used entries are evicted and passed
+    to `on_evict`, if given. A `max_size` of 0 disables the cache.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        sizeof: Callable[[Any], int] = len,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None,
+    ):
+        self.max_size = max_size
+        self.sizeof = sizeof
+        self.on_evict = on_evict
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._data: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def set(self, key: Hashable, value: Any) -> bool:
+        """
+        Store `value` under `key`. Values larger than the whole cache are not
+        stored; returns whether the value was cached.
+        """
+        size = self.sizeof(value)
+        if self.max_size <= 0 or size > self.max_size:
+            return False
+
+        evicted = []
+        with self._lock:
+            if key in self._data:
+                self.size -= self._data.pop(key)[1]
+
+            self._data[key] = (value, size)
+            self.size += size
+
+            while self.size > self.max_size:
+                evicted_key, (evicted_value, evicted_size) = self._data.popitem(
+                    last=False
+                )
+                self.size -= evicted_size
+                evicted.append((evicted_key, evicted_value))
+
+        # Outside the lock, callbacks may be slow (e.g. deleting files)
+        if self.on_evict:
+            for evicted_key, evicted_value in evicted:
+                self.on_evict(evicted_key, evicted_value)
+
+        return True
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.pop(key, None)
+            if item is None:
+                return default
+
+            self.size -= item[1]
+            return item[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "size": self.size,
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,156 @@
+import json
+import zlib
+from typing import AsyncIterator, Iterable, Iterator, Optional
+
+from fastapi import HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+NDJSON = "ndjson"
+JSON_GZIP = "json.gz"
+
+EXPORT_FORMATS = (NDJSON, JSON_GZIP)
+
+# Bytes of output collected before they are sent
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+def iter_ndjson(items: Iterable[BaseModel]) -> Iterator[bytes]:
+    buffer = bytearray()
+    for item in items:
+        buffer += item.model_dump_json().encode()
+        buffer += b"\n"
+        if len(buffer) >= EXPORT_CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+
+    if buffer:
+        yield bytes(buffer)
+
+
+def iter_json_gzip(items: Iterable[BaseModel]) -> Iterator[bytes]:
+    """A gzip compressed JSON array of `items`, compressed as it is written."""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+
+    output = bytearray(compressor.compress(b"["))
+    for idx, item in enumerate(items):
+        data = (b"," if idx else b"") + item.model_dump_json().encode()
+        output += compressor.compress(data)
+        if len(output) >= EXPORT_CHUNK_SIZE:
+            yield bytes(output)
+            output.clear()
+
+    output += compressor.compress(b"]")
+    output += compressor.flush()
+    yield bytes(output)
+
+
+def get_export_response(
+    items: Iterable[BaseModel], format: str, filename: str
+) -> StreamingResponse:
+    """
+    Stream `items` as NDJSON or as a gzip compressed JSON array. Rows are
+    serialized as they are read, so the export never sits in memory.
+    """
+    if format == NDJSON:
+        return StreamingResponse(
+            iter_ndjson(items),
+            media_type="application/x-ndjson",
+            headers={
+                "Content-Disposition": f'attachment; filename="{filename}.ndjson"'
+            },
+        )
+    elif format == JSON_GZIP:
+        return StreamingResponse(
+            iter_json_gzip(items),
+            media_type="application/gzip",
+            headers={
+                "Content-Disposition": f'attachment; filename="{filename}.json.gz"'
+            },
+        )
+
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Unsupported export format, use one of: {', '.join(EXPORT_FORMATS)}",
+    )
+
+
+async def read_ndjson(
+    request: Request, max_size: int, max_line_size: int
+) -> AsyncIterator[tuple[int, Optional[dict]]]:
+    """
+    Parse an NDJSON request body, optionally gzip compressed, line by line as
+    it arrives. Yields (line number, item), with None for invalid lines.
+
+    Raises 413 once the decompressed body exceeds `max_size` bytes or a line
+    exceeds `max_line_size` bytes; lines read before are already yielded.
+    """
+    decompressor = None
+    buffer = bytearray()
+    size = 0
+    line_number = 0
+
+    def too_large(detail: str) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail
+        )
+
+    def decompress(chunk: bytes) -> Iterator[bytes]:
+        # Bounded output per call, so a small bomb can't inflate in one go
+        while chunk:
+            try:
+                data = decompressor.decompress(chunk, max_size - size + 1)
+            except zlib.error:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid gzip data",
+                )
+            chunk = decompressor.unconsumed_tail
+            yield data
+
+    async for chunk in request.stream():
+        if decompressor is None:
+            gzipped = request.headers.get(
+                "content-encoding"
+            ) == "gzip" or chunk.startswith(b"\x1f\x8b")
+            decompressor = (
+                zlib.decompressobj(wbits=16 + zlib.MAX_WBITS) if gzipped else False
+            )
+
+        for data in decompress(chunk) if decompressor else (chunk,):
+            size += len(data)
+            if size > max_size:
+                raise too_large(f"Import is larger than {max_size} bytes")
+
+            # Only the new data is searched for line breaks
+            start = len(buffer)
+            buffer += data
+            line_start = 0
+            while (end := buffer.find(b"\n", start)) != -1:
+                line_number += 1
+                if end - line_start > max_line_size:
+                    raise too_large(
+                        f"Line {line_number} is larger than {max_line_size} bytes"
+                    )
+
+                line = buffer[line_start:end]
+                if line.strip():
+                    yield line_number, parse_ndjson_line(line)
+                line_start = start = end + 1
+            del buffer[:line_start]
+
+            if len(buffer) > max_line_size:
+                raise too_large(
+                    f"Line {line_number + 1} is larger than {max_line_size} bytes"
+                )
+
+    if buffer.strip():
+        yield line_number + 1, parse_ndjson_line(buffer)
+
+
+def parse_ndjson_line(line: bytes) -> Optional[dict]:
+    try:
+        item = json.loads(line)
+        return item if isinstance(item, dict) else None
+    except ValueError:
+        return None
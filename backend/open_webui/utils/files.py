@@ -19,6 +19,7 @@ from open_webui.models.chats import Chats
 from open_webui.models.files import Files
 from open_webui.routers.files import upload_file_handler
 
+import logging
 import mimetypes
 import base64
 import io
@@ -26,37 +27,107 @@ import re
 
 import requests
 
+from open_webui.env import (
+    CHAT_IMAGE_CACHE_MAX_SIZE,
+    CHAT_IMAGE_MAX_DIMENSION,
+    CHAT_IMAGE_REENCODE_QUALITY,
+)
+from open_webui.utils.cache import LRUCache
+
+log = logging.getLogger(__name__)
+
 BASE64_IMAGE_URL_PREFIX = re.compile(r"data:image/\w+;base64,", re.IGNORECASE)
 MARKDOWN_IMAGE_URL_PATTERN = re.compile(r"!\[(.*?)\]\((.+?)\)", re.IGNORECASE)
 
+# Inlined (base64 data URL) images keyed by URL or file id
+IMAGE_CACHE = LRUCache(CHAT_IMAGE_CACHE_MAX_SIZE)
+
+
+def downscale_image_data(image_data: bytes, content_type: str) -> tuple[bytes, str]:
+    """
+    Downscale images whose longest side exceeds CHAT_IMAGE_MAX_DIMENSION and
+    re-encode them. The original data is returned if resizing is disabled,
+    fails, or would not make the payload smaller.
+    """
+    if not CHAT_IMAGE_MAX_DIMENSION:
+        return image_data, content_type
 
-def get_image_base64_from_url(url: str) -> Optional[str]:
     try:
-        if url.startswith("http"):
-            # Download the image from the URL
-            response = requests.get(url)
-            response.raise_for_status()
-            image_data = response.content
-            encoded_string = base64.b64encode(image_data).decode("utf-8")
-            content_type = response.headers.get("Content-Type", "image/png")
-            return f"data:{content_type};base64,{encoded_string}"
-        else:
-            file = Files.get_file_by_id(url)
+        from PIL import Image
 
-            if not file:
-                return None
+        with Image.open(io.BytesIO(image_data)) as image:
+            if max(image.size) <= CHAT_IMAGE_MAX_DIMENSION or getattr(
+                image, "is_animated", False
+            ):
+                return image_data, content_type
 
-            file_path = Storage.get_file(file.path)
-            file_path = Path(file_path)
+            image.thumbnail((CHAT_IMAGE_MAX_DIMENSION, CHAT_IMAGE_MAX_DIMENSION))
 
-            if file_path.is_file():
-                with open(file_path, "rb") as image_file:
-                    encoded_string = base64.b64encode(image_file.read()).decode("utf-8")
-                    content_type, _ = mimetypes.guess_type(file_path.name)
-                    return f"data:{content_type};base64,{encoded_string}"
+            buffer = io.BytesIO()
+            if image.mode in ("RGBA", "LA", "P"):
+                image.save(buffer, format="PNG", optimize=True)
+                resized_content_type = "image/png"
             else:
-                return None
+                image.convert("RGB").save(
+                    buffer, format="JPEG", quality=CHAT_IMAGE_REENCODE_QUALITY
+                )
+                resized_content_type = "image/jpeg"
+
+        resized_data = buffer.getvalue()
+        if len(resized_data) < len(image_data):
+            return resized_data, resized_content_type
+    except Exception as e:
+        log.debug(f"Error downscaling image: {e}")
+
+    return image_data, content_type
+
+
+def get_image_data_from_url(url: str) -> tuple[Optional[bytes], Optional[str]]:
+    if url.startswith("http"):
+        # Download the image from the URL
+        response = requests.get(url)
+        response.raise_for_status()
+        return response.content, response.headers.get("Content-Type", "image/png")
+    else:
+        file = Files.get_file_by_id(url)
+
+        if not file:
+            return None, None
+
+        file_path = Storage.get_file(file.path)
+        file_path = Path(file_path)
+
+        if file_path.is_file():
+            with open(file_path, "rb") as image_file:
+                content_type, _ = mimetypes.guess_type(file_path.name)
+                return image_file.read(), content_type
+        else:
+            return None, None
+
+
+def get_image_base64_from_url(url: str) -> Optional[str]:
+    """
+    Return `url` (an http(s) URL or a file id) as a base64 data URL.
+
+    Results are kept in IMAGE_CACHE so images already sent earlier in a
+    conversation are not downloaded and re-encoded on every turn; images are
+    downscaled once, when they are first cached.
+    """
+    cached = IMAGE_CACHE.get(url)
+    if cached is not None:
+        return cached
+
+    try:
+        image_data, content_type = get_image_data_from_url(url)
+        if image_data is None:
+            return None
+
+        image_data, content_type = downscale_image_data(image_data, content_type)
+        encoded_string = base64.b64encode(image_data).decode("utf-8")
+        base64_data = f"data:{content_type};base64,{encoded_string}"
 
+        IMAGE_CACHE.set(url, base64_data)
+        return base64_data
     except Exception as e:
         return None
 
@@ -1,14 +1,30 @@
 import inspect
 import logging
+import threading
+import time
+from typing import Any, Optional
 
 from open_webui.utils.plugin import (
+    RequirementsNotReadyError,
     load_function_module_by_id,
     get_function_module_from_cache,
 )
-from open_webui.models.functions import Functions
+from open_webui.models.functions import (
+    Functions,
+    FunctionModel,
+    FunctionWithValvesModel,
+)
 
 log = logging.getLogger(__name__)
 
+FILTER_TYPES = ("inlet", "outlet", "stream")
+
+# Compiled chains kept, one per model and set of enabled toggle filters
+FILTER_CHAIN_CACHE_SIZE = 256
+
+# User valves kept per chain, one per user and filter
+USER_VALVES_CACHE_SIZE = 1024
+
 
 def get_function_module(request, function_id, load_from_db=True):
     """
@@ -20,115 +36,255 @@ def get_function_module(request, function_id, load_from_db=True):
     return function_module
 
 
-def get_sorted_filter_ids(request, model: dict, enabled_filter_ids: list = None):
-    def get_priority(function_id):
-        function = Functions.get_function_by_id(function_id)
-        if function is not None:
-            valves = Functions.get_function_valves_by_id(function_id)
-            return valves.get("priority", 0) if valves else 0
-        return 0
-
-    filter_ids = [function.id for function in Functions.get_global_filter_functions()]
-    if "info" in model and "meta" in model["info"]:
-        filter_ids.extend(model["info"]["meta"].get("filterIds", []))
-        filter_ids = list(set(filter_ids))
-    active_filter_ids = [
-        function.id
-        for function in Functions.get_functions_by_type("filter", active_only=True)
-    ]
+class FilterHandler:
+    """A filter hook with the parameters it takes, inspected once."""
 
-    def get_active_status(filter_id):
-        function_module = get_function_module(request, filter_id)
+    def __init__(self, handler):
+        self.handler = handler
+        self.parameters = tuple(inspect.signature(handler).parameters)
+        self.is_coroutine = inspect.iscoroutinefunction(handler)
+        self.takes_user = "__user__" in self.parameters
 
-        if getattr(function_module, "toggle", None):
-            return filter_id in (enabled_filter_ids or [])
 
-        return True
+class CompiledFilter:
+    """A filter function with its valves applied and its hooks inspected."""
 
-    active_filter_ids = [
-        filter_id for filter_id in active_filter_ids if get_active_status(filter_id)
-    ]
+    def __init__(self, id: str, module, valves: Optional[dict] = None):
+        self.id = id
+        self.module = module
+        self.priority = (valves or {}).get("priority", 0)
+        self.toggle = bool(getattr(module, "toggle", None))
+        self.file_handler = getattr(module, "file_handler", None)
 
-    filter_ids = [fid for fid in filter_ids if fid in active_filter_ids]
-    filter_ids.sort(key=get_priority)
+        self.valves = None
+        if hasattr(module, "valves") and hasattr(module, "Valves"):
+            self.valves = module.Valves(**(valves or {}))
+            module.valves = self.valves
 
-    return filter_ids
+        self.user_valves_class = getattr(module, "UserValves", None)
+        self.handlers = {
+            filter_type: FilterHandler(getattr(module, filter_type))
+            for filter_type in FILTER_TYPES
+            if getattr(module, filter_type, None)
+        }
 
 
-async def process_filter_functions(
-    request, filter_functions, filter_type, form_data, extra_params
-):
-    skip_files = None
+class FilterChain:
+    """
+    The filters applied to a chat, sorted by priority, compiled once so that
+    running a hook, e.g. on every streamed chunk, only calls the handlers.
+    """
 
-    for function in filter_functions:
-        filter = function
-        filter_id = function.id
-        if not filter:
-            continue
+    def __init__(self, filters: list[CompiledFilter], stamp: Any = None):
+        self.filters = filters
+        self.stamp = stamp
 
-        function_module = get_function_module(
-            request, filter_id, load_from_db=(filter_type != "stream")
-        )
-        # Prepare handler function
-        handler = getattr(function_module, filter_type, None)
-        if not handler:
-            continue
+        self.user_valves: dict[tuple[str, str], tuple[dict, Any]] = {}
 
-        # Check if the function has a file_handler variable
-        if filter_type == "inlet" and hasattr(function_module, "file_handler"):
-            skip_files = function_module.file_handler
+    @property
+    def ids(self) -> list[str]:
+        return [filter.id for filter in self.filters]
 
-        # Apply valves to the function
-        if hasattr(function_module, "valves") and hasattr(function_module, "Valves"):
-            valves = Functions.get_function_valves_by_id(filter_id)
-            function_module.valves = function_module.Valves(
-                **(valves if valves else {})
+    def get_user_valves(self, filter: CompiledFilter, user: dict):
+        if "settings" in user:
+            valves = (
+                ((user["settings"] or {}).get("functions") or {}).get("valves") or {}
+            ).get(filter.id) or {}
+        else:
+            valves = (
+                Functions.get_user_valves_by_id_and_user_id(filter.id, user["id"]) or {}
             )
 
-        try:
-            # Prepare parameters
-            sig = inspect.signature(handler)
-
-            params = {"body": form_data}
-            if filter_type == "stream":
-                params = {"event": form_data}
-
-            params = params | {
-                k: v
-                for k, v in {
-                    **extra_params,
-                    "__id__": filter_id,
-                }.items()
-                if k in sig.parameters
-            }
-
-            # Handle user parameters
-            if "__user__" in sig.parameters:
-                if hasattr(function_module, "UserValves"):
+        key = (user.get("id"), filter.id)
+        cached = self.user_valves.get(key)
+        if cached is not None and cached[0] == valves:
+            return cached[1]
+
+        if len(self.user_valves) >= USER_VALVES_CACHE_SIZE:
+            self.user_valves.clear()
+
+        user_valves = filter.user_valves_class(**valves)
+        self.user_valves[key] = (valves, user_valves)
+        return user_valves
+
+    async def run(self, filter_type: str, form_data, extra_params: dict):
+        skip_files = None
+
+        for filter in self.filters:
+            handler = filter.handlers.get(filter_type)
+            if handler is None:
+                continue
+
+            # Check if the function has a file_handler variable
+            if filter_type == "inlet" and filter.file_handler is not None:
+                skip_files = filter.file_handler
+
+            # Valves may have been replaced on the shared module
+            if filter.valves is not None and filter.module.valves is not filter.valves:
+                filter.module.valves = filter.valves
+
+            try:
+                params = (
+                    {"event": form_data}
+                    if filter_type == "stream"
+                    else {"body": form_data}
+                )
+                for name in handler.parameters:
+                    if name == "__id__":
+                        params[name] = filter.id
+                    elif name in extra_params:
+                        params[name] = extra_params[name]
+
+                # Handle user parameters
+                if handler.takes_user and filter.user_valves_class is not None:
                     try:
-                        params["__user__"]["valves"] = function_module.UserValves(
-                            **Functions.get_user_valves_by_id_and_user_id(
-                                filter_id, params["__user__"]["id"]
-                            )
+                        params["__user__"]["valves"] = self.get_user_valves(
+                            filter, params["__user__"]
                         )
                     except Exception as e:
                         log.exception(f"Failed to get user values: {e}")
 
-            # Execute handler
-            if inspect.iscoroutinefunction(handler):
-                form_data = await handler(**params)
-            else:
-                form_data = handler(**params)
+                # Execute handler
+                if handler.is_coroutine:
+                    form_data = await handler.handler(**params)
+                else:
+                    form_data = handler.handler(**params)
+
+            except Exception as e:
+                log.debug(f"Error in {filter_type} handler {filter.id}: {e}")
+                raise e
+
+        # Handle file cleanup for inlet
+        if skip_files:
+            if "files" in form_data.get("metadata", {}):
+                del form_data["metadata"]["files"]
+            if "files" in form_data:
+                del form_data["files"]
+
+        return form_data
+
+
+class FilterChainCache:
+    """
+    Compiled filter chains keyed by model and enabled toggle filters.
+
+    Each chain is stamped with the count and latest `updated_at` of the
+    filter functions, which any change to a filter, its valves or its
+    activation moves. A chain compiled in the same second as the latest
+    change is not cached, as a further change within that second would
+    leave the stamp unchanged.
+    """
+
+    def __init__(self, size: int = FILTER_CHAIN_CACHE_SIZE):
+        self.size = size
+        self.chains: dict[tuple, FilterChain] = {}
+        self.lock = threading.Lock()
+
+    def get(self, key: tuple, stamp: tuple) -> Optional[FilterChain]:
+        with self.lock:
+            chain = self.chains.get(key)
+            return chain if chain is not None and chain.stamp == stamp else None
+
+    def set(self, key: tuple, chain: FilterChain):
+        if chain.stamp[1] >= int(time.time()):
+            return
 
-        except Exception as e:
-            log.debug(f"Error in {filter_type} handler {filter_id}: {e}")
-            raise e
+        with self.lock:
+            if key not in self.chains and len(self.chains) >= self.size:
+                self.chains.pop(next(iter(self.chains)))
+            self.chains[key] = chain
 
-    # Handle file cleanup for inlet
-    if skip_files:
-        if "files" in form_data.get("metadata", {}):
-            del form_data["metadata"]["files"]
-        if "files" in form_data:
-            del form_data["files"]
 
-    return form_data, {}
+FILTER_CHAINS = FilterChainCache()
+
+
+def compile_filters(request, functions: list[FunctionModel]) -> list[CompiledFilter]:
+    """
+    The compiled filters of `functions`, leaving out those whose requirements
+    are still being installed, so chats keep working meanwhile.
+    """
+    filters = []
+    for function in functions:
+        try:
+            module = get_function_module(request, function.id)
+        except RequirementsNotReadyError as e:
+            log.warning(f"Skipping filter {function.id}: {e}")
+            continue
+
+        if isinstance(function, FunctionWithValvesModel):
+            valves = function.valves
+        else:
+            valves = Functions.get_function_valves_by_id(function.id)
+
+        filters.append(CompiledFilter(function.id, module, valves))
+    return filters
+
+
+def get_filter_chain(
+    request, model: dict, enabled_filter_ids: list = None
+) -> FilterChain:
+    """
+    The compiled chain of the global and model filters that are active,
+    with toggle filters only if enabled for the chat.
+    """
+    filter_ids = set(
+        ((model.get("info") or {}).get("meta") or {}).get("filterIds") or []
+    )
+    enabled_filter_ids = set(enabled_filter_ids or [])
+
+    key = (
+        model.get("id"),
+        tuple(sorted(filter_ids)),
+        tuple(sorted(enabled_filter_ids)),
+    )
+    stamp = Functions.get_functions_stamp_by_type("filter")
+
+    chain = FILTER_CHAINS.get(key, stamp)
+    if chain is not None:
+        return chain
+
+    functions = [
+        function
+        for function in Functions.get_functions_by_type(
+            "filter", active_only=True, include_valves=True
+        )
+        if function.is_global or function.id in filter_ids
+    ]
+    functions.sort(key=lambda function: function.id)
+
+    compiled = compile_filters(request, functions)
+    filters = [
+        filter
+        for filter in compiled
+        if not filter.toggle or filter.id in enabled_filter_ids
+    ]
+    filters.sort(key=lambda filter: filter.priority)
+
+    chain = FilterChain(filters, stamp)
+    # Compiled again once the skipped filters can be loaded
+    if len(compiled) == len(functions):
+        FILTER_CHAINS.set(key, chain)
+    return chain
+
+
+def get_sorted_filter_ids(request, model: dict, enabled_filter_ids: list = None):
+    return get_filter_chain(request, model, enabled_filter_ids).ids
+
+
+async def process_filter_functions(
+    request, filter_functions, filter_type, form_data, extra_params
+):
+    """
+    Run the `filter_type` hook of a filter chain, or of a list of filter
+    functions compiled for this call.
+    """
+    if isinstance(filter_functions, FilterChain):
+        chain = filter_functions
+    else:
+        chain = FilterChain(
+            compile_filters(
+                request, [function for function in filter_functions if function]
+            )
+        )
+
+    return await chain.run(filter_type, form_data, extra_params), {}
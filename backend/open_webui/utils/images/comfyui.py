@@ -1,113 +1,408 @@
 import asyncio
+import base64
 import json
 import logging
 import random
-import requests
-import aiohttp
+import time
 import urllib.parse
-import urllib.request
-from typing import Optional
+import uuid
+from collections import deque
+from typing import Callable, Optional
 
-import websocket  # NOTE: websocket-client (https://github.com/websocket-client/websocket-client)
+import aiohttp
 from pydantic import BaseModel
 
+from open_webui.env import AIOHTTP_CLIENT_SESSION_SSL, AIOHTTP_CLIENT_TIMEOUT
+
 log = logging.getLogger(__name__)
 
 default_headers = {"User-Agent": "Mozilla/5.0"}
 
+# Seconds between preview images sent to the chat
+PREVIEW_INTERVAL = 1.0
 
-def queue_prompt(prompt, client_id, base_url, api_key):
-    log.info("queue_prompt")
-    p = {"prompt": prompt, "client_id": client_id}
-    data = json.dumps(p).encode("utf-8")
-    log.debug(f"queue_prompt data: {data}")
-    try:
-        req = urllib.request.Request(
-            f"{base_url}/prompt",
-            data=data,
-            headers={**default_headers, "Authorization": f"Bearer {api_key}"},
-        )
-        response = urllib.request.urlopen(req).read()
-        return json.loads(response)
-    except Exception as e:
-        log.exception(f"Error while queuing prompt: {e}")
-        raise e
+# Longest wait before reconnecting a dropped websocket
+MAX_RECONNECT_DELAY = 30
 
+# Binary websocket event types
+PREVIEW_IMAGE = 1
+PREVIEW_IMAGE_TYPES = {1: "image/jpeg", 2: "image/png"}
 
-def get_image(filename, subfolder, folder_type, base_url, api_key):
-    log.info("get_image")
-    data = {"filename": filename, "subfolder": subfolder, "type": folder_type}
-    url_values = urllib.parse.urlencode(data)
-    req = urllib.request.Request(
-        f"{base_url}/view?{url_values}",
-        headers={**default_headers, "Authorization": f"Bearer {api_key}"},
-    )
-    with urllib.request.urlopen(req) as response:
-        return response.read()
+
+def get_base_urls(base_url: str) -> list[str]:
+    """Instances configured in `base_url`, separated by semicolons."""
+    return [url.strip().rstrip("/") for url in base_url.split(";") if url.strip()]
 
 
 def get_image_url(filename, subfolder, folder_type, base_url):
-    log.info("get_image")
     data = {"filename": filename, "subfolder": subfolder, "type": folder_type}
     url_values = urllib.parse.urlencode(data)
     return f"{base_url}/view?{url_values}"
 
 
-def get_history(prompt_id, base_url, api_key):
-    log.info("get_history")
-
-    req = urllib.request.Request(
-        f"{base_url}/history/{prompt_id}",
-        headers={**default_headers, "Authorization": f"Bearer {api_key}"},
-    )
-    with urllib.request.urlopen(req) as response:
-        return json.loads(response.read())
-
-
-def get_images(ws, prompt, client_id, base_url, api_key):
-    prompt_id = queue_prompt(prompt, client_id, base_url, api_key)["prompt_id"]
-    output_images = []
-    while True:
-        out = ws.recv()
-        if isinstance(out, str):
-            message = json.loads(out)
-            if message["type"] == "executing":
-                data = message["data"]
-                if data["node"] is None and data["prompt_id"] == prompt_id:
-                    break  # Execution is done
+class ComfyUIClient:
+    """
+    Client for one ComfyUI instance, shared by all generations.
+
+    A single websocket, opened on first use and reopened when it drops,
+    receives the events of every prompt queued through this client and
+    hands them to the generation waiting for that prompt.
+    """
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.client_id = uuid.uuid4().hex
+
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self.reader: Optional[asyncio.Task] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.lock: Optional[asyncio.Lock] = None
+
+        self.prompts: dict[str, asyncio.Queue] = {}
+        # Events of prompts not registered yet, replayed once they are
+        self.unclaimed: deque = deque(maxlen=256)
+        self.executing: Optional[str] = None
+        self.queue_remaining = 0
+
+    @property
+    def headers(self) -> dict:
+        headers = {**default_headers}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    @property
+    def load(self) -> int:
+        """Prompts queued on the instance, by any client, or waited on here."""
+        return max(self.queue_remaining, len(self.prompts))
+
+    @property
+    def connected(self) -> bool:
+        return (
+            self.ws is not None
+            and not self.ws.closed
+            and self.loop is asyncio.get_running_loop()
+        )
+
+    async def connect(self):
+        if self.connected:
+            return
+
+        if self.loop is not asyncio.get_running_loop():
+            # Connections cannot be shared across event loops
+            self.loop = asyncio.get_running_loop()
+            self.lock = asyncio.Lock()
+            self.session = None
+            self.ws = None
+
+        async with self.lock:
+            if self.connected:
+                return
+
+            if self.session is None or self.session.closed:
+                self.session = aiohttp.ClientSession(
+                    headers=self.headers, trust_env=True
+                )
+
+            ws_url = self.base_url.replace("http://", "ws://").replace(
+                "https://", "wss://"
+            )
+            self.ws = await self.session.ws_connect(
+                f"{ws_url}/ws?clientId={self.client_id}",
+                heartbeat=30,
+                ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            )
+            self.reader = asyncio.create_task(self.read(self.ws))
+            log.info(f"Connected to ComfyUI at {self.base_url}")
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+        if self.reader is not None:
+            # Closing the websocket ends the reader, which fails waiting prompts
+            await asyncio.gather(self.reader, return_exceptions=True)
+        if self.session is not None:
+            await self.session.close()
+        self.ws = None
+        self.reader = None
+        self.session = None
+
+    async def read(self, ws: aiohttp.ClientWebSocketResponse):
+        try:
+            async for message in ws:
+                if message.type == aiohttp.WSMsgType.TEXT:
+                    self.dispatch(json.loads(message.data))
+                elif message.type == aiohttp.WSMsgType.BINARY:
+                    self.dispatch_preview(message.data)
+                elif message.type == aiohttp.WSMsgType.ERROR:
+                    break
+        except Exception as e:
+            log.warning(f"ComfyUI websocket at {self.base_url} failed: {e}")
+        finally:
+            log.info(f"Disconnected from ComfyUI at {self.base_url}")
+            for queue in self.prompts.values():
+                queue.put_nowait({"type": "disconnected", "data": {}})
+
+    def dispatch(self, message: dict):
+        type = message.get("type")
+        data = message.get("data") or {}
+
+        if type == "status":
+            exec_info = (data.get("status") or {}).get("exec_info") or {}
+            self.queue_remaining = exec_info.get("queue_remaining", 0)
+            return
+
+        prompt_id = data.get("prompt_id")
+        if not prompt_id:
+            return
+
+        if type == "execution_start":
+            self.executing = prompt_id
+        elif type == "executing":
+            self.executing = prompt_id if data.get("node") is not None else None
+
+        if prompt_id in self.prompts:
+            self.prompts[prompt_id].put_nowait(message)
         else:
-            continue  # previews are binary data
+            self.unclaimed.append(message)
+
+    def dispatch_preview(self, data: bytes):
+        # Previews carry no prompt id, they belong to the running prompt
+        if len(data) < 8 or int.from_bytes(data[:4], "big") != PREVIEW_IMAGE:
+            return
+
+        if self.executing in self.prompts:
+            self.prompts[self.executing].put_nowait(
+                {
+                    "type": "preview",
+                    "data": {
+                        "mime_type": PREVIEW_IMAGE_TYPES.get(
+                            int.from_bytes(data[4:8], "big"), "image/jpeg"
+                        ),
+                        "image": data[8:],
+                    },
+                }
+            )
+
+    def register(self, prompt_id: str) -> asyncio.Queue:
+        queue = self.prompts.setdefault(prompt_id, asyncio.Queue())
+        for message in list(self.unclaimed):
+            if (message.get("data") or {}).get("prompt_id") == prompt_id:
+                self.unclaimed.remove(message)
+                queue.put_nowait(message)
+        return queue
+
+    async def request(self, method: str, path: str, **kwargs) -> aiohttp.ClientResponse:
+        await self.connect()
+        response = await self.session.request(
+            method,
+            f"{self.base_url}{path}",
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
+            ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            **kwargs,
+        )
+        response.raise_for_status()
+        return response
+
+    async def queue_prompt(self, workflow: dict, prompt_id: str) -> str:
+        async with await self.request(
+            "POST",
+            "/prompt",
+            json={
+                "prompt": workflow,
+                "client_id": self.client_id,
+                "prompt_id": prompt_id,
+            },
+        ) as response:
+            # Older versions pick their own id
+            return (await response.json())["prompt_id"]
+
+    async def get_history(self, prompt_id: str) -> dict:
+        async with await self.request("GET", f"/history/{prompt_id}") as response:
+            return await response.json()
+
+    async def get_image_data(self, url: str) -> tuple[bytes, str]:
+        async with await self.request(
+            "GET", url.removeprefix(self.base_url)
+        ) as response:
+            return await response.read(), response.headers.get(
+                "content-type", "image/png"
+            )
+
+    async def upload_image(self, image_file_item) -> dict:
+        _, (filename, file_bytes, mime_type) = image_file_item
+
+        form = aiohttp.FormData()
+        form.add_field("image", file_bytes, filename=filename, content_type=mime_type)
+        form.add_field("type", "input")  # required by ComfyUI
+
+        async with await self.request(
+            "POST", "/api/upload/image", data=form
+        ) as response:
+            return await response.json()
+
+    async def wait(
+        self,
+        prompt_id: str,
+        queue: asyncio.Queue,
+        event_emitter: Optional[Callable] = None,
+    ):
+        async def emit(event: dict):
+            if event_emitter:
+                try:
+                    await event_emitter(event)
+                except Exception as e:
+                    log.debug(f"Failed to emit ComfyUI progress: {e}")
+
+        previewed_at = 0.0
+        reconnect_delay = 1
+
+        while True:
+            message = await queue.get()
+            type = message.get("type")
+            data = message.get("data") or {}
+
+            if type == "executing" and data.get("node") is None:
+                return
+            elif type == "execution_success":
+                return
+            elif type == "execution_error":
+                raise Exception(
+                    f"ComfyUI error in node {data.get('node_type')}: {data.get('exception_message')}"
+                )
+            elif type == "execution_interrupted":
+                raise Exception("ComfyUI execution was interrupted")
+            elif type == "progress":
+                await emit(
+                    {
+                        "type": "status",
+                        "data": {
+                            "description": f"Generating image ({data.get('value')}/{data.get('max')})",
+                            "done": False,
+                        },
+                    }
+                )
+            elif type == "preview":
+                if time.monotonic() - previewed_at < PREVIEW_INTERVAL:
+                    continue
+                previewed_at = time.monotonic()
+
+                image = base64.b64encode(data["image"]).decode()
+                await emit(
+                    {
+                        "type": "files",
+                        "data": {
+                            "files": [
+                                {
+                                    "type": "image",
+                                    "url": f"data:{data['mime_type']};base64,{image}",
+                                }
+                            ]
+                        },
+                    }
+                )
+            elif type == "disconnected":
+                # Reconnect under the same client id to keep receiving the
+                # events of this prompt, unless it finished in the meantime
+                await asyncio.sleep(reconnect_delay)
+                reconnect_delay = min(reconnect_delay * 2, MAX_RECONNECT_DELAY)
+                try:
+                    await self.connect()
+                    if prompt_id in await self.get_history(prompt_id):
+                        return
+                    reconnect_delay = 1
+                except Exception as e:
+                    log.warning(f"Failed to reconnect to ComfyUI: {e}")
+                    queue.put_nowait(message)
+
+    async def run_workflow(
+        self, workflow: dict, event_emitter: Optional[Callable] = None
+    ) -> dict:
+        """
+        Queue `workflow` and wait for it, reporting its progress and previews
+        through `event_emitter`. Returns the URLs of the output images.
+        """
+        await self.connect()
+
+        prompt_id = str(uuid.uuid4())
+        queue = self.register(prompt_id)
+        try:
+            queued_id = await self.queue_prompt(workflow, prompt_id)
+            if queued_id != prompt_id:
+                self.prompts.pop(prompt_id, None)
+                prompt_id, queue = queued_id, self.register(queued_id)
+
+            await self.wait(prompt_id, queue, event_emitter)
+            history = (await self.get_history(prompt_id))[prompt_id]
+        finally:
+            self.prompts.pop(prompt_id, None)
+
+        output_images = []
+        for node_output in history["outputs"].values():
+            for image in node_output.get("images", []):
+                output_images.append(
+                    {
+                        "url": get_image_url(
+                            image["filename"],
+                            image["subfolder"],
+                            image["type"],
+                            self.base_url,
+                        )
+                    }
+                )
+        return {"data": output_images}
 
-    history = get_history(prompt_id, base_url, api_key)[prompt_id]
-    for o in history["outputs"]:
-        for node_id in history["outputs"]:
-            node_output = history["outputs"][node_id]
-            if "images" in node_output:
-                for image in node_output["images"]:
-                    url = get_image_url(
-                        image["filename"], image["subfolder"], image["type"], base_url
-                    )
-                    output_images.append({"url": url})
-    return {"data": output_images}
 
+class ComfyUIScheduler:
+    """
+    Spreads generations over the configured ComfyUI instances, sending each
+    to the instance with the shortest queue that can be reached.
+    """
 
-async def comfyui_upload_image(image_file_item, base_url, api_key):
-    url = f"{base_url}/api/upload/image"
-    headers = {}
+    def __init__(self):
+        self.clients: dict[tuple[str, str], ComfyUIClient] = {}
 
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"
+    def get_client(self, base_url: str, api_key: Optional[str]) -> ComfyUIClient:
+        key = (base_url, api_key or "")
+        if key not in self.clients:
+            self.clients[key] = ComfyUIClient(base_url, api_key)
+        return self.clients[key]
 
-    _, (filename, file_bytes, mime_type) = image_file_item
+    async def get_available_client(
+        self, base_url: str, api_key: Optional[str]
+    ) -> ComfyUIClient:
+        clients = [self.get_client(url, api_key) for url in get_base_urls(base_url)]
+        if not clients:
+            raise Exception("No ComfyUI URL configured")
 
-    form = aiohttp.FormData()
-    form.add_field("image", file_bytes, filename=filename, content_type=mime_type)
-    form.add_field("type", "input")  # required by ComfyUI
+        error = None
+        for client in sorted(clients, key=lambda client: client.load):
+            try:
+                await client.connect()
+                return client
+            except Exception as e:
+                log.warning(f"ComfyUI at {client.base_url} is unavailable: {e}")
+                error = e
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, data=form, headers=headers) as resp:
-            resp.raise_for_status()
-            return await resp.json()
+        raise Exception(f"No ComfyUI instance is available: {error}")
+
+    async def close(self):
+        clients = list(self.clients.values())
+        self.clients.clear()
+        for client in clients:
+            try:
+                await client.close()
+            except Exception as e:
+                log.warning(f"Failed to close ComfyUI client {client.base_url}: {e}")
+
+
+COMFYUI_SCHEDULER = ComfyUIScheduler()
+
+
+async def get_comfyui_client(base_url: str, api_key: Optional[str]) -> ComfyUIClient:
+    return await COMFYUI_SCHEDULER.get_available_client(base_url, api_key)
 
 
 class ComfyUINodeInput(BaseModel):
@@ -136,9 +431,11 @@ class ComfyUICreateImageForm(BaseModel):
 
 
 async def comfyui_create_image(
-    model: str, payload: ComfyUICreateImageForm, client_id, base_url, api_key
+    model: str,
+    payload: ComfyUICreateImageForm,
+    client: ComfyUIClient,
+    event_emitter: Optional[Callable] = None,
 ):
-    ws_url = base_url.replace("http://", "ws://").replace("https://", "wss://")
     workflow = json.loads(payload.workflow.workflow)
 
     for node in payload.workflow.nodes:
@@ -188,28 +485,13 @@ async def comfyui_create_image(
             for node_id in node.node_ids:
                 workflow[node_id]["inputs"][node.key] = node.value
 
+    log.info("Sending workflow to ComfyUI.")
+    log.debug(f"Workflow: {workflow}")
     try:
-        ws = websocket.WebSocket()
-        headers = {"Authorization": f"Bearer {api_key}"}
-        ws.connect(f"{ws_url}/ws?clientId={client_id}", header=headers)
-        log.info("WebSocket connection established.")
-    except Exception as e:
-        log.exception(f"Failed to connect to WebSocket server: {e}")
-        return None
-
-    try:
-        log.info("Sending workflow to WebSocket server.")
-        log.info(f"Workflow: {workflow}")
-        images = await asyncio.to_thread(
-            get_images, ws, workflow, client_id, base_url, api_key
-        )
+        return await client.run_workflow(workflow, event_emitter)
     except Exception as e:
         log.exception(f"Error while receiving images: {e}")
-        images = None
-
-    ws.close()
-
-    return images
+        return None
 
 
 class ComfyUIEditImageForm(BaseModel):
@@ -226,9 +508,11 @@ class ComfyUIEditImageForm(BaseModel):
 
 
 async def comfyui_edit_image(
-    model: str, payload: ComfyUIEditImageForm, client_id, base_url, api_key
+    model: str,
+    payload: ComfyUIEditImageForm,
+    client: ComfyUIClient,
+    event_emitter: Optional[Callable] = None,
 ):
-    ws_url = base_url.replace("http://", "ws://").replace("https://", "wss://")
     workflow = json.loads(payload.workflow.workflow)
 
     for node in payload.workflow.nodes:
@@ -287,25 +571,10 @@ async def comfyui_edit_image(
             for node_id in node.node_ids:
                 workflow[node_id]["inputs"][node.key] = node.value
 
+    log.info("Sending workflow to ComfyUI.")
+    log.debug(f"Workflow: {workflow}")
     try:
-        ws = websocket.WebSocket()
-        headers = {"Authorization": f"Bearer {api_key}"}
-        ws.connect(f"{ws_url}/ws?clientId={client_id}", header=headers)
-        log.info("WebSocket connection established.")
-    except Exception as e:
-        log.exception(f"Failed to connect to WebSocket server: {e}")
-        return None
-
-    try:
-        log.info("Sending workflow to WebSocket server.")
-        log.info(f"Workflow: {workflow}")
-        images = await asyncio.to_thread(
-            get_images, ws, workflow, client_id, base_url, api_key
-        )
+        return await client.run_workflow(workflow, event_emitter)
     except Exception as e:
         log.exception(f"Error while receiving images: {e}")
-        images = None
-
-    ws.close()
-
-    return images
+        return None
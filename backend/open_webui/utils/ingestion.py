@@ -0,0 +1,378 @@
+import asyncio
+import logging
+import math
+import os
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from fastapi import FastAPI, Request
+from starlette.datastructures import Headers
+
+from open_webui.env import (
+    INGESTION_QUEUE_LOCK_TIMEOUT,
+    INGESTION_QUEUE_MAX_ATTEMPTS,
+    INGESTION_QUEUE_RETRY_BACKOFF,
+    INGESTION_QUEUE_SIZE_PENALTY,
+    INGESTION_WORKER_CONCURRENCY,
+)
+from open_webui.models.files import FileModel, Files
+from open_webui.models.jobs import JobModel, Jobs
+from open_webui.models.knowledge import Knowledges
+from open_webui.models.users import UserModel, Users
+
+log = logging.getLogger(__name__)
+
+FILE_PROCESSING_JOB = "file_processing"
+FILES_BATCH_JOB = "files_batch"
+KNOWLEDGE_FILES_JOB = "knowledge_files"
+KNOWLEDGE_REINDEX_JOB = "knowledge_reindex"
+
+POLL_INTERVAL = 1.0
+
+# Finished jobs are kept this long for inspection
+JOB_RETENTION = 7 * 24 * 3600
+
+
+@dataclass
+class JobHandler:
+    run: Callable[[Request, JobModel, UserModel], None]
+    # Called after every status change, e.g. to mirror it onto the file
+    on_update: Optional[Callable[[JobModel], None]] = None
+
+
+def get_size_penalty(size: Optional[int]) -> int:
+    """Rank penalty in seconds, growing with each doubling above 1 MiB."""
+    if not size or size <= 1024 * 1024:
+        return 0
+    return math.ceil(math.log2(size / (1024 * 1024))) * INGESTION_QUEUE_SIZE_PENALTY
+
+
+def get_retry_delay(attempts: int) -> int:
+    return INGESTION_QUEUE_RETRY_BACKOFF * 2 ** max(attempts - 1, 0)
+
+
+####################
+# Enqueue
+####################
+
+
+def enqueue_file_processing(
+    file_item: FileModel,
+    content_type: Optional[str],
+    file_metadata: dict,
+    user: UserModel,
+) -> Optional[JobModel]:
+    job = Jobs.insert_new_job(
+        FILE_PROCESSING_JOB,
+        user.id,
+        {
+            "file_id": file_item.id,
+            "content_type": content_type,
+            "file_metadata": file_metadata,
+        },
+        max_attempts=INGESTION_QUEUE_MAX_ATTEMPTS,
+        delay=get_size_penalty((file_item.meta or {}).get("size")),
+    )
+    if job:
+        update_file_job(job)
+    return job
+
+
+def enqueue_files_batch(
+    collection_name: str, files: list[FileModel], user: UserModel
+) -> Optional[JobModel]:
+    return Jobs.insert_new_job(
+        FILES_BATCH_JOB,
+        user.id,
+        {"collection_name": collection_name, "file_ids": [file.id for file in files]},
+        max_attempts=INGESTION_QUEUE_MAX_ATTEMPTS,
+        delay=get_size_penalty(
+            sum((file.meta or {}).get("size") or 0 for file in files)
+        ),
+    )
+
+
+def enqueue_knowledge_files(
+    knowledge_id: str, files: list[FileModel], user: UserModel
+) -> Optional[JobModel]:
+    return Jobs.insert_new_job(
+        KNOWLEDGE_FILES_JOB,
+        user.id,
+        {"knowledge_id": knowledge_id, "file_ids": [file.id for file in files]},
+        max_attempts=INGESTION_QUEUE_MAX_ATTEMPTS,
+        delay=get_size_penalty(
+            sum((file.meta or {}).get("size") or 0 for file in files)
+        ),
+    )
+
+
+####################
+# Handlers
+####################
+
+
+def update_file_job(job: JobModel):
+    data = {
+        "job": {
+            "id": job.id,
+            "status": job.status,
+            "attempts": job.attempts,
+            "max_attempts": job.max_attempts,
+        }
+    }
+
+    if job.status == "pending":
+        # Queued or waiting for a retry
+        data["status"] = "pending"
+    elif job.status == "failed":
+        data["status"] = "failed"
+        data["error"] = job.error
+
+    Files.update_file_data_by_id(job.payload["file_id"], data)
+
+
+def run_file_processing_job(request: Request, job: JobModel, user: UserModel):
+    from open_webui.routers.files import handle_uploaded_file
+
+    file = Files.get_file_by_id(job.payload["file_id"])
+    if not file:
+        log.info(f"File {job.payload['file_id']} was deleted, skipping job {job.id}")
+        return
+
+    handle_uploaded_file(
+        request,
+        job.payload.get("content_type"),
+        file.path,
+        file,
+        job.payload.get("file_metadata") or {},
+        user,
+    )
+
+
+def run_files_batch_job(request: Request, job: JobModel, user: UserModel):
+    from open_webui.routers.retrieval import BatchProcessFilesForm, save_files_batch
+
+    knowledge_id = job.payload.get("knowledge_id")
+    if knowledge_id and not Knowledges.get_knowledge_by_id(id=knowledge_id):
+        log.info(f"Knowledge {knowledge_id} was deleted, skipping job {job.id}")
+        return
+
+    files = [
+        file
+        for file in (Files.get_file_by_id(id) for id in job.payload["file_ids"])
+        if file
+    ]
+    if not files:
+        return
+
+    result = asyncio.run(
+        save_files_batch(
+            request,
+            BatchProcessFilesForm(
+                files=files,
+                collection_name=knowledge_id or job.payload["collection_name"],
+            ),
+            user,
+        )
+    )
+
+    completed = [r.file_id for r in result.results if r.status == "completed"]
+    if knowledge_id:
+        for file_id in completed:
+            Knowledges.add_file_to_knowledge_by_id(
+                knowledge_id=knowledge_id, file_id=file_id, user_id=user.id
+            )
+
+    failed = [err.file_id for err in result.errors]
+    progress = (job.progress or {}).get("completed", 0) + len(completed)
+    Jobs.update_job_progress(
+        job.id,
+        {
+            "completed": progress,
+            "total": progress + len(failed),
+            "errors": [f"{err.file_id}: {err.error}" for err in result.errors],
+        },
+        # Only retry the files that failed
+        payload={**job.payload, "file_ids": failed},
+    )
+
+    if failed:
+        raise Exception(f"{len(failed)} of {len(files)} files failed to process")
+
+
+def run_knowledge_reindex_job(request: Request, job: JobModel, user: UserModel):
+    from open_webui.utils.reindex import reindex_knowledge_bases
+
+    reindex_knowledge_bases(request, job, user)
+
+
+JOB_HANDLERS: dict[str, JobHandler] = {
+    FILE_PROCESSING_JOB: JobHandler(
+        run=run_file_processing_job, on_update=update_file_job
+    ),
+    FILES_BATCH_JOB: JobHandler(run=run_files_batch_job),
+    KNOWLEDGE_FILES_JOB: JobHandler(run=run_files_batch_job),
+    KNOWLEDGE_REINDEX_JOB: JobHandler(run=run_knowledge_reindex_job),
+}
+
+
+####################
+# Worker
+####################
+
+
+class IngestionWorker:
+    """
+    Runs queued jobs on `concurrency` threads until stopped.
+
+    Any number of workers, on any number of hosts, can share one queue. Each
+    sends heartbeats for the jobs it is running and requeues the jobs of
+    workers that stopped sending theirs.
+    """
+
+    def __init__(
+        self,
+        app: FastAPI,
+        concurrency: int = INGESTION_WORKER_CONCURRENCY,
+        types: Optional[list[str]] = None,
+    ):
+        self.app = app
+        self.concurrency = concurrency
+        self.types = types or list(JOB_HANDLERS)
+        self.id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+        self.running: dict[str, JobModel] = {}
+        self.running_lock = threading.Lock()
+        self.stopped = threading.Event()
+
+    def get_request(self) -> Request:
+        # Handlers expect a request, create a mock one bound to the app
+        return Request(
+            {
+                "type": "http",
+                "asgi.version": "3.0",
+                "asgi.spec_version": "2.0",
+                "method": "POST",
+                "path": "/internal",
+                "query_string": b"",
+                "headers": Headers({}).raw,
+                "client": ("127.0.0.1", 12345),
+                "server": ("127.0.0.1", 80),
+                "scheme": "http",
+                "app": self.app,
+            }
+        )
+
+    def notify(self, job: Optional[JobModel]):
+        handler = JOB_HANDLERS.get(job.type) if job else None
+        if handler and handler.on_update:
+            try:
+                handler.on_update(job)
+            except Exception as e:
+                log.warning(f"Failed to report status of job {job.id}: {e}")
+
+    def run_job(self, job: JobModel):
+        with self.running_lock:
+            self.running[job.id] = job
+
+        log.info(f"Running {job.type} job {job.id} (attempt {job.attempts})")
+        self.notify(job)
+
+        try:
+            user = Users.get_user_by_id(job.user_id) if job.user_id else None
+            if not user:
+                raise Exception(f"User {job.user_id} not found")
+
+            JOB_HANDLERS[job.type].run(self.get_request(), job, user)
+
+            if Jobs.complete_job(job.id, self.id):
+                self.notify(Jobs.get_job_by_id(job.id))
+        except Exception as e:
+            error = str(e.detail) if hasattr(e, "detail") else str(e)
+            log.exception(f"Job {job.id} failed: {error}")
+            self.notify(
+                Jobs.fail_job(job.id, self.id, error, get_retry_delay(job.attempts))
+            )
+        finally:
+            with self.running_lock:
+                self.running.pop(job.id, None)
+
+    def work(self, until_empty: bool = False):
+        while not self.stopped.is_set():
+            try:
+                job = Jobs.claim_job(self.id, self.types)
+            except Exception as e:
+                log.exception(f"Failed to claim a job: {e}")
+                job = None
+
+            if job is None:
+                if until_empty:
+                    return
+                self.stopped.wait(POLL_INTERVAL)
+                continue
+
+            self.run_job(job)
+
+    def maintain(self):
+        interval = INGESTION_QUEUE_LOCK_TIMEOUT / 3
+        while not self.stopped.wait(interval):
+            try:
+                with self.running_lock:
+                    ids = list(self.running)
+                Jobs.heartbeat_jobs(self.id, ids)
+
+                for job in Jobs.requeue_stale_jobs(INGESTION_QUEUE_LOCK_TIMEOUT):
+                    log.warning(f"Requeued job {job.id} of an unresponsive worker")
+                    self.notify(job)
+
+                Jobs.delete_finished_jobs(int(time.time()) - JOB_RETENTION)
+            except Exception as e:
+                log.exception(f"Job queue maintenance failed: {e}")
+
+    def run(self, until_empty: bool = False):
+        """
+        Process jobs until stopped or, with `until_empty`, until no job is
+        ready to run.
+        """
+        log.info(f"Ingestion worker {self.id} started with {self.concurrency} threads")
+
+        workers = [
+            threading.Thread(
+                target=self.work,
+                args=(until_empty,),
+                name=f"ingestion-{i}",
+                daemon=True,
+            )
+            for i in range(self.concurrency)
+        ]
+        # Daemons, so a worker running inside the web process, e.g. for a
+        # reindex, never holds up its shutdown
+        threads = workers + [
+            threading.Thread(
+                target=self.maintain, name="ingestion-maintenance", daemon=True
+            )
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            while any(worker.is_alive() for worker in workers):
+                if self.stopped.wait(1):
+                    break
+        except KeyboardInterrupt:
+            pass
+        self.stop()
+
+        # Let running jobs finish; whatever is cut short is requeued by the
+        # next worker once its heartbeat expires
+        for thread in threads:
+            thread.join()
+
+        log.info(f"Ingestion worker {self.id} stopped")
+
+    def stop(self):
+        self.stopped.set()
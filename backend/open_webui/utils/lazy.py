@@ -0,0 +1,120 @@
+import importlib
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+log = logging.getLogger(__name__)
+
+# Objects loaded by `warm_up`
+WARM_UP_OBJECTS: list["LazyObject"] = []
+
+# Seconds a failed load is remembered before the loader is tried again,
+# doubling with each consecutive failure up to the maximum
+RETRY_BACKOFF = 5
+MAX_RETRY_BACKOFF = 300
+
+
+class LazyObject:
+    """
+    Stand-in for an object that is expensive to create, e.g. a local model or
+    a vector DB connection. It is created by `loader` on first attribute
+    access, or ahead of time by `load`, and used transparently afterwards.
+
+    With `warm`, it is also loaded in the background by `warm_up`. When the
+    loader fails, its error is raised again on every access until a backoff
+    has passed, rather than running the loader each time.
+    """
+
+    def __init__(self, name: str, loader: Callable[[], Any], warm: bool = True):
+        self._name = name
+        self._loader = loader
+        self._object = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+        self._error = None
+        self._traceback = None
+        self._failures = 0
+        self._retry_at = 0.0
+
+        if warm:
+            WARM_UP_OBJECTS.append(self)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self) -> Any:
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._load()
+        return self._object
+
+    def _load(self):
+        if self._error is not None and time.monotonic() < self._retry_at:
+            # The original traceback, rather than growing it with every raise
+            raise self._error.with_traceback(self._traceback)
+
+        start = time.perf_counter()
+        try:
+            self._object = self._loader()
+        except Exception as e:
+            self._failures += 1
+            backoff = min(RETRY_BACKOFF * 2 ** (self._failures - 1), MAX_RETRY_BACKOFF)
+            self._error = e
+            self._traceback = e.__traceback__
+            self._retry_at = time.monotonic() + backoff
+            log.warning(f"Failed to load {self._name}, retrying in {backoff}s: {e}")
+            raise
+
+        self._loaded = True
+        self._error = self._traceback = None
+        self._failures = 0
+        log.info(f"Loaded {self._name} in {time.perf_counter() - start:.2f}s")
+
+    def __getattr__(self, name: str):
+        obj = self.load()
+        if obj is None:
+            raise AttributeError(f"{self._name} is not available")
+        return getattr(obj, name)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._loaded else "not loaded"
+        return f"<LazyObject {self._name} ({state})>"
+
+
+def lazy_import(module: str, name: str, warm: bool = False) -> Callable:
+    """
+    Function or class `name` of `module`, imported on its first call so that
+    the module and its dependencies are only loaded when used.
+    """
+    target = LazyObject(
+        f"{module}.{name}",
+        lambda: getattr(importlib.import_module(module), name),
+        warm=warm,
+    )
+
+    def wrapper(*args, **kwargs):
+        return target.load()(*args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__qualname__ = name
+    wrapper.__module__ = module
+    return wrapper
+
+
+def warm_up() -> threading.Thread:
+    """Load the lazy objects meant to be warmed up in a background thread."""
+
+    def run():
+        for obj in list(WARM_UP_OBJECTS):
+            try:
+                obj.load()
+            except Exception as e:
+                log.warning(f"Failed to warm up {obj._name}: {e}")
+
+    thread = threading.Thread(target=run, name="warm-up", daemon=True)
+    thread.start()
+    return thread
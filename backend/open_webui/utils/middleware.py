@@ -7,6 +7,7 @@ import textwrap
 
 import asyncio
 from aiocache import cached
+from opentelemetry import trace
 from typing import Any, Optional
 import random
 import json
@@ -14,6 +15,7 @@ import html
 import inspect
 import re
 import ast
+import copy
 
 from uuid import uuid4
 from concurrent.futures import ThreadPoolExecutor
@@ -41,7 +43,7 @@ from open_webui.routers.tasks import (
     generate_chat_tags,
 )
 from open_webui.routers.retrieval import (
-    process_web_search,
+    run_web_search,
     SearchForm,
 )
 from open_webui.routers.images import (
@@ -66,7 +68,6 @@ from open_webui.utils.files import (
 
 
 from open_webui.models.users import UserModel
-from open_webui.models.functions import Functions
 from open_webui.models.models import Models
 
 from open_webui.retrieval.utils import get_sources_from_items
@@ -95,12 +96,13 @@ from open_webui.utils.misc import (
 from open_webui.utils.tools import get_tools, get_updated_tool_function
 from open_webui.utils.plugin import load_function_module_by_id
 from open_webui.utils.filter import (
-    get_sorted_filter_ids,
+    get_filter_chain,
     process_filter_functions,
 )
 from open_webui.utils.code_interpreter import execute_code_jupyter
 from open_webui.utils.payload import apply_system_prompt_to_body
 from open_webui.utils.mcp.client import MCPClient
+from open_webui.utils.stages import Stage, run_stages
 
 
 from open_webui.config import (
@@ -118,6 +120,7 @@ from open_webui.env import (
     BYPASS_MODEL_ACCESS_CONTROL,
     ENABLE_REALTIME_CHAT_SAVE,
     ENABLE_QUERIES_CACHE,
+    CHAT_IMAGE_FETCH_CONCURRENCY,
 )
 from open_webui.constants import TASKS
 
@@ -635,10 +638,14 @@ async def chat_web_search_handler(
     )
 
     try:
-        results = await process_web_search(
+        results = await run_web_search(
             request,
             SearchForm(queries=queries),
             user=user,
+            # Progress only, not worth rewriting the chat once per site
+            event_emitter=get_event_emitter(
+                extra_params["__metadata__"], update_db=False
+            ),
         )
 
         if results:
@@ -1120,6 +1127,38 @@ def apply_params_to_form_data(form_data, model):
 async def convert_url_images_to_base64(form_data):
     messages = form_data.get("messages", [])
 
+    image_urls = set()
+    for message in messages:
+        content = message.get("content")
+        if not isinstance(content, list):
+            continue
+
+        for item in content:
+            if isinstance(item, dict) and item.get("type") == "image_url":
+                image_url = item.get("image_url", {}).get("url", "")
+                if image_url and not image_url.startswith("data:image/"):
+                    image_urls.add(image_url)
+
+    if not image_urls:
+        return form_data
+
+    # Fetch every distinct image once, concurrently; repeated turns are served
+    # from the inlined image cache in get_image_base64_from_url
+    semaphore = asyncio.Semaphore(CHAT_IMAGE_FETCH_CONCURRENCY)
+
+    async def fetch(image_url):
+        async with semaphore:
+            try:
+                return await asyncio.to_thread(get_image_base64_from_url, image_url)
+            except Exception as e:
+                log.debug(f"Error converting image URL to base64: {e}")
+                return None
+
+    image_urls = list(image_urls)
+    base64_images = dict(
+        zip(image_urls, await asyncio.gather(*[fetch(url) for url in image_urls]))
+    )
+
     for message in messages:
         content = message.get("content")
         if not isinstance(content, list):
@@ -1132,23 +1171,15 @@ async def convert_url_images_to_base64(form_data):
                 new_content.append(item)
                 continue
 
-            image_url = item.get("image_url", {}).get("url", "")
-            if image_url.startswith("data:image/"):
-                new_content.append(item)
-                continue
-
-            try:
-                base64_data = await asyncio.to_thread(
-                    get_image_base64_from_url, image_url
-                )
+            base64_data = base64_images.get(item.get("image_url", {}).get("url", ""))
+            if base64_data:
                 new_content.append(
                     {
                         "type": "image_url",
                         "image_url": {"url": base64_data},
                     }
                 )
-            except Exception as e:
-                log.debug(f"Error converting image URL to base64: {e}")
+            else:
                 new_content.append(item)
 
         message["content"] = new_content
@@ -1160,6 +1191,11 @@ async def process_chat_payload(request, form_data, user, metadata, model):
     # Pipeline Inlet -> Filter Inlet -> Chat Memory -> Chat Web Search -> Chat Image Generation
     # -> Chat Code Interpreter (Form Data Update) -> (Default) Chat Tools Function Calling
     # -> Chat Files
+    # Memory, web search, image generation and tool resolution run concurrently
+    # (see `run_stages` below); the ordering above only holds along dependencies.
+
+    # Used to measure time-to-first-token once the response starts streaming
+    metadata["started_at"] = time.perf_counter()
 
     form_data = apply_params_to_form_data(form_data, model)
     log.debug(f"form_data: {form_data}")
@@ -1288,12 +1324,9 @@ async def process_chat_payload(request, form_data, user, metadata, model):
         raise e
 
     try:
-        filter_functions = [
-            Functions.get_function_by_id(filter_id)
-            for filter_id in get_sorted_filter_ids(
-                request, model, metadata.get("filter_ids", [])
-            )
-        ]
+        filter_functions = get_filter_chain(
+            request, model, metadata.get("filter_ids", [])
+        )
 
         form_data, flags = await process_filter_functions(
             request=request,
@@ -1305,245 +1338,281 @@ async def process_chat_payload(request, form_data, user, metadata, model):
     except Exception as e:
         raise Exception(f"{e}")
 
-    features = form_data.pop("features", None)
-    if features:
-        if "voice" in features and features["voice"]:
-            if request.app.state.config.VOICE_MODE_PROMPT_TEMPLATE != None:
-                if request.app.state.config.VOICE_MODE_PROMPT_TEMPLATE != "":
-                    template = request.app.state.config.VOICE_MODE_PROMPT_TEMPLATE
-                else:
-                    template = DEFAULT_VOICE_MODE_PROMPT_TEMPLATE
-
-                form_data["messages"] = add_or_update_system_message(
-                    template,
-                    form_data["messages"],
-                )
-
-        if "memory" in features and features["memory"]:
-            form_data = await chat_memory_handler(
-                request, form_data, extra_params, user
-            )
-
-        if "web_search" in features and features["web_search"]:
-            form_data = await chat_web_search_handler(
-                request, form_data, extra_params, user
-            )
-
-        if "image_generation" in features and features["image_generation"]:
-            form_data = await chat_image_generation_handler(
-                request, form_data, extra_params, user
-            )
+    features = form_data.pop("features", None) or {}
+    if features.get("voice"):
+        if request.app.state.config.VOICE_MODE_PROMPT_TEMPLATE != None:
+            if request.app.state.config.VOICE_MODE_PROMPT_TEMPLATE != "":
+                template = request.app.state.config.VOICE_MODE_PROMPT_TEMPLATE
+            else:
+                template = DEFAULT_VOICE_MODE_PROMPT_TEMPLATE
 
-        if "code_interpreter" in features and features["code_interpreter"]:
-            form_data["messages"] = add_or_update_user_message(
-                (
-                    request.app.state.config.CODE_INTERPRETER_PROMPT_TEMPLATE
-                    if request.app.state.config.CODE_INTERPRETER_PROMPT_TEMPLATE != ""
-                    else DEFAULT_CODE_INTERPRETER_PROMPT
-                ),
+            form_data["messages"] = add_or_update_system_message(
+                template,
                 form_data["messages"],
             )
 
     tool_ids = form_data.pop("tool_ids", None)
-    files = form_data.pop("files", None)
-
-    prompt = get_last_user_message(form_data["messages"])
-    # TODO: re-enable URL extraction from prompt
-    # urls = []
-    # if prompt and len(prompt or "") < 500 and (not files or len(files) == 0):
-    #     urls = extract_urls(prompt)
-
-    if files:
-        if not files:
-            files = []
-
-        for file_item in files:
-            if file_item.get("type", "file") == "folder":
-                # Get folder files
-                folder_id = file_item.get("id", None)
-                if folder_id:
-                    folder = Folders.get_folder_by_id_and_user_id(folder_id, user.id)
-                    if folder and folder.data and "files" in folder.data:
-                        files = [f for f in files if f.get("id", None) != folder_id]
-                        files = [*files, *folder.data["files"]]
-
-        # files = [*files, *[{"type": "url", "url": url, "name": url} for url in urls]]
-        # Remove duplicate files based on their content
-        files = list({json.dumps(f, sort_keys=True): f for f in files}.values())
-
-    metadata = {
-        **metadata,
-        "tool_ids": tool_ids,
-        "files": files,
-    }
-    form_data["metadata"] = metadata
 
-    # Server side tools
-    tool_ids = metadata.get("tool_ids", None)
     # Client side tools
     direct_tool_servers = metadata.get("tool_servers", None)
 
-    log.debug(f"{tool_ids=}")
-    log.debug(f"{direct_tool_servers=}")
-
     tools_dict = {}
 
     mcp_clients = {}
     mcp_tools_dict = {}
 
-    if tool_ids:
-        for tool_id in tool_ids:
-            if tool_id.startswith("server:mcp:"):
-                try:
-                    server_id = tool_id[len("server:mcp:") :]
-
-                    mcp_server_connection = None
-                    for (
-                        server_connection
-                    ) in request.app.state.config.TOOL_SERVER_CONNECTIONS:
-                        if (
-                            server_connection.get("type", "") == "mcp"
-                            and server_connection.get("info", {}).get("id") == server_id
-                        ):
-                            mcp_server_connection = server_connection
-                            break
+    # The stages below form a dependency graph: independent network round-trips
+    # (web search, image generation, MCP connects) run concurrently and only
+    # stages that consume another stage's output are ordered after it.
+    #
+    # Stages generating from the messages read fixed copies, so what they see
+    # doesn't depend on which concurrent stage finished first: web search reads
+    # the messages as of the end of the memory stage, tools the messages once
+    # every context stage is done.
+
+    def copy_messages() -> list[dict]:
+        # Contents are updated in place; strings (e.g. images) are not copied
+        return copy.deepcopy(form_data["messages"])
+
+    context_messages = copy_messages()
+
+    async def memory_stage():
+        nonlocal form_data, context_messages
+        form_data = await chat_memory_handler(request, form_data, extra_params, user)
+        context_messages = copy_messages()
+
+    async def web_search_stage():
+        result = await chat_web_search_handler(
+            request, {**form_data, "messages": context_messages}, extra_params, user
+        )
+        if "files" in result:
+            form_data["files"] = result["files"]
 
-                    if not mcp_server_connection:
-                        log.error(f"MCP server with id {server_id} not found")
-                        continue
+    async def image_generation_stage():
+        nonlocal form_data
+        form_data = await chat_image_generation_handler(
+            request, form_data, extra_params, user
+        )
 
-                    auth_type = mcp_server_connection.get("auth_type", "")
-                    headers = {}
-                    if auth_type == "bearer":
-                        headers["Authorization"] = (
-                            f"Bearer {mcp_server_connection.get('key', '')}"
-                        )
-                    elif auth_type == "none":
-                        # No authentication
-                        pass
-                    elif auth_type == "session":
-                        headers["Authorization"] = (
-                            f"Bearer {request.state.token.credentials}"
+    async def code_interpreter_stage():
+        form_data["messages"] = add_or_update_user_message(
+            (
+                request.app.state.config.CODE_INTERPRETER_PROMPT_TEMPLATE
+                if request.app.state.config.CODE_INTERPRETER_PROMPT_TEMPLATE != ""
+                else DEFAULT_CODE_INTERPRETER_PROMPT
+            ),
+            form_data["messages"],
+        )
+
+    async def files_stage():
+        nonlocal metadata
+
+        files = form_data.pop("files", None)
+
+        # TODO: re-enable URL extraction from prompt
+        # urls = []
+        # if prompt and len(prompt or "") < 500 and (not files or len(files) == 0):
+        #     urls = extract_urls(prompt)
+
+        if files:
+            if not files:
+                files = []
+
+            for file_item in files:
+                if file_item.get("type", "file") == "folder":
+                    # Get folder files
+                    folder_id = file_item.get("id", None)
+                    if folder_id:
+                        folder = Folders.get_folder_by_id_and_user_id(
+                            folder_id, user.id
                         )
-                    elif auth_type == "system_oauth":
-                        oauth_token = extra_params.get("__oauth_token__", None)
-                        if oauth_token:
-                            headers["Authorization"] = (
-                                f"Bearer {oauth_token.get('access_token', '')}"
-                            )
-                    elif auth_type == "oauth_2.1":
-                        try:
-                            splits = server_id.split(":")
-                            server_id = splits[-1] if len(splits) > 1 else server_id
+                        if folder and folder.data and "files" in folder.data:
+                            files = [f for f in files if f.get("id", None) != folder_id]
+                            files = [*files, *folder.data["files"]]
+
+            # files = [*files, *[{"type": "url", "url": url, "name": url} for url in urls]]
+            # Remove duplicate files based on their content
+            files = list({json.dumps(f, sort_keys=True): f for f in files}.values())
+
+        metadata = {
+            **metadata,
+            "tool_ids": tool_ids,
+            "files": files,
+        }
+        form_data["metadata"] = metadata
 
-                            oauth_token = await request.app.state.oauth_client_manager.get_oauth_token(
-                                user.id, f"mcp:{server_id}"
-                            )
+    async def connect_mcp_server(tool_id) -> dict:
+        server_tools_dict = {}
+        server_id = tool_id[len("server:mcp:") :]
 
-                            if oauth_token:
-                                headers["Authorization"] = (
-                                    f"Bearer {oauth_token.get('access_token', '')}"
-                                )
-                        except Exception as e:
-                            log.error(f"Error getting OAuth token: {e}")
-                            oauth_token = None
-
-                    connection_headers = mcp_server_connection.get("headers", None)
-                    if connection_headers and isinstance(connection_headers, dict):
-                        for key, value in connection_headers.items():
-                            headers[key] = value
-
-                    mcp_clients[server_id] = MCPClient()
-                    await mcp_clients[server_id].connect(
-                        url=mcp_server_connection.get("url", ""),
-                        headers=headers if headers else None,
+        try:
+            mcp_server_connection = None
+            for server_connection in request.app.state.config.TOOL_SERVER_CONNECTIONS:
+                if (
+                    server_connection.get("type", "") == "mcp"
+                    and server_connection.get("info", {}).get("id") == server_id
+                ):
+                    mcp_server_connection = server_connection
+                    break
+
+            if not mcp_server_connection:
+                log.error(f"MCP server with id {server_id} not found")
+                return server_tools_dict
+
+            auth_type = mcp_server_connection.get("auth_type", "")
+            headers = {}
+            if auth_type == "bearer":
+                headers["Authorization"] = (
+                    f"Bearer {mcp_server_connection.get('key', '')}"
+                )
+            elif auth_type == "none":
+                # No authentication
+                pass
+            elif auth_type == "session":
+                headers["Authorization"] = f"Bearer {request.state.token.credentials}"
+            elif auth_type == "system_oauth":
+                oauth_token = extra_params.get("__oauth_token__", None)
+                if oauth_token:
+                    headers["Authorization"] = (
+                        f"Bearer {oauth_token.get('access_token', '')}"
                     )
+            elif auth_type == "oauth_2.1":
+                try:
+                    splits = server_id.split(":")
+                    server_id = splits[-1] if len(splits) > 1 else server_id
 
-                    function_name_filter_list = mcp_server_connection.get(
-                        "config", {}
-                    ).get("function_name_filter_list", "")
+                    oauth_token = (
+                        await request.app.state.oauth_client_manager.get_oauth_token(
+                            user.id, f"mcp:{server_id}"
+                        )
+                    )
 
-                    if isinstance(function_name_filter_list, str):
-                        function_name_filter_list = function_name_filter_list.split(",")
+                    if oauth_token:
+                        headers["Authorization"] = (
+                            f"Bearer {oauth_token.get('access_token', '')}"
+                        )
+                except Exception as e:
+                    log.error(f"Error getting OAuth token: {e}")
 
-                    tool_specs = await mcp_clients[server_id].list_tool_specs()
-                    for tool_spec in tool_specs:
+            connection_headers = mcp_server_connection.get("headers", None)
+            if connection_headers and isinstance(connection_headers, dict):
+                for key, value in connection_headers.items():
+                    headers[key] = value
 
-                        def make_tool_function(client, function_name):
-                            async def tool_function(**kwargs):
-                                return await client.call_tool(
-                                    function_name,
-                                    function_args=kwargs,
-                                )
+            mcp_clients[server_id] = MCPClient()
+            await mcp_clients[server_id].connect(
+                url=mcp_server_connection.get("url", ""),
+                headers=headers if headers else None,
+            )
 
-                            return tool_function
+            function_name_filter_list = mcp_server_connection.get("config", {}).get(
+                "function_name_filter_list", ""
+            )
 
-                        if function_name_filter_list:
-                            if not is_string_allowed(
-                                tool_spec["name"], function_name_filter_list
-                            ):
-                                # Skip this function
-                                continue
+            if isinstance(function_name_filter_list, str):
+                function_name_filter_list = function_name_filter_list.split(",")
 
-                        tool_function = make_tool_function(
-                            mcp_clients[server_id], tool_spec["name"]
+            tool_specs = await mcp_clients[server_id].list_tool_specs()
+            for tool_spec in tool_specs:
+
+                def make_tool_function(client, function_name):
+                    async def tool_function(**kwargs):
+                        return await client.call_tool(
+                            function_name,
+                            function_args=kwargs,
                         )
 
-                        mcp_tools_dict[f"{server_id}_{tool_spec['name']}"] = {
-                            "spec": {
-                                **tool_spec,
-                                "name": f"{server_id}_{tool_spec['name']}",
-                            },
-                            "callable": tool_function,
-                            "type": "mcp",
-                            "client": mcp_clients[server_id],
-                            "direct": False,
-                        }
-                except Exception as e:
-                    log.debug(e)
-                    if event_emitter:
-                        await event_emitter(
-                            {
-                                "type": "chat:message:error",
-                                "data": {
-                                    "error": {
-                                        "content": f"Failed to connect to MCP server '{server_id}'"
-                                    }
-                                },
+                    return tool_function
+
+                if function_name_filter_list:
+                    if not is_string_allowed(
+                        tool_spec["name"], function_name_filter_list
+                    ):
+                        # Skip this function
+                        continue
+
+                tool_function = make_tool_function(
+                    mcp_clients[server_id], tool_spec["name"]
+                )
+
+                server_tools_dict[f"{server_id}_{tool_spec['name']}"] = {
+                    "spec": {
+                        **tool_spec,
+                        "name": f"{server_id}_{tool_spec['name']}",
+                    },
+                    "callable": tool_function,
+                    "type": "mcp",
+                    "client": mcp_clients[server_id],
+                    "direct": False,
+                }
+        except Exception as e:
+            log.debug(e)
+            if event_emitter:
+                await event_emitter(
+                    {
+                        "type": "chat:message:error",
+                        "data": {
+                            "error": {
+                                "content": f"Failed to connect to MCP server '{server_id}'"
                             }
-                        )
-                    continue
+                        },
+                    }
+                )
 
-        tools_dict = await get_tools(
-            request,
-            tool_ids,
-            user,
-            {
-                **extra_params,
-                "__model__": models[task_model_id],
-                "__messages__": form_data["messages"],
-                "__files__": metadata.get("files", []),
-            },
+        return server_tools_dict
+
+    async def mcp_stage():
+        # Connect to every MCP server at once, merging in tool_ids order
+        results = await asyncio.gather(
+            *[
+                connect_mcp_server(tool_id)
+                for tool_id in tool_ids
+                if tool_id.startswith("server:mcp:")
+            ]
         )
+        for server_tools_dict in results:
+            mcp_tools_dict.update(server_tools_dict)
+
+    async def tools_stage():
+        nonlocal tools_dict
+
+        # Server side tools
+        if tool_ids:
+            tools_dict = await get_tools(
+                request,
+                tool_ids,
+                user,
+                {
+                    **extra_params,
+                    "__model__": models[task_model_id],
+                    "__messages__": copy_messages(),
+                    "__files__": metadata.get("files", []),
+                },
+            )
 
-        if mcp_tools_dict:
-            tools_dict = {**tools_dict, **mcp_tools_dict}
+            if mcp_tools_dict:
+                tools_dict = {**tools_dict, **mcp_tools_dict}
 
-    if direct_tool_servers:
-        for tool_server in direct_tool_servers:
-            tool_specs = tool_server.pop("specs", [])
+        if direct_tool_servers:
+            for tool_server in direct_tool_servers:
+                tool_specs = tool_server.pop("specs", [])
 
-            for tool in tool_specs:
-                tools_dict[tool["name"]] = {
-                    "spec": tool,
-                    "direct": True,
-                    "server": tool_server,
-                }
+                for tool in tool_specs:
+                    tools_dict[tool["name"]] = {
+                        "spec": tool,
+                        "direct": True,
+                        "server": tool_server,
+                    }
+
+        if mcp_clients:
+            metadata["mcp_clients"] = mcp_clients
 
-    if mcp_clients:
-        metadata["mcp_clients"] = mcp_clients
+    async def tool_calling_stage():
+        nonlocal form_data
+
+        if not tools_dict:
+            return
 
-    if tools_dict:
         if metadata.get("params", {}).get("function_calling") == "native":
             # If the function calling is native, then call the tools function calling handler
             metadata["tools"] = tools_dict
@@ -1561,13 +1630,86 @@ async def process_chat_payload(request, form_data, user, metadata, model):
             except Exception as e:
                 log.exception(e)
 
-    try:
-        form_data, flags = await chat_completion_files_handler(
-            request, form_data, extra_params, user
+    async def retrieval_stage():
+        nonlocal form_data
+
+        # Query generation and retrieval are ordered inside the files handler
+        try:
+            form_data, flags = await chat_completion_files_handler(
+                request, form_data, extra_params, user
+            )
+            sources.extend(flags.get("sources", []))
+        except Exception as e:
+            log.exception(e)
+
+    stages = []
+    context_stage_names = []
+
+    if features.get("memory"):
+        stages.append(Stage("memory", memory_stage))
+        context_stage_names.append("memory")
+
+    if features.get("web_search"):
+        stages.append(
+            Stage(
+                "web_search",
+                web_search_stage,
+                depends_on=["memory"] if features.get("memory") else [],
+            )
         )
-        sources.extend(flags.get("sources", []))
-    except Exception as e:
-        log.exception(e)
+        context_stage_names.append("web_search")
+
+    if features.get("image_generation"):
+        # Updates the messages, which must not happen before the memory stage
+        # took its copy
+        stages.append(
+            Stage(
+                "image_generation",
+                image_generation_stage,
+                depends_on=["memory"] if features.get("memory") else [],
+            )
+        )
+        context_stage_names.append("image_generation")
+
+    if features.get("code_interpreter"):
+        # Appended to the user message, so it must not leak into the queries
+        # generated by the stages above
+        stages.append(
+            Stage(
+                "code_interpreter",
+                code_interpreter_stage,
+                depends_on=list(context_stage_names),
+            )
+        )
+        context_stage_names.append("code_interpreter")
+
+    stages.append(
+        Stage(
+            "files",
+            files_stage,
+            depends_on=["web_search"] if features.get("web_search") else [],
+        )
+    )
+
+    # Tools get the messages with every context stage applied
+    tools_dependencies = ["files", *context_stage_names]
+    if tool_ids and any(tool_id.startswith("server:mcp:") for tool_id in tool_ids):
+        stages.append(Stage("mcp", mcp_stage))
+        tools_dependencies.append("mcp")
+
+    stages.append(Stage("tools", tools_stage, depends_on=tools_dependencies))
+    stages.append(
+        Stage(
+            "tool_calling",
+            tool_calling_stage,
+            depends_on=["tools"],
+        )
+    )
+    stages.append(Stage("retrieval", retrieval_stage, depends_on=["tool_calling"]))
+
+    await run_stages(stages, event_emitter=event_emitter)
+
+    prompt = get_last_user_message(form_data["messages"])
 
     # If context is not empty, insert it into the messages
     if len(sources) > 0:
@@ -1910,6 +2052,7 @@ async def process_chat_response(
                             metadata["message_id"],
                             {
                                 "error": {"content": error},
+                                "done": True,
                             },
                         )
                         if isinstance(error, str) or isinstance(error, dict):
@@ -1961,6 +2104,7 @@ async def process_chat_response(
                                 {
                                     "role": "assistant",
                                     "content": content,
+                                    "done": True,
                                 },
                             )
 
@@ -2051,12 +2195,7 @@ async def process_chat_response(
         "__request__": request,
         "__model__": model,
     }
-    filter_functions = [
-        Functions.get_function_by_id(filter_id)
-        for filter_id in get_sorted_filter_ids(
-            request, model, metadata.get("filter_ids", [])
-        )
-    ]
+    filter_functions = get_filter_chain(request, model, metadata.get("filter_ids", []))
 
     # Streaming response
     if event_emitter and event_caller:
@@ -2509,6 +2648,29 @@ async def process_chat_response(
                         ),
                     )
                     last_delta_data = None
+                    first_token = False
+
+                    async def emit_time_to_first_token():
+                        started_at = metadata.get("started_at")
+                        if started_at is None:
+                            return
+
+                        ttft = round((time.perf_counter() - started_at) * 1000, 2)
+                        log.debug(f"time to first token: {ttft}ms")
+                        trace.get_current_span().set_attribute(
+                            "chat.time_to_first_token_ms", ttft
+                        )
+                        await event_emitter(
+                            {
+                                "type": "status",
+                                "data": {
+                                    "action": "time_to_first_token",
+                                    "ttft": ttft,
+                                    "done": True,
+                                    "hidden": True,
+                                },
+                            }
+                        )
 
                     async def flush_pending_delta_data(threshold: int = 0):
                         nonlocal delta_count
@@ -2692,6 +2854,10 @@ async def process_chat_response(
                                         or delta.get("reasoning")
                                         or delta.get("thinking")
                                     )
+
+                                    if (value or reasoning_content) and not first_token:
+                                        first_token = True
+                                        await emit_time_to_first_token()
                                     if reasoning_content:
                                         if (
                                             not content_blocks
@@ -3259,15 +3425,16 @@ async def process_chat_response(
                     "title": title,
                 }
 
-                if not ENABLE_REALTIME_CHAT_SAVE:
-                    # Save message in the database
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
-                        metadata["chat_id"],
-                        metadata["message_id"],
-                        {
-                            "content": serialize_content_blocks(content_blocks),
-                        },
-                    )
+                # Save the finished message in the database, which also counts
+                # it in the usage stats
+                Chats.upsert_message_to_chat_by_id_and_message_id(
+                    metadata["chat_id"],
+                    metadata["message_id"],
+                    {
+                        "content": serialize_content_blocks(content_blocks),
+                        "done": True,
+                    },
+                )
 
                 # Send a webhook notification if the user is not active
                 if not Users.is_user_active(user.id):
@@ -3297,15 +3464,15 @@ async def process_chat_response(
                 log.warning("Task was cancelled!")
                 await event_emitter({"type": "chat:tasks:cancel"})
 
-                if not ENABLE_REALTIME_CHAT_SAVE:
-                    # Save message in the database
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
-                        metadata["chat_id"],
-                        metadata["message_id"],
-                        {
-                            "content": serialize_content_blocks(content_blocks),
-                        },
-                    )
+                # Save the stopped message in the database
+                Chats.upsert_message_to_chat_by_id_and_message_id(
+                    metadata["chat_id"],
+                    metadata["message_id"],
+                    {
+                        "content": serialize_content_blocks(content_blocks),
+                        "done": True,
+                    },
+                )
 
             if response.background is not None:
                 await response.background()
@@ -17,6 +17,8 @@ from open_webui.models.groups import Groups
 
 
 from open_webui.utils.plugin import (
+    REQUIREMENTS_INSTALLER,
+    RequirementsNotReadyError,
     load_function_module_by_id,
     get_function_module_from_cache,
 )
@@ -87,7 +89,11 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
         base_models = request.app.state.BASE_MODELS
     else:
         base_models = await get_all_base_models(request, user=user)
-        request.app.state.BASE_MODELS = base_models
+        # Pipes are left out while their requirements are installed, listed
+        # again afterwards
+        request.app.state.BASE_MODELS = (
+            [] if REQUIREMENTS_INSTALLER.is_busy() else base_models
+        )
 
     # deep copy the base models to avoid modifying the original list
     models = [model.copy() for model in base_models]
@@ -287,7 +293,11 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
         ]
 
     def get_function_module_by_id(function_id):
-        function_module, _, _ = get_function_module_from_cache(request, function_id)
+        try:
+            function_module, _, _ = get_function_module_from_cache(request, function_id)
+        except RequirementsNotReadyError as e:
+            log.warning(f"Skipping function {function_id}: {e}")
+            return None
         return function_module
 
     for model in models:
@@ -309,6 +319,8 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
                 raise Exception(f"Action not found: {action_id}")
 
             function_module = get_function_module_by_id(action_id)
+            if function_module is None:
+                continue
             model["actions"].extend(
                 get_action_items_from_module(action_function, function_module)
             )
@@ -321,7 +333,7 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
 
             function_module = get_function_module_by_id(filter_id)
 
-            if getattr(function_module, "toggle", None):
+            if function_module is not None and getattr(function_module, "toggle", None):
                 model["filters"].extend(
                     get_filter_items_from_module(filter_function, function_module)
                 )
@@ -1,3 +1,4 @@
+import asyncio
 import base64
 import copy
 import hashlib
@@ -28,7 +29,7 @@ from typing import Optional
 
 
 from open_webui.models.auths import Auths
-from open_webui.models.oauth_sessions import OAuthSessions
+from open_webui.models.oauth_sessions import OAuthSessions, OAuthSessionModel
 from open_webui.models.users import Users
 
 
@@ -69,6 +70,9 @@ from open_webui.env import (
     ENABLE_OAUTH_ID_TOKEN_COOKIE,
     ENABLE_OAUTH_EMAIL_FALLBACK,
     OAUTH_CLIENT_INFO_ENCRYPTION_KEY,
+    OAUTH_SESSION_CACHE_TTL,
+    OAUTH_TOKEN_REFRESH_INTERVAL,
+    REDIS_KEY_PREFIX,
 )
 from open_webui.utils.misc import parse_duration
 from open_webui.utils.auth import get_password_hash, create_token
@@ -400,6 +404,230 @@ async def get_oauth_client_info_with_dynamic_client_registration(
         raise e
 
 
+####################
+# OAuth session cache
+####################
+
+# Seconds before expiry from which a token is refreshed when used
+OAUTH_TOKEN_REFRESH_LEEWAY = 300
+
+# Seconds a worker waits for a token being refreshed by another worker
+OAUTH_TOKEN_REFRESH_TIMEOUT = 30
+
+# Seconds after its last use that a session is kept refreshed in the background
+OAUTH_SESSION_ACTIVE_WINDOW = 3600
+
+
+def is_token_expiring(
+    session: OAuthSessionModel, leeway: int = OAUTH_TOKEN_REFRESH_LEEWAY
+) -> bool:
+    return time.time() + leeway >= session.expires_at
+
+
+def load_oauth_session(key: tuple) -> Optional[OAuthSessionModel]:
+    """
+    The session of a cache key, ("session", session_id, user_id) for login
+    sessions or ("client", client_id, user_id) for tool server clients.
+    """
+    kind, id, user_id = key
+    if kind == "session":
+        return OAuthSessions.get_session_by_id_and_user_id(id, user_id)
+    return OAuthSessions.get_session_by_provider_and_user_id(id, user_id)
+
+
+class OAuthSessionCache:
+    """
+    Decrypted OAuth sessions, reused for OAUTH_SESSION_CACHE_TTL seconds so
+    that forwarding a token does not read and decrypt its session each time.
+
+    Refreshes are single-flight per session: concurrent callers wait for the
+    one refreshing, through a lock within the worker and a Redis lock across
+    workers, then use the token it stored.
+
+    Entries are dropped once expired, unless used within `active_window`
+    seconds, which keeps them for the background refresh loop.
+    """
+
+    def __init__(
+        self,
+        ttl: int = OAUTH_SESSION_CACHE_TTL,
+        active_window: int = (
+            OAUTH_SESSION_ACTIVE_WINDOW if OAUTH_TOKEN_REFRESH_INTERVAL else 0
+        ),
+    ):
+        self.ttl = ttl
+        self.active_window = active_window
+        # Key -> [session, loaded at, last used at]
+        self.entries: dict[tuple, list] = {}
+        self.locks: dict[str, asyncio.Lock] = {}
+        self.pruned_at = time.time()
+
+    def prune(self, force: bool = False):
+        """Forget expired, inactive entries; at most once per TTL unless forced."""
+        now = time.time()
+        if not force and now - self.pruned_at < max(self.ttl, 1):
+            return
+        self.pruned_at = now
+
+        for key, entry in list(self.entries.items()):
+            if now - entry[1] >= self.ttl and now - entry[2] > self.active_window:
+                del self.entries[key]
+
+        ids = {entry[0].id for entry in self.entries.values()}
+        for id, lock in list(self.locks.items()):
+            if id not in ids and not lock.locked():
+                del self.locks[id]
+
+    def get(self, key: tuple) -> Optional[OAuthSessionModel]:
+        self.prune()
+
+        entry = self.entries.get(key)
+        now = time.time()
+        if entry is None or now - entry[1] >= self.ttl:
+            return None
+
+        entry[2] = now
+        return entry[0]
+
+    def load(self, key: tuple) -> Optional[OAuthSessionModel]:
+        self.prune()
+
+        session = load_oauth_session(key)
+        if session is None:
+            self.entries.pop(key, None)
+        else:
+            used_at = self.entries[key][2] if key in self.entries else time.time()
+            self.entries[key] = [session, time.time(), used_at]
+        return session
+
+    def delete(self, session_id: str):
+        for key, entry in list(self.entries.items()):
+            if entry[0].id == session_id:
+                del self.entries[key]
+
+    def get_active_sessions(self) -> list[tuple[tuple, OAuthSessionModel]]:
+        """The sessions used within the active window, forgetting the others."""
+        now = time.time()
+        for key, entry in list(self.entries.items()):
+            if now - entry[2] > self.active_window:
+                del self.entries[key]
+        self.prune(force=True)
+
+        return [(key, entry[0]) for key, entry in self.entries.items()]
+
+    async def refresh(
+        self,
+        redis,
+        key: tuple,
+        session: OAuthSessionModel,
+        perform,
+        force: bool = False,
+        leeway: int = OAUTH_TOKEN_REFRESH_LEEWAY,
+    ) -> Optional[OAuthSessionModel]:
+        """
+        Refresh the token of `session` with `perform` if it expires within
+        `leeway` seconds, unless it was refreshed since it was read. Returns
+        the current session, or None if the refresh failed or the session is
+        gone.
+        """
+        lock = self.locks.setdefault(session.id, asyncio.Lock())
+        async with lock:
+            current = self.load(key)
+            if current is None:
+                return None
+            if current.token != session.token or not (
+                force or is_token_expiring(current, leeway)
+            ):
+                # Refreshed meanwhile, by this or another worker
+                return current
+
+            lock_key = f"{REDIS_KEY_PREFIX}:oauth:refresh:{current.id}"
+            lock_value = secrets.token_hex(8)
+            if redis is not None:
+                try:
+                    if not await redis.set(
+                        lock_key,
+                        lock_value,
+                        nx=True,
+                        ex=OAUTH_TOKEN_REFRESH_TIMEOUT,
+                    ):
+                        return await self.wait_for_refresh(redis, key, current)
+                except Exception as e:
+                    log.warning(f"Failed to lock the refresh of {current.id}: {e}")
+                    redis = None
+
+            try:
+                token = await perform(current)
+                if not token:
+                    return None
+
+                refreshed = OAuthSessions.update_session_by_id(current.id, token)
+                if refreshed is not None:
+                    self.entries[key] = [refreshed, time.time(), time.time()]
+                return refreshed
+            finally:
+                if redis is not None:
+                    try:
+                        if await redis.get(lock_key) == lock_value:
+                            await redis.delete(lock_key)
+                    except Exception as e:
+                        log.debug(f"Failed to unlock the refresh of {current.id}: {e}")
+
+    async def wait_for_refresh(
+        self, redis, key: tuple, session: OAuthSessionModel
+    ) -> Optional[OAuthSessionModel]:
+        lock_key = f"{REDIS_KEY_PREFIX}:oauth:refresh:{session.id}"
+        deadline = time.time() + OAUTH_TOKEN_REFRESH_TIMEOUT
+        while time.time() < deadline:
+            await asyncio.sleep(0.25)
+
+            current = self.load(key)
+            if current is None or current.token != session.token:
+                return current
+            if not await redis.exists(lock_key):
+                break
+
+        # Not refreshed in time, the token may still be accepted
+        return session
+
+
+OAUTH_SESSION_CACHE = OAuthSessionCache()
+
+
+async def oauth_token_refresh_loop(app, interval: int = OAUTH_TOKEN_REFRESH_INTERVAL):
+    """
+    Refresh the tokens used recently by this worker before they come within
+    the refresh leeway, so requests do not wait on the identity provider.
+    """
+    if not interval:
+        return
+
+    while True:
+        await asyncio.sleep(interval)
+
+        for key, session in OAUTH_SESSION_CACHE.get_active_sessions():
+            if not session.token.get("refresh_token") or not is_token_expiring(
+                session, OAUTH_TOKEN_REFRESH_LEEWAY + interval
+            ):
+                continue
+
+            manager = (
+                app.state.oauth_manager
+                if key[0] == "session"
+                else app.state.oauth_client_manager
+            )
+            try:
+                await OAUTH_SESSION_CACHE.refresh(
+                    getattr(app.state, "redis", None),
+                    key,
+                    session,
+                    manager._perform_token_refresh,
+                    leeway=OAUTH_TOKEN_REFRESH_LEEWAY + interval,
+                )
+            except Exception as e:
+                log.error(f"Error refreshing token for session {session.id}: {e}")
+
+
 class OAuthClientManager:
     def __init__(self, app):
         self.oauth = OAuth()
@@ -614,22 +842,19 @@ class OAuthClientManager:
         """
         try:
             # Get the OAuth session
-            session = OAuthSessions.get_session_by_provider_and_user_id(
-                client_id, user_id
-            )
+            key = ("client", client_id, user_id)
+            session = OAUTH_SESSION_CACHE.get(key) or OAUTH_SESSION_CACHE.load(key)
             if not session:
                 log.warning(
                     f"No OAuth session found for user {user_id}, client_id {client_id}"
                 )
                 return None
 
-            if force_refresh or datetime.now() + timedelta(
-                minutes=5
-            ) >= datetime.fromtimestamp(session.expires_at):
+            if force_refresh or is_token_expiring(session):
                 log.debug(
                     f"Token refresh needed for user {user_id}, client_id {session.provider}"
                 )
-                refreshed_token = await self._refresh_token(session)
+                refreshed_token = await self._refresh_token(session, key, force_refresh)
                 if refreshed_token:
                     return refreshed_token
                 else:
@@ -637,6 +862,7 @@ class OAuthClientManager:
                         f"Token refresh failed for user {user_id}, client_id {session.provider}, deleting session {session.id}"
                     )
                     OAuthSessions.delete_session_by_id(session.id)
+                    OAUTH_SESSION_CACHE.delete(session.id)
                     return None
             return session.token
 
@@ -644,27 +870,33 @@ class OAuthClientManager:
             log.error(f"Error getting OAuth token for user {user_id}: {e}")
             return None
 
-    async def _refresh_token(self, session) -> dict:
+    async def _refresh_token(
+        self, session, key: tuple, force_refresh: bool = False
+    ) -> dict:
         """
         Refresh an OAuth token if needed, with concurrency protection.
 
         Args:
             session: The OAuth session object
+            key: The session cache key
+            force_refresh: Refresh even if the token is not about to expire
 
         Returns:
             dict: Refreshed token data, or None if refresh failed
         """
         try:
-            # Perform the actual refresh
-            refreshed_token = await self._perform_token_refresh(session)
+            # Single-flight refresh, or the token refreshed meanwhile
+            refreshed_session = await OAUTH_SESSION_CACHE.refresh(
+                getattr(self.app.state, "redis", None),
+                key,
+                session,
+                self._perform_token_refresh,
+                force=force_refresh,
+            )
 
-            if refreshed_token:
-                # Update the session with new token data
-                session = OAuthSessions.update_session_by_id(
-                    session.id, refreshed_token
-                )
-                log.info(f"Successfully refreshed token for session {session.id}")
-                return session.token
+            if refreshed_session:
+                log.info(f"Refreshed token for session {refreshed_session.id}")
+                return refreshed_session.token
             else:
                 log.error(f"Failed to refresh token for session {session.id}")
                 return None
@@ -822,6 +1054,7 @@ class OAuthClientManager:
                     for session in sessions:
                         if session.provider == client_id:
                             OAuthSessions.delete_session_by_id(session.id)
+                            OAUTH_SESSION_CACHE.delete(session.id)
 
                     session = OAuthSessions.create_session(
                         user_id=user_id,
@@ -909,20 +1142,19 @@ class OAuthManager:
         """
         try:
             # Get the OAuth session
-            session = OAuthSessions.get_session_by_id_and_user_id(session_id, user_id)
+            key = ("session", session_id, user_id)
+            session = OAUTH_SESSION_CACHE.get(key) or OAUTH_SESSION_CACHE.load(key)
             if not session:
                 log.warning(
                     f"No OAuth session found for user {user_id}, session {session_id}"
                 )
                 return None
 
-            if force_refresh or datetime.now() + timedelta(
-                minutes=5
-            ) >= datetime.fromtimestamp(session.expires_at):
+            if force_refresh or is_token_expiring(session):
                 log.debug(
                     f"Token refresh needed for user {user_id}, provider {session.provider}"
                 )
-                refreshed_token = await self._refresh_token(session)
+                refreshed_token = await self._refresh_token(session, key, force_refresh)
                 if refreshed_token:
                     return refreshed_token
                 else:
@@ -930,6 +1162,7 @@ class OAuthManager:
                         f"Token refresh failed for user {user_id}, provider {session.provider}, deleting session {session.id}"
                     )
                     OAuthSessions.delete_session_by_id(session.id)
+                    OAUTH_SESSION_CACHE.delete(session.id)
 
                     return None
             return session.token
@@ -938,27 +1171,33 @@ class OAuthManager:
             log.error(f"Error getting OAuth token for user {user_id}: {e}")
             return None
 
-    async def _refresh_token(self, session) -> dict:
+    async def _refresh_token(
+        self, session, key: tuple, force_refresh: bool = False
+    ) -> dict:
         """
         Refresh an OAuth token if needed, with concurrency protection.
 
         Args:
             session: The OAuth session object
+            key: The session cache key
+            force_refresh: Refresh even if the token is not about to expire
 
         Returns:
             dict: Refreshed token data, or None if refresh failed
         """
         try:
-            # Perform the actual refresh
-            refreshed_token = await self._perform_token_refresh(session)
+            # Single-flight refresh, or the token refreshed meanwhile
+            refreshed_session = await OAUTH_SESSION_CACHE.refresh(
+                getattr(self.app.state, "redis", None),
+                key,
+                session,
+                self._perform_token_refresh,
+                force=force_refresh,
+            )
 
-            if refreshed_token:
-                # Update the session with new token data
-                session = OAuthSessions.update_session_by_id(
-                    session.id, refreshed_token
-                )
-                log.info(f"Successfully refreshed token for session {session.id}")
-                return session.token
+            if refreshed_session:
+                log.info(f"Refreshed token for session {refreshed_session.id}")
+                return refreshed_session.token
             else:
                 log.error(f"Failed to refresh token for session {session.id}")
                 return None
@@ -1620,6 +1859,7 @@ class OAuthManager:
             for session in sessions:
                 if session.provider == provider:
                     OAuthSessions.delete_session_by_id(session.id)
+                    OAUTH_SESSION_CACHE.delete(session.id)
 
             session = OAuthSessions.create_session(
                 user_id=user.id,
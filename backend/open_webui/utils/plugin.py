@@ -1,18 +1,36 @@
+import asyncio
+import hashlib
+import importlib
+import json
 import os
+import queue
 import re
 import subprocess
 import sys
+import threading
+import time
+from dataclasses import dataclass
 from importlib import util
+from pathlib import Path
 import types
 import tempfile
 import logging
-
-from open_webui.env import PIP_OPTIONS, PIP_PACKAGE_INDEX_OPTIONS
+from typing import Callable, Optional
+
+from open_webui.env import (
+    PIP_OPTIONS,
+    PIP_PACKAGE_INDEX_OPTIONS,
+    PIP_WHEEL_CACHE_DIR,
+    PLUGIN_MODULE_CACHE_TTL,
+    REDIS_KEY_PREFIX,
+)
 from open_webui.models.functions import Functions
 from open_webui.models.tools import Tools
 
 log = logging.getLogger(__name__)
 
+PLUGIN_INVALIDATION_CHANNEL = f"{REDIS_KEY_PREFIX}:plugins:invalidate"
+
 
 def extract_frontmatter(content):
     """
@@ -80,8 +98,10 @@ def load_tool_module_by_id(tool_id, content=None):
         Tools.update_tool_by_id(tool_id, {"content": content})
     else:
         frontmatter = extract_frontmatter(content)
-        # Install required packages found within the frontmatter
-        install_frontmatter_requirements(frontmatter.get("requirements", ""))
+        # Required packages found within the frontmatter must be installed
+        ensure_frontmatter_requirements(
+            frontmatter.get("requirements", ""), f"tool:{tool_id}"
+        )
 
     module_name = f"tool_{tool_id}"
     module = types.ModuleType(module_name)
@@ -125,7 +145,9 @@ def load_function_module_by_id(function_id: str, content: str | None = None):
         Functions.update_function_by_id(function_id, {"content": content})
     else:
         frontmatter = extract_frontmatter(content)
-        install_frontmatter_requirements(frontmatter.get("requirements", ""))
+        ensure_frontmatter_requirements(
+            frontmatter.get("requirements", ""), f"function:{function_id}"
+        )
 
     module_name = f"function_{function_id}"
     module = types.ModuleType(module_name)
@@ -165,147 +187,470 @@ def load_function_module_by_id(function_id: str, content: str | None = None):
         os.unlink(temp_file.name)
 
 
-def get_tool_module_from_cache(request, tool_id, load_from_db=True):
-    if load_from_db:
-        # Always load from the database by default
-        tool = Tools.get_tool_by_id(tool_id)
-        if not tool:
-            raise Exception(f"Tool not found: {tool_id}")
-        content = tool.content
+####################
+# Module cache
+####################
 
-        new_content = replace_imports(content)
-        if new_content != content:
-            content = new_content
-            # Update the tool content in the database
-            Tools.update_tool_by_id(tool_id, {"content": content})
-
-        if (
-            hasattr(request.app.state, "TOOL_CONTENTS")
-            and tool_id in request.app.state.TOOL_CONTENTS
-        ) and (
-            hasattr(request.app.state, "TOOLS") and tool_id in request.app.state.TOOLS
-        ):
-            if request.app.state.TOOL_CONTENTS[tool_id] == content:
-                return request.app.state.TOOLS[tool_id], None
-
-        tool_module, frontmatter = load_tool_module_by_id(tool_id, content)
-    else:
-        if hasattr(request.app.state, "TOOLS") and tool_id in request.app.state.TOOLS:
-            return request.app.state.TOOLS[tool_id], None
 
-        tool_module, frontmatter = load_tool_module_by_id(tool_id)
+@dataclass
+class PluginModuleVersion:
+    """
+    What a cached module was loaded from: the row's `updated_at` and a hash
+    of its content, read in second `loaded_at`.
+    """
+
+    updated_at: int
+    content_hash: str
+    loaded_at: int
+    validated_at: float
 
-    if not hasattr(request.app.state, "TOOLS"):
-        request.app.state.TOOLS = {}
 
-    if not hasattr(request.app.state, "TOOL_CONTENTS"):
-        request.app.state.TOOL_CONTENTS = {}
+def get_content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode()).hexdigest()
 
-    request.app.state.TOOLS[tool_id] = tool_module
-    request.app.state.TOOL_CONTENTS[tool_id] = content
 
-    return tool_module, frontmatter
+def is_module_current(
+    version: PluginModuleVersion,
+    get_updated_at: Callable[[], Optional[int]],
+    get_content: Callable[[], Optional[str]],
+) -> bool:
+    """
+    Whether a cached module is still current. Within PLUGIN_MODULE_CACHE_TTL
+    of the last check it is taken as current without reading the DB; changes
+    made through this app evict it from every worker before that.
 
+    Otherwise the `updated_at` stamp is compared, and the content hash only
+    if the stamp moved (e.g. for a valves update) or is from the same second
+    the content was read, when it cannot tell two versions apart.
+    """
+    now = time.time()
+    if now - version.validated_at < PLUGIN_MODULE_CACHE_TTL:
+        return True
 
-def get_function_module_from_cache(request, function_id, load_from_db=True):
-    if load_from_db:
-        # Always load from the database by default
-        # This is useful for hooks like "inlet" or "outlet" where the content might change
-        # and we want to ensure the latest content is used.
+    updated_at = get_updated_at()
+    if updated_at is None:
+        return False
 
-        function = Functions.get_function_by_id(function_id)
-        if not function:
-            raise Exception(f"Function not found: {function_id}")
-        content = function.content
+    if updated_at != version.updated_at or updated_at >= version.loaded_at:
+        loaded_at = int(now)
+        content = get_content()
+        if content is None or get_content_hash(content) != version.content_hash:
+            return False
 
-        new_content = replace_imports(content)
-        if new_content != content:
-            content = new_content
-            # Update the function content in the database
-            Functions.update_function_by_id(function_id, {"content": content})
+        version.updated_at = updated_at
+        version.loaded_at = loaded_at
 
-        if (
-            hasattr(request.app.state, "FUNCTION_CONTENTS")
-            and function_id in request.app.state.FUNCTION_CONTENTS
-        ) and (
-            hasattr(request.app.state, "FUNCTIONS")
-            and function_id in request.app.state.FUNCTIONS
-        ):
-            if request.app.state.FUNCTION_CONTENTS[function_id] == content:
-                return request.app.state.FUNCTIONS[function_id], None, None
-
-        function_module, function_type, frontmatter = load_function_module_by_id(
-            function_id, content
-        )
-    else:
-        # Load from cache (e.g. "stream" hook)
-        # This is useful for performance reasons
+    version.validated_at = now
+    return True
 
-        if (
-            hasattr(request.app.state, "FUNCTIONS")
-            and function_id in request.app.state.FUNCTIONS
-        ):
-            return request.app.state.FUNCTIONS[function_id], None, None
 
-        function_module, function_type, frontmatter = load_function_module_by_id(
-            function_id
+def get_state_dict(app, name: str) -> dict:
+    if not hasattr(app.state, name):
+        setattr(app.state, name, {})
+    return getattr(app.state, name)
+
+
+def get_tool_module_from_cache(request, tool_id, load_from_db=True):
+    """
+    The loaded module of a tool. With `load_from_db`, a cached module is
+    checked to still match the tool in the DB, see `is_module_current`.
+    """
+    modules = get_state_dict(request.app, "TOOLS")
+    versions = get_state_dict(request.app, "TOOL_VERSIONS")
+
+    tool_module = modules.get(tool_id)
+    version = versions.get(tool_id)
+    if tool_module is not None and (
+        not load_from_db
+        or (
+            version is not None
+            and is_module_current(
+                version,
+                lambda: Tools.get_tool_updated_at_by_id(tool_id),
+                lambda: getattr(Tools.get_tool_by_id(tool_id), "content", None),
+            )
         )
+    ):
+        return tool_module, None
+
+    loaded_at = int(time.time())
+    tool = Tools.get_tool_by_id(tool_id)
+    if not tool:
+        raise Exception(f"Tool not found: {tool_id}")
+    content = tool.content
+
+    new_content = replace_imports(content)
+    if new_content != content:
+        content = new_content
+        # Update the tool content in the database
+        tool = Tools.update_tool_by_id(tool_id, {"content": content}) or tool
+
+    tool_module, frontmatter = load_tool_module_by_id(tool_id, content)
+
+    modules[tool_id] = tool_module
+    versions[tool_id] = PluginModuleVersion(
+        tool.updated_at, get_content_hash(content), loaded_at, time.time()
+    )
 
-    if not hasattr(request.app.state, "FUNCTIONS"):
-        request.app.state.FUNCTIONS = {}
+    return tool_module, frontmatter
+
+
+def get_function_module_from_cache(request, function_id, load_from_db=True):
+    """
+    The loaded module of a function. With `load_from_db`, e.g. for hooks like
+    "inlet" or "outlet" where the content might change, a cached module is
+    checked to still match the function in the DB, see `is_module_current`.
+    """
+    modules = get_state_dict(request.app, "FUNCTIONS")
+    versions = get_state_dict(request.app, "FUNCTION_VERSIONS")
+
+    function_module = modules.get(function_id)
+    version = versions.get(function_id)
+    if function_module is not None and (
+        not load_from_db
+        or (
+            version is not None
+            and is_module_current(
+                version,
+                lambda: Functions.get_function_updated_at_by_id(function_id),
+                lambda: getattr(
+                    Functions.get_function_by_id(function_id), "content", None
+                ),
+            )
+        )
+    ):
+        return function_module, None, None
+
+    loaded_at = int(time.time())
+    function = Functions.get_function_by_id(function_id)
+    if not function:
+        raise Exception(f"Function not found: {function_id}")
+    content = function.content
+
+    new_content = replace_imports(content)
+    if new_content != content:
+        content = new_content
+        # Update the function content in the database
+        function = (
+            Functions.update_function_by_id(function_id, {"content": content})
+            or function
+        )
 
-    if not hasattr(request.app.state, "FUNCTION_CONTENTS"):
-        request.app.state.FUNCTION_CONTENTS = {}
+    function_module, function_type, frontmatter = load_function_module_by_id(
+        function_id, content
+    )
 
-    request.app.state.FUNCTIONS[function_id] = function_module
-    request.app.state.FUNCTION_CONTENTS[function_id] = content
+    modules[function_id] = function_module
+    versions[function_id] = PluginModuleVersion(
+        function.updated_at, get_content_hash(content), loaded_at, time.time()
+    )
 
     return function_module, function_type, frontmatter
 
 
-def install_frontmatter_requirements(requirements: str):
-    if requirements:
+def evict_plugin_module(app, type: str, id: str):
+    """Drop a cached function or tool module of this worker."""
+    if type == "function":
+        modules, versions = "FUNCTIONS", "FUNCTION_VERSIONS"
+    else:
+        modules, versions = "TOOLS", "TOOL_VERSIONS"
+
+    get_state_dict(app, modules).pop(id, None)
+    get_state_dict(app, versions).pop(id, None)
+
+
+async def invalidate_plugin_module(request, type: str, id: str):
+    """
+    Drop a cached function or tool module after it was changed or deleted,
+    in this worker and, through Redis, in all others.
+    """
+    evict_plugin_module(request.app, type, id)
+
+    redis = getattr(request.app.state, "redis", None)
+    if redis is not None:
         try:
-            req_list = [req.strip() for req in requirements.split(",")]
-            log.info(f"Installing requirements: {' '.join(req_list)}")
-            subprocess.check_call(
-                [sys.executable, "-m", "pip", "install"]
-                + PIP_OPTIONS
-                + req_list
-                + PIP_PACKAGE_INDEX_OPTIONS
+            await redis.publish(
+                PLUGIN_INVALIDATION_CHANNEL, json.dumps({"type": type, "id": id})
             )
         except Exception as e:
-            log.error(f"Error installing packages: {' '.join(req_list)}")
-            raise e
+            log.warning(f"Failed to broadcast the change of {type} {id}: {e}")
 
+
+async def plugin_invalidation_listener(app):
+    pubsub = app.state.redis.pubsub()
+    await pubsub.subscribe(PLUGIN_INVALIDATION_CHANNEL)
+
+    async for message in pubsub.listen():
+        if message["type"] != "message":
+            continue
+        try:
+            data = json.loads(message["data"])
+            evict_plugin_module(app, data["type"], data["id"])
+        except Exception as e:
+            log.exception(f"Error handling plugin invalidation: {e}")
+
+
+####################
+# Requirements
+####################
+
+# Seconds before a failed requirement set is retried when a module needs it
+REQUIREMENTS_RETRY_INTERVAL = 300
+
+
+class RequirementsNotReadyError(Exception):
+    pass
+
+
+def parse_requirements(requirements: Optional[str]) -> tuple[str, ...]:
+    """The deduplicated, sorted requirements of a frontmatter `requirements`."""
+    return tuple(
+        sorted({req.strip() for req in (requirements or "").split(",") if req.strip()})
+    )
+
+
+def are_requirements_satisfied(requirements: tuple[str, ...]) -> bool:
+    """
+    Whether all requirements are already installed in a matching version,
+    so that pip need not run. Requirements that cannot be checked, e.g. URLs,
+    count as unsatisfied.
+    """
+    from importlib.metadata import PackageNotFoundError, version
+
+    from packaging.requirements import Requirement
+
+    for requirement in requirements:
+        try:
+            requirement = Requirement(requirement)
+        except Exception:
+            return False
+
+        if requirement.marker and not requirement.marker.evaluate():
+            continue
+        if requirement.url:
+            return False
+
+        try:
+            installed = version(requirement.name)
+        except PackageNotFoundError:
+            return False
+
+        if not requirement.specifier.contains(installed, prereleases=True):
+            return False
+
+    return True
+
+
+class RequirementsInstaller:
+    """
+    Installs the requirements of functions and tools on a background thread,
+    so loading a module never runs pip inline.
+
+    Each distinct requirement set is installed once, whatever the number of
+    functions and tools declaring it. Wheels are built into `wheel_dir` and
+    installed from there, so with the directory on a shared volume, other
+    workers and pods install without downloading or building. Installs are
+    serialized across the processes of a host with a file lock.
+    """
+
+    def __init__(self, wheel_dir: str):
+        self.wheel_dir = Path(wheel_dir)
+        self.ready: set[tuple[str, ...]] = set()
+        self.status: dict[tuple[str, ...], dict] = {}
+        self.events: dict[tuple[str, ...], threading.Event] = {}
+        self.lock = threading.Lock()
+        self.queue: queue.Queue = queue.Queue()
+        self.thread: Optional[threading.Thread] = None
+        # Last error output of pip
+        self.error: Optional[str] = None
+
+    def is_ready(self, requirements: tuple[str, ...]) -> bool:
+        if not requirements or requirements in self.ready:
+            return True
+        if are_requirements_satisfied(requirements):
+            self.ready.add(requirements)
+            return True
+        return False
+
+    def submit(self, requirements: tuple[str, ...], source: Optional[str] = None):
+        """Queue a requirement set unless it is queued or failed recently."""
+        with self.lock:
+            entry = self.status.get(requirements)
+            if entry is None or (
+                entry["status"] == "failed"
+                and time.time() - entry["finished_at"] > REQUIREMENTS_RETRY_INTERVAL
+            ):
+                entry = {
+                    "requirements": list(requirements),
+                    "status": "pending",
+                    "sources": [],
+                    "error": None,
+                    "queued_at": int(time.time()),
+                    "finished_at": None,
+                }
+                self.status[requirements] = entry
+                self.events[requirements] = threading.Event()
+                self.queue.put(requirements)
+
+                if self.thread is None or not self.thread.is_alive():
+                    self.thread = threading.Thread(
+                        target=self.run, name="requirements-installer", daemon=True
+                    )
+                    self.thread.start()
+
+            if source and source not in entry["sources"]:
+                entry["sources"].append(source)
+            return entry
+
+    def wait(self, requirements: tuple[str, ...], timeout: Optional[float] = None):
+        self.events[requirements].wait(timeout)
+        return self.status[requirements]
+
+    def get_status(self) -> list[dict]:
+        with self.lock:
+            return [dict(entry) for entry in self.status.values()]
+
+    def is_busy(self) -> bool:
+        """Whether any requirement set is still waiting for or being installed."""
+        with self.lock:
+            return any(
+                entry["status"] in ("pending", "installing")
+                for entry in self.status.values()
+            )
+
+    def run(self):
+        while True:
+            requirements = self.queue.get()
+            entry = self.status[requirements]
+            entry["status"] = "installing"
+
+            try:
+                self.install(requirements)
+                self.ready.add(requirements)
+                entry["status"] = "installed"
+            except Exception as e:
+                log.error(f"Error installing packages: {' '.join(requirements)}: {e}")
+                entry["status"] = "failed"
+                entry["error"] = str(e)
+            finally:
+                entry["finished_at"] = int(time.time())
+                self.events[requirements].set()
+
+    def pip(self, *args: str, index: bool = True) -> bool:
+        result = subprocess.run(
+            [sys.executable, "-m", "pip", *args]
+            + PIP_OPTIONS
+            + (PIP_PACKAGE_INDEX_OPTIONS if index else []),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        if result.returncode != 0:
+            log.debug(f"pip {args[0]} failed: {result.stderr}")
+            self.error = (result.stderr.strip().splitlines() or [None])[-1]
+        return result.returncode == 0
+
+    def install(self, requirements: tuple[str, ...]):
+        self.wheel_dir.mkdir(parents=True, exist_ok=True)
+
+        # Workers of this host share the environment, pods have their own
+        lock_path = Path(tempfile.gettempdir()) / "open-webui-requirements.lock"
+        with open(lock_path, "w") as lock_file:
+            try:
+                import fcntl
+
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            except ImportError:
+                pass
+
+            # Possibly installed by another worker in the meantime
+            if are_requirements_satisfied(requirements):
+                return
+
+            log.info(f"Installing requirements: {' '.join(requirements)}")
+            find_links = ["--no-index", "--find-links", str(self.wheel_dir)]
+            installed = self.pip("install", *find_links, *requirements, index=False)
+            if not installed and self.pip(
+                "wheel", "--wheel-dir", str(self.wheel_dir), *requirements
+            ):
+                installed = self.pip("install", *find_links, *requirements, index=False)
+            if not installed:
+                log.warning("Failed to install from wheels, installing directly")
+                if not self.pip("install", *requirements):
+                    raise Exception(self.error or "pip install failed")
+
+        importlib.invalidate_caches()
+
+
+REQUIREMENTS_INSTALLER = RequirementsInstaller(PIP_WHEEL_CACHE_DIR)
+
+
+def ensure_frontmatter_requirements(
+    requirements: Optional[str], source: Optional[str] = None, wait: bool = False
+):
+    """
+    Make sure the requirements of a module are installed before it is
+    loaded. Missing ones are queued for installation and, unless `wait`,
+    RequirementsNotReadyError is raised instead of waiting for pip.
+    """
+    requirements = parse_requirements(requirements)
+    if REQUIREMENTS_INSTALLER.is_ready(requirements):
+        return
+
+    entry = REQUIREMENTS_INSTALLER.submit(requirements, source)
+    if wait:
+        entry = REQUIREMENTS_INSTALLER.wait(requirements)
+
+    if entry["status"] == "installed":
+        return
+    if entry["status"] == "failed":
+        raise Exception(
+            f"Failed to install requirements {', '.join(requirements)}: {entry['error']}"
+        )
+    raise RequirementsNotReadyError(
+        f"Installing requirements {', '.join(requirements)}, try again shortly"
+    )
+
+
+async def wait_for_frontmatter_requirements(content: str, source: Optional[str] = None):
+    """Install the requirements of a module's content without blocking the loop."""
+    requirements = extract_frontmatter(content).get("requirements", "")
+    await asyncio.to_thread(ensure_frontmatter_requirements, requirements, source, True)
+
+
+def install_frontmatter_requirements(requirements: str):
+    if requirements:
+        ensure_frontmatter_requirements(requirements, wait=True)
     else:
         log.info("No requirements found in frontmatter.")
 
 
 def install_tool_and_function_dependencies():
     """
-    Install all dependencies for all admin tools and active functions.
-
-    By first collecting all dependencies from the frontmatter of each tool and function,
-    and then installing them using pip. Duplicates or similar version specifications are
-    handled by pip as much as possible.
+    Queue the installation of the dependencies of all admin tools and active
+    functions, once per distinct requirement set. Modules whose requirements
+    are not installed yet fail to load with RequirementsNotReadyError, without
+    being deactivated, until they are.
     """
     function_list = Functions.get_functions(active_only=True)
     tool_list = Tools.get_tools()
 
-    all_dependencies = ""
+    sources = {}
     try:
         for function in function_list:
             frontmatter = extract_frontmatter(replace_imports(function.content))
-            if dependencies := frontmatter.get("requirements"):
-                all_dependencies += f"{dependencies}, "
+            if requirements := parse_requirements(frontmatter.get("requirements")):
+                sources.setdefault(requirements, []).append(f"function:{function.id}")
         for tool in tool_list:
             # Only install requirements for admin tools
             if tool.user and tool.user.role == "admin":
                 frontmatter = extract_frontmatter(replace_imports(tool.content))
-                if dependencies := frontmatter.get("requirements"):
-                    all_dependencies += f"{dependencies}, "
+                if requirements := parse_requirements(frontmatter.get("requirements")):
+                    sources.setdefault(requirements, []).append(f"tool:{tool.id}")
 
-        install_frontmatter_requirements(all_dependencies.strip(", "))
+        for requirements, ids in sources.items():
+            if not REQUIREMENTS_INSTALLER.is_ready(requirements):
+                for source in ids:
+                    REQUIREMENTS_INSTALLER.submit(requirements, source)
     except Exception as e:
         log.error(f"Error installing requirements: {e}")
@@ -0,0 +1,152 @@
+import logging
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from importlib.abc import MetaPathFinder
+from typing import Optional
+
+log = logging.getLogger(__name__)
+
+# Packages listed in the startup report
+REPORT_SIZE = 30
+
+
+def get_rss() -> int:
+    """Resident memory of this process in bytes, 0 where unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        pass
+
+    try:
+        import resource
+
+        # Peak rather than current memory, the best available here
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss if sys.platform == "darwin" else rss * 1024
+    except Exception:
+        return 0
+
+
+class ProfilingLoader:
+    """Loader wrapper measuring the time and memory taken to execute a module."""
+
+    def __init__(self, loader, name: str, profiler: "ImportProfiler"):
+        self.loader = loader
+        self.name = name
+        self.profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        self.profiler.enter(self.name)
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.profiler.exit()
+
+
+class ImportProfiler(MetaPathFinder):
+    """
+    Records the import time and memory growth of every module imported while
+    it is installed. A module's own cost excludes the modules it imports.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.start_rss = get_rss()
+
+        # Module -> [own seconds, own bytes]
+        self.stats: dict[str, list] = defaultdict(lambda: [0.0, 0])
+        self.local = threading.local()
+
+    @property
+    def stack(self) -> list[list]:
+        # [module, start time, start rss, children seconds, children bytes]
+        # for the imports in progress on this thread
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = ProfilingLoader(spec.loader, fullname, self)
+                return spec
+        return None
+
+    def enter(self, name: str):
+        self.stack.append([name, time.perf_counter(), get_rss(), 0.0, 0])
+
+    def exit(self):
+        name, started_at, start_rss, children_time, children_rss = self.stack.pop()
+        elapsed = time.perf_counter() - started_at
+        rss = get_rss() - start_rss
+
+        self.stats[name][0] += elapsed - children_time
+        self.stats[name][1] += rss - children_rss
+        if self.stack:
+            self.stack[-1][3] += elapsed
+            self.stack[-1][4] += rss
+
+    def get_report(self, size: int = REPORT_SIZE) -> str:
+        packages = defaultdict(lambda: [0.0, 0, 0])
+        for name, (seconds, rss) in self.stats.items():
+            package = packages[
+                (
+                    ".".join(name.split(".")[:2])
+                    if name.startswith("open_webui.")
+                    else name.split(".")[0]
+                )
+            ]
+            package[0] += seconds
+            package[1] += rss
+            package[2] += 1
+
+        lines = [
+            f"Startup took {time.perf_counter() - self.started_at:.2f}s and "
+            f"{(get_rss() - self.start_rss) / 2**20:.0f} MiB in {len(self.stats)} imported modules",
+            f"{'package':<40} {'modules':>8} {'seconds':>8} {'MiB':>8}",
+        ]
+        for package, (seconds, rss, count) in sorted(
+            packages.items(), key=lambda item: item[1][0], reverse=True
+        )[:size]:
+            lines.append(
+                f"{package:<40} {count:>8} {seconds:>8.3f} {rss / 2**20:>8.1f}"
+            )
+        return "\n".join(lines)
+
+
+IMPORT_PROFILER: Optional[ImportProfiler] = None
+
+
+def start_import_profiling():
+    global IMPORT_PROFILER
+    if IMPORT_PROFILER is None:
+        IMPORT_PROFILER = ImportProfiler()
+        sys.meta_path.insert(0, IMPORT_PROFILER)
+
+
+def stop_import_profiling() -> Optional[str]:
+    """Stop profiling and return the report, if profiling was started."""
+    global IMPORT_PROFILER
+    if IMPORT_PROFILER is None:
+        return None
+
+    if IMPORT_PROFILER in sys.meta_path:
+        sys.meta_path.remove(IMPORT_PROFILER)
+    report = IMPORT_PROFILER.get_report()
+    IMPORT_PROFILER = None
+    return report
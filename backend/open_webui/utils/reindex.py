@@ -0,0 +1,371 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
+
+from fastapi import FastAPI, Request
+from langchain_core.documents import Document
+
+from open_webui.env import (
+    ENABLE_INGESTION_QUEUE,
+    INGESTION_QUEUE_LOCK_TIMEOUT,
+    INGESTION_QUEUE_MAX_ATTEMPTS,
+    KNOWLEDGE_REINDEX_CONCURRENCY,
+)
+from open_webui.models.files import FileModel, Files
+from open_webui.models.jobs import JobModel, Jobs
+from open_webui.models.knowledge import Knowledges
+from open_webui.models.users import UserModel
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.utils.ingestion import KNOWLEDGE_REINDEX_JOB, IngestionWorker
+from open_webui.utils.misc import calculate_sha256_string
+
+log = logging.getLogger(__name__)
+
+# Seconds between checkpoints of the job progress
+CHECKPOINT_INTERVAL = 5
+
+
+def get_shadow_collection_name(knowledge_id: str, job_id: str) -> str:
+    return f"{knowledge_id}-{job_id[:8]}"
+
+
+def get_file_docs(file: FileModel) -> list[Document]:
+    """
+    Documents of an already processed file, from its own collection or its
+    stored extracted text, the same way a file is added to a knowledge base.
+    """
+    result = VECTOR_DB_CLIENT.query(
+        collection_name=f"file-{file.id}", filter={"file_id": file.id}
+    )
+
+    if result is not None and len(result.ids[0]) > 0:
+        return [
+            Document(
+                page_content=result.documents[0][idx],
+                metadata=result.metadatas[0][idx],
+            )
+            for idx, id in enumerate(result.ids[0])
+        ]
+
+    return [
+        Document(
+            page_content=file.data.get("content", "").replace("<br/>", "\n"),
+            metadata={
+                **file.meta,
+                "name": file.filename,
+                "created_by": file.user_id,
+                "file_id": file.id,
+                "source": file.filename,
+            },
+        )
+    ]
+
+
+def reindex_file(
+    request: Request,
+    file_id: str,
+    collection_name: str,
+    user: UserModel,
+    resume: bool = False,
+):
+    from open_webui.routers.retrieval import (
+        ProcessFileForm,
+        process_file,
+        save_docs_to_vector_db,
+    )
+
+    file = Files.get_file_by_id(file_id)
+    if not file:
+        return
+
+    if resume:
+        # Drop a partial insert left by an interrupted attempt
+        try:
+            VECTOR_DB_CLIENT.delete(
+                collection_name=collection_name, filter={"file_id": file.id}
+            )
+        except Exception:
+            pass
+
+    if not (file.data or {}).get("content"):
+        # Nothing extracted yet, parse it once
+        process_file(request, ProcessFileForm(file_id=file.id), user=user)
+        file = Files.get_file_by_id(file_id)
+
+    text_content = file.data.get("content", "")
+    save_docs_to_vector_db(
+        request,
+        docs=get_file_docs(file),
+        collection_name=collection_name,
+        metadata={
+            "file_id": file.id,
+            "name": file.filename,
+            "hash": file.hash or calculate_sha256_string(text_content),
+        },
+        add=True,
+        user=user,
+        blob_hash=(file.meta or {}).get("sha256"),
+    )
+
+
+class ReindexProgress:
+    """
+    Checkpointed state of a reindex job, stored as the job progress.
+
+    Per knowledge base it records the shadow collection being built, the
+    files already in it and the errors; `retired` lists the collections
+    replaced by a swap, deleted once no reader can still be using them.
+    """
+
+    def __init__(self, job: JobModel):
+        self.job_id = job.id
+        self.state = {
+            "total": 0,
+            "completed": 0,
+            "failed": 0,
+            "knowledge": {},
+            "retired": [],
+            **(job.progress or {}),
+        }
+        self.lock = threading.Lock()
+
+        self.started_at = time.time()
+        self.completed_at_start = self.state["completed"] + self.state["failed"]
+        self.checkpointed_at = 0.0
+
+    def get_knowledge(self, knowledge_id: str) -> dict:
+        with self.lock:
+            return self.state["knowledge"].setdefault(
+                knowledge_id,
+                {
+                    "collection": get_shadow_collection_name(knowledge_id, self.job_id),
+                    "status": "building",
+                    "files": [],
+                    "errors": {},
+                },
+            )
+
+    def add_total(self, count: int):
+        with self.lock:
+            self.state["total"] += count
+
+    def add_file(self, knowledge: dict, file_id: str, error: Optional[str] = None):
+        with self.lock:
+            if error is None:
+                knowledge["files"].append(file_id)
+                self.state["completed"] += 1
+            else:
+                knowledge["errors"][file_id] = error
+                self.state["failed"] += 1
+
+    def get_eta(self) -> Optional[int]:
+        done = self.state["completed"] + self.state["failed"]
+        rate = (done - self.completed_at_start) / max(time.time() - self.started_at, 1)
+        if rate <= 0:
+            return None
+        return int(max(self.state["total"] - done, 0) / rate)
+
+    def checkpoint(self, force: bool = False):
+        if not force and time.time() - self.checkpointed_at < CHECKPOINT_INTERVAL:
+            return
+
+        with self.lock:
+            self.state["eta"] = self.get_eta()
+            Jobs.update_job_progress(self.job_id, self.state)
+        self.checkpointed_at = time.time()
+
+
+def reindex_knowledge_base(
+    request: Request,
+    knowledge_id: str,
+    progress: ReindexProgress,
+    user: UserModel,
+    resume: bool = False,
+):
+    knowledge = progress.get_knowledge(knowledge_id)
+    collection_name = knowledge["collection"]
+
+    with ThreadPoolExecutor(max_workers=KNOWLEDGE_REINDEX_CONCURRENCY) as executor:
+        # Repeat for files added to the knowledge base in the meantime
+        rounds = 0
+        while True:
+            done = set(knowledge["files"]) | set(knowledge["errors"])
+            file_ids = [
+                file_id
+                for file_id in Knowledges.get_file_ids_by_id(knowledge_id)
+                if file_id not in done
+            ]
+            if not file_ids:
+                break
+            if rounds:
+                progress.add_total(len(file_ids))
+            rounds += 1
+
+            futures = {
+                executor.submit(
+                    reindex_file, request, file_id, collection_name, user, resume
+                ): file_id
+                for file_id in file_ids
+            }
+            for future in as_completed(futures):
+                file_id = futures[future]
+                try:
+                    future.result()
+                    progress.add_file(knowledge, file_id)
+                except Exception as e:
+                    error = str(e.detail) if hasattr(e, "detail") else str(e)
+                    log.error(f"Error reindexing file {file_id}: {error}")
+                    progress.add_file(knowledge, file_id, error)
+                progress.checkpoint()
+
+    if not Knowledges.get_knowledge_by_id(id=knowledge_id):
+        # Deleted while reindexing
+        try:
+            VECTOR_DB_CLIENT.client.delete_collection(collection_name)
+        except Exception:
+            pass
+        knowledge["status"] = "deleted"
+        return
+
+    # Drop files removed from the knowledge base in the meantime
+    file_ids = set(Knowledges.get_file_ids_by_id(knowledge_id))
+    for file_id in set(knowledge["files"]) - file_ids:
+        VECTOR_DB_CLIENT.delete(
+            collection_name=collection_name, filter={"file_id": file_id}
+        )
+
+    previous = VECTOR_DB_CLIENT.swap_collection(knowledge_id, collection_name)
+    if previous and previous != collection_name:
+        progress.state["retired"].append(
+            {"collection": previous, "knowledge_id": knowledge_id, "at": time.time()}
+        )
+    knowledge["status"] = "completed"
+
+    if knowledge["errors"]:
+        log.warning(
+            f"Failed to reindex {len(knowledge['errors'])} files in knowledge base {knowledge_id}"
+        )
+
+
+def reconcile_knowledge_base(
+    request: Request, knowledge_id: str, knowledge: dict, user: UserModel
+):
+    """
+    Bring a swapped in collection up to date with its knowledge base. Files
+    added after the last reindex round, or by a process still resolving the
+    replaced collection, are indexed again; files removed meanwhile are
+    dropped.
+    """
+    if not Knowledges.get_knowledge_by_id(id=knowledge_id):
+        return
+
+    collection_name = VECTOR_DB_CLIENT.resolve(knowledge_id, cached=False)
+    file_ids = Knowledges.get_file_ids_by_id(knowledge_id)
+
+    for file_id in set(knowledge["files"]) - set(file_ids):
+        VECTOR_DB_CLIENT.client.delete(
+            collection_name=collection_name, filter={"file_id": file_id}
+        )
+
+    for file_id in file_ids:
+        if file_id in knowledge["errors"]:
+            continue
+
+        result = VECTOR_DB_CLIENT.client.query(
+            collection_name=collection_name, filter={"file_id": file_id}, limit=1
+        )
+        if result is not None and len(result.ids[0]) > 0:
+            continue
+
+        try:
+            reindex_file(request, file_id, collection_name, user)
+            log.info(f"Added file {file_id} missed by the reindex to {knowledge_id}")
+        except Exception as e:
+            log.error(f"Error adding file {file_id} to {collection_name}: {e}")
+
+
+def reindex_knowledge_bases(request: Request, job: JobModel, user: UserModel):
+    knowledge_ids = job.payload["knowledge_ids"]
+    progress = ReindexProgress(job)
+    resume = bool(job.progress)
+
+    if not resume:
+        progress.add_total(
+            sum(len(Knowledges.get_file_ids_by_id(id)) for id in knowledge_ids)
+        )
+    log.info(
+        f"Reindexing {len(knowledge_ids)} knowledge bases"
+        + (" from checkpoint" if resume else "")
+    )
+
+    for knowledge_id in knowledge_ids:
+        if progress.get_knowledge(knowledge_id)["status"] != "building":
+            continue
+
+        reindex_knowledge_base(request, knowledge_id, progress, user, resume)
+        progress.checkpoint(force=True)
+
+    # Replaced collections may still be read through cached aliases
+    for retired in list(progress.state["retired"]):
+        delay = retired["at"] + 2 * VECTOR_DB_CLIENT.ttl - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+        # Files written to it meanwhile would be lost with it
+        knowledge_id = retired.get("knowledge_id")
+        if knowledge_id:
+            reconcile_knowledge_base(
+                request, knowledge_id, progress.get_knowledge(knowledge_id), user
+            )
+
+        try:
+            VECTOR_DB_CLIENT.client.delete_collection(retired["collection"])
+        except Exception as e:
+            log.warning(f"Failed to delete collection {retired['collection']}: {e}")
+        progress.state["retired"].remove(retired)
+
+    progress.checkpoint(force=True)
+    log.info("Reindexing completed.")
+
+
+def start_knowledge_reindex(app: FastAPI, user: UserModel) -> Optional[JobModel]:
+    """
+    Queue a reindex of all knowledge bases, or resume the last one if it did
+    not complete. Without the ingestion queue, a worker thread of this
+    process runs it.
+    """
+    Jobs.requeue_stale_jobs(INGESTION_QUEUE_LOCK_TIMEOUT)
+
+    job = Jobs.get_latest_job_by_type(KNOWLEDGE_REINDEX_JOB)
+    if job and job.status == "running":
+        return job
+
+    if not job or job.status != "pending":
+        payload = {
+            "knowledge_ids": [
+                knowledge.id for knowledge in Knowledges.get_knowledge_bases()
+            ]
+        }
+        previous = job if job and job.status == "failed" else None
+        if previous:
+            # Continue from the checkpoint of the failed run
+            payload = previous.payload
+
+        job = Jobs.insert_new_job(
+            KNOWLEDGE_REINDEX_JOB,
+            user.id,
+            payload,
+            max_attempts=INGESTION_QUEUE_MAX_ATTEMPTS,
+        )
+        if job and previous and previous.progress:
+            Jobs.update_job_progress(job.id, previous.progress)
+
+    if job and not ENABLE_INGESTION_QUEUE:
+        worker = IngestionWorker(app, concurrency=1, types=[KNOWLEDGE_REINDEX_JOB])
+        threading.Thread(
+            target=worker.run, kwargs={"until_empty": True}, daemon=True
+        ).start()
+
+    return job
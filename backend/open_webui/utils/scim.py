@@ -0,0 +1,209 @@
+import json
+import re
+from typing import Any, Callable, Optional
+
+from sqlalchemy import and_, func, not_, or_
+
+# Filter comparison operators, RFC 7644 3.4.2.2
+SCIM_FILTER_OPERATORS = ("eq", "ne", "co", "sw", "ew", "gt", "ge", "lt", "le")
+
+SCIM_SCHEMA_PREFIX = re.compile(r"^urn:[^\s\[\]()\"]*:", re.IGNORECASE)
+
+SCIM_FILTER_TOKEN = re.compile(
+    r"""
+    \s*(?:
+        (?P<string>"(?:[^"\\]|\\.)*")
+      | (?P<paren>[()\[\]])
+      | (?P<word>[^\s()\[\]"]+)
+    )
+    """,
+    re.VERBOSE,
+)
+
+
+class SCIMFilterError(ValueError):
+    pass
+
+
+def tokenize_filter(text: str) -> list[tuple[str, Any]]:
+    tokens = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = SCIM_FILTER_TOKEN.match(text, position)
+        if not match or match.end() == position:
+            raise SCIMFilterError(f"Invalid filter at position {position}")
+        position = match.end()
+
+        if match.group("string") is not None:
+            try:
+                tokens.append(("value", json.loads(match.group("string"))))
+            except json.JSONDecodeError:
+                raise SCIMFilterError(f"Invalid string {match.group('string')}")
+        elif match.group("paren") is not None:
+            tokens.append((match.group("paren"), None))
+        else:
+            tokens.append(("word", match.group("word")))
+    return tokens
+
+
+class SCIMFilterParser:
+    """
+    Recursive descent parser of SCIM filters into nested tuples:
+    ("and" | "or", left, right), ("not", node), ("pr", attribute) and
+    (operator, attribute, value), with lowercase attribute paths.
+    """
+
+    def __init__(self, text: str):
+        self.tokens = tokenize_filter(text)
+        self.position = 0
+
+    def peek(self) -> tuple[Optional[str], Any]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return (None, None)
+
+    def next(self) -> tuple[Optional[str], Any]:
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def is_keyword(self, keyword: str) -> bool:
+        kind, value = self.peek()
+        return kind == "word" and value.lower() == keyword
+
+    def expect(self, kind: str):
+        if self.next()[0] != kind:
+            raise SCIMFilterError(f"Expected '{kind}' in filter")
+
+    def parse(self) -> tuple:
+        node = self.parse_or()
+        if self.position < len(self.tokens):
+            raise SCIMFilterError(f"Unexpected '{self.peek()[1]}' in filter")
+        return node
+
+    def parse_or(self, prefix: str = "") -> tuple:
+        node = self.parse_and(prefix)
+        while self.is_keyword("or"):
+            self.next()
+            node = ("or", node, self.parse_and(prefix))
+        return node
+
+    def parse_and(self, prefix: str = "") -> tuple:
+        node = self.parse_factor(prefix)
+        while self.is_keyword("and"):
+            self.next()
+            node = ("and", node, self.parse_factor(prefix))
+        return node
+
+    def parse_factor(self, prefix: str = "") -> tuple:
+        if self.is_keyword("not"):
+            self.next()
+            self.expect("(")
+            node = self.parse_or(prefix)
+            self.expect(")")
+            return ("not", node)
+
+        kind, value = self.next()
+        if kind == "(":
+            node = self.parse_or(prefix)
+            self.expect(")")
+            return node
+        if kind != "word":
+            raise SCIMFilterError("Expected an attribute in filter")
+
+        attribute = prefix + SCIM_SCHEMA_PREFIX.sub("", value).lower()
+
+        if self.peek()[0] == "[":
+            # Value path, e.g. members[value eq "id"]
+            self.next()
+            node = self.parse_or(f"{attribute}.")
+            self.expect("]")
+            return node
+
+        kind, operator = self.next()
+        operator = (operator or "").lower() if kind == "word" else ""
+        if operator == "pr":
+            return ("pr", attribute)
+        if operator not in SCIM_FILTER_OPERATORS:
+            raise SCIMFilterError(f"Unsupported operator '{operator}' in filter")
+
+        kind, value = self.next()
+        if kind == "word":
+            literals = {"true": True, "false": False, "null": None}
+            if value.lower() in literals:
+                value = literals[value.lower()]
+            else:
+                try:
+                    value = json.loads(value)
+                except json.JSONDecodeError:
+                    raise SCIMFilterError(f"Invalid value '{value}' in filter")
+        elif kind != "value":
+            raise SCIMFilterError("Expected a value in filter")
+
+        return (operator, attribute, value)
+
+
+def parse_filter(text: Optional[str]) -> Optional[tuple]:
+    """Parse a SCIM filter, None if empty. Raises SCIMFilterError."""
+    if not text or not text.strip():
+        return None
+    return SCIMFilterParser(text).parse()
+
+
+def compare_column(column, operator: str, value: Any, case_exact: bool = False):
+    """A SQL condition comparing a string column, case-insensitive by default."""
+    if operator == "pr":
+        return and_(column.isnot(None), column != "")
+    if value is None:
+        if operator == "eq":
+            return column.is_(None)
+        if operator == "ne":
+            return column.isnot(None)
+        raise SCIMFilterError(f"Operator '{operator}' does not take null")
+
+    if not case_exact and isinstance(value, str):
+        column, value = func.lower(column), value.lower()
+
+    if operator == "eq":
+        return column == value
+    if operator == "ne":
+        return or_(column != value, column.is_(None))
+    if operator == "co":
+        return column.contains(str(value), autoescape=True)
+    if operator == "sw":
+        return column.startswith(str(value), autoescape=True)
+    if operator == "ew":
+        return column.endswith(str(value), autoescape=True)
+    if operator == "gt":
+        return column > value
+    if operator == "ge":
+        return column >= value
+    if operator == "lt":
+        return column < value
+    if operator == "le":
+        return column <= value
+    raise SCIMFilterError(f"Unsupported operator '{operator}' in filter")
+
+
+def compile_filter(node: tuple, attributes: dict[str, Callable[[str, Any], Any]]):
+    """
+    Compile a parsed filter into a SQL condition, with `attributes` mapping
+    each supported attribute path to a function of (operator, value).
+    """
+    kind = node[0]
+    if kind == "and":
+        return and_(
+            compile_filter(node[1], attributes), compile_filter(node[2], attributes)
+        )
+    if kind == "or":
+        return or_(
+            compile_filter(node[1], attributes), compile_filter(node[2], attributes)
+        )
+    if kind == "not":
+        return not_(compile_filter(node[1], attributes))
+
+    attribute = node[1]
+    if attribute not in attributes:
+        raise SCIMFilterError(f"Filtering on '{attribute}' is not supported")
+    return attributes[attribute](kind, node[2] if kind != "pr" else None)
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+from opentelemetry import trace
+
+log = logging.getLogger(__name__)
+
+tracer = trace.get_tracer(__name__)
+
+
+@dataclass
+class Stage:
+    """
+    A single step of the pre-inference pipeline.
+
+    `func` takes no arguments and is awaited once every stage listed in
+    `depends_on` has finished. Stages without a dependency path between them
+    run concurrently.
+    """
+
+    name: str
+    func: Callable[[], Awaitable[None]]
+    depends_on: list[str] = field(default_factory=list)
+
+
+async def run_stages(
+    stages: list[Stage],
+    event_emitter: Optional[Callable] = None,
+    span_name: str = "chat.pre_inference",
+) -> dict[str, float]:
+    """
+    Run `stages` as a dependency graph and return the wall time (in ms) of
+    each stage. Stages must be listed after the stages they depend on.
+
+    The first stage to raise cancels every stage still pending and the
+    exception is re-raised to the caller.
+    """
+
+    tasks: dict[str, asyncio.Task] = {}
+    timings: dict[str, float] = {}
+
+    async def run(stage: Stage):
+        if stage.depends_on:
+            await asyncio.gather(*(tasks[name] for name in stage.depends_on))
+
+        start = time.perf_counter()
+        with tracer.start_as_current_span(f"{span_name}.{stage.name}") as span:
+            try:
+                await stage.func()
+            finally:
+                timings[stage.name] = round((time.perf_counter() - start) * 1000, 2)
+                span.set_attribute("stage.duration_ms", timings[stage.name])
+
+    seen = set()
+    for stage in stages:
+        if stage.name in seen:
+            raise ValueError(f"Duplicate stage: {stage.name}")
+
+        for dependency in stage.depends_on:
+            if dependency not in seen:
+                raise ValueError(
+                    f"Stage '{stage.name}' depends on unknown or later stage '{dependency}'"
+                )
+
+        seen.add(stage.name)
+
+    start = time.perf_counter()
+    with tracer.start_as_current_span(span_name) as span:
+        for stage in stages:
+            # Tasks inherit the current context, so stage spans nest under `span`
+            tasks[stage.name] = asyncio.create_task(run(stage))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        finally:
+            total = round((time.perf_counter() - start) * 1000, 2)
+            span.set_attribute("stage.duration_ms", total)
+
+    log.debug(f"{span_name} timings (ms): total={total} {timings}")
+
+    if event_emitter:
+        await event_emitter(
+            {
+                "type": "status",
+                "data": {
+                    "action": "pipeline_timings",
+                    "timings": {**timings, "total": total},
+                    "done": True,
+                    "hidden": True,
+                },
+            }
+        )
+
+    return timings
@@ -37,11 +37,14 @@ from langchain_core.utils.function_calling import (
 from open_webui.utils.misc import is_string_allowed
 from open_webui.models.tools import Tools
 from open_webui.models.users import UserModel
-from open_webui.utils.plugin import load_tool_module_by_id
+from open_webui.utils.plugin import get_tool_module_from_cache
 from open_webui.env import (
     AIOHTTP_CLIENT_TIMEOUT,
     AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA,
     AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
+    REDIS_KEY_PREFIX,
+    TOOL_SERVER_CONNECTION_POOL_SIZE,
+    TOOL_SERVER_REFRESH_INTERVAL,
 )
 
 import copy
@@ -108,6 +111,7 @@ async def get_tools(
     request: Request, tool_ids: list[str], user: UserModel, extra_params: dict
 ) -> dict[str, dict]:
     tools_dict = {}
+    tool_servers = None
 
     for tool_id in tool_ids:
         tool = Tools.get_tool_by_id(tool_id)
@@ -130,12 +134,13 @@ async def get_tools(
 
                 if type == "openapi":
 
-                    tool_server_data = None
-                    for server in await get_tool_servers(request):
-                        if server["id"] == server_id:
-                            tool_server_data = server
-                            break
+                    if tool_servers is None:
+                        tool_servers = {
+                            server["id"]: server
+                            for server in await get_tool_servers(request)
+                        }
 
+                    tool_server_data = tool_servers.get(server_id)
                     if tool_server_data is None:
                         log.warning(f"Tool server data not found for {server_id}")
                         continue
@@ -244,10 +249,7 @@ async def get_tools(
             else:
                 continue
         else:
-            module = request.app.state.TOOLS.get(tool_id, None)
-            if module is None:
-                module, _ = load_tool_module_by_id(tool_id)
-                request.app.state.TOOLS[tool_id] = module
+            module, _ = get_tool_module_from_cache(request, tool_id)
 
             __user__ = {
                 **extra_params["__user__"],
@@ -557,32 +559,165 @@ def convert_openapi_to_tool_payload(openapi_spec):
     return tool_payload
 
 
-async def set_tool_servers(request: Request):
-    request.app.state.TOOL_SERVERS = await get_tool_servers_data(
-        request.app.state.config.TOOL_SERVER_CONNECTIONS
-    )
+####################
+# Tool servers
+####################
+
+TOOL_SERVERS_KEY = f"{REDIS_KEY_PREFIX}:tool_servers"
+TOOL_SERVERS_VERSION_KEY = f"{TOOL_SERVERS_KEY}:version"
+TOOL_SERVERS_REFRESH_LOCK_KEY = f"{TOOL_SERVERS_KEY}:refresh_lock"
+
+
+class ToolServerCache:
+    """
+    The OpenAPI tool servers with their specs parsed and converted to tool
+    payloads, shared by the requests of this process.
+
+    With Redis, a refresh stores the servers then increments a version
+    counter, and other instances reload them only when the counter moves, so
+    a request costs a GET of the counter rather than parsing every spec.
+    """
+
+    def __init__(self):
+        self.servers: Optional[list[dict]] = None
+        self.version: Optional[str] = None
+        self.lock = asyncio.Lock()
+
+    async def get(self, app) -> list[dict]:
+        version = None
+        if app.state.redis is not None:
+            try:
+                version = await app.state.redis.get(TOOL_SERVERS_VERSION_KEY)
+            except Exception as e:
+                log.error(f"Error fetching the tool servers version from Redis: {e}")
+                version = self.version
+
+        if self.servers is not None and version == self.version:
+            return self.servers
+
+        async with self.lock:
+            if self.servers is not None and version == self.version:
+                return self.servers
+
+            if version is not None:
+                try:
+                    servers = await app.state.redis.get(TOOL_SERVERS_KEY)
+                    if servers is not None:
+                        self.set(app, json.loads(servers), version)
+                        return self.servers
+                except Exception as e:
+                    log.error(f"Error fetching tool_servers from Redis: {e}")
+
+            # Never fetched, e.g. on startup without Redis
+            return await self.refresh(app)
+
+    def set(self, app, servers: list[dict], version: Optional[str] = None):
+        self.servers = servers
+        self.version = version
+        app.state.TOOL_SERVERS = servers
+
+    async def refresh(self, app) -> list[dict]:
+        """Fetch the specs of the enabled servers and share them."""
+        servers = await get_tool_servers_data(app.state.config.TOOL_SERVER_CONNECTIONS)
+
+        version = None
+        if app.state.redis is not None:
+            try:
+                # Stored before the counter moves, so that a new version is
+                # never read with the previous servers
+                await app.state.redis.set(TOOL_SERVERS_KEY, json.dumps(servers))
+                version = str(await app.state.redis.incr(TOOL_SERVERS_VERSION_KEY))
+            except Exception as e:
+                log.error(f"Error storing tool_servers in Redis: {e}")
+
+        self.set(app, servers, version)
+        await TOOL_SERVER_SESSIONS.close(keep={server.get("url") for server in servers})
+        return servers
+
+
+TOOL_SERVER_CACHE = ToolServerCache()
+
+
+class ToolServerSessions:
+    """
+    HTTP sessions reused by the tool calls of each tool server, keeping their
+    connections open. Cookies are sent per call and never stored, as the
+    sessions are shared by all users.
+    """
+
+    def __init__(self, pool_size: int = TOOL_SERVER_CONNECTION_POOL_SIZE):
+        self.pool_size = pool_size
+        self.sessions: dict[str, tuple[asyncio.AbstractEventLoop, Any]] = {}
+
+    def get(self, url: str) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
 
-    if request.app.state.redis is not None:
-        await request.app.state.redis.set(
-            "tool_servers", json.dumps(request.app.state.TOOL_SERVERS)
+        entry = self.sessions.get(url)
+        if entry is not None and entry[0] is loop and not entry[1].closed:
+            return entry[1]
+
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.pool_size),
+            cookie_jar=aiohttp.DummyCookieJar(),
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
+            trust_env=True,
         )
+        self.sessions[url] = (loop, session)
+        return session
+
+    async def close(self, keep: Optional[set] = None):
+        """Close the sessions of all servers, except those in `keep`."""
+        for url in list(self.sessions):
+            if keep and url in keep:
+                continue
+
+            loop, session = self.sessions.pop(url)
+            if loop is asyncio.get_running_loop() and not session.closed:
+                try:
+                    await session.close()
+                except Exception as e:
+                    log.debug(f"Error closing the session of {url}: {e}")
 
-    return request.app.state.TOOL_SERVERS
+
+TOOL_SERVER_SESSIONS = ToolServerSessions()
+
+
+async def set_tool_servers(request: Request):
+    return await TOOL_SERVER_CACHE.refresh(request.app)
 
 
 async def get_tool_servers(request: Request):
-    tool_servers = []
-    if request.app.state.redis is not None:
-        try:
-            tool_servers = json.loads(await request.app.state.redis.get("tool_servers"))
-            request.app.state.TOOL_SERVERS = tool_servers
-        except Exception as e:
-            log.error(f"Error fetching tool_servers from Redis: {e}")
+    return await TOOL_SERVER_CACHE.get(request.app)
 
-    if not tool_servers:
-        tool_servers = await set_tool_servers(request)
 
-    return tool_servers
+async def tool_server_refresh_loop(app, interval: int = TOOL_SERVER_REFRESH_INTERVAL):
+    """
+    Load the tool servers, then refresh their specs every `interval` seconds,
+    off the request path. With Redis, one instance refreshes per interval.
+    """
+    try:
+        await TOOL_SERVER_CACHE.get(app)
+    except Exception as e:
+        log.exception(f"Error loading tool servers: {e}")
+
+    if not interval:
+        return
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if app.state.redis is not None:
+                if not await app.state.redis.set(
+                    TOOL_SERVERS_REFRESH_LOCK_KEY,
+                    getattr(app.state, "instance_id", "") or "1",
+                    nx=True,
+                    ex=max(interval - 1, 1),
+                ):
+                    continue
+
+            await TOOL_SERVER_CACHE.refresh(app)
+        except Exception as e:
+            log.exception(f"Error refreshing tool servers: {e}")
 
 
 async def get_tool_server_data(url: str, headers: Optional[dict]) -> Dict[str, Any]:
@@ -794,50 +929,48 @@ async def execute_tool_server(
             if params:
                 body_params = params
 
-        async with aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        ) as session:
-            request_method = getattr(session, http_method.lower())
-
-            if http_method in ["post", "put", "patch", "delete"]:
-                async with request_method(
-                    final_url,
-                    json=body_params,
-                    headers=headers,
-                    cookies=cookies,
-                    ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
-                    allow_redirects=False,
-                ) as response:
-                    if response.status >= 400:
-                        text = await response.text()
-                        raise Exception(f"HTTP error {response.status}: {text}")
+        session = TOOL_SERVER_SESSIONS.get(url)
+        request_method = getattr(session, http_method.lower())
+
+        if http_method in ["post", "put", "patch", "delete"]:
+            async with request_method(
+                final_url,
+                json=body_params,
+                headers=headers,
+                cookies=cookies,
+                ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
+                allow_redirects=False,
+            ) as response:
+                if response.status >= 400:
+                    text = await response.text()
+                    raise Exception(f"HTTP error {response.status}: {text}")
 
-                    try:
-                        response_data = await response.json()
-                    except Exception:
-                        response_data = await response.text()
+                try:
+                    response_data = await response.json()
+                except Exception:
+                    response_data = await response.text()
 
-                    response_headers = response.headers
-                    return (response_data, response_headers)
-            else:
-                async with request_method(
-                    final_url,
-                    headers=headers,
-                    cookies=cookies,
-                    ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
-                    allow_redirects=False,
-                ) as response:
-                    if response.status >= 400:
-                        text = await response.text()
-                        raise Exception(f"HTTP error {response.status}: {text}")
+                response_headers = response.headers
+                return (response_data, response_headers)
+        else:
+            async with request_method(
+                final_url,
+                headers=headers,
+                cookies=cookies,
+                ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
+                allow_redirects=False,
+            ) as response:
+                if response.status >= 400:
+                    text = await response.text()
+                    raise Exception(f"HTTP error {response.status}: {text}")
 
-                    try:
-                        response_data = await response.json()
-                    except Exception:
-                        response_data = await response.text()
+                try:
+                    response_data = await response.json()
+                except Exception:
+                    response_data = await response.text()
 
-                    response_headers = response.headers
-                    return (response_data, response_headers)
+                response_headers = response.headers
+                return (response_data, response_headers)
 
     except Exception as err:
         error = str(err)